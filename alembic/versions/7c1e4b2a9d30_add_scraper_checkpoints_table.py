@@ -0,0 +1,35 @@
+"""add scraper checkpoints table
+
+Revision ID: 7c1e4b2a9d30
+Revises: 24e82e9079c0
+Create Date: 2026-10-19 10:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2a9d30'
+down_revision: Union[str, Sequence[str], None] = '24e82e9079c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'scraper_checkpoints',
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('source'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scraper_checkpoints')
@@ -0,0 +1,123 @@
+"""partition audit logs by month
+
+Revision ID: 9e2b5f7c3d18
+Revises: d4a1c8e67b35
+Create Date: 2026-10-19 19:12:37.604118
+
+Rebuilds audit_logs as a table range-partitioned on performed_at: one
+partition per month from the oldest row to AUDIT_PARTITION_MONTHS_AHEAD
+months ahead, plus a default partition. Rows are copied across; the primary
+key becomes (id, performed_at) because a partitioned table's keys must
+include the partition key. Later months are created by
+app/services/audit_partition_service.py.
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b5f7c3d18'
+down_revision: Union[str, Sequence[str], None] = 'd4a1c8e67b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+COLUMNS = (
+    'id, user_id, action, entity_type, entity_id, audit_log_metadata, '
+    'ip_address, user_agent, performed_at'
+)
+
+
+def _add_months(month: date, n: int) -> date:
+    years, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def _columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True, comment='NULL for system-initiated actions'),
+        sa.Column('action', postgresql.ENUM(name='audit_action_enum', create_type=False), nullable=False),
+        sa.Column('entity_type', sa.String(length=100), nullable=True, comment="e.g. 'Claim', 'FraudCase', 'User'"),
+        sa.Column('entity_id', sa.UUID(), nullable=True, comment='PK of the affected record'),
+        sa.Column('audit_log_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='Arbitrary context — diff, old/new values, request IP, etc.'),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=500), nullable=True),
+        sa.Column('performed_at', sa.DateTime(timezone=True), nullable=False, comment='Partition key'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE audit_logs SET performed_at = now() WHERE performed_at IS NULL")
+    op.drop_index(op.f('ix_audit_logs_user_id'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_action'), table_name='audit_logs')
+    op.drop_index('idx_audit_user', table_name='audit_logs')
+    op.drop_index('idx_audit_performed_at', table_name='audit_logs')
+    op.drop_index('idx_audit_entity', table_name='audit_logs')
+    op.rename_table('audit_logs', 'audit_logs_unpartitioned')
+    op.execute(
+        "ALTER TABLE audit_logs_unpartitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+    )
+
+    op.create_table('audit_logs',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'performed_at'),
+    postgresql_partition_by='RANGE (performed_at)'
+    )
+    oldest = op.get_bind().scalar(sa.text("SELECT min(performed_at) FROM audit_logs_unpartitioned"))
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    month = (oldest.date() if oldest else this_month).replace(day=1)
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE audit_logs_y{month.year}m{month.month:02d} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned"
+    )
+    op.drop_table('audit_logs_unpartitioned')
+
+    op.create_index('idx_audit_entity', 'audit_logs', ['entity_type', 'entity_id'], unique=False)
+    op.create_index('idx_audit_performed_at', 'audit_logs', ['performed_at'], unique=False)
+    op.create_index('brin_audit_performed_at', 'audit_logs', ['performed_at'], unique=False, postgresql_using='brin')
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id', 'performed_at'], unique=False)
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.drop_index(op.f('ix_audit_logs_action'), table_name='audit_logs_partitioned')
+    op.drop_index('idx_audit_user', table_name='audit_logs_partitioned')
+    op.drop_index('brin_audit_performed_at', table_name='audit_logs_partitioned')
+    op.drop_index('idx_audit_performed_at', table_name='audit_logs_partitioned')
+    op.drop_index('idx_audit_entity', table_name='audit_logs_partitioned')
+    op.execute(
+        "ALTER TABLE audit_logs_partitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey"
+    )
+
+    op.create_table('audit_logs',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned"
+    )
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")  # and its partitions
+
+    op.create_index('idx_audit_entity', 'audit_logs', ['entity_type', 'entity_id'], unique=False)
+    op.create_index('idx_audit_performed_at', 'audit_logs', ['performed_at'], unique=False)
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_user_id'), 'audit_logs', ['user_id'], unique=False)
@@ -0,0 +1,34 @@
+"""add ghost probability to suppliers
+
+Revision ID: a3f9d27c51e8
+Revises: 7c1e4b2a9d30
+Create Date: 2026-10-19 11:02:47.530219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9d27c51e8'
+down_revision: Union[str, Sequence[str], None] = '7c1e4b2a9d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('suppliers', sa.Column('ghost_probability', sa.Float(), nullable=True, comment='Ghost-supplier probability (0–1) from ml/supplier_risk.py; written by the supplier ghost backfill.'))
+    op.add_column('suppliers', sa.Column('model_version', sa.String(length=40), nullable=True, comment='supplier_risk model version behind ghost_probability; NULL means features changed and it must be recomputed.'))
+    op.create_index(op.f('ix_suppliers_ghost_probability'), 'suppliers', ['ghost_probability'], unique=False)
+    op.create_index(op.f('ix_suppliers_model_version'), 'suppliers', ['model_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_suppliers_model_version'), table_name='suppliers')
+    op.drop_index(op.f('ix_suppliers_ghost_probability'), table_name='suppliers')
+    op.drop_column('suppliers', 'model_version')
+    op.drop_column('suppliers', 'ghost_probability')
@@ -0,0 +1,36 @@
+"""index data version timestamps
+
+Revision ID: b7d3e9f14a20
+Revises: f2a8d6c1b947
+Create Date: 2026-10-19 16:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9f14a20'
+down_revision: Union[str, Sequence[str], None] = 'f2a8d6c1b947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tenders_updated_at'), 'tenders', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_risk_scores_updated_at'), 'risk_scores', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_red_flags_created_at'), 'red_flags', ['created_at'], unique=False)
+    op.create_index(op.f('ix_suppliers_updated_at'), 'suppliers', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_contracts_updated_at'), 'contracts', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contracts_updated_at'), table_name='contracts')
+    op.drop_index(op.f('ix_suppliers_updated_at'), table_name='suppliers')
+    op.drop_index(op.f('ix_red_flags_created_at'), table_name='red_flags')
+    op.drop_index(op.f('ix_risk_scores_updated_at'), table_name='risk_scores')
+    op.drop_index(op.f('ix_tenders_updated_at'), table_name='tenders')
@@ -0,0 +1,50 @@
+"""add whistleblower triage queue columns
+
+Revision ID: c58e1d4f7a02
+Revises: a3f9d27c51e8
+Create Date: 2026-10-19 13:20:11.402873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e1d4f7a02'
+down_revision: Union[str, Sequence[str], None] = 'a3f9d27c51e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('whistleblower_reports', sa.Column('tracking_code', sa.String(length=20), nullable=True, comment='Random code returned to the reporter for status checks.'))
+    op.add_column('whistleblower_reports', sa.Column('triage_status', sa.String(length=20), server_default='pending', nullable=False, comment='pending | processing | done | failed | skipped'))
+    op.add_column('whistleblower_reports', sa.Column('triage_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('whistleblower_reports', sa.Column('triage_claimed_at', sa.DateTime(timezone=True), nullable=True, comment='When a triage worker claimed the report; stale claims are retried.'))
+    op.add_column('whistleblower_reports', sa.Column('triaged_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('whistleblower_reports', sa.Column('escalated_at', sa.DateTime(timezone=True), nullable=True, comment='Set when triage found the report urgent and credible.'))
+    op.create_index(op.f('ix_whistleblower_reports_tracking_code'), 'whistleblower_reports', ['tracking_code'], unique=True)
+    op.create_index(op.f('ix_whistleblower_reports_triage_status'), 'whistleblower_reports', ['triage_status'], unique=False)
+    op.create_index(op.f('ix_whistleblower_reports_escalated_at'), 'whistleblower_reports', ['escalated_at'], unique=False)
+    # Reports triaged synchronously before this change are already done;
+    # the rest (AI was unavailable) go through the new queue.
+    op.execute(
+        "UPDATE whistleblower_reports SET triage_status = 'done', triaged_at = submitted_at "
+        "WHERE ai_triage_summary IS NOT NULL OR credibility_score IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_whistleblower_reports_escalated_at'), table_name='whistleblower_reports')
+    op.drop_index(op.f('ix_whistleblower_reports_triage_status'), table_name='whistleblower_reports')
+    op.drop_index(op.f('ix_whistleblower_reports_tracking_code'), table_name='whistleblower_reports')
+    op.drop_column('whistleblower_reports', 'escalated_at')
+    op.drop_column('whistleblower_reports', 'triaged_at')
+    op.drop_column('whistleblower_reports', 'triage_claimed_at')
+    op.drop_column('whistleblower_reports', 'triage_attempts')
+    op.drop_column('whistleblower_reports', 'triage_status')
+    op.drop_column('whistleblower_reports', 'tracking_code')
@@ -0,0 +1,45 @@
+"""add risk daily rollup table
+
+Revision ID: d4a1c8e67b35
+Revises: b7d3e9f14a20
+Create Date: 2026-10-19 17:42:09.551830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a1c8e67b35'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9f14a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'risk_daily_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('county', sa.String(length=100), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('risk_level', sa.String(length=10), nullable=False),
+        sa.Column('flag_type', sa.String(length=50), nullable=False),
+        sa.Column('tender_count', sa.Integer(), nullable=False),
+        sa.Column('estimated_value_sum', sa.Float(), nullable=False),
+        sa.Column('total_score_sum', sa.Float(), nullable=False, comment='Over scored tenders; avg = sum / tender_count'),
+        sa.Column('flagged_tender_count', sa.Integer(), nullable=False),
+        sa.Column('flagged_value_sum', sa.Float(), nullable=False),
+        sa.Column('flag_count', sa.Integer(), nullable=False),
+        sa.Column('contract_count', sa.Integer(), nullable=False),
+        sa.Column('contract_value_sum', sa.Float(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('day', 'county', 'category', 'risk_level', 'flag_type'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('risk_daily_rollup')
@@ -0,0 +1,30 @@
+"""add investigation package to risk scores
+
+Revision ID: e41b7c9a2f63
+Revises: c58e1d4f7a02
+Create Date: 2026-10-19 14:05:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7c9a2f63'
+down_revision: Union[str, Sequence[str], None] = 'c58e1d4f7a02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('risk_scores', sa.Column('investigation_package', sa.Text(), nullable=True, comment='Last generated EACC investigation package (Markdown).'))
+    op.add_column('risk_scores', sa.Column('investigation_package_at', sa.DateTime(timezone=True), nullable=True, comment='When investigation_package was generated; stale once updated_at is newer.'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('risk_scores', 'investigation_package_at')
+    op.drop_column('risk_scores', 'investigation_package')
@@ -0,0 +1,28 @@
+"""add input fingerprint to risk scores
+
+Revision ID: f2a8d6c1b947
+Revises: e41b7c9a2f63
+Create Date: 2026-10-19 14:48:02.550913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d6c1b947'
+down_revision: Union[str, Sequence[str], None] = 'e41b7c9a2f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('risk_scores', sa.Column('input_fingerprint', sa.String(length=64), nullable=True, comment='SHA-256 of the scoring inputs (risk_fingerprint_service); unchanged → rescore skipped.'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('risk_scores', 'input_fingerprint')
@@ -0,0 +1,34 @@
+"""
+Admin diagnostics — request profiles captured by app/core/profiler.py.
+
+Profile a request by sending `X-Profile: <PROFILER_TOKEN>`; the response's
+X-Profile-ID header names the stored profile. Download it in folded format
+and render with flamegraph.pl, inferno-flamegraph or speedscope.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.dependencies import require_role
+from app.core.profiler import get_profile, list_profiles
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/profiles", response_model=dict)
+async def profiles(user=Depends(require_role("admin"))):
+    """Profiles in the ring buffer, newest first."""
+    items = list_profiles()
+    return {"items": items, "total": len(items)}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def profile_folded(profile_id: str, user=Depends(require_role("admin"))):
+    """One profile as collapsed stacks (`frame;frame;frame count` per line)."""
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or evicted")
+    return PlainTextResponse(
+        profile.folded(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+    )
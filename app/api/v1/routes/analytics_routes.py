@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_read_db
+from app.core.dependencies import conditional_get, get_current_user
 from app.models.user_model import User
 from app.services.analytics_service import (
     get_analytics_kpis,
@@ -14,19 +14,21 @@ from app.services.analytics_service import (
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
-@router.get("/kpis", response_model=dict)
+@router.get("/kpis", response_model=dict, dependencies=[Depends(conditional_get)])
 async def analytics_kpis(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Top-level KPI cards for the analytics page."""
     return await get_analytics_kpis(db)
 
 
-@router.get("/spending-trend", response_model=dict)
+@router.get(
+    "/spending-trend", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def spending_trend(
     months: int = Query(6, ge=1, le=24),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Monthly budgeted vs actual vs flagged spend in millions KES."""
@@ -34,19 +36,23 @@ async def spending_trend(
     return {"items": items}
 
 
-@router.get("/risk-distribution", response_model=dict)
+@router.get(
+    "/risk-distribution", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def risk_distribution(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Count of tenders per risk level."""
     return await get_risk_distribution(db)
 
 
-@router.get("/daily-trend", response_model=dict)
+@router.get(
+    "/daily-trend", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def daily_trend(
     days: int = Query(7, ge=1, le=30),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Daily risk level counts for TrendChart area chart."""
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_read_db
+from app.core.dependencies import conditional_get, get_current_user
 from app.models.user_model import User
 from app.services.county_risk_service import (
     get_county_risk,
@@ -13,9 +13,11 @@ from app.services.county_risk_service import (
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
-@router.get("/county-risk", response_model=dict)
+@router.get(
+    "/county-risk", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def county_risk(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Aggregated risk stats per county."""
@@ -23,10 +25,10 @@ async def county_risk(
     return {"items": items}
 
 
-@router.get("/risk-trend", response_model=dict)
+@router.get("/risk-trend", response_model=dict, dependencies=[Depends(conditional_get)])
 async def risk_trend(
     months: int = Query(6, ge=1, le=24, description="Number of months to look back"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Monthly tender counts by risk level."""
@@ -34,9 +36,13 @@ async def risk_trend(
     return {"items": items}
 
 
-@router.get("/risk-type-distribution", response_model=dict)
+@router.get(
+    "/risk-type-distribution",
+    response_model=dict,
+    dependencies=[Depends(conditional_get)],
+)
 async def risk_type_distribution(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Total count per RedFlag type across all tenders."""
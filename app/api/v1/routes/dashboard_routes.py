@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.database import get_read_db
+from app.core.dependencies import conditional_get, get_current_user
+from app.core.sse import sse_response
 from app.models.user_model import User
 from app.services.dashboard_service import (
     ask_ai_query,
@@ -11,23 +12,24 @@ from app.services.dashboard_service import (
     get_dashboard_stats,
     get_high_risk_tenders,
     get_top_risk_suppliers,
+    stream_ai_query,
 )
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
-@router.get("/stats", response_model=dict)
+@router.get("/stats", response_model=dict, dependencies=[Depends(conditional_get)])
 async def dashboard_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """KPI cards — totals and deltas vs last 30 days."""
     return await get_dashboard_stats(db)
 
 
-@router.get("/heatmap", response_model=dict)
+@router.get("/heatmap", response_model=dict, dependencies=[Depends(conditional_get)])
 async def dashboard_heatmap(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """County risk summary for the map widget."""
@@ -35,9 +37,11 @@ async def dashboard_heatmap(
     return {"items": items}
 
 
-@router.get("/top-risk-suppliers", response_model=dict)
+@router.get(
+    "/top-risk-suppliers", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def top_risk_suppliers(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Top 5 suppliers by risk score."""
@@ -45,9 +49,11 @@ async def top_risk_suppliers(
     return {"items": items}
 
 
-@router.get("/high-risk-tenders", response_model=dict)
+@router.get(
+    "/high-risk-tenders", response_model=dict, dependencies=[Depends(conditional_get)]
+)
 async def high_risk_tenders(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Top 10 high/critical risk tenders for the dashboard table."""
@@ -66,3 +72,12 @@ async def ai_query(
 ):
     """Natural language query answered by Claude."""
     return await ask_ai_query(payload.question)
+
+
+@router.post("/ai-query/stream")
+async def ai_query_stream(
+    payload: AIQueryRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Same as /ai-query, streamed as Server-Sent Events while Claude answers."""
+    return sse_response(stream_ai_query(payload.question))
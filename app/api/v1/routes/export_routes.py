@@ -0,0 +1,55 @@
+"""
+Bulk export routes (streaming):
+  GET /api/export/tenders?format=ndjson|csv|parquet
+  GET /api/export/risk-scores?format=...
+  GET /api/export/red-flags?format=...
+
+All three accept the same filters as GET /api/tenders.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.dependencies import require_role
+from app.services.export_service import export_filters, stream_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+def _export_response(dataset: str, fmt: str, filters: dict) -> StreamingResponse:
+    body, media_type, filename = stream_export(dataset, fmt, filters)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/tenders")
+async def export_tenders(
+    format: str = Query("ndjson", description="ndjson | csv | parquet"),
+    filters: dict = Depends(export_filters),
+    user=Depends(require_role("admin", "investigator")),
+):
+    """Every matching tender with entity name and composite risk score."""
+    return _export_response("tenders", format, filters)
+
+
+@router.get("/risk-scores")
+async def export_risk_scores(
+    format: str = Query("ndjson", description="ndjson | csv | parquet"),
+    filters: dict = Depends(export_filters),
+    user=Depends(require_role("admin", "investigator")),
+):
+    """Component and composite risk scores for every matching tender."""
+    return _export_response("risk-scores", format, filters)
+
+
+@router.get("/red-flags")
+async def export_red_flags(
+    format: str = Query("ndjson", description="ndjson | csv | parquet"),
+    filters: dict = Depends(export_filters),
+    user=Depends(require_role("admin", "investigator")),
+):
+    """Every red flag raised on a matching tender."""
+    return _export_response("red-flags", format, filters)
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql.functions import count
 
+from app.core.config import settings
 from app.core.dependencies import PaginationParams, get_db, require_permission
 from app.models.audit_log_model import AuditLog
 from app.enums import AuditAction
@@ -36,12 +37,13 @@ async def list_audit_logs(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("manage_users")),
 ):
-    # ── Base query ─────────────────────────────────
-    query = select(AuditLog).options(joinedload(AuditLog.user))
     # ── Filters ────────────────────────────────────
+    # performed_at bounds go straight onto the partition key so PostgreSQL
+    # only scans the monthly partitions they overlap.
+    filters = []
     if action:
         try:
-            query = query.where(AuditLog.action == AuditAction(action))
+            filters.append(AuditLog.action == AuditAction(action))
         except ValueError:
             return PaginatedResponse(
                 items=[],
@@ -51,20 +53,30 @@ async def list_audit_logs(
                 pages=0,
             )
     if entity_type:
-        query = query.where(AuditLog.entity_type == entity_type)
+        filters.append(AuditLog.entity_type == entity_type)
     if user_id:
-        query = query.where(AuditLog.user_id == user_id)
+        filters.append(AuditLog.user_id == user_id)
     if from_date:
-        query = query.where(AuditLog.performed_at >= from_date)
+        filters.append(AuditLog.performed_at >= from_date)
     if to_date:
-        query = query.where(AuditLog.performed_at <= to_date)
+        filters.append(AuditLog.performed_at <= to_date)
     # ── Count query ────────────────────────────────
-    count_query = select(count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    # Counts stop at AUDIT_LOG_COUNT_LIMIT — an exact count of a wide filter
+    # would scan every matching row of a very large table. One row past the
+    # limit tells a capped count from an exact one.
+    count_limit = settings.AUDIT_LOG_COUNT_LIMIT
+    count_query = select(count()).select_from(
+        select(AuditLog.id).where(*filters).limit(count_limit + 1).subquery()
+    )
+    total = (await db.execute(count_query)).scalar_one()
+    total_is_capped = total > count_limit
+    total = min(total, count_limit)
     # ── Pagination ─────────────────────────────────
     query = (
-        query.order_by(AuditLog.performed_at.desc())
+        select(AuditLog)
+        .options(joinedload(AuditLog.user))
+        .where(*filters)
+        .order_by(AuditLog.performed_at.desc())
         .offset(pagination.offset)
         .limit(pagination.page_size)
     )
@@ -93,4 +105,5 @@ async def list_audit_logs(
         page=pagination.page,
         page_size=pagination.page_size,
         pages=-(-total // pagination.page_size) if total else 0,
+        total_is_capped=total_is_capped,
     )
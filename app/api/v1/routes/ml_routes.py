@@ -7,9 +7,13 @@ ML Management routes:
   POST /api/ml/train/collusion-vectorizer
   POST /api/ml/train/supplier-rf
   POST /api/ml/train/supplier-if
+  GET  /api/ml/jobs
+  GET  /api/ml/jobs/{job_id}
+  POST /api/ml/backfill/ghost-probability
   GET  /api/ml/spending-forecast/{entity_id}
 """
 
+from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -20,10 +24,12 @@ from app.core.database import get_db
 from app.core.dependencies import require_role
 from app.models.contract_model import Contract
 from app.models.procuring_entity_model import ProcuringEntity
-from app.services.ml_service import (
-    get_model_status,
-    train_supplier_if,
-    train_supplier_rf,
+from app.services.ml_service import TRAINING_RUNNERS, get_model_status
+from app.services.supplier_ghost_service import schedule_ghost_backfill
+from app.services.training_job_service import (
+    get_job,
+    list_jobs,
+    submit_training_job,
 )
 
 router = APIRouter(prefix="/ml", tags=["ML Models"])
@@ -87,141 +93,76 @@ async def model_performance():
 
 
 # ── Training endpoints ─────────────────────────────────────────────────────────
+#
+# Every /train/* endpoint queues a background job and returns 202 with the job
+# id. Poll GET /ml/jobs/{job_id} for stage, progress and the final result —
+# job state is stored with the weights, so any worker can answer the poll.
 
 
-@router.post("/train/xgboost-synthetic")
-async def train_xgboost_synthetic(user=Depends(require_role("admin"))):
+def _queue_training(model_id: str) -> dict:
     try:
-        from app.ml.xgb_risk_model import train_with_synthetic_data
+        job = submit_training_job(model_id, TRAINING_RUNNERS[model_id])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {
+        "job_id": job["id"],
+        "model_id": model_id,
+        "status": job["status"],
+        "status_url": f"/api/v1/ml/jobs/{job['id']}",
+    }
 
-        train_with_synthetic_data()
-        return {
-            "status": "success",
-            "message": "XGBoost trained on 500 synthetic records",
-        }
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=f"xgboost not installed: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/train/xgboost-synthetic", status_code=202)
+async def train_xgboost_synthetic(user=Depends(require_role("admin"))):
+    return _queue_training("xgboost_risk_model")
 
-@router.post("/train/price-anomaly")
-async def train_price_anomaly(
-    user=Depends(require_role("admin")),
-    db: AsyncSession = Depends(get_db),
-):
-    from app.models.price_benchmark_model import PriceBenchmark
-    from app.models.tender_model import Tender
 
-    result = await db.execute(
-        select(Tender).filter(
-            Tender.estimated_value.isnot(None),
-            Tender.category.isnot(None),
-        )
-    )
-    tenders = result.scalars().all()
+@router.post("/train/price-anomaly", status_code=202)
+async def train_price_anomaly(user=Depends(require_role("admin"))):
+    return _queue_training("price_anomaly_isolation_forest")
 
-    if len(tenders) < 50:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Need at least 50 tenders. Currently have {len(tenders)}.",
-        )
 
-    records = []
-    for t in tenders:
-        bench_result = await db.execute(
-            select(PriceBenchmark).filter(
-                PriceBenchmark.category.ilike(f"%{t.category}%")
-            )
-        )
-        bench = bench_result.scalars().first()
-        if bench:
-            records.append(
-                {
-                    "price": t.estimated_value,
-                    "benchmark_avg": bench.avg_price,
-                    "estimated_value": t.estimated_value,
-                    "category": t.category,
-                    "county": t.county,
-                }
-            )
-
-    if len(records) < 30:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Only {len(records)} tenders matched benchmarks. Need 30+.",
-        )
+@router.post("/train/collusion-vectorizer", status_code=202)
+async def train_collusion_vectorizer(user=Depends(require_role("admin"))):
+    return _queue_training("collusion_tfidf_vectorizer")
 
-    try:
-        from app.ml.price_anomaly import train
 
-        train(records)
-        return {"status": "success", "records_used": len(records)}
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=f"sklearn not installed: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.post("/train/supplier-rf", status_code=202)
+async def train_supplier_rf_route(user=Depends(require_role("admin"))):
+    return _queue_training("supplier_random_forest")
 
 
-@router.post("/train/collusion-vectorizer")
-async def train_collusion_vectorizer(
-    user=Depends(require_role("admin")),
-    db: AsyncSession = Depends(get_db),
-):
-    from app.models.bid_model import Bid
+@router.post("/train/supplier-if", status_code=202)
+async def train_supplier_if_route(user=Depends(require_role("admin"))):
+    return _queue_training("supplier_isolation_forest")
 
-    result = await db.execute(select(Bid).filter(Bid.proposal_text.isnot(None)))
-    bids = result.scalars().all()
-    texts = [
-        b.proposal_text for b in bids if b.proposal_text and len(b.proposal_text) > 50
-    ]
 
-    if len(texts) < 20:
-        raise HTTPException(
-            status_code=400, detail=f"Need 20+ bid texts. Have {len(texts)}."
-        )
+# ── Training jobs ──────────────────────────────────────────────────────────────
 
-    try:
-        from app.ml.collusion import fit_vectorizer
-
-        fit_vectorizer(texts)
-        return {"status": "success", "texts_used": len(texts)}
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-
-@router.post("/train/supplier-rf")
-async def train_supplier_rf_route(
+@router.get("/jobs")
+async def list_training_jobs(
+    model_id: Optional[str] = None,
     user=Depends(require_role("admin")),
-    db: AsyncSession = Depends(get_db),
 ):
-    try:
-        result = await train_supplier_rf(db)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=f"sklearn not installed: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Recent training jobs, newest first."""
+    return {"items": list_jobs(model_id)}
 
 
-@router.post("/train/supplier-if")
-async def train_supplier_if_route(
-    user=Depends(require_role("admin")),
-    db: AsyncSession = Depends(get_db),
-):
-    try:
-        result = await train_supplier_if(db)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=f"sklearn not installed: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/jobs/{job_id}")
+async def get_training_job(job_id: str, user=Depends(require_role("admin"))):
+    """Status, stage and progress (0-1) of a single training job."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job
+
+
+@router.post("/backfill/ghost-probability", status_code=202)
+async def backfill_ghost_probability(user=Depends(require_role("admin"))):
+    """Recompute Supplier.ghost_probability for every stale supplier."""
+    schedule_ghost_backfill(delay=0)
+    return {"status": "queued"}
 
 
 # ── Spending forecast ──────────────────────────────────────────────────────────
@@ -296,6 +237,7 @@ async def analyse_tender_collusion(
         return {"tender_id": str(tender_id), "message": "Need at least 2 bids"}
 
     from app.ml.collusion import detect_bid_collusion
+    from app.services.supplier_network_service import get_supplier_network
 
     bids_data = [
         {
@@ -305,7 +247,8 @@ async def analyse_tender_collusion(
         }
         for b in bids
     ]
-    result = detect_bid_collusion(bids_data, tender.description)
+    network = await get_supplier_network(db)
+    result = detect_bid_collusion(bids_data, tender.description, network)
     result["tender_id"] = str(tender_id)
     result["bid_count"] = len(bids)
     return result
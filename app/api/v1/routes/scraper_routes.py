@@ -0,0 +1,38 @@
+"""
+Scraper routes:
+  POST /api/scraper/run      start an incremental crawl (runs in background)
+  GET  /api/scraper/status   last run per source
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.dependencies import require_role
+from app.services.scraper_service import get_scrape_status, start_scrape
+
+router = APIRouter(prefix="/scraper", tags=["Scraper"])
+
+
+@router.post("/run", status_code=202)
+async def run_scraper(
+    source: str = Query("ppip"),
+    score: bool = Query(False, description="Score inserted tenders after loading"),
+    max_pages: Optional[int] = Query(None, ge=1),
+    user=Depends(require_role("admin")),
+):
+    try:
+        run = start_scrape(source, score=score, max_pages=max_pages)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown scraper source '{source}'")
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {**run, "status_url": f"/api/v1/scraper/status?source={source}"}
+
+
+@router.get("/status")
+async def scraper_status(
+    source: Optional[str] = None,
+    user=Depends(require_role("admin")),
+):
+    return get_scrape_status(source)
@@ -2,18 +2,21 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-import asyncio
 from fastapi import APIRouter, Depends, Query
-from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from functools import partial
 
+from app.api.v1.serializers import DIRECTOR, RowSerializer
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, require_role
+from app.core.dependencies import conditional_get, get_current_user, require_role
+from app.core.fast_json import FastJSONResponse
 from app.models.user_model import User
 from app.models.supplier_model import Supplier
 from app.schemas.supplier_schema import SupplierCreate
 from app.services.supplier_checker_service import compute_supplier_score
+from app.services.rescore_tracker_service import track_supplier_change
+from app.services.supplier_ghost_service import backfill_ghost_probabilities
+from app.services.supplier_network_service import get_supplier_network
 from app.services.supplier_service import (
     delete_supplier,
     get_supplier_by_id,
@@ -24,23 +27,11 @@ from app.services.supplier_service import (
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
 
-async def _ghost_prob(supplier: Supplier) -> float:
-    try:
-        from app.ml.supplier_risk import predict as ml_supplier
-
-        kwargs = dict(
-            company_age_days=supplier.company_age_days,
-            tax_filings_count=supplier.tax_filings_count,
-            directors=supplier.directors or [],
-            has_physical_address=supplier.has_physical_address,
-            has_online_presence=supplier.has_online_presence,
-            past_contracts_count=supplier.past_contracts_count,
-            past_contracts_value=supplier.past_contracts_value,
-        )
-        r = await run_in_threadpool(partial(ml_supplier, **kwargs))
-        return round(r.get("ghost_probability") or r["combined_score"] / 100, 4)
-    except Exception:
-        return round(min((supplier.risk_score or 0) / 100, 1.0), 4)
+def _ghost_prob(supplier: Supplier) -> float:
+    """Persisted ghost probability; risk_score-derived until the backfill runs."""
+    if supplier.ghost_probability is not None:
+        return supplier.ghost_probability
+    return round(min((supplier.risk_score or 0) / 100, 1.0), 4)
 
 
 def _risk_level(score: Optional[float]) -> str:
@@ -55,19 +46,57 @@ def _risk_level(score: Optional[float]) -> str:
     return "low"
 
 
-def serialize_director(d) -> dict:
+async def _director_network(db: AsyncSession, supplier_id: UUID) -> dict:
+    """Suppliers sharing directors with this one, from the in-memory index."""
+    network = await get_supplier_network(db)
+    neighbours = network.neighbours(supplier_id)
+    names = {}
+    if neighbours:
+        rows = await db.execute(
+            select(Supplier.id, Supplier.name).filter(
+                Supplier.id.in_([UUID(n) for n in neighbours])
+            )
+        )
+        names = {str(r.id): r.name for r in rows}
     return {
-        "id": str(d.id),
-        "full_name": d.full_name,
-        "national_id": d.national_id,
-        "role_title": d.role_title,
-        "phone": d.phone,
-        "email": d.email,
-        "is_politically_exposed": d.is_politically_exposed,
-        "pep_details": d.pep_details,
+        "degree": len(neighbours),
+        "component_size": len(network.component(supplier_id)),
+        "linked_suppliers": [
+            {
+                "id": n,
+                "name": names.get(n),
+                "shared_directors": network.shared_directors(supplier_id, n),
+            }
+            for n in sorted(neighbours)
+        ],
     }
 
 
+SUPPLIER_LIST = RowSerializer(
+    {
+        "id": "id",
+        "name": "name",
+        "registration_number": "registration_number",
+        "county": "county",
+        "company_age_days": "company_age_days",
+        "tax_filings_count": "tax_filings_count",
+        "risk_score": "risk_score",
+        "is_verified": "is_verified",
+        "is_blacklisted": "is_blacklisted",
+        "directors": ("directors", DIRECTOR.many),
+    },
+    computed={
+        "risk_level": lambda s: _risk_level(s.risk_score),
+        "risk_flags": lambda s: compute_supplier_score(s)["flags"],
+        "ghost_probability": _ghost_prob,
+        "contracts_won": lambda s: len(s.contracts) if s.contracts else 0,
+        "total_value_won": lambda s: (
+            sum(c.contract_value or 0 for c in s.contracts) if s.contracts else 0
+        ),
+    },
+)
+
+
 def serialize_red_flag(rf) -> dict:
     return {
         "id": str(rf.id),
@@ -93,7 +122,7 @@ def serialize_contract(c) -> dict:
     }
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, response_class=FastJSONResponse)
 async def list_suppliers_route(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
@@ -103,8 +132,10 @@ async def list_suppliers_route(
     is_blacklisted: Optional[bool] = None,
     min_risk_score: Optional[float] = Query(None),
     risk_level: Optional[str] = Query(None, description="low|medium|high|critical"),
+    sort: str = Query("risk_score", pattern="^(risk_score|ghost_probability)$"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    validators: dict = Depends(conditional_get),
 ):
     suppliers, total = await list_suppliers(
         db,
@@ -114,42 +145,21 @@ async def list_suppliers_route(
         is_blacklisted=is_blacklisted,
         min_risk_score=min_risk_score,
         risk_level=risk_level,
+        sort=sort,
         page=page,
         limit=limit,
     )
 
-    ghost_probs = await asyncio.gather(*[_ghost_prob(s) for s in suppliers])
-
-    items = [
+    return FastJSONResponse(
         {
-            "id": str(s.id),
-            "name": s.name,
-            "registration_number": s.registration_number,
-            "county": s.county,
-            "company_age_days": s.company_age_days,
-            "tax_filings_count": s.tax_filings_count,
-            "risk_score": s.risk_score,
-            "risk_level": _risk_level(s.risk_score),
-            "risk_flags": compute_supplier_score(s)["flags"],
-            "ghost_probability": gp,
-            "is_verified": s.is_verified,
-            "is_blacklisted": s.is_blacklisted,
-            "directors": [serialize_director(d) for d in (s.directors or [])],
-            "contracts_won": len(s.contracts) if s.contracts else 0,
-            "total_value_won": (
-                sum(c.contract_value or 0 for c in s.contracts) if s.contracts else 0
-            ),
-        }
-        for s, gp in zip(suppliers, ghost_probs)
-    ]
-
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pages": (total + limit - 1) // limit,
-    }
+            "items": SUPPLIER_LIST.many(suppliers),
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit,
+        },
+        headers=validators,
+    )
 
 
 @router.get("/{supplier_id}", response_model=dict)
@@ -161,6 +171,7 @@ async def get_supplier_route(
     supplier = await get_supplier_by_id(db, supplier_id)
     red_flags = await get_supplier_red_flags(db, supplier_id)
     risk_result = compute_supplier_score(supplier)
+    director_network = await _director_network(db, supplier.id)
 
     return {
         "id": str(supplier.id),
@@ -185,20 +196,22 @@ async def get_supplier_route(
         "past_contracts_value": supplier.past_contracts_value,
         "risk_score": supplier.risk_score,
         "risk_level": _risk_level(supplier.risk_score),
-        "ghost_probability": await _ghost_prob(supplier),
+        "ghost_probability": _ghost_prob(supplier),
+        "ghost_model_version": supplier.model_version,
         "risk_flags": risk_result["flags"],
         "is_verified": supplier.is_verified,
         "is_blacklisted": supplier.is_blacklisted,
         "verification_status": supplier.verification_status,
         "verification_notes": supplier.verification_notes,
         "blacklist_reason": supplier.blacklist_reason,
-        "directors": [serialize_director(d) for d in (supplier.directors or [])],
+        "directors": DIRECTOR.many(supplier.directors),
         "contracts_won": len(supplier.contracts) if supplier.contracts else 0,
         "total_value_won": (
             sum(c.contract_value or 0 for c in supplier.contracts) if supplier.contracts else 0
         ),
         "contracts": [serialize_contract(c) for c in (supplier.contracts or [])],
         "red_flags": [serialize_red_flag(rf) for rf in red_flags],
+        "director_network": director_network,
         "created_at": supplier.created_at.isoformat(),
         "updated_at": supplier.updated_at.isoformat(),
     }
@@ -243,8 +256,16 @@ async def refresh_supplier_risk(
     risk_result = compute_supplier_score(supplier)
     supplier.risk_score = risk_result["score"]
     await db.commit()
+    ghost = await backfill_ghost_probabilities(supplier_ids=[supplier.id])
+    await db.refresh(supplier)
+    track_supplier_change(supplier.id)  # rescore its tenders if their inputs moved
 
-    return {"risk_score": risk_result["score"], "flags": risk_result["flags"]}
+    return {
+        "risk_score": risk_result["score"],
+        "flags": risk_result["flags"],
+        "ghost_probability": supplier.ghost_probability,
+        "ghost_model_version": ghost["model_version"],
+    }
 
 
 @router.delete("/{supplier_id}", status_code=204)
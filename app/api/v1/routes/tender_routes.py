@@ -1,27 +1,45 @@
-from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from sqlalchemy import asc, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.sql.functions import count
 
+from app.api.v1.serializers import TENDER_LIST
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, require_role
+from app.core.dependencies import conditional_get, get_current_user, require_role
+from app.core.fast_json import FastJSONResponse
+from app.core.sse import sse_response
+from app.models.loader_profiles import load_profile
 from app.models.user_model import User
 from app.models.risk_score_model import RiskScore
-from app.models.supplier_model import Supplier
 from app.models.tender_model import Tender
-from app.schemas.tender_schema import TenderCreate
-from app.services.risk_engine_service import compute_and_save_risk
+from app.schemas.tender_schema import TenderCreate, TenderRescoreRequest
+from app.services.investigation_package_service import (
+    cached_package,
+    load_package_inputs,
+    package_response,
+    save_package,
+    stream_package,
+)
+from app.services.rescoring_service import rescore_tenders
+from app.services.risk_engine_service import compute_and_save_risk, rescore_if_changed
+from app.services.risk_fingerprint_service import load_scoring_inputs
+from app.services.tender_detail_service import get_tender_detail
+from app.services.tender_ingest_service import (
+    INGEST_FORMATS,
+    BulkTenderIngestor,
+    iter_lines,
+    score_ingested_tenders,
+)
+from app.services.tender_service import apply_tender_filters
 from app.services.tender_service import create_tender as create_tender_service
 
 router = APIRouter(prefix="/tenders", tags=["Tenders"])
 
 
-@router.get("", response_model=dict)
+@router.get("", response_model=dict, response_class=FastJSONResponse)
 async def list_tenders(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
@@ -41,52 +59,23 @@ async def list_tenders(
     search: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    validators: dict = Depends(conditional_get),
 ):
     """List tenders with filters, sorting, and pagination. Protected endpoint."""
 
-    base_query = select(Tender)
-
-    # ── Filters ────────────────────────────────────────────────────────────────
-    if county:
-        base_query = base_query.filter(Tender.county.ilike(f"%{county}%"))
-    if category:
-        base_query = base_query.filter(Tender.category.ilike(f"%{category}%"))
-    if status:
-        base_query = base_query.filter(Tender.status == status)
-    if procurement_method:
-        base_query = base_query.filter(Tender.procurement_method == procurement_method)
-    if min_value is not None:
-        base_query = base_query.filter(Tender.estimated_value >= min_value)
-    if max_value is not None:
-        base_query = base_query.filter(Tender.estimated_value <= max_value)
-    if date_from:
-        try:
-            base_query = base_query.filter(
-                Tender.created_at >= datetime.fromisoformat(date_from)
-            )
-        except ValueError:
-            raise HTTPException(
-                status_code=400, detail=f"Invalid date_from format: {date_from!r}"
-            )
-    if date_to:
-        try:
-            base_query = base_query.filter(
-                Tender.created_at <= datetime.fromisoformat(date_to)
-            )
-        except ValueError:
-            raise HTTPException(
-                status_code=400, detail=f"Invalid date_to format: {date_to!r}"
-            )
-    if search:
-        base_query = base_query.filter(
-            Tender.title.ilike(f"%{search}%")
-            | Tender.description.ilike(f"%{search}%")
-            | Tender.reference_number.ilike(f"%{search}%")
-        )
-    if risk_level:
-        base_query = base_query.join(
-            RiskScore, RiskScore.tender_id == Tender.id
-        ).filter(RiskScore.risk_level == risk_level)
+    base_query = apply_tender_filters(
+        select(Tender),
+        county=county,
+        category=category,
+        status=status,
+        procurement_method=procurement_method,
+        min_value=min_value,
+        max_value=max_value,
+        date_from=date_from,
+        date_to=date_to,
+        search=search,
+        risk_level=risk_level,
+    )
 
     # ── Sorting ────────────────────────────────────────────────────────────────
     order_fn = desc if sort_order == "desc" else asc
@@ -107,112 +96,22 @@ async def list_tenders(
 
     # ── Data fetch ─────────────────────────────────────────────────────────────
     data_query = (
-        base_query.options(
-            joinedload(Tender.entity),
-            selectinload(Tender.risk_score),
-            selectinload(Tender.red_flags),
-            selectinload(Tender.bids),
-            selectinload(Tender.documents),
-        )
+        base_query.options(*load_profile(Tender, "list"))
         .offset((page - 1) * limit)
         .limit(limit)
     )
     tenders = (await db.execute(data_query)).unique().scalars().all()
 
-    # ── Serialisers ────────────────────────────────────────────────────────────
-    def serialize_entity(e) -> dict | None:
-        if not e:
-            return None
-        return {
-            "id": str(e.id),
-            "name": e.name,
-            "type": e.entity_type,
-            "county": e.county,
-            "contact_email": e.contact_email,
-        }
-
-    def serialize_risk_score(rs) -> dict | None:
-        if not rs:
-            return None
-        return {
-            "id": str(rs.id),
-            "total_score": rs.total_score,
-            "risk_level": rs.risk_level.value if hasattr(rs.risk_level, "value") else rs.risk_level,
-            "price_score": rs.price_score,
-            "supplier_score": rs.supplier_score,
-            "spec_score": rs.spec_score,
-            "collusion_score": rs.collusion_score,
-            "ai_analysis": rs.ai_analysis,
-            "computed_at": rs.computed_at.isoformat() if rs.computed_at else None,
-        }
-
-    def serialize_red_flag(rf) -> dict:
-        return {
-            "id": str(rf.id),
-            "flag_type": rf.flag_type,
-            "severity": rf.severity,
-            "description": rf.description,
-            "evidence": rf.evidence,
-            "created_at": rf.created_at.isoformat(),
-        }
-
-    def serialize_bid(b) -> dict:
-        return {
-            "id": str(b.id),
-            "supplier_id": str(b.supplier_id),
-            "amount": b.bid_amount,
-            "currency": b.currency,
-            "status": b.status,
-            "is_winner": b.is_winner,
-            "submitted_at": b.submitted_at.isoformat() if b.submitted_at else None,
-        }
-
-    def serialize_document(d) -> dict:
-        return {
-            "id": str(d.id),
-            "title": d.title,
-            "document_type": d.document_type,
-            "file_url": d.file_url,
-            "file_size": d.file_size,
-            "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None,
-        }
-
-    # ── Build response items ───────────────────────────────────────────────────
-    items = [
+    return FastJSONResponse(
         {
-            "id": str(t.id),
-            "reference_number": t.reference_number,
-            "title": t.title,
-            "description": t.description,
-            "category": t.category,
-            "county": t.county,
-            "estimated_value": t.estimated_value,
-            "currency": t.currency,
-            "procurement_method": t.procurement_method,
-            "status": t.status,
-            "submission_deadline": (
-                t.submission_deadline.isoformat() if t.submission_deadline else None
-            ),
-            "opening_date": t.opening_date.isoformat() if t.opening_date else None,
-            "created_at": t.created_at.isoformat(),
-            "updated_at": t.updated_at.isoformat(),
-            "source_url": t.source_url,
-            "source": t.source,
-            "entity": serialize_entity(t.entity),
-            "risk_score": serialize_risk_score(t.risk_score),
-            "red_flags": [serialize_red_flag(rf) for rf in t.red_flags],
-            "bids": [serialize_bid(b) for b in t.bids],
-            "documents": [serialize_document(d) for d in t.documents],
-        }
-        for t in tenders
-    ]
-    return {
-        "items": items,
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pages": (total + limit - 1) // limit,
-    }
+            "items": TENDER_LIST.many(tenders),
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pages": (total + limit - 1) // limit,
+        },
+        headers=validators,
+    )
 
 
 @router.get("/{tender_id}", response_model=dict)
@@ -222,111 +121,7 @@ async def get_tender(
     current_user: User = Depends(get_current_user),
 ):
     """Full tender detail with risk score, red flags, bids, and entity."""
-    result = await db.execute(
-        select(Tender)
-        .options(
-            joinedload(Tender.risk_score),
-            joinedload(Tender.red_flags),
-            joinedload(Tender.bids),
-            joinedload(Tender.contract),
-            joinedload(Tender.entity),
-        )
-        .filter(Tender.id == tender_id)
-    )
-    tender = result.unique().scalar_one_or_none()
-
-    if not tender:
-        raise HTTPException(status_code=404, detail="Tender not found")
-
-    # Enrich bids with supplier names
-    bids_out = []
-    if tender.bids:
-        supplier_ids = [b.supplier_id for b in tender.bids]
-        suppliers_result = await db.execute(select(Supplier).filter(Supplier.id.in_(supplier_ids)))
-        suppliers_map = {s.id: s.name for s in suppliers_result.scalars().all()}
-        for b in tender.bids:
-            bids_out.append(
-                {
-                    "id": str(b.id),
-                    "supplier_id": str(b.supplier_id),
-                    "supplier_name": suppliers_map.get(b.supplier_id),
-                    "bid_amount": b.bid_amount,
-                    "is_winner": b.is_winner,
-                    "similarity_score": b.similarity_score,
-                    "proposal_text": b.proposal_text,
-                }
-            )
-
-    return {
-        "id": str(tender.id),
-        "reference_number": tender.reference_number,
-        "title": tender.title,
-        "description": tender.description,
-        "category": tender.category,
-        "estimated_value": tender.estimated_value,
-        "currency": tender.currency or "KES",
-        "county": tender.county,
-        "procurement_method": tender.procurement_method,
-        "status": tender.status,
-        "submission_deadline": (
-            tender.submission_deadline.isoformat()
-            if tender.submission_deadline
-            else None
-        ),
-        "source_url": tender.source_url,
-        "created_at": tender.created_at.isoformat(),
-        "entity": (
-            {
-                "id": str(tender.entity.id),
-                "name": tender.entity.name,
-                "county": tender.entity.county,
-                "corruption_history_score": tender.entity.corruption_history_score,
-            }
-            if tender.entity
-            else None
-        ),
-        "risk_score": (
-            {
-                "total_score": tender.risk_score.total_score,
-                "risk_level": tender.risk_score.risk_level.value if hasattr(tender.risk_score.risk_level, "value") else tender.risk_score.risk_level,
-                "price_score": tender.risk_score.price_score,
-                "supplier_score": tender.risk_score.supplier_score,
-                "spec_score": tender.risk_score.spec_score,
-                "contract_value_score": tender.risk_score.contract_value_score,
-                "entity_history_score": tender.risk_score.entity_history_score,
-                "flags": tender.risk_score.flags,
-                "ai_analysis": tender.risk_score.ai_analysis,
-                "recommended_action": tender.risk_score.recommended_action,
-                "computed_at": tender.risk_score.computed_at.isoformat(),
-            }
-            if tender.risk_score
-            else None
-        ),
-        "red_flags": [
-            {
-                "type": f.flag_type,
-                "severity": f.severity,
-                "description": f.description,
-                "evidence": f.evidence,
-            }
-            for f in (tender.red_flags or [])
-        ],
-        "bids": bids_out,
-        "bid_count": len(bids_out),
-        "contract": (
-            {
-                "contract_value": tender.contract.contract_value,
-                "awarded_at": (
-                    tender.contract.awarded_at.isoformat()
-                    if tender.contract.awarded_at
-                    else None
-                ),
-                "value_variation_pct": tender.contract.value_variation_pct,
-            }
-            if tender.contract
-            else None
-        ),
-    }
+    return await get_tender_detail(db, tender_id)
 
 
 @router.post("", response_model=dict, status_code=201)
@@ -342,21 +137,73 @@ async def create_tender(
     return {"id": str(tender.id), "message": "Tender created. Risk analysis queued."}
 
 
+@router.post("/bulk", response_model=dict)
+async def bulk_ingest_tenders(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: str = Query("ndjson", description="ndjson | ocds"),
+    source: str = Query("ppip"),
+    score: bool = Query(False, description="Queue risk scoring for inserted tenders"),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(require_role("admin")),
+):
+    """
+    Bulk-load tenders from an NDJSON body (one tender or OCDS release per
+    line). Duplicates on reference_number are skipped, not rejected.
+    """
+    if format not in INGEST_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(INGEST_FORMATS)}",
+        )
+    ingestor = BulkTenderIngestor(db, source=source, user_id=user.id)
+    summary = await ingestor.ingest(iter_lines(request.stream()), fmt=format)
+    if score and ingestor.inserted_ids:
+        background_tasks.add_task(score_ingested_tenders, ingestor.inserted_ids)
+    return {**summary, "scoring_queued": bool(score and ingestor.inserted_ids)}
+
+
+_RESCORE_SYNC_LIMIT = 500
+
+
+@router.post("/rescore", response_model=dict)
+async def rescore(
+    payload: TenderRescoreRequest,
+    background_tasks: BackgroundTasks,
+    user=Depends(require_role("admin")),
+):
+    """
+    Rescore tenders whose scoring inputs changed (see risk_fingerprint_service).
+    With tender_ids the run is synchronous and returns rescored/skipped counts;
+    without, every tender is checked in the background.
+    """
+    if payload.tender_ids is None:
+        background_tasks.add_task(rescore_tenders, None, payload.force)
+        return {"status": "queued", "force": payload.force}
+    if len(payload.tender_ids) > _RESCORE_SYNC_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {_RESCORE_SYNC_LIMIT} tender_ids per request; omit them to rescore all",
+        )
+    counts = await rescore_tenders(payload.tender_ids, force=payload.force)
+    return {"status": "done", "force": payload.force, **counts}
+
+
 @router.post("/{tender_id}/analyze-risk", response_model=dict)
 async def trigger_risk_analysis(
     tender_id: UUID,
     use_ai: bool = Query(True),
+    force: bool = Query(False, description="Rescore even if the inputs are unchanged"),
     db: AsyncSession = Depends(get_db),
     user=Depends(require_role("admin", "investigator")),
 ):
-    """Manually trigger / refresh risk analysis for a tender."""
+    """
+    Manually trigger / refresh risk analysis for a tender. Skipped when the
+    scoring inputs are unchanged since the last run, unless force=true.
+    """
     result = await db.execute(
         select(Tender)
-        .options(
-            joinedload(Tender.bids),
-            joinedload(Tender.contract),
-            joinedload(Tender.entity),
-        )
+        .options(*load_profile(Tender, "scoring"))
         .filter(Tender.id == tender_id)
     )
     tender = result.unique().scalar_one_or_none()
@@ -364,21 +211,9 @@ async def trigger_risk_analysis(
     if not tender:
         raise HTTPException(status_code=404, detail="Tender not found")
 
-    supplier = None
-    if tender.contract:
-        supplier_result = await db.execute(
-            select(Supplier).filter(Supplier.id == tender.contract.supplier_id)
-        )
-        supplier = supplier_result.scalar_one_or_none()
-    elif tender.bids:
-        winning_bid = next((b for b in tender.bids if b.is_winner), tender.bids[0])
-        supplier_result = await db.execute(
-            select(Supplier).filter(Supplier.id == winning_bid.supplier_id)
-        )
-        supplier = supplier_result.scalar_one_or_none()
-
-    risk_score = await compute_and_save_risk(
-        db, tender, supplier, list(tender.bids or []), use_ai=use_ai, user_id=user.id
+    supplier, bids = await load_scoring_inputs(db, tender)
+    risk_score, rescored = await rescore_if_changed(
+        db, tender, supplier, bids, use_ai=use_ai, force=force, user_id=user.id
     )
 
     return {
@@ -393,88 +228,46 @@ async def trigger_risk_analysis(
         "ai_analysis": risk_score.ai_analysis,
         "recommended_action": risk_score.recommended_action,
         "computed_at": risk_score.computed_at.isoformat(),
+        "rescored": rescored,
     }
 
 
 @router.get("/{tender_id}/investigation-package", response_model=dict)
 async def get_investigation_package(
     tender_id: UUID,
+    refresh: bool = Query(False, description="Regenerate even if a current package is stored"),
     db: AsyncSession = Depends(get_db),
     user=Depends(require_role("admin", "investigator")),
 ):
     """Generate full AI investigation briefing for EACC investigators."""
-    result = await db.execute(
-        select(Tender)
-        .options(
-            joinedload(Tender.risk_score),
-            joinedload(Tender.bids),
-            joinedload(Tender.contract),
-        )
-        .filter(Tender.id == tender_id)
-    )
-    tender = result.unique().scalar_one_or_none()
+    tender, inputs = await load_package_inputs(db, tender_id)
 
-    if not tender:
-        raise HTTPException(status_code=404, detail="Tender not found")
-    if not tender.risk_score:
-        raise HTTPException(
-            status_code=400,
-            detail="Run risk analysis first before generating investigation package",
+    package_md = None if refresh else cached_package(tender.risk_score)
+    if package_md is not None:
+        return package_response(
+            tender, package_md, tender.risk_score.investigation_package_at, cached=True
         )
 
-    supplier = None
-    if tender.contract:
-        supplier_result = await db.execute(
-            select(Supplier).filter(Supplier.id == tender.contract.supplier_id)
-        )
-        supplier = supplier_result.scalar_one_or_none()
-
     from app.services.ai_service import generate_investigation_package
 
-    package_md = await generate_investigation_package(
-        tender={
-            "title": tender.title,
-            "description": tender.description,
-            "estimated_value": tender.estimated_value,
-            "county": tender.county,
-            "procurement_method": tender.procurement_method,
-            "status": tender.status,
-            "reference_number": tender.reference_number,
-        },
-        risk_score={
-            "total_score": tender.risk_score.total_score,
-            "risk_level": tender.risk_score.risk_level.value if hasattr(tender.risk_score.risk_level, "value") else tender.risk_score.risk_level,
-            "price_score": tender.risk_score.price_score,
-            "supplier_score": tender.risk_score.supplier_score,
-            "spec_score": tender.risk_score.spec_score,
-            "flags": tender.risk_score.flags,
-            "ai_analysis": tender.risk_score.ai_analysis,
-        },
-        supplier=(
-            {
-                "name": supplier.name,
-                "registration_number": supplier.registration_number,
-                "company_age_days": supplier.company_age_days,
-                "tax_filings_count": supplier.tax_filings_count,
-                "directors": supplier.directors,
-                "risk_score": supplier.risk_score,
-            }
-            if supplier
-            else None
-        ),
-        bids=[
-            {"bid_amount": b.bid_amount, "is_winner": b.is_winner}
-            for b in (tender.bids or [])
-        ],
-    )
+    package_md = await generate_investigation_package(**inputs)
+    generated_at = await save_package(tender.risk_score.id, package_md)
+    return package_response(tender, package_md, generated_at, cached=False)
 
-    return {
-        "tender_id": str(tender_id),
-        "tender_title": tender.title,
-        "reference_number": tender.reference_number,
-        "package_markdown": package_md,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-    }
+
+@router.get("/{tender_id}/investigation-package/stream")
+async def stream_investigation_package(
+    tender_id: UUID,
+    refresh: bool = Query(False, description="Regenerate even if a current package is stored"),
+    db: AsyncSession = Depends(get_db),
+    user=Depends(require_role("admin", "investigator")),
+):
+    """
+    Same briefing as /investigation-package, streamed as Server-Sent Events
+    (start → delta… → done | error) while Claude writes it.
+    """
+    tender, inputs = await load_package_inputs(db, tender_id)
+    return sse_response(stream_package(tender, inputs, refresh=refresh))
 
 
 async def _run_risk_in_background(tender_id: UUID):
@@ -487,13 +280,14 @@ async def _run_risk_in_background(tender_id: UUID):
         try:
             result = await db.execute(
                 select(Tender)
-                .options(joinedload(Tender.bids), joinedload(Tender.entity))
+                .options(*load_profile(Tender, "scoring"))
                 .filter(Tender.id == tender_id)
             )
             tender = result.unique().scalar_one_or_none()
             if tender:
+                supplier, bids = await load_scoring_inputs(db, tender)
                 # Disable AI to prevent unhandled Anthropic API failures
-                await compute_and_save_risk(db, tender, use_ai=False)
+                await compute_and_save_risk(db, tender, supplier, bids, use_ai=False)
             await db.commit()
         except Exception as e:
             await db.rollback()
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import desc, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -10,6 +11,10 @@ from app.core.dependencies import require_role
 from app.models.tender_model import Tender
 from app.models.whistleblower_report_model import WhistleblowerReport
 from app.schemas.whistleblower_schema import WhistleblowerCreate
+from app.services.whistleblower_triage_service import (
+    new_tracking_code,
+    notify_new_report,
+)
 
 router = APIRouter(prefix="/whistleblower", tags=["Whistleblower"])
 
@@ -21,73 +26,70 @@ async def submit_report(
 ):
     """
     Anonymous whistleblower report submission. No authentication required.
-    AI triages the report immediately on submission.
+    The report is stored immediately; AI triage runs afterwards in the
+    background queue (services/whistleblower_triage_service.py).
     """
-    # Resolve tender title if tender_id provided
-    related_tender_title = None
-    if payload.tender_id:
-        result = await db.execute(select(Tender).filter(Tender.id == payload.tender_id))
-        tender = result.scalars().first()
-        related_tender_title = tender.title if tender else None
-
-    # AI triage
-    credibility_score = None
-    triage_summary = None
-    urgency = "medium"
-    is_credible = False
-    allegation_type = payload.allegation_type or "other"
-    identity_risk = "low"
-    corroborating_evidence_needed = []
-
-    try:
-        from app.services.ai_service import triage_whistleblower_report
-
-        triage_result = await triage_whistleblower_report(
-            payload.description,
-            related_tender_title,
+    for attempt in range(3):
+        report = WhistleblowerReport(
+            tender_id=payload.tender_id,
+            tender_reference=payload.tender_reference,
+            report_text=payload.description,  # ← description → report_text
+            allegation_type=payload.allegation_type or "other",
+            entity_name=payload.entity_name,
+            evidence_description=payload.evidence_description,
+            tracking_code=new_tracking_code(),
+            triage_status="pending",
         )
-        credibility_score = triage_result.get("credibility_score")
-        triage_summary = triage_result.get("triage_summary")
-        urgency = triage_result.get("urgency", "medium")
-        is_credible = triage_result.get("is_credible", False)
-        allegation_type = triage_result.get("allegation_type", allegation_type)
-        identity_risk = triage_result.get("identity_risk", "low")
-        corroborating_evidence_needed = triage_result.get(
-            "corroborating_evidence_needed", []
-        )
-    except Exception:
-        pass  # AI unavailable — still accept the report
-
-    # Save — map form fields to model columns correctly
-    report = WhistleblowerReport(
-        tender_id=payload.tender_id,
-        tender_reference=payload.tender_reference,  # ← now saved
-        report_text=payload.description,  # ← description → report_text
-        allegation_type=allegation_type,
-        entity_name=payload.entity_name,  # ← now saved
-        evidence_description=payload.evidence_description,  # ← now saved
-        ai_triage_summary=triage_summary,
-        credibility_score=credibility_score,
-        urgency=urgency,
-        is_credible=is_credible,
-    )
-    db.add(report)
-    await db.commit()
-    await db.refresh(report)
+        db.add(report)
+        try:
+            await db.commit()
+            break
+        except IntegrityError:
+            await db.rollback()
+            if payload.tender_id and not await db.get(Tender, payload.tender_id):
+                raise HTTPException(status_code=404, detail="Tender not found")
+            if attempt == 2:  # tracking code collided three times — give up
+                raise
+    notify_new_report()
 
     return {
         "report_id": str(report.id),
-        "credibility_score": credibility_score,
-        "allegation_type": allegation_type,
-        "urgency": urgency,
-        "triage_summary": triage_summary,
-        "is_credible": is_credible,
-        "identity_risk": identity_risk,
-        "corroborating_evidence_needed": corroborating_evidence_needed,
+        "tracking_code": report.tracking_code,
+        "triage_status": report.triage_status,
+        "status_url": f"/api/v1/whistleblower/status/{report.tracking_code}",
         "message": "Your report has been received securely and anonymously.",
     }
 
 
+@router.get("/status/{tracking_code}", response_model=dict)
+async def report_status(
+    tracking_code: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Reporter-facing status check by tracking code. No authentication required."""
+    result = await db.execute(
+        select(
+            WhistleblowerReport.triage_status,
+            WhistleblowerReport.is_reviewed,
+            WhistleblowerReport.submitted_at,
+        ).filter(WhistleblowerReport.tracking_code == tracking_code.strip().upper())
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if row.is_reviewed:
+        status = "reviewed"
+    elif row.triage_status == "done":
+        status = "awaiting_review"
+    else:
+        status = "received"
+    return {
+        "tracking_code": tracking_code.strip().upper(),
+        "status": status,
+        "submitted_on": row.submitted_at.date().isoformat(),
+    }
+
+
 @router.get("/reports", response_model=dict)
 async def list_reports(
     page: int = Query(1, ge=1),
@@ -95,12 +97,25 @@ async def list_reports(
     is_reviewed: Optional[bool] = Query(None),
     urgency: Optional[str] = Query(None, description="low|medium|high|critical"),
     allegation_type: Optional[str] = Query(None),
+    escalated: Optional[bool] = Query(None),
+    triage_status: Optional[str] = Query(
+        None, description="pending|processing|done|failed|skipped"
+    ),
     db: AsyncSession = Depends(get_db),
     user=Depends(require_role("admin", "investigator")),
 ):
     """List whistleblower reports. Investigators and admins only."""
     base_query = select(WhistleblowerReport)
 
+    if escalated is not None:
+        base_query = base_query.filter(
+            WhistleblowerReport.escalated_at.isnot(None)
+            if escalated
+            else WhistleblowerReport.escalated_at.is_(None)
+        )
+    if triage_status:
+        base_query = base_query.filter(WhistleblowerReport.triage_status == triage_status)
+
     if is_reviewed is not None:
         base_query = base_query.filter(WhistleblowerReport.is_reviewed == is_reviewed)
     if allegation_type:
@@ -116,7 +131,10 @@ async def list_reports(
     )
 
     data_query = (
-        base_query.order_by(desc(WhistleblowerReport.credibility_score))
+        base_query.order_by(
+            WhistleblowerReport.escalated_at.desc().nulls_last(),
+            desc(WhistleblowerReport.credibility_score),
+        )
         .offset((page - 1) * limit)
         .limit(limit)
     )
@@ -135,6 +153,8 @@ async def list_reports(
                 "urgency": r.urgency,
                 "is_reviewed": r.is_reviewed,
                 "is_credible": r.is_credible,
+                "triage_status": r.triage_status,
+                "escalated_at": r.escalated_at.isoformat() if r.escalated_at else None,
                 "submitted_at": r.submitted_at.isoformat(),
             }
             for r in reports
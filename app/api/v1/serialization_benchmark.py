@@ -0,0 +1,357 @@
+"""
+Response build time for the tender and supplier list pages: the previous
+per-route closures + jsonable_encoder + JSONResponse path vs the
+precompiled serializers in app/api/v1/serializers.py + FastJSONResponse.
+
+Run:
+    python -m app.api.v1.serialization_benchmark
+    python -m app.api.v1.serialization_benchmark --sizes 20 100 1000 --repeat 7 --json
+
+Rows are synthetic in-memory objects shaped like the loaded models (each
+tender with 5 bids, 3 red flags and 2 documents; each supplier with 3
+directors and 4 contracts), so the timings are serialization and encoding
+only — no database. "build ms" is dict building + encoding to bytes.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Callable
+
+from app.api.v1.routes.supplier_routes import SUPPLIER_LIST, _ghost_prob, _risk_level
+from app.api.v1.serializers import TENDER_LIST
+from app.core import fast_json
+from app.core.fast_json import FastJSONResponse
+from app.enums import FlagSeverity, RiskLevel
+from app.services.supplier_checker_service import compute_supplier_score
+
+DEFAULT_SIZES = (20, 100, 1000)
+_NOW = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+
+
+# ── Synthetic rows ────────────────────────────────────────────────────────────
+
+
+def _tender(i: int) -> SimpleNamespace:
+    tender_id = uuid.uuid4()
+    created = _NOW - timedelta(hours=i)
+    return SimpleNamespace(
+        id=tender_id,
+        reference_number=f"KE/PROC/{i:06d}",
+        title=f"Supply and delivery of medical equipment lot {i}",
+        description="Supply, delivery, installation and commissioning. " * 4,
+        category="medical",
+        county="Nairobi",
+        estimated_value=2_500_000.0 + i,
+        currency="KES",
+        procurement_method="open_tender",
+        status="open",
+        submission_deadline=created + timedelta(days=21),
+        opening_date=created + timedelta(days=22),
+        created_at=created,
+        updated_at=created,
+        source_url=f"https://tenders.go.ke/tender/{i}",
+        source="ppip",
+        entity=SimpleNamespace(
+            id=uuid.uuid4(),
+            name="Ministry of Health",
+            entity_type="ministry",
+            county="Nairobi",
+            contact_email="procurement@health.go.ke",
+        ),
+        risk_score=SimpleNamespace(
+            id=uuid.uuid4(),
+            total_score=67.5,
+            risk_level=RiskLevel.HIGH,
+            price_score=80.0,
+            supplier_score=55.0,
+            spec_score=40.0,
+            collusion_score=12.5,
+            ai_analysis="Price 3.2x benchmark; winning supplier registered 41 days before.",
+            computed_at=created,
+        ),
+        red_flags=[
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                flag_type="price_inflation",
+                severity=FlagSeverity.HIGH,
+                description="Price deviates 220% from benchmark",
+                evidence={"benchmark": 780_000.0, "deviation_pct": 220.5},
+                created_at=created,
+            )
+            for _ in range(3)
+        ],
+        bids=[
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                supplier_id=uuid.uuid4(),
+                bid_amount=2_400_000.0 + b * 1000,
+                currency="KES",
+                status="submitted",
+                is_winner=b == 0,
+                submitted_at=created + timedelta(days=3),
+            )
+            for b in range(5)
+        ],
+        documents=[
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                filename=f"tender_{i}_spec_{d}.pdf",
+                doc_type="specification",
+                file_path=f"https://res.cloudinary.com/uwazi/tender_{i}_{d}.pdf",
+                file_size_bytes=482_133,
+                created_at=created,
+            )
+            for d in range(2)
+        ],
+    )
+
+
+def _supplier(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name=f"Apex Supplies {i} Ltd",
+        registration_number=f"PVT-{i:08d}",
+        county="Mombasa",
+        company_age_days=40 + i % 900,
+        tax_filings_count=i % 4,
+        risk_score=float(i % 100),
+        ghost_probability=None if i % 3 else 0.42,
+        is_verified=i % 2 == 0,
+        is_blacklisted=False,
+        has_physical_address=i % 5 != 0,
+        has_online_presence=i % 2 == 0,
+        past_contracts_count=i % 7,
+        directors=[
+            SimpleNamespace(
+                id=uuid.uuid4(),
+                full_name=f"Director {i}-{d}",
+                national_id=f"{30_000_000 + i * 3 + d}",
+                role_title="director",
+                phone="+254700000000",
+                email=f"d{d}@apex{i}.co.ke",
+                is_politically_exposed=d == 0 and i % 10 == 0,
+                pep_details=None,
+            )
+            for d in range(3)
+        ],
+        contracts=[SimpleNamespace(contract_value=1_000_000.0 + c) for c in range(4)],
+    )
+
+
+# ── Previous implementation ───────────────────────────────────────────────────
+
+
+def _legacy_tender_page(tenders: list) -> dict:
+    """The list_tenders closures as they were (document attributes corrected)."""
+
+    def serialize_entity(e) -> dict | None:
+        if not e:
+            return None
+        return {
+            "id": str(e.id),
+            "name": e.name,
+            "type": e.entity_type,
+            "county": e.county,
+            "contact_email": e.contact_email,
+        }
+
+    def serialize_risk_score(rs) -> dict | None:
+        if not rs:
+            return None
+        return {
+            "id": str(rs.id),
+            "total_score": rs.total_score,
+            "risk_level": rs.risk_level.value if hasattr(rs.risk_level, "value") else rs.risk_level,
+            "price_score": rs.price_score,
+            "supplier_score": rs.supplier_score,
+            "spec_score": rs.spec_score,
+            "collusion_score": rs.collusion_score,
+            "ai_analysis": rs.ai_analysis,
+            "computed_at": rs.computed_at.isoformat() if rs.computed_at else None,
+        }
+
+    def serialize_red_flag(rf) -> dict:
+        return {
+            "id": str(rf.id),
+            "flag_type": rf.flag_type,
+            "severity": rf.severity,
+            "description": rf.description,
+            "evidence": rf.evidence,
+            "created_at": rf.created_at.isoformat(),
+        }
+
+    def serialize_bid(b) -> dict:
+        return {
+            "id": str(b.id),
+            "supplier_id": str(b.supplier_id),
+            "amount": b.bid_amount,
+            "currency": b.currency,
+            "status": b.status,
+            "is_winner": b.is_winner,
+            "submitted_at": b.submitted_at.isoformat() if b.submitted_at else None,
+        }
+
+    def serialize_document(d) -> dict:
+        return {
+            "id": str(d.id),
+            "title": d.filename,
+            "document_type": d.doc_type,
+            "file_url": d.file_path,
+            "file_size": d.file_size_bytes,
+            "uploaded_at": d.created_at.isoformat() if d.created_at else None,
+        }
+
+    items = [
+        {
+            "id": str(t.id),
+            "reference_number": t.reference_number,
+            "title": t.title,
+            "description": t.description,
+            "category": t.category,
+            "county": t.county,
+            "estimated_value": t.estimated_value,
+            "currency": t.currency,
+            "procurement_method": t.procurement_method,
+            "status": t.status,
+            "submission_deadline": (
+                t.submission_deadline.isoformat() if t.submission_deadline else None
+            ),
+            "opening_date": t.opening_date.isoformat() if t.opening_date else None,
+            "created_at": t.created_at.isoformat(),
+            "updated_at": t.updated_at.isoformat(),
+            "source_url": t.source_url,
+            "source": t.source,
+            "entity": serialize_entity(t.entity),
+            "risk_score": serialize_risk_score(t.risk_score),
+            "red_flags": [serialize_red_flag(rf) for rf in t.red_flags],
+            "bids": [serialize_bid(b) for b in t.bids],
+            "documents": [serialize_document(d) for d in t.documents],
+        }
+        for t in tenders
+    ]
+    return _page(items)
+
+
+def _legacy_supplier_page(suppliers: list) -> dict:
+    def serialize_director(d) -> dict:
+        return {
+            "id": str(d.id),
+            "full_name": d.full_name,
+            "national_id": d.national_id,
+            "role_title": d.role_title,
+            "phone": d.phone,
+            "email": d.email,
+            "is_politically_exposed": d.is_politically_exposed,
+            "pep_details": d.pep_details,
+        }
+
+    items = [
+        {
+            "id": str(s.id),
+            "name": s.name,
+            "registration_number": s.registration_number,
+            "county": s.county,
+            "company_age_days": s.company_age_days,
+            "tax_filings_count": s.tax_filings_count,
+            "risk_score": s.risk_score,
+            "risk_level": _risk_level(s.risk_score),
+            "risk_flags": compute_supplier_score(s)["flags"],
+            "ghost_probability": _ghost_prob(s),
+            "is_verified": s.is_verified,
+            "is_blacklisted": s.is_blacklisted,
+            "directors": [serialize_director(d) for d in (s.directors or [])],
+            "contracts_won": len(s.contracts) if s.contracts else 0,
+            "total_value_won": (
+                sum(c.contract_value or 0 for c in s.contracts) if s.contracts else 0
+            ),
+        }
+        for s in suppliers
+    ]
+    return _page(items)
+
+
+def _page(items: list) -> dict:
+    return {"items": items, "total": len(items), "page": 1, "limit": len(items), "pages": 1}
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+
+def _legacy_render(page: dict) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from starlette.responses import JSONResponse
+
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+def _time(build: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    """Median ms per build, and the body size."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = build()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for size in args.sizes:
+        tenders = [_tender(i) for i in range(size)]
+        suppliers = [_supplier(i) for i in range(size)]
+        cases = {
+            "tenders": (
+                lambda: _legacy_render(_legacy_tender_page(tenders)),
+                lambda: FastJSONResponse(_page(TENDER_LIST.many(tenders))).body,
+            ),
+            "suppliers": (
+                lambda: _legacy_render(_legacy_supplier_page(suppliers)),
+                lambda: FastJSONResponse(_page(SUPPLIER_LIST.many(suppliers))).body,
+            ),
+        }
+        for shape, (legacy, fast) in cases.items():
+            legacy()
+            fast()  # warm up
+            legacy_ms, legacy_bytes = _time(legacy, args.repeat)
+            fast_ms, fast_bytes = _time(fast, args.repeat)
+            results.append(
+                {
+                    "shape": shape,
+                    "rows": size,
+                    "encoder": fast_json.BACKEND,
+                    "legacy_ms": round(legacy_ms, 3),
+                    "fast_ms": round(fast_ms, 3),
+                    "speedup": round(legacy_ms / fast_ms, 2) if fast_ms else None,
+                    "legacy_bytes": legacy_bytes,
+                    "fast_bytes": fast_bytes,
+                }
+            )
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"encoder: {fast_json.BACKEND}")
+        print(f"{'shape':10s} {'rows':>6s} {'legacy ms':>10s} {'fast ms':>9s} {'×':>6s} {'KiB':>8s}")
+        for r in results:
+            print(
+                f"{r['shape']:10s} {r['rows']:6d} {r['legacy_ms']:10.2f} {r['fast_ms']:9.2f}"
+                f" {r['speedup'] or 0:6.1f} {r['fast_bytes'] / 1024:8.1f}"
+            )
@@ -0,0 +1,165 @@
+"""
+Precompiled row serializers for the large list responses.
+
+Each shape is compiled once at import: one attrgetter fetches every column
+of a row in a single C call, and converters run only for the fields that
+need one (nested rows, lists) and only when the value is not None. UUIDs,
+datetimes and enums are left as they are — FastJSONResponse
+(app/core/fast_json) encodes them directly — so a page is built as plain
+dicts and encoded once, without FastAPI's jsonable_encoder walk.
+
+    return FastJSONResponse({"items": TENDER_LIST.many(tenders), ...})
+
+Key names are the API's; the attribute each one reads is the model's.
+`python -m app.api.v1.serialization_benchmark` times these against the
+previous closure + jsonable_encoder path.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional, Union
+
+Field = Union[str, tuple[str, Callable[[Any], Any]]]
+
+
+class RowSerializer:
+    """
+    `fields` maps output key → attribute name, or (attribute, converter).
+    `computed` maps output key → function of the whole row, for values that
+    are not a single column.
+    """
+
+    __slots__ = ("keys", "_get", "_convert", "_computed")
+
+    def __init__(self, fields: dict[str, Field], computed: Optional[dict[str, Callable]] = None):
+        attrs, convert = [], []
+        for i, spec in enumerate(fields.values()):
+            if isinstance(spec, tuple):
+                attr, fn = spec
+                convert.append((i, fn))
+            else:
+                attr = spec
+            attrs.append(attr)
+        self.keys = tuple(fields)
+        getter = attrgetter(*attrs)
+        self._get = getter if len(attrs) > 1 else lambda obj: (getter(obj),)
+        self._convert = tuple(convert)
+        self._computed = tuple((computed or {}).items())
+
+    def __call__(self, obj: Any) -> dict:
+        values = self._get(obj)
+        if self._convert:
+            values = list(values)
+            for i, fn in self._convert:
+                if values[i] is not None:
+                    values[i] = fn(values[i])
+        row = dict(zip(self.keys, values))
+        for key, fn in self._computed:
+            row[key] = fn(obj)
+        return row
+
+    def many(self, objs: Optional[Iterable[Any]]) -> list[dict]:
+        return [self(obj) for obj in objs] if objs else []
+
+
+# ── Tender list ───────────────────────────────────────────────────────────────
+
+ENTITY = RowSerializer(
+    {
+        "id": "id",
+        "name": "name",
+        "type": "entity_type",
+        "county": "county",
+        "contact_email": "contact_email",
+    }
+)
+
+RISK_SCORE = RowSerializer(
+    {
+        "id": "id",
+        "total_score": "total_score",
+        "risk_level": "risk_level",
+        "price_score": "price_score",
+        "supplier_score": "supplier_score",
+        "spec_score": "spec_score",
+        "collusion_score": "collusion_score",
+        "ai_analysis": "ai_analysis",
+        "computed_at": "computed_at",
+    }
+)
+
+RED_FLAG = RowSerializer(
+    {
+        "id": "id",
+        "flag_type": "flag_type",
+        "severity": "severity",
+        "description": "description",
+        "evidence": "evidence",
+        "created_at": "created_at",
+    }
+)
+
+BID = RowSerializer(
+    {
+        "id": "id",
+        "supplier_id": "supplier_id",
+        "amount": "bid_amount",
+        "currency": "currency",
+        "status": "status",
+        "is_winner": "is_winner",
+        "submitted_at": "submitted_at",
+    }
+)
+
+DOCUMENT = RowSerializer(
+    {
+        "id": "id",
+        "title": "filename",
+        "document_type": "doc_type",
+        "file_url": "file_path",
+        "file_size": "file_size_bytes",
+        "uploaded_at": "created_at",
+    }
+)
+
+TENDER_LIST = RowSerializer(
+    {
+        "id": "id",
+        "reference_number": "reference_number",
+        "title": "title",
+        "description": "description",
+        "category": "category",
+        "county": "county",
+        "estimated_value": "estimated_value",
+        "currency": "currency",
+        "procurement_method": "procurement_method",
+        "status": "status",
+        "submission_deadline": "submission_deadline",
+        "opening_date": "opening_date",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+        "source_url": "source_url",
+        "source": "source",
+        "entity": ("entity", ENTITY),
+        "risk_score": ("risk_score", RISK_SCORE),
+        "red_flags": ("red_flags", RED_FLAG.many),
+        "bids": ("bids", BID.many),
+        "documents": ("documents", DOCUMENT.many),
+    }
+)
+
+
+# ── Suppliers ─────────────────────────────────────────────────────────────────
+
+DIRECTOR = RowSerializer(
+    {
+        "id": "id",
+        "full_name": "full_name",
+        "national_id": "national_id",
+        "role_title": "role_title",
+        "phone": "phone",
+        "email": "email",
+        "is_politically_exposed": "is_politically_exposed",
+        "pep_details": "pep_details",
+    }
+)
+
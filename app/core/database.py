@@ -1,7 +1,21 @@
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
+from app.core import sql_stats  # noqa: F401 — registers the engine event listeners
 from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# asyncpg-only option; SQLite (development, python -m app.core.load_test) takes none
+_CONNECT_ARGS = (
+    {} if settings.DATABASE_URL.startswith("sqlite") else {"prepared_statement_cache_size": 0}
+)
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -10,9 +24,7 @@ engine = create_async_engine(
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=60,
-    connect_args={
-        "prepared_statement_cache_size": 0,  # ← must be here, not in pool args
-    },
+    connect_args=_CONNECT_ARGS,  # ← must be here, not in pool args
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -34,3 +46,117 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+# ── Read replica ──────────────────────────────────────────────────────────────
+#
+# Analytics/dashboard aggregations read through get_read_db(). With
+# DATABASE_READ_URL set they run on the replica's own (separately sized)
+# pool; otherwise — or while the replica is unreachable or lagging more than
+# DB_REPLICA_MAX_LAG_SECONDS — they fall back to the primary. Either way the
+# transaction is READ ONLY and rolled back at the end of the request.
+
+read_engine = (
+    create_async_engine(
+        settings.DATABASE_READ_URL,
+        echo=settings.DB_ECHO,
+        future=True,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        connect_args={"prepared_statement_cache_size": 0},
+    ).execution_options(postgresql_readonly=True)
+    if settings.DATABASE_READ_URL
+    else None
+)
+
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+PrimaryReadSessionLocal = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# 0 on a primary or a caught-up standby; replay delay otherwise
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+_replica = {"usable": read_engine is not None, "lag_seconds": None, "error": None, "checked_at": 0.0}
+_replica_lock = asyncio.Lock()
+
+
+async def check_replica() -> dict:
+    """Measure replica lag now and decide whether reads may use it."""
+    if read_engine is None:
+        return replica_status()
+    try:
+        async with asyncio.timeout(5):
+            async with read_engine.connect() as conn:
+                lag = float((await conn.execute(_REPLICA_LAG_SQL)).scalar() or 0)
+        usable = lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        error = None if usable else "lagging"
+    except Exception as exc:
+        lag, usable, error = None, False, str(exc) or type(exc).__name__
+    if usable and not _replica["usable"]:
+        logger.info("Read replica back in rotation", extra={"lag_seconds": lag})
+    elif not usable and _replica["usable"]:
+        logger.warning("Read replica bypassed", extra={"lag_seconds": lag, "error": error})
+    _replica.update(usable=usable, lag_seconds=lag, error=error, checked_at=time.monotonic())
+    return replica_status()
+
+
+def replica_status() -> dict:
+    return {
+        "configured": read_engine is not None,
+        "usable": _replica["usable"],
+        "lag_seconds": _replica["lag_seconds"],
+        "error": _replica["error"],
+    }
+
+
+async def _replica_usable() -> bool:
+    if read_engine is None:
+        return False
+    if time.monotonic() - _replica["checked_at"] >= settings.DB_REPLICA_CHECK_SECONDS:
+        if not _replica_lock.locked():  # one request re-checks; the rest use last result
+            async with _replica_lock:
+                await check_replica()
+    return _replica["usable"]
+
+
+async def _open_read_session() -> AsyncSession:
+    if await _replica_usable():
+        session = ReadSessionLocal()
+        try:
+            await session.connection()  # fail over now rather than mid-query
+            session.info["replica"] = True
+            return session
+        except Exception as exc:
+            await session.close()
+            logger.warning("Read replica bypassed", extra={"error": str(exc)})
+            _replica.update(usable=False, error=str(exc), checked_at=time.monotonic())
+    session = PrimaryReadSessionLocal()
+    session.info["replica"] = False
+    return session
+
+
+async def get_read_db():
+    """Read-only session: replica when healthy, primary otherwise."""
+    session = await _open_read_session()
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
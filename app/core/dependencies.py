@@ -5,23 +5,26 @@ Provides reusable Depends() callables for:
   - Database session injection
   - Current user resolution from JWT
   - Permission-based access guards
+  - Conditional GET (ETag / If-None-Match) for polled read endpoints
   - Pagination parameter parsing
 """
 
+import hashlib
 import uuid
 from typing import Annotated, List
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.security import verify_access_token
+from app.models.loader_profiles import load_profile
 from app.models.user_model import User
 from app.schemas.user_schema import UserResponse
+from app.services.data_version_service import data_version
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -50,10 +53,10 @@ async def get_current_user(
             detail="Invalid or expired token format",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
-    # Fetch user from database with roles eagerly loaded
+    # Fetch user with roles + permissions (require_role / require_permission)
     result = await db.execute(
         select(User)
-        .options(selectinload(User.roles))  # <-- add this
+        .options(*load_profile(User, "auth"))
         .filter(User.id == user_uuid)
     )
     user = result.scalars().first()
@@ -114,6 +117,44 @@ def require_role(*allowed_roles: str):
     return checker
 
 
+# ── Conditional GET ───────────────────────────────────────────────────────────
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) against an If-None-Match list."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(c.strip().removeprefix("W/") == tag for c in if_none_match.split(","))
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+) -> dict[str, str]:
+    """
+    ETag for a polled read endpoint: the data-version token
+    (data_version_service) hashed with the URL. A matching If-None-Match
+    ends the request with 304 before the endpoint's own queries run — after
+    authentication, so a 304 never leaks to an anonymous caller.
+
+    Returns the validator headers; they are already set on the response,
+    routes that build their own Response pass them on.
+    """
+    version = await data_version(db)
+    key = f"{version}|{request.url.path}?{request.url.query}"
+    etag = f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
 # ── Pagination ────────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,55 @@
+"""
+JSON encoding for hot paths (log lines, large responses).
+
+Uses orjson when it is installed — several times faster than the stdlib
+encoder — and falls back to a preconfigured json.JSONEncoder otherwise.
+Output is compact UTF-8 either way, and both encode UUIDs as strings,
+datetimes as ISO 8601 and enums by value, so callers can hand over model
+values as they are. Anything else unknown is rendered with str().
+
+FastJSONResponse renders with it; returning one from a route skips
+FastAPI's jsonable_encoder pass entirely.
+"""
+
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional — pip install orjson
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+_fallback = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+    return _fallback.encode(obj).encode()
+
+
+def dumps_str(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+    return _fallback.encode(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
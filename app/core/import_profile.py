@@ -0,0 +1,145 @@
+"""
+Import-time profile of the API process (a readable `python -X importtime`).
+
+Run:
+    python -m app.core.import_profile                      # import app.main
+    python -m app.core.import_profile --top 40 --json
+    python -m app.core.import_profile --fail-on pandas sklearn xgboost spacy
+
+Imports the target module in a fresh interpreter with -X importtime and
+reports total import time, the slowest modules (cumulative and self) and
+the cost per top-level package. --fail-on exits 1 if any of the listed
+packages is imported at startup — heavy dependencies belong inside the
+functions that use them (see app/core/warmup.py).
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Packages that should only load lazily / during warm-up
+HEAVY_PACKAGES = (
+    "pandas",
+    "numpy",
+    "sklearn",
+    "xgboost",
+    "spacy",
+    "prophet",
+    "pyarrow",
+    "anthropic",
+    "cloudinary",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """-X importtime lines → [{module, self_us, cumulative_us, depth}] in load order."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(
+                {
+                    "module": module,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": (len(indent) - 1) // 2,
+                }
+            )
+    return rows
+
+
+def profile(module: str = "app.main", top: int = 25) -> dict:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not _LINE.match(line)]
+        raise RuntimeError(f"import {module} failed:\n" + "\n".join(errors[-20:]))
+
+    by_package: dict[str, int] = defaultdict(int)
+    for row in rows:
+        by_package[row["module"].split(".")[0]] += row["self_us"]
+    loaded = {row["module"].split(".")[0] for row in rows}
+
+    def ms(us: int) -> float:
+        return round(us / 1000, 2)
+
+    return {
+        "module": module,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": ms(sum(r["cumulative_us"] for r in rows if r["depth"] == 0)),
+        "modules_loaded": len(rows),
+        "heavy_packages_loaded": sorted(loaded & set(HEAVY_PACKAGES)),
+        "packages_loaded": sorted(loaded),
+        "slowest_cumulative": [
+            {"module": r["module"], "ms": ms(r["cumulative_us"])}
+            for r in sorted(rows, key=lambda r: -r["cumulative_us"])[:top]
+        ],
+        "slowest_self": [
+            {"module": r["module"], "ms": ms(r["self_us"])}
+            for r in sorted(rows, key=lambda r: -r["self_us"])[:top]
+        ],
+        "by_package": [
+            {"package": name, "ms": ms(us)}
+            for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]
+        ],
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"import {report['module']}: {report['import_ms']:.1f} ms in imports, "
+        f"{report['wall_ms']:.1f} ms wall, {report['modules_loaded']} modules"
+    )
+    heavy = report["heavy_packages_loaded"]
+    print(f"heavy packages at startup: {', '.join(heavy) if heavy else 'none'}")
+    for title, key, label in (
+        ("Slowest (cumulative)", "slowest_cumulative", "module"),
+        ("Slowest (self)", "slowest_self", "module"),
+        ("By top-level package (self)", "by_package", "package"),
+    ):
+        print(f"\n{title}")
+        for row in report[key]:
+            print(f"  {row['ms']:9.2f} ms  {row[label]}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure import time of the API.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "--fail-on",
+        nargs="*",
+        metavar="PACKAGE",
+        help="Exit 1 if any of these packages is imported (default list if empty)",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = profile(args.module, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+    if args.fail_on is not None:
+        forbidden = set(args.fail_on or HEAVY_PACKAGES)
+        offenders = sorted(forbidden & set(report["packages_loaded"]))
+        if offenders:
+            print(f"\nimported at startup: {', '.join(offenders)}", file=sys.stderr)
+            raise SystemExit(1)
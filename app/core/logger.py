@@ -1,15 +1,24 @@
-"""app/core/logger.py — Structured logging with JSON (prod) and colour (dev)."""
+"""
+app/core/logger.py — Structured logging with JSON (prod) and colour (dev).
 
-import json
+With LOG_QUEUE (default) loggers only enqueue records; a QueueListener
+thread formats and writes them, so a slow stdout never blocks the loop.
+"""
+
+import atexit
+import copy
 import logging
 import logging.config
+import queue
 import sys
 import uuid
 from contextvars import ContextVar
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
 from app.core.config import settings
+from app.core.fast_json import dumps_str
 
 request_id_var: ContextVar[str] = ContextVar("request_id", default="no-request")
 
@@ -53,48 +62,42 @@ def _redact(data: dict) -> dict:
     }
 
 
+# Attributes every LogRecord has — anything else came in through `extra=`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime", "request_id"}
+
+
+def _record_request_id(record: logging.LogRecord) -> str:
+    # set by _ContextQueueHandler when the record crossed to the listener thread
+    return getattr(record, "request_id", None) or get_request_id()
+
+
+def _exception_text(formatter: logging.Formatter, record: logging.LogRecord) -> str | None:
+    if record.exc_info:
+        return formatter.formatException(record.exc_info)
+    return record.exc_text
+
+
 class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         log: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
-            "request_id": get_request_id(),
+            "request_id": _record_request_id(record),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
         }
-        known = {
-            "name",
-            "msg",
-            "args",
-            "levelname",
-            "levelno",
-            "pathname",
-            "filename",
-            "module",
-            "exc_info",
-            "exc_text",
-            "stack_info",
-            "lineno",
-            "funcName",
-            "created",
-            "msecs",
-            "relativeCreated",
-            "thread",
-            "threadName",
-            "processName",
-            "process",
-            "message",
-            "taskName",
-        }
-        extras = {k: record.__dict__[k] for k in set(record.__dict__) - known}
+        extras = {k: v for k, v in record.__dict__.items() if k not in _RECORD_ATTRS}
         if extras:
             log["extra"] = _redact(extras)
-        if record.exc_info:
-            log["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log, default=str)
+        exception = _exception_text(self, record)
+        if exception:
+            log["exception"] = exception
+        return dumps_str(log)
 
 
 _COLOURS = {
@@ -110,14 +113,37 @@ _RESET = "\033[0m"
 class DevFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         c = _COLOURS.get(record.levelname, "")
-        ts = datetime.now(timezone.utc).strftime("%H:%M:%S")
-        rid = get_request_id()[:8]
+        ts = datetime.fromtimestamp(record.created, timezone.utc).strftime("%H:%M:%S")
+        rid = _record_request_id(record)[:8]
         line = f"{c}[{record.levelname.ljust(8)}]{_RESET} {ts} | {rid} | {record.name} | {record.getMessage()}"
-        if record.exc_info:
-            line += "\n" + self.formatException(record.exc_info)
+        exception = _exception_text(self, record)
+        if exception:
+            line += "\n" + exception
         return line
 
 
+class _ContextQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread. Everything the formatters read from
+    the calling context (request id, message args, exception) is resolved
+    here; the JSON encoding and the write happen off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.request_id = get_request_id()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_exc_formatter = logging.Formatter()
+_listener: QueueListener | None = None
+
+
 def _build_config(level: str, json_logs: bool) -> dict:
     fmt = "json" if json_logs else "dev"
     return {
@@ -152,9 +178,36 @@ def _build_config(level: str, json_logs: bool) -> dict:
     }
 
 
+def _start_queue() -> None:
+    """Route every configured logger through one queue to the console handler."""
+    global _listener
+    console = logging.getHandlerByName("console")
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _ContextQueueHandler(log_queue)
+    for name in (None, *_build_config("INFO", False)["loggers"]):
+        configured = logging.getLogger(name)
+        if console in configured.handlers:
+            configured.removeHandler(console)
+            configured.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logging() -> None:
     json_logs = settings.ENVIRONMENT == "production"
+    stop_logging()
     logging.config.dictConfig(_build_config(settings.LOG_LEVEL.upper(), json_logs))
+    if settings.LOG_QUEUE:
+        _start_queue()
     get_logger(__name__).info(
         "Logging initialised",
         extra={"environment": settings.ENVIRONMENT, "json_mode": json_logs},
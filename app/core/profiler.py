@@ -0,0 +1,274 @@
+"""
+Opt-in sampling profiler for single requests.
+
+RequestLoggingMiddleware profiles a request when it carries
+`X-Profile: <PROFILER_TOKEN>`, or at random for a PROFILE_SAMPLE_RATE share
+of traffic. The token is only read from the header: a query string ends up
+in request and proxy access logs. One sampler thread wakes
+every PROFILE_INTERVAL_MS while at least one profile is open and records,
+for every asyncio task created in the request's context:
+
+  [cpu]     the real stack, if the task is running on the event loop
+  [await]   the coroutine await chain, if the task is suspended
+  [thread]  busy worker-thread stacks, while the request awaits
+            run_in_threadpool / to_thread / run_in_executor
+
+Stacks are kept in collapsed ("folded") format — `frame;frame;frame count`
+per line — which flamegraph.pl, inferno and speedscope read directly.
+Finished profiles go into a ring buffer of PROFILE_BUFFER_SIZE entries,
+listed at GET /admin/profiles. Sampled (not explicitly requested) profiles
+shorter than PROFILE_MIN_DURATION_MS are dropped.
+
+Cost: nothing when no profile is open (the sampler thread blocks on an
+event); while one is, a stack walk per task every interval. Thread samples
+are attributed to every open profile waiting on a thread, so they are
+approximate when several profiled requests do that at once. Per process.
+"""
+
+import asyncio
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MAX_DEPTH = 128
+# Frames that mean "this task is waiting for a worker thread"
+_THREAD_HANDOFF = frozenset(
+    {"run_in_threadpool", "run_sync", "run_sync_in_worker_thread", "to_thread", "run_in_executor"}
+)
+# Innermost frame of a pool worker blocked on its work queue
+_IDLE_LEAVES = ("threading.py:", "queue.py:", "_worker (futures/thread.py:")
+
+
+class RequestProfile:
+    def __init__(self, request_id: str, method: str, path: str, requested: bool):
+        self.id = request_id
+        self.method = method
+        self.path = path
+        self.requested = requested
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self.duration_ms = 0.0
+        self.status_code: Optional[int] = None
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {n}" for stack, n in self.stacks.most_common()) + "\n"
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "requested": self.requested,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": self.samples,
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "top_frames": [
+                {"frame": frame, "samples": n}
+                for frame, n in _self_time(self.stacks).most_common(10)
+            ],
+        }
+
+
+_profile_var: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_active: dict[int, RequestProfile] = {}
+_lock = threading.Lock()
+_wake = threading.Event()
+_sampler: Optional[threading.Thread] = None
+_profiles: "deque[RequestProfile]" = deque(maxlen=max(settings.PROFILE_BUFFER_SIZE, 1))
+
+
+# ── Request hooks (RequestLoggingMiddleware) ──────────────────────────────────
+
+
+def profile_requested(headers) -> Optional[bool]:
+    """True: explicitly requested; False: sampled; None: don't profile."""
+    token = settings.PROFILER_TOKEN
+    flag = headers.get("x-profile")
+    if token and flag and hmac.compare_digest(flag, token):
+        return True
+    if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return False
+    return None
+
+
+def start_profile(request_id: str, method: str, path: str, requested: bool) -> RequestProfile:
+    """Open a profile covering the current task and every task it spawns."""
+    global _sampler
+    profile = RequestProfile(request_id, method, path, requested)
+    _profile_var.set(profile)
+    with _lock:
+        _active[id(profile)] = profile
+        if _sampler is None or not _sampler.is_alive():
+            _sampler = threading.Thread(target=_sample_loop, name="request-profiler", daemon=True)
+            _sampler.start()
+    _wake.set()
+    return profile
+
+
+def finish_profile(profile: RequestProfile, status_code: int) -> bool:
+    """Close `profile`; returns whether it was kept in the ring buffer."""
+    with _lock:
+        _active.pop(id(profile), None)
+        if not _active:
+            _wake.clear()
+    profile.duration_ms = (time.perf_counter() - profile._started) * 1000
+    profile.status_code = status_code
+    if not profile.requested and profile.duration_ms < settings.PROFILE_MIN_DURATION_MS:
+        return False
+    _profiles.append(profile)
+    logger.info(
+        "Request profiled",
+        extra={
+            "profile_id": profile.id,
+            "path": profile.path,
+            "duration_ms": round(profile.duration_ms, 2),
+            "samples": profile.samples,
+        },
+    )
+    return True
+
+
+# ── Ring buffer (GET /admin/profiles) ─────────────────────────────────────────
+
+
+def list_profiles() -> list[dict]:
+    return [p.summary() for p in reversed(_profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[RequestProfile]:
+    return next((p for p in reversed(_profiles) if p.id == profile_id), None)
+
+
+# ── Sampling ──────────────────────────────────────────────────────────────────
+
+
+def _label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    else:
+        filename = "/".join(filename.split(os.sep)[-2:])
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _frame_stack(frame) -> list[str]:
+    """Outermost-first labels of a live thread's stack."""
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _await_stack(coro) -> list[str]:
+    """Outermost-first labels of a suspended coroutine's await chain."""
+    labels = []
+    while coro is not None and len(labels) < _MAX_DEPTH:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "gi_frame", None)
+            or getattr(coro, "ag_frame", None)
+        )
+        if frame is None:
+            if isinstance(coro, asyncio.Task):
+                coro = coro.get_coro()
+                continue
+            labels.append(f"<{type(coro).__name__}>")
+            break
+        labels.append(_label(frame.f_code))
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+            or getattr(coro, "ag_await", None)
+        )
+    return labels
+
+
+def _is_idle(labels: list[str]) -> bool:
+    """A pool worker blocked waiting for its next work item."""
+    return not labels or any(leaf in labels[-1] for leaf in _IDLE_LEAVES)
+
+
+def _self_time(stacks: Counter) -> Counter:
+    leaves: Counter = Counter()
+    for stack, n in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += n
+    return leaves
+
+
+def _sample_once(profiles: list[RequestProfile]) -> None:
+    frames = sys._current_frames()
+    loops = {p.loop for p in profiles}
+    open_ids = {id(p) for p in profiles}
+    awaiting_thread: set[int] = set()
+    sampled: set[int] = set()
+
+    for loop in loops:
+        running = asyncio.current_task(loop)
+        try:
+            tasks = asyncio.all_tasks(loop)
+        except RuntimeError:  # task set changed under us — skip this tick
+            continue
+        for task in tasks:
+            profile = task.get_context().get(_profile_var)
+            if profile is None or id(profile) not in open_ids:
+                continue
+            if task is running:
+                root, labels = "[cpu]", _frame_stack(frames.get(profile.loop_thread))
+            else:
+                root, labels = "[await]", _await_stack(task.get_coro())
+                if any(label.split(" ", 1)[0].rsplit(".", 1)[-1] in _THREAD_HANDOFF for label in labels):
+                    awaiting_thread.add(id(profile))
+            profile.stacks[";".join([task.get_name(), root, *labels])] += 1
+            sampled.add(id(profile))
+
+    if awaiting_thread:
+        loop_threads = {p.loop_thread for p in profiles}
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in frames.items():
+            if ident in loop_threads or ident == threading.get_ident():
+                continue
+            labels = _frame_stack(frame)
+            if _is_idle(labels):
+                continue
+            stack = ";".join([f"[thread {names.get(ident, ident)}]", *labels])
+            for profile in profiles:
+                if id(profile) in awaiting_thread:
+                    profile.stacks[stack] += 1
+
+    for profile in profiles:
+        if id(profile) in sampled:
+            profile.samples += 1
+
+
+def _sample_loop() -> None:
+    while True:
+        _wake.wait()
+        with _lock:
+            profiles = list(_active.values())
+        if profiles:
+            try:
+                _sample_once(profiles)
+            except Exception as exc:  # never take the process down for a profile
+                logger.warning("Profiler sample failed", extra={"error": str(exc)})
+        time.sleep(settings.PROFILE_INTERVAL_MS / 1000)
@@ -2,6 +2,7 @@
 
 import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.core.config import settings
@@ -34,6 +35,42 @@ def start_scheduler():
         id="render_keepalive",
         replace_existing=True,
     )
+    if settings.SCRAPER_INTERVAL_MINUTES > 0:
+        from app.services.scraper_service import run_scheduled_scrape
+
+        scheduler.add_job(
+            run_scheduled_scrape,
+            trigger=IntervalTrigger(minutes=settings.SCRAPER_INTERVAL_MINUTES),
+            id="ppip_scrape",
+            replace_existing=True,
+        )
+    if settings.RESCORE_NIGHTLY_HOUR >= 0:
+        from app.services.rescoring_service import run_nightly_rescore
+
+        scheduler.add_job(
+            run_nightly_rescore,
+            trigger=CronTrigger(hour=settings.RESCORE_NIGHTLY_HOUR, minute=0, timezone="UTC"),
+            id="nightly_rescore",
+            replace_existing=True,
+        )
+    if settings.RISK_ROLLUP_NIGHTLY_HOUR >= 0:
+        from app.services.risk_rollup_service import run_nightly_compaction
+
+        scheduler.add_job(
+            run_nightly_compaction,
+            trigger=CronTrigger(hour=settings.RISK_ROLLUP_NIGHTLY_HOUR, minute=0, timezone="UTC"),
+            id="risk_rollup_compaction",
+            replace_existing=True,
+        )
+    if settings.AUDIT_MAINTENANCE_HOUR >= 0:
+        from app.services.audit_partition_service import run_maintenance
+
+        scheduler.add_job(
+            run_maintenance,
+            trigger=CronTrigger(hour=settings.AUDIT_MAINTENANCE_HOUR, minute=30, timezone="UTC"),
+            id="audit_partition_maintenance",
+            replace_existing=True,
+        )
     scheduler.start()
     logger.info("Scheduler started")
 
@@ -0,0 +1,217 @@
+"""
+SQL statement budget per endpoint — fails when an endpoint starts issuing
+more queries than it used to (a new N+1, a lost loader profile).
+
+Run against a seeded database (python -m app.seeds.run):
+    python -m app.core.sql_budget                  # check against sql_budget.json
+    python -m app.core.sql_budget --show-sql       # print each endpoint's statements
+    python -m app.core.sql_budget --update         # re-pin after an intended change
+
+Each endpoint in ENDPOINTS is called in-process through httpx's ASGI
+transport (no lifespan, so no scheduler or warm-up) as the first superuser,
+and every statement sent to any engine during the call is counted. The user
+is resolved up front, so the count is the endpoint's own work; the tender
+detail cache is disabled. Exits 1 if an endpoint exceeds its pinned count
+or does not answer 200. An endpoint in ENDPOINTS without a pin fails too —
+pin it with --update when it is added.
+
+Counts depend on page sizes, not table sizes: a loop that queries per row
+shows up as a count that grows with `limit`, which is why list endpoints
+are measured with a full page.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BUDGET_FILE = Path(__file__).with_name("sql_budget.json")
+
+ENDPOINTS = {
+    "tenders.list": "/api/v1/tenders?limit=20",
+    "tenders.detail": "/api/v1/tenders/{tender_id}",
+    "suppliers.list": "/api/v1/suppliers?limit=20",
+    "suppliers.detail": "/api/v1/suppliers/{supplier_id}",
+    "dashboard.stats": "/api/v1/dashboard/stats",
+    "dashboard.heatmap": "/api/v1/dashboard/heatmap",
+    "dashboard.top_risk_suppliers": "/api/v1/dashboard/top-risk-suppliers",
+    "dashboard.high_risk_tenders": "/api/v1/dashboard/high-risk-tenders",
+    "analytics.county_risk": "/api/v1/analytics/county-risk",
+}
+
+
+class StatementCounter:
+    """Collects every statement executed on any engine while active."""
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+async def _fixtures():
+    """Superuser to call as, and ids for the detail endpoints."""
+    from sqlalchemy import desc, select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models.loader_profiles import load_profile
+    from app.models.risk_score_model import RiskScore
+    from app.models.supplier_model import Supplier
+    from app.models.user_model import User
+
+    async with AsyncSessionLocal() as db:
+        user = (
+            await db.execute(
+                select(User)
+                .options(*load_profile(User, "auth"))
+                .filter(User.is_superuser.is_(True))
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        tender_id = await db.scalar(
+            select(RiskScore.tender_id).order_by(desc(RiskScore.total_score)).limit(1)
+        )
+        supplier_id = await db.scalar(
+            select(Supplier.id).order_by(desc(Supplier.risk_score)).limit(1)
+        )
+    if user is None or tender_id is None or supplier_id is None:
+        raise RuntimeError(
+            "needs a superuser, a scored tender and a supplier — run python -m app.seeds.run"
+        )
+    return user, {"tender_id": tender_id, "supplier_id": supplier_id}
+
+
+async def measure(endpoints: dict[str, str]) -> dict[str, dict]:
+    """endpoint name → {status, statements, sql}."""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.config import settings
+    from app.core.database import engine
+    from app.core.dependencies import get_current_user
+    from app.main import app
+
+    user, ids = await _fixtures()
+    app.dependency_overrides[get_current_user] = lambda: user
+    settings.TENDER_DETAIL_CACHE_TTL_SECONDS = 0
+
+    results = {}
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://sql-budget") as client:
+            for name, path in endpoints.items():
+                with StatementCounter() as counter:
+                    response = await client.get(path.format(**ids))
+                results[name] = {
+                    "status": response.status_code,
+                    "statements": counter.count,
+                    "sql": counter.statements,
+                }
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        await engine.dispose()
+    return results
+
+
+def load_budget() -> dict[str, int]:
+    if not BUDGET_FILE.exists():
+        return {}
+    return json.loads(BUDGET_FILE.read_text())
+
+
+def compare(results: dict[str, dict], budget: dict[str, int]) -> list[dict]:
+    rows = []
+    for name, result in results.items():
+        pinned = budget.get(name)
+        if result["status"] != 200:
+            verdict = "error"
+        elif pinned is None:
+            verdict = "unpinned"
+        elif result["statements"] > pinned:
+            verdict = "regression"
+        elif result["statements"] < pinned:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append(
+            {
+                "endpoint": name,
+                "status": result["status"],
+                "statements": result["statements"],
+                "budget": pinned,
+                "verdict": verdict,
+            }
+        )
+    return rows
+
+
+def _print_report(rows: list[dict], results: dict[str, dict], show_sql: bool) -> None:
+    for row in rows:
+        budget = "-" if row["budget"] is None else row["budget"]
+        print(
+            f"  {row['verdict']:<10} {row['statements']:>4} / {budget:<4} "
+            f"{row['endpoint']}  (HTTP {row['status']})"
+        )
+        if show_sql or row["verdict"] == "regression":
+            for statement in results[row["endpoint"]]["sql"]:
+                print(f"      {' '.join(statement.split())[:160]}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check SQL statements per endpoint.")
+    parser.add_argument("--only", nargs="*", metavar="ENDPOINT", help="Subset of ENDPOINTS")
+    parser.add_argument("--update", action="store_true", help=f"Re-pin {BUDGET_FILE.name}")
+    parser.add_argument("--show-sql", action="store_true", help="Print every statement")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    endpoints = {
+        name: path for name, path in ENDPOINTS.items() if not args.only or name in args.only
+    }
+    results = asyncio.run(measure(endpoints))
+    budget = load_budget()
+    rows = compare(results, budget)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_report(rows, results, args.show_sql)
+
+    errors = [r["endpoint"] for r in rows if r["verdict"] == "error"]
+    if args.update:
+        if errors:
+            print(f"\nnot pinned, endpoints failed: {', '.join(errors)}", file=sys.stderr)
+            raise SystemExit(1)
+        budget.update({name: r["statements"] for name, r in results.items()})
+        BUDGET_FILE.write_text(json.dumps(dict(sorted(budget.items())), indent=2) + "\n")
+        print(f"\npinned {len(results)} endpoints in {BUDGET_FILE}")
+        raise SystemExit(0)
+
+    regressions = [r["endpoint"] for r in rows if r["verdict"] == "regression"]
+    unpinned = [r["endpoint"] for r in rows if r["verdict"] == "unpinned"]
+    if regressions or errors or unpinned:
+        print(
+            f"\nover budget: {', '.join(regressions) or 'none'}; "
+            f"failed: {', '.join(errors) or 'none'}; "
+            f"unpinned: {', '.join(unpinned) or 'none'}",
+            file=sys.stderr,
+        )
+        raise SystemExit(1)
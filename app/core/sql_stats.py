@@ -0,0 +1,162 @@
+"""
+Per-request SQL instrumentation on SQLAlchemy engine events.
+
+RequestLoggingMiddleware opens a RequestSQLStats for each request (keyed by
+the request_id from app/core/logger.py). Every statement any engine runs
+while serving it adds to the request's count, time and rows. When the
+request finishes, the totals go on the "Request completed" log line. In
+development (or with SQL_STATS_HEADER) they also go in a response header:
+
+    X-DB-Stats: statements=7; time_ms=12.4; rows=143; repeated=0
+
+Statements slower than SQL_SLOW_QUERY_MS are logged as they finish, with
+the statement, the shape of its parameters (names and types, never values)
+and the row count. A statement shape run SQL_N_PLUS_ONE_THRESHOLD times or
+more in one request is logged as a likely N+1 when the request ends.
+
+Background jobs have no request; only the slow-query log applies to them.
+"""
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# A run of bind placeholders — IN (...) lists vary in length per call
+_PLACEHOLDER_RUN = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))+")
+_MAX_LOGGED_SQL = 1000
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with whitespace and placeholder lists collapsed."""
+    return _PLACEHOLDER_RUN.sub("…", " ".join(statement.split()))
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Names and types of the bound parameters — never their values."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return {"executemany": len(parameters), "row": parameter_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        types = [type(value).__name__ for value in parameters]
+        if len(types) > 20:
+            return {"count": len(types), "types": dict(Counter(types))}
+        return types
+    return type(parameters).__name__
+
+
+class RequestSQLStats:
+    """Statement count, time and rows for one request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.statements = 0
+        self.time_ms = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+    def add(self, shape: str, duration_ms: float, rows: int) -> None:
+        self.statements += 1
+        self.time_ms += duration_ms
+        self.rows += rows
+        self.shapes[shape] += 1
+
+    def repeated(self) -> list[tuple[str, int]]:
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        if threshold <= 0:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def summary(self) -> dict:
+        return {
+            "db_statements": self.statements,
+            "db_time_ms": round(self.time_ms, 2),
+            "db_rows": self.rows,
+            "db_repeated": len(self.repeated()),
+        }
+
+    def header(self) -> str:
+        s = self.summary()
+        return (
+            f"statements={s['db_statements']}; time_ms={s['db_time_ms']}; "
+            f"rows={s['db_rows']}; repeated={s['db_repeated']}"
+        )
+
+    def report_repeated(self, method: str, path: str) -> None:
+        for shape, n in self.repeated():
+            logger.warning(
+                "Repeated statement — likely N+1",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "repeats": n,
+                    "statement": shape[:_MAX_LOGGED_SQL],
+                },
+            )
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("sql_stats", default=None)
+
+
+def start_request_stats(request_id: str) -> RequestSQLStats:
+    """Collect statements for the current request (call before the app runs)."""
+    stats = RequestSQLStats(request_id)
+    _current.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestSQLStats]:
+    return _current.get()
+
+
+def stats_header_enabled() -> bool:
+    return settings.SQL_STATS_HEADER or settings.ENVIRONMENT == "development"
+
+
+# ── Engine events ─────────────────────────────────────────────────────────────
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_stats_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("sql_stats_started")
+    if not started:
+        return
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    rows = max(getattr(cursor, "rowcount", -1) or 0, 0)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement_shape(statement), duration_ms, rows)
+
+    if 0 < settings.SQL_SLOW_QUERY_MS <= duration_ms:
+        logger.warning(
+            "Slow query",
+            extra={
+                "duration_ms": round(duration_ms, 2),
+                "rows": rows,
+                "statement": statement_shape(statement)[:_MAX_LOGGED_SQL],
+                "parameters": parameter_shape(parameters, executemany),
+            },
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed(context) -> None:
+    started = context.connection.info.get("sql_stats_started") if context.connection else None
+    if started:
+        started.pop()
@@ -0,0 +1,39 @@
+"""
+Server-Sent Events helpers for the streaming AI endpoints.
+
+An SSE stream is `text/event-stream` with frames of the form
+
+    event: delta
+    data: {"text": "..."}
+
+separated by a blank line. Every stream from this API emits:
+
+    start   immediately, before the upstream call — first byte in well
+            under a second even though Claude takes 10–20 s to finish
+    delta   {"text": ...} per text chunk
+    done    final metadata once the full text is in (and persisted)
+    error   {"detail": ...} if generation failed; the stream then ends
+
+Starlette cancels the response task when the client disconnects; the
+cancellation propagates into the generator and closes the upstream
+Anthropic stream (see ai_service.stream_text).
+"""
+
+import json
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # stop reverse proxies from buffering the stream
+}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,175 @@
+"""
+Startup warm-up.
+
+Route modules import nothing heavy at module level — numpy, sklearn,
+xgboost, spaCy, anthropic and cloudinary are imported inside the functions
+that use them. That keeps `import app.main` (and therefore worker boot)
+fast, but without a warm-up the first scoring request would pay for every
+one of those imports plus model loading.
+
+start_warmup() runs the steps below as a background task from lifespan:
+blocking steps go to a worker thread, so the event loop keeps serving
+/health while they run. GET /ready answers 503 until the pass finishes
+and every *required* step succeeded (failed required steps are retried).
+Optional steps that fail or whose dependency is not installed are only
+recorded — the app falls back without them.
+
+Profile what module import itself costs with:
+    python -m app.core.import_profile
+"""
+
+import asyncio
+import importlib
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, Union
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Step = Callable[[], Union[object, Awaitable[object]]]
+
+
+async def _check_database() -> None:
+    from sqlalchemy import text
+
+    from app.core.database import engine
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_replica() -> None:
+    from app.core.database import check_replica
+
+    await check_replica()  # never raises; marks the replica bypassed instead
+
+
+async def _risk_rollup() -> None:
+    from app.services.risk_rollup_service import rebuild_if_empty
+
+    await rebuild_if_empty()  # returns at once; a rebuild runs in the background
+
+
+def _imports(*modules: str) -> Step:
+    return lambda: [importlib.import_module(m) for m in modules]
+
+
+def _call(module: str, attr: str) -> Step:
+    return lambda: getattr(importlib.import_module(module), attr)()
+
+
+# (name, step, required) — run in order
+WARMUP_STEPS: list[tuple[str, Step, bool]] = [
+    ("database", _check_database, True),
+    ("database:replica", _check_replica, False),
+    ("rollup:risk_daily", _risk_rollup, False),
+    ("import:numpy", _imports("numpy", "app.ml.columnar"), False),
+    (
+        "import:sklearn",
+        _imports("sklearn.feature_extraction.text", "sklearn.metrics.pairwise"),
+        False,
+    ),
+    ("import:xgboost", _imports("xgboost"), False),
+    ("import:anthropic", _imports("app.services.ai_service"), False),
+    ("import:cloudinary", _call("app.services.cloudinary_service", "_uploader"), False),
+    ("model:xgb_risk", _call("app.ml.xgb_risk_model", "_load_model"), False),
+    ("model:price_anomaly", _call("app.ml.price_anomaly", "_load_model"), False),
+    ("model:supplier_risk", _call("app.ml.supplier_risk", "_load_models"), False),
+    ("model:collusion_tfidf", _call("app.ml.collusion", "_load_vectorizer"), False),
+    ("nlp:spacy", _call("app.ml.spec_nlp", "_get_nlp"), False),
+]
+
+_state: dict = {
+    "status": "pending",  # pending | warming | retrying | ready
+    "started_at": None,
+    "finished_at": None,
+    "duration_ms": None,
+    "steps": {},
+}
+_task: Optional[asyncio.Task] = None
+_RETRY_SECONDS = 5.0
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def _run_step(step: Step) -> None:
+    if asyncio.iscoroutinefunction(step):
+        await step()
+    else:
+        await asyncio.to_thread(step)
+
+
+async def _run_steps(steps: list[tuple[str, Step, bool]]) -> list[tuple[str, Step, bool]]:
+    """Run steps in order; return the required ones that failed."""
+    failed = []
+    for name, step, required in steps:
+        t0 = time.perf_counter()
+        record = {"required": required}
+        try:
+            await asyncio.wait_for(_run_step(step), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+            record["status"] = "ok"
+        except ImportError as exc:
+            record.update(status="skipped", error=str(exc))
+        except asyncio.TimeoutError:
+            record.update(status="timeout", error=f"exceeded {settings.WARMUP_TIMEOUT_SECONDS}s")
+        except Exception as exc:
+            record.update(status="failed", error=str(exc))
+        record["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        _state["steps"][name] = record
+
+        if record["status"] != "ok":
+            if required and record["status"] != "skipped":
+                failed.append((name, step, required))
+            logger.warning("Warm-up step did not complete", extra={"step": name, **record})
+    return failed
+
+
+async def run_warmup(steps: Optional[list[tuple[str, Step, bool]]] = None) -> dict:
+    """
+    Run every step once, then keep retrying failed required steps (e.g. the
+    database not accepting connections yet) until they pass.
+    """
+    steps = WARMUP_STEPS if steps is None else steps
+    _state.update(status="warming", started_at=_now(), finished_at=None, steps={})
+    started = time.perf_counter()
+
+    failed = await _run_steps(steps)
+    while failed:
+        _state["status"] = "retrying"
+        await asyncio.sleep(_RETRY_SECONDS)
+        failed = await _run_steps(failed)
+
+    _state.update(
+        status="ready",
+        finished_at=_now(),
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    logger.info("Warm-up finished", extra={"duration_ms": _state["duration_ms"]})
+    return _state
+
+
+def start_warmup() -> None:
+    """Schedule the warm-up pass from lifespan (no-op if disabled)."""
+    global _task
+    if not settings.WARMUP_ENABLED:
+        _state.update(status="ready", started_at=_now(), finished_at=_now(), duration_ms=0.0)
+        return
+    _task = asyncio.create_task(run_warmup())
+
+
+def stop_warmup() -> None:
+    if _task is not None and not _task.done():
+        _task.cancel()
+
+
+def is_ready() -> bool:
+    return _state["status"] == "ready"
+
+
+def warmup_state() -> dict:
+    return {**_state, "steps": dict(_state["steps"])}
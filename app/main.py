@@ -3,12 +3,18 @@ Procurement Platform — Main Application
 
 Assembles all routes under /api/v1 prefix.
 Run with: uvicorn app.main:app --reload
+
+Route modules keep heavy dependencies (ML libraries, anthropic, cloudinary)
+out of module scope; lifespan loads them in the background instead
+(app/core/warmup.py) and GET /ready reports when that has finished.
+Measure startup imports with: python -m app.core.import_profile
 """
 
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Logging MUST be set up before any import that logs
 from app.core.logger import get_logger, setup_logging
@@ -16,24 +22,33 @@ from app.core.logger import get_logger, setup_logging
 setup_logging()
 logger = get_logger(__name__)
 
+from app.api.v1.routes.admin_routes import router as admin_router
 from app.api.v1.routes.analytics_routes import router as analytics_router
 from app.api.v1.routes.analyze_routes import router as analyze_router
 from app.api.v1.routes.auth_routes import router as auth_router
 from app.api.v1.routes.benchmark_routes import router as benchmarks_router
 from app.api.v1.routes.county_risk_routes import router as county_risk_router
 from app.api.v1.routes.dashboard_routes import router as dashboard_router
+from app.api.v1.routes.export_routes import router as export_router
 from app.api.v1.routes.investigation_routes import router as investigation_router
 from app.api.v1.routes.ml_routes import collusion_router
 from app.api.v1.routes.ml_routes import router as ml_router
 from app.api.v1.routes.user_routes import router as user_router
 
-# from app.api.v1.routes.scraper import router as scraper_router
+from app.api.v1.routes.scraper_routes import router as scraper_router
 from app.api.v1.routes.supplier_routes import router as suppliers_router
 from app.api.v1.routes.tender_routes import router as tenders_router
 from app.api.v1.routes.whistleblower_routes import router as whistleblower_router
 from app.api.v1.routes.log_routes import router as logs_router
 from app.core.config import settings
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.warmup import is_ready, start_warmup, stop_warmup, warmup_state
+from app.services.training_job_service import shutdown_training_executor
+from app.services.whistleblower_triage_service import (
+    start_triage_worker,
+    stop_triage_worker,
+)
+from app.middleware.compression_middleware import CompressionMiddleware
 from app.middleware.logger_middleware import RequestLoggingMiddleware
 
 
@@ -44,8 +59,13 @@ async def lifespan(app: FastAPI):
         extra={"version": settings.APP_VERSION, "environment": settings.ENVIRONMENT},
     )
     start_scheduler()
+    start_warmup()  # background — /health answers immediately, /ready once warm
+    start_triage_worker()
     yield
+    stop_triage_worker()
+    stop_warmup()
     stop_scheduler()
+    shutdown_training_executor()
     logger.info("Procurement system API shut down")
 
 
@@ -62,6 +82,7 @@ app = FastAPI(
 )
 
 # ── Middleware ──────────────────────────────────────────────────────────────────────
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(
     CORSMiddleware,
@@ -92,7 +113,7 @@ app.include_router(benchmarks_router, prefix=PREFIX)  # GET|POST /api/benchmarks
 app.include_router(
     analyze_router, prefix=PREFIX
 )  # POST /api/analyze/price-check|specifications  GET /county-risk
-# app.include_router(scraper_router)  # POST /api/scraper/run
+app.include_router(scraper_router, prefix=PREFIX)  # POST /api/scraper/run
 app.include_router(
     ml_router, prefix=PREFIX
 )  # GET /api/ml/status  POST /api/ml/train/*  GET /spending-forecast
@@ -103,6 +124,8 @@ app.include_router(county_risk_router, prefix=PREFIX)
 app.include_router(analytics_router, prefix=PREFIX)
 app.include_router(investigation_router, prefix=PREFIX)
 app.include_router(logs_router, prefix=PREFIX)
+app.include_router(export_router, prefix=PREFIX)  # GET /api/export/{dataset}
+app.include_router(admin_router, prefix=PREFIX)  # GET /api/admin/profiles
 
 
 @app.get("/", tags=["Health"])
@@ -118,3 +141,10 @@ def root():
 @app.get("/health", tags=["Health"])
 def health():
     return {"status": "ok"}
+
+
+@app.get("/ready", tags=["Health"])
+def ready():
+    """Readiness probe: 503 until startup warm-up has finished."""
+    state = warmup_state()
+    return JSONResponse(status_code=200 if is_ready() else 503, content=state)
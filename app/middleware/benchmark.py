@@ -0,0 +1,211 @@
+"""
+Per-request overhead of RequestLoggingMiddleware: the previous
+BaseHTTPMiddleware version vs the pure ASGI one, with log lines written
+inline vs through the LOG_QUEUE listener thread.
+
+Run:
+    python -m app.middleware.benchmark
+    python -m app.middleware.benchmark --requests 5000 --repeat 7 --json
+
+Requests are driven straight through the ASGI interface (no server, no
+sockets) against a bare Starlette app with a small JSON route and a
+streaming route, so the numbers are the middleware's own cost on top of the
+route. Log output goes to /dev/null; the queue rows therefore show the time
+the event loop spends per request, not the listener's formatting time.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core import logger as app_logger
+from app.core.config import settings
+from app.core.logger import get_logger, set_request_id
+from app.core.profiler import finish_profile, profile_requested, start_profile
+from app.core.sql_stats import start_request_stats, stats_header_enabled
+from app.middleware.logger_middleware import _SKIP_PATHS, RequestLoggingMiddleware
+
+logger = get_logger("app.middleware.logger_middleware")
+
+_PAYLOAD = {"id": str(uuid.uuid4()), "title": "Supply of laboratory reagents", "score": 41.5}
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation this module replaced, for comparison."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        set_request_id(request_id)
+        sql_stats = start_request_stats(request_id)
+        path = request.url.path
+        method = request.method
+        skip = path in _SKIP_PATHS
+        requested = None if skip else profile_requested(request.headers)
+        profile = (
+            start_profile(request_id, method, path, requested)
+            if requested is not None
+            else None
+        )
+        start = time.perf_counter()
+        if not skip:
+            logger.info(
+                "Request started",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "query": str(request.query_params),
+                    "client_ip": request.client.host if request.client else "unknown",
+                    "user_agent": request.headers.get("user-agent", ""),
+                },
+            )
+        response: Response = await call_next(request)
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        status = response.status_code
+        if not skip:
+            log_fn = logger.warning if status >= 400 else logger.info
+            log_fn(
+                "Request completed",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "status_code": status,
+                    "duration_ms": duration_ms,
+                    **sql_stats.summary(),
+                },
+            )
+            sql_stats.report_repeated(method, path)
+        response.headers["X-Request-ID"] = request_id
+        if profile is not None and finish_profile(profile, status):
+            response.headers["X-Profile-ID"] = request_id
+        if stats_header_enabled():
+            response.headers["X-DB-Stats"] = sql_stats.header()
+        return response
+
+
+# ── Target app ────────────────────────────────────────────────────────────────
+
+
+async def _json(request: Request) -> JSONResponse:
+    return JSONResponse(_PAYLOAD)
+
+
+async def _stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(8):
+            yield f'{{"chunk":{i}}}\n'.encode()
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+_ROUTES = [Route("/json", _json), Route("/stream", _stream)]
+
+VARIANTS = {
+    "none": lambda app: app,
+    "legacy": LegacyRequestLoggingMiddleware,
+    "asgi": RequestLoggingMiddleware,
+}
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"user-agent", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _drive(app, path: str, n: int) -> float:
+    """Seconds to serve `n` sequential requests to `path`."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(n):
+        await app(_scope(path), receive, send)
+    return time.perf_counter() - started
+
+
+def _configure_logging(queued: bool) -> None:
+    settings.LOG_QUEUE = queued
+    app_logger.setup_logging()
+    logging.getHandlerByName("console").setStream(open(os.devnull, "w"))
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for queued in (False, True):
+        _configure_logging(queued)
+        for variant, wrap in VARIANTS.items():
+            app = wrap(Starlette(routes=_ROUTES))
+            for path in ("/json", "/stream"):
+                asyncio.run(_drive(app, path, min(args.requests, 200)))  # warm up
+                timings = [
+                    asyncio.run(_drive(app, path, args.requests)) for _ in range(args.repeat)
+                ]
+                results.append(
+                    {
+                        "logging": "queue" if queued else "sync",
+                        "middleware": variant,
+                        "route": path,
+                        "requests": args.requests,
+                        "us_per_request": round(
+                            statistics.median(timings) / args.requests * 1e6, 1
+                        ),
+                    }
+                )
+    app_logger.stop_logging()
+
+    baseline = {
+        (r["logging"], r["route"]): r["us_per_request"]
+        for r in results
+        if r["middleware"] == "none"
+    }
+    for r in results:
+        r["overhead_us"] = round(r["us_per_request"] - baseline[(r["logging"], r["route"])], 1)
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark request logging middleware.")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'logging':8s} {'middleware':10s} {'route':8s} {'µs/req':>9s} {'overhead':>9s}")
+        for r in results:
+            print(
+                f"{r['logging']:8s} {r['middleware']:10s} {r['route']:8s}"
+                f" {r['us_per_request']:9.1f} {r['overhead_us']:9.1f}"
+            )
@@ -0,0 +1,140 @@
+"""
+app/middleware/compression_middleware.py — gzip / brotli response compression.
+
+A response is compressed when the client accepts it and the body is at
+least COMPRESSION_MIN_BYTES: brotli (`br`) if the optional brotli package
+is installed, gzip otherwise. Streamed bodies are compressed chunk by chunk
+with a flush after each, so they still arrive incrementally. Server-Sent
+Events, bodies that already carry a Content-Encoding and formats that are
+compressed already (images, archives, xlsx, pdf) pass through untouched.
+"""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional — pip install brotli
+    brotli = None
+
+_SKIP_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "audio/",
+    "video/",
+    "application/zip",
+    "application/gzip",
+    "application/pdf",
+    "application/vnd.openxmlformats",
+)
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self):
+        self._z = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._z.compress(data)
+        return out + self._z.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self):
+        self._b = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._b.process(data)
+        return out + (self._b.finish() if final else self._b.flush())
+
+
+def _choose_encoder(accept_encoding: str):
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return _Brotli
+    if "gzip" in accepted or "*" in accepted:
+        return _Gzip
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoder_cls = _choose_encoder(Headers(scope=scope).get("accept-encoding", ""))
+        if encoder_cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message  # held until the first body chunk decides
+                return
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                if encoder is None:
+                    passthrough = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or content_type.startswith(_SKIP_CONTENT_TYPES)
+                    or (not more_body and len(body) < settings.COMPRESSION_MIN_BYTES)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                encoder = encoder_cls()
+                if "content-length" in headers:
+                    del headers["content-length"]
+                headers["Content-Encoding"] = encoder.encoding
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": encoder.compress(body, final=not more_body),
+                    "more_body": more_body,
+                }
+            )
+
+        await self.app(scope, receive, send_wrapper)
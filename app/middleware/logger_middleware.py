@@ -1,40 +1,89 @@
-"""app/middleware/logger_middleware.py — Request ID injection and structured request logging."""
+"""
+app/middleware/logger_middleware.py — Request ID injection and structured request logging.
 
+Pure ASGI (no BaseHTTPMiddleware): the app's send is wrapped rather than the
+response buffered through a second task, and "Request completed" is logged
+after the last body chunk, so streamed responses are timed in full.
+
+With LOG_2XX_SAMPLE_RATE below 1 only that share of requests is logged at
+INFO; a request left out of the sample is still logged if it ends non-2xx,
+raises, or takes LOG_SLOW_REQUEST_MS or longer.
+"""
+
+import random
 import time
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
 from app.core.logger import get_logger, set_request_id
+from app.core.profiler import finish_profile, profile_requested, start_profile
+from app.core.sql_stats import start_request_stats, stats_header_enabled
 
 logger = get_logger(__name__)
 _SKIP_PATHS = frozenset({"/health", "/metrics", "/favicon.ico"})
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+class RequestLoggingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
         set_request_id(request_id)
-        path = request.url.path
-        method = request.method
+        sql_stats = start_request_stats(request_id)
+        path = scope["path"]
+        method = scope["method"]
         skip = path in _SKIP_PATHS
+        sample_rate = settings.LOG_2XX_SAMPLE_RATE
+        sampled = not skip and (sample_rate >= 1 or random.random() < sample_rate)
+        requested = None if skip else profile_requested(headers)
+        profile = (
+            start_profile(request_id, method, path, requested)
+            if requested is not None
+            else None
+        )
+        status = 500
         start = time.perf_counter()
-        if not skip:
+        if sampled:
+            client = scope.get("client")
             logger.info(
                 "Request started",
                 extra={
                     "method": method,
                     "path": path,
-                    "query": str(request.query_params),
-                    "client_ip": request.client.host if request.client else "unknown",
-                    "user_agent": request.headers.get("user-agent", ""),
+                    "query": str(QueryParams(scope.get("query_string", b""))),
+                    "client_ip": client[0] if client else "unknown",
+                    "user_agent": headers.get("user-agent", ""),
                 },
             )
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-Request-ID"] = request_id
+                if stats_header_enabled():
+                    # statements run while a streaming body is sent come after this
+                    response_headers["X-DB-Stats"] = sql_stats.header()
+                if profile is not None and profile.requested:
+                    # requested profiles are always kept; sampled ones only if slow
+                    response_headers["X-Profile-ID"] = request_id
+            await send(message)
+
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
+            if profile is not None:
+                finish_profile(profile, 500)
             duration_ms = round((time.perf_counter() - start) * 1000, 2)
             logger.error(
                 "Request failed with unhandled exception",
@@ -42,9 +91,13 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 exc_info=exc,
             )
             raise
+
         duration_ms = round((time.perf_counter() - start) * 1000, 2)
-        status = response.status_code
-        if not skip:
+        if profile is not None:
+            finish_profile(profile, status)
+        if skip:
+            return
+        if sampled or status >= 300 or duration_ms >= settings.LOG_SLOW_REQUEST_MS:
             log_fn = logger.warning if status >= 400 else logger.info
             log_fn(
                 "Request completed",
@@ -53,7 +106,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "path": path,
                     "status_code": status,
                     "duration_ms": duration_ms,
+                    "log_sample_rate": sample_rate if sampled else None,
+                    **sql_stats.summary(),
                 },
             )
-        response.headers["X-Request-ID"] = request_id
-        return response
+        sql_stats.report_repeated(method, path)
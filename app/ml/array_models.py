@@ -0,0 +1,212 @@
+"""
+Array-backed inference replicas of the sklearn estimators we ship.
+
+A fitted sklearn forest is a list of Python objects per tree; unpickling it
+rebuilds every one in each worker's private heap. These classes flatten the
+same model into a handful of plain numpy arrays (see artifacts.publish_bundle)
+that can be np.load(mmap_mode="r")-ed, so gunicorn workers share the pages
+through the OS page cache and load in microseconds. Inference needs numpy
+only; sklearn is imported solely by the from_sklearn() converters, which run
+in the training process.
+
+Each class implements just the methods app/ml calls on the sklearn original
+(transform / predict_proba / decision_function) and reproduces its output —
+features are compared as float32 like sklearn's tree code does.
+"""
+
+from typing import Any
+
+import numpy as np
+
+# Rows traversed per step; bounds the (rows × trees) index matrices.
+_CHUNK_ROWS = 4096
+
+
+class ArrayScaler:
+    """StandardScaler.transform() from mean_/scale_ arrays."""
+
+    kind = "standard_scaler"
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def from_sklearn(cls, scaler) -> "ArrayScaler":
+        n = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n)
+        return cls(np.asarray(mean, dtype=float), np.asarray(scale, dtype=float))
+
+    def to_arrays(self) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+        return {"mean": self.mean, "scale": self.scale}, {}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray], meta: dict) -> "ArrayScaler":
+        return cls(arrays["mean"], arrays["scale"])
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=float) - self.mean) / self.scale
+
+
+class _ArrayForest:
+    """
+    Every tree of a forest concatenated into flat node arrays. Child indices
+    are global; leaves point at themselves so a fixed max_depth-step walk
+    leaves every row on its leaf without per-row branching.
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict):
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.max_depth = int(meta["max_depth"])
+        self.meta = meta
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray], meta: dict):
+        return cls(arrays, meta)
+
+    def to_arrays(self) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+        arrays = {
+            "left": self.left,
+            "right": self.right,
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "value": self.value,
+            "roots": self.roots,
+        }
+        return arrays, {**self.meta, "max_depth": self.max_depth}
+
+    @staticmethod
+    def _flatten(trees) -> tuple[dict[str, np.ndarray], int]:
+        """trees: [(sklearn tree_, feature index map or None, per-node values)]"""
+        parts = {k: [] for k in ("left", "right", "feature", "threshold", "value")}
+        roots, offset, max_depth = [], 0, 0
+        for tree, feature_map, values in trees:
+            n = tree.node_count
+            leaf = tree.children_left == -1
+            index = np.arange(n) + offset
+            feature = np.where(leaf, 0, tree.feature)
+            if feature_map is not None:
+                feature = np.asarray(feature_map)[feature]
+            parts["left"].append(np.where(leaf, index, tree.children_left + offset))
+            parts["right"].append(np.where(leaf, index, tree.children_right + offset))
+            parts["feature"].append(feature)
+            parts["threshold"].append(np.where(leaf, 0.0, tree.threshold))
+            parts["value"].append(values)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, int(tree.max_depth))
+        arrays = {
+            "left": np.concatenate(parts["left"]).astype(np.int32),
+            "right": np.concatenate(parts["right"]).astype(np.int32),
+            "feature": np.concatenate(parts["feature"]).astype(np.int32),
+            "threshold": np.concatenate(parts["threshold"]).astype(np.float64),
+            "value": np.concatenate(parts["value"]).astype(np.float64),
+            "roots": np.asarray(roots, dtype=np.int32),
+        }
+        return arrays, max_depth
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """(rows, trees) global leaf index per row and tree."""
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty((X.shape[0], len(self.roots)), dtype=np.int32)
+        for start in range(0, X.shape[0], _CHUNK_ROWS):
+            chunk = X[start : start + _CHUNK_ROWS]
+            rows = np.arange(chunk.shape[0])[:, None]
+            node = np.broadcast_to(self.roots, (chunk.shape[0], len(self.roots))).copy()
+            for _ in range(self.max_depth):
+                go_left = chunk[rows, self.feature[node]] <= self.threshold[node]
+                node = np.where(go_left, self.left[node], self.right[node])
+            out[start : start + chunk.shape[0]] = node
+        return out
+
+
+class ArrayForestClassifier(_ArrayForest):
+    """RandomForestClassifier.predict_proba(): mean of per-leaf class fractions."""
+
+    kind = "forest_classifier"
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "ArrayForestClassifier":
+        trees = []
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            counts = tree.value[:, 0, :].astype(float)
+            totals = counts.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            trees.append((tree, None, counts / totals))
+        arrays, max_depth = cls._flatten(trees)
+        meta = {"max_depth": max_depth, "classes": np.asarray(forest.classes_).tolist()}
+        return cls(arrays, meta)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return np.asarray(self.meta["classes"])
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.value[self._leaves(X)].mean(axis=1)
+
+
+class ArrayIsolationForest(_ArrayForest):
+    """
+    IsolationForest.decision_function(). Each node stores the path-length
+    term sklearn adds at that leaf (depth + average_path_length(n_samples)),
+    so scoring is one gather and a sum per row.
+    """
+
+    kind = "isolation_forest"
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "ArrayIsolationForest":
+        from sklearn.ensemble._iforest import _average_path_length
+
+        trees = []
+        for estimator, features in zip(forest.estimators_, forest.estimators_features_):
+            tree = estimator.tree_
+            depth = np.zeros(tree.node_count)
+            # sklearn stores parents before children, so one forward pass works
+            for node in range(tree.node_count):
+                if tree.children_left[node] != -1:
+                    depth[tree.children_left[node]] = depth[node] + 1
+                    depth[tree.children_right[node]] = depth[node] + 1
+            values = depth + _average_path_length(tree.n_node_samples)
+            trees.append((tree, features, values))
+        arrays, max_depth = cls._flatten(trees)
+        meta = {
+            "max_depth": max_depth,
+            "denominator": float(
+                len(forest.estimators_) * _average_path_length([forest._max_samples])[0]
+            ),
+            "offset": float(forest.offset_),
+        }
+        return cls(arrays, meta)
+
+    def score_samples(self, X) -> np.ndarray:
+        depths = self.value[self._leaves(X)].sum(axis=1)
+        denominator = self.meta["denominator"]
+        if denominator == 0:
+            return -np.full(depths.shape, 0.5)
+        return -(2 ** (-depths / denominator))
+
+    def decision_function(self, X) -> np.ndarray:
+        return self.score_samples(X) - self.meta["offset"]
+
+    def predict(self, X) -> np.ndarray:
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+
+ARRAY_MODELS = {
+    cls.kind: cls for cls in (ArrayScaler, ArrayForestClassifier, ArrayIsolationForest)
+}
+
+# sklearn class name → array-backed replacement
+SKLEARN_CONVERTERS = {
+    "StandardScaler": ArrayScaler,
+    "RandomForestClassifier": ArrayForestClassifier,
+    "IsolationForest": ArrayIsolationForest,
+}
@@ -0,0 +1,444 @@
+"""
+Model artifact publishing and loading.
+
+Training jobs run in a separate process while the API keeps serving
+predictions from the same weights directory. Every artifact is written to a
+temp file next to its final path and swapped in with os.replace(), so a
+concurrent _load_model() either sees the previous weights or the new ones —
+never a half-written pickle.
+
+Bundles
+───────
+publish() writes plain pickles (the original format, still read as a
+fallback). Models now publish a *bundle* instead — a directory with a
+manifest.json and one file per array / blob:
+
+  weights/<bundle>/manifest.json         format version, bundle version,
+                                         component kinds, sha256 per file
+  weights/<bundle>/<comp>.<field>.<h>.npy  forest / scaler / idf arrays —
+                                         np.load(mmap_mode="r"), so workers
+                                         share pages via the page cache
+  weights/<bundle>/<comp>.model.<h>.ubj  XGBoost native UBJSON
+  weights/<bundle>/<comp>.vocab.<h>.txt  TF-IDF terms, one per line in
+                                         column order
+
+Data files are content-addressed and written before the manifest, so
+os.replace() of manifest.json is the single commit point. Files of the
+previous manifest are kept one generation for readers mid-load.
+
+load_bundle() verifies hashes on first load, then caches the decoded
+components per process until the manifest changes on disk — predictions
+no longer unpickle weights on every call.
+
+    python -m app.ml.artifacts convert   # legacy pickles → bundles
+    python -m app.ml.artifacts verify    # re-hash every bundle
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+WEIGHTS_DIR = os.path.join(os.path.dirname(__file__), "weights")
+
+BUNDLE_FORMAT = "uwazi-model-bundle"
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+class ArtifactIntegrityError(Exception):
+    """A bundle file is missing or its hash doesn't match the manifest."""
+
+
+def publish(artifacts: dict[str, object]) -> None:
+    """
+    Atomically publish {path: object} pickles.
+
+    All files are staged first; nothing is replaced unless every artifact
+    serialised successfully, so a model and its scaler stay in step.
+    """
+    staged: list[tuple[str, str]] = []
+    try:
+        for path, obj in artifacts.items():
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(obj, f)
+                f.flush()
+                os.fsync(f.fileno())
+            staged.append((tmp_path, path))
+    except BaseException:
+        for tmp_path, _ in staged:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        raise
+
+    for tmp_path, path in staged:
+        os.replace(tmp_path, path)
+
+
+def artifact_version(*paths: str) -> Optional[str]:
+    """
+    Short fingerprint of the published files at `paths` (mtime + size), or
+    None if none exist. Changes whenever publish() swaps in new weights, so
+    it can be stored next to predictions to detect ones made by old models.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        parts.append(f"{os.path.basename(path)}:{st.st_mtime_ns}:{st.st_size}")
+    if not parts:
+        return None
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+# ── Bundles ───────────────────────────────────────────────────────────────────
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _npy_bytes(array) -> bytes:
+    import numpy as np
+
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(array), allow_pickle=False)
+    return buf.getvalue()
+
+
+def _encode(obj) -> tuple[str, dict[str, tuple[str, bytes]], dict]:
+    """
+    obj → (kind, {field: (extension, bytes)}, meta). Known model types get
+    a pickle-free encoding; anything else is stored as a pickle blob.
+    """
+    from app.ml.array_models import ARRAY_MODELS, SKLEARN_CONVERTERS
+
+    cls_name = type(obj).__name__
+    if cls_name in SKLEARN_CONVERTERS:
+        obj = SKLEARN_CONVERTERS[cls_name].from_sklearn(obj)
+    if getattr(obj, "kind", None) in ARRAY_MODELS:
+        arrays, meta = obj.to_arrays()
+        return obj.kind, {k: ("npy", _npy_bytes(v)) for k, v in arrays.items()}, meta
+
+    if cls_name in ("XGBClassifier", "XGBRegressor"):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.ubj")
+            obj.save_model(path)
+            with open(path, "rb") as f:
+                data = f.read()
+        return "xgboost", {"model": ("ubj", data)}, {"class": cls_name}
+
+    if cls_name == "TfidfVectorizer":
+        terms = sorted(obj.vocabulary_, key=obj.vocabulary_.__getitem__)
+        params = {
+            k: v
+            for k, v in obj.get_params().items()
+            if k not in ("dtype", "vocabulary", "preprocessor", "tokenizer")
+            and not callable(v)
+        }
+        params["ngram_range"] = list(params["ngram_range"])
+        if isinstance(params.get("stop_words"), (set, frozenset)):
+            params["stop_words"] = sorted(params["stop_words"])
+        return (
+            "tfidf",
+            {
+                "vocab": ("txt", "\n".join(terms).encode("utf-8")),
+                "idf": ("npy", _npy_bytes(obj.idf_)),
+            },
+            {"params": params},
+        )
+
+    return "pickle", {"object": ("pkl", pickle.dumps(obj))}, {"class": cls_name}
+
+
+def _decode(kind: str, files: dict[str, str], meta: dict):
+    """Inverse of _encode(); `files` maps field → absolute path."""
+    if kind == "pickle":
+        with open(files["object"], "rb") as f:
+            return pickle.load(f)
+
+    import numpy as np
+
+    from app.ml.array_models import ARRAY_MODELS
+
+    if kind in ARRAY_MODELS:
+        arrays = {k: np.load(p, mmap_mode="r", allow_pickle=False) for k, p in files.items()}
+        return ARRAY_MODELS[kind].from_arrays(arrays, meta)
+
+    if kind == "xgboost":
+        import xgboost
+
+        model = getattr(xgboost, meta.get("class", "XGBClassifier"))()
+        model.load_model(files["model"])
+        return model
+
+    if kind == "tfidf":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        with open(files["vocab"], encoding="utf-8") as f:
+            terms = f.read().split("\n")
+        params = {**meta["params"], "ngram_range": tuple(meta["params"]["ngram_range"])}
+        vectorizer = TfidfVectorizer(
+            **params, vocabulary={t: i for i, t in enumerate(terms)}
+        )
+        vectorizer.idf_ = np.load(files["idf"], mmap_mode="r", allow_pickle=False)
+        return vectorizer
+
+    raise ValueError(f"Unknown artifact kind '{kind}'")
+
+
+def read_manifest(bundle_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(bundle_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ArtifactIntegrityError(f"{bundle_dir}: not a model bundle")
+    if manifest.get("format_version", 0) > BUNDLE_FORMAT_VERSION:
+        raise ArtifactIntegrityError(
+            f"{bundle_dir}: bundle format v{manifest['format_version']} is newer "
+            f"than this code (v{BUNDLE_FORMAT_VERSION})"
+        )
+    return manifest
+
+
+def publish_bundle(
+    bundle_dir: str, components: dict[str, Any], meta: Optional[dict] = None
+) -> dict:
+    """
+    Publish named model components to `bundle_dir` and return the manifest.
+
+    Components not named here carry over from the current manifest (like
+    publish() leaving other pickles alone), so e.g. retraining only the
+    IsolationForest keeps the RandomForest.
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    previous = read_manifest(bundle_dir)
+    entries = dict(previous["components"]) if previous else {}
+
+    for name, obj in components.items():
+        kind, fields, comp_meta = _encode(obj)
+        files = {}
+        for field, (ext, data) in fields.items():
+            sha = hashlib.sha256(data).hexdigest()
+            filename = f"{name}.{field}.{sha[:16]}.{ext}"
+            path = os.path.join(bundle_dir, filename)
+            if not os.path.exists(path):
+                _write_atomic(path, data)
+            files[field] = {"path": filename, "sha256": sha, "bytes": len(data)}
+        entries[name] = {"kind": kind, "files": files, "meta": comp_meta}
+
+    version = hashlib.sha256(
+        "|".join(
+            f"{name}:{f['sha256']}"
+            for name, entry in sorted(entries.items())
+            for f in entry["files"].values()
+        ).encode()
+    ).hexdigest()[:12]
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "meta": {**(previous or {}).get("meta", {}), **(meta or {})},
+        "components": entries,
+    }
+    _write_atomic(
+        os.path.join(bundle_dir, MANIFEST),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    _collect_garbage(bundle_dir, manifest, previous)
+    return manifest
+
+
+def _manifest_files(manifest: Optional[dict]) -> set[str]:
+    if not manifest:
+        return set()
+    return {
+        f["path"] for entry in manifest["components"].values() for f in entry["files"].values()
+    }
+
+
+def _collect_garbage(bundle_dir: str, current: dict, previous: Optional[dict]) -> None:
+    keep = _manifest_files(current) | _manifest_files(previous) | {MANIFEST}
+    for filename in os.listdir(bundle_dir):
+        if filename not in keep and not filename.startswith("."):
+            try:
+                os.unlink(os.path.join(bundle_dir, filename))
+            except OSError:
+                pass
+
+
+def verify_bundle(bundle_dir: str) -> list[str]:
+    """Problems found re-hashing every file in the manifest (empty = OK)."""
+    manifest = read_manifest(bundle_dir)
+    if manifest is None:
+        return [f"{bundle_dir}: no manifest"]
+    problems = []
+    for name, entry in manifest["components"].items():
+        for field, f in entry["files"].items():
+            path = os.path.join(bundle_dir, f["path"])
+            if not os.path.exists(path):
+                problems.append(f"{name}.{field}: missing {f['path']}")
+            elif _sha256_file(path) != f["sha256"]:
+                problems.append(f"{name}.{field}: sha256 mismatch for {f['path']}")
+    return problems
+
+
+_bundle_cache: dict[str, tuple[tuple, dict]] = {}
+_bundle_lock = threading.Lock()
+
+
+def _manifest_stamp(bundle_dir: str) -> Optional[tuple]:
+    try:
+        st = os.stat(os.path.join(bundle_dir, MANIFEST))
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load_bundle(bundle_dir: str, verify: bool = True) -> Optional[dict[str, Any]]:
+    """
+    Decoded {component: object} for a bundle, or None if none is published.
+    Cached per process and reloaded when manifest.json is replaced.
+    """
+    stamp = _manifest_stamp(bundle_dir)
+    if stamp is None:
+        return None
+    cached = _bundle_cache.get(bundle_dir)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with _bundle_lock:
+        cached = _bundle_cache.get(bundle_dir)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        manifest = read_manifest(bundle_dir)
+        if manifest is None:
+            return None
+        if verify:
+            problems = verify_bundle(bundle_dir)
+            if problems:
+                raise ArtifactIntegrityError("; ".join(problems))
+        components = {
+            name: _decode(
+                entry["kind"],
+                {k: os.path.join(bundle_dir, f["path"]) for k, f in entry["files"].items()},
+                entry["meta"],
+            )
+            for name, entry in manifest["components"].items()
+        }
+        _bundle_cache[bundle_dir] = (stamp, components)
+        return components
+
+
+def bundle_version(bundle_dir: str) -> Optional[str]:
+    """Manifest version (hash of every component file), or None."""
+    manifest = read_manifest(bundle_dir)
+    return manifest["version"] if manifest else None
+
+
+def has_component(bundle_dir: str, name: str) -> bool:
+    manifest = read_manifest(bundle_dir)
+    return bool(manifest) and name in manifest["components"]
+
+
+def load_pickle(path: str):
+    """Legacy single-file artifact, or None if absent."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+# bundle dir name → {component: legacy pickle filename}
+LEGACY_PICKLES = {
+    "xgb_risk": {"model": "xgb_risk_model.pkl", "scaler": "xgb_scaler.pkl"},
+    "price_anomaly": {"model": "price_anomaly_if.pkl", "encoders": "price_anomaly_encoders.pkl"},
+    "supplier_risk": {
+        "scaler": "supplier_scaler.pkl",
+        "rf": "supplier_rf.pkl",
+        "if": "supplier_if.pkl",
+    },
+    "collusion_tfidf": {"vectorizer": "collusion_tfidf.pkl"},
+}
+
+
+def convert_legacy(weights_dir: str = WEIGHTS_DIR) -> dict[str, Optional[str]]:
+    """Publish a bundle for every model that only has legacy pickles."""
+    converted = {}
+    for bundle, components in LEGACY_PICKLES.items():
+        objects = {}
+        for name, filename in components.items():
+            obj = load_pickle(os.path.join(weights_dir, filename))
+            if obj is None:
+                continue
+            if name == "encoders":  # price_anomaly stored {"scaler": scaler}
+                name, obj = "scaler", obj["scaler"]
+            objects[name] = obj
+        if objects:
+            manifest = publish_bundle(
+                os.path.join(weights_dir, bundle), objects, meta={"converted_from": "pickle"}
+            )
+            converted[bundle] = manifest["version"]
+        else:
+            converted[bundle] = None
+    return converted
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Model artifact bundles.")
+    parser.add_argument("command", choices=["convert", "verify"])
+    parser.add_argument("--weights-dir", default=WEIGHTS_DIR)
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        print(json.dumps(convert_legacy(args.weights_dir), indent=2))
+    else:
+        failed = False
+        for bundle in sorted(LEGACY_PICKLES):
+            path = os.path.join(args.weights_dir, bundle)
+            if read_manifest(path) is None:
+                continue
+            problems = verify_bundle(path)
+            failed |= bool(problems)
+            print(f"{bundle}: {'OK' if not problems else '; '.join(problems)}")
+        raise SystemExit(1 if failed else 0)
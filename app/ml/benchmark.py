@@ -0,0 +1,224 @@
+"""
+Per-model inference benchmark: row-at-a-time predict() vs predict_batch().
+
+Run:
+    python -m app.ml.benchmark                  # published weights (or fallbacks)
+    python -m app.ml.benchmark --train          # train throwaway models first
+    python -m app.ml.benchmark --sizes 1 100 10000 --repeat 5
+
+--train fits each model on synthetic data into a temp directory, so the
+weights in app/ml/weights are never touched. The row loop is extrapolated
+from at most --loop-cap rows; at 10k rows it would otherwise dominate the run.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import numpy as np
+
+from app.ml import price_anomaly, supplier_risk, xgb_risk_model
+
+DEFAULT_SIZES = (1, 100, 10_000)
+
+
+# ── Synthetic columnar inputs ─────────────────────────────────────────────────
+
+
+def supplier_columns(n: int, rng: np.random.Generator) -> dict:
+    return {
+        "company_age_days": rng.integers(10, 5000, n),
+        "tax_filings_count": rng.integers(0, 10, n),
+        "director_company_count": rng.integers(0, 6, n),
+        "has_physical_address": rng.random(n) > 0.3,
+        "has_online_presence": rng.random(n) > 0.5,
+        "past_contracts_count": rng.integers(0, 40, n),
+        "past_contracts_value": rng.uniform(0, 5e8, n),
+        "employee_count": rng.integers(0, 500, n),
+    }
+
+
+def price_columns(n: int, rng: np.random.Generator) -> dict:
+    benchmark = rng.uniform(100, 100_000, n)
+    return {
+        "price": benchmark * rng.uniform(0.7, 3.0, n),
+        "benchmark_avg": benchmark,
+        "estimated_value": rng.uniform(1e5, 5e8, n),
+        "category": rng.choice(list(price_anomaly.CATEGORY_MAP), n),
+        "county": rng.choice(list(price_anomaly.COUNTY_MAP), n),
+    }
+
+
+def xgb_columns(n: int, rng: np.random.Generator) -> dict:
+    bids = rng.integers(1, 15, n)
+    return {
+        "price_deviation_pct": rng.uniform(-10, 400, n),
+        "supplier_ghost_prob": rng.random(n),
+        "spec_restrictiveness": rng.uniform(0, 100, n),
+        "estimated_value": rng.uniform(1e5, 5e8, n),
+        "procurement_method": rng.choice(
+            [k for k in xgb_risk_model.PROCUREMENT_METHOD_ENC if k], n
+        ),
+        "entity_history_score": rng.uniform(0, 100, n),
+        "deadline_days": rng.integers(1, 60, n),
+        "bid_count": bids,
+        "single_bidder": bids == 1,
+        "political_proximity_days": rng.integers(0, 365, n),
+    }
+
+
+def _rows(columns: dict, n: int) -> Iterator[dict]:
+    for i in range(n):
+        yield {k: v[i].item() if hasattr(v[i], "item") else v[i] for k, v in columns.items()}
+
+
+def _supplier_row(row: dict) -> dict:
+    count = row.pop("director_company_count")
+    return {**row, "directors": [{"other_companies": [None] * count}]}
+
+
+MODELS: dict[str, tuple[Callable, Callable, Callable, Callable]] = {
+    # name: (columns, predict, predict_batch, row adapter)
+    "supplier_risk": (
+        supplier_columns,
+        supplier_risk.predict,
+        supplier_risk.predict_batch,
+        _supplier_row,
+    ),
+    "price_anomaly": (
+        price_columns,
+        price_anomaly.predict,
+        price_anomaly.predict_batch,
+        lambda row: row,
+    ),
+    "xgb_risk_model": (
+        xgb_columns,
+        xgb_risk_model.predict,
+        xgb_risk_model.predict_batch,
+        lambda row: row,
+    ),
+}
+
+
+# ── Throwaway training ────────────────────────────────────────────────────────
+
+
+@contextmanager
+def _temp_weights() -> Iterator[str]:
+    """Point every model's weight locations at a temp dir for the duration."""
+    saved = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for module in (supplier_risk, price_anomaly, xgb_risk_model):
+            for attr in dir(module):
+                if attr.endswith(("_PATH", "BUNDLE_DIR")):
+                    path = getattr(module, attr)
+                    saved.append((module, attr, path))
+                    setattr(module, attr, os.path.join(tmp, os.path.basename(path)))
+        try:
+            yield tmp
+        finally:
+            for module, attr, path in saved:
+                setattr(module, attr, path)
+
+
+def _train_all(rng: np.random.Generator, n: int = 2000) -> None:
+    cols = supplier_columns(n, rng)
+    records = [_supplier_row(r) for r in _rows(cols, n)]
+    for record in records:
+        record["is_ghost"] = record["tax_filings_count"] == 0
+    supplier_risk.train(records)
+
+    price_anomaly.train(list(_rows(price_columns(n, rng), n)))
+    xgb_risk_model.train_with_synthetic_data()
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_model(
+    name: str, sizes, repeat: int, loop_cap: int, rng: np.random.Generator
+) -> list[dict]:
+    make_columns, predict, predict_batch, adapt = MODELS[name]
+    results = []
+    for n in sizes:
+        columns = make_columns(n, rng)
+        loop_n = min(n, loop_cap)
+        rows = [adapt(r) for r in _rows(columns, loop_n)]
+
+        loop_s = _best_of(lambda: [predict(**r) for r in rows], repeat) * n / loop_n
+        batch_s = _best_of(lambda: predict_batch(columns), repeat)
+        results.append(
+            {
+                "model": name,
+                "rows": n,
+                "model_used": predict_batch({k: v[:1] for k, v in columns.items()})[
+                    "model_used"
+                ],
+                "loop_ms": round(loop_s * 1000, 3),
+                "loop_extrapolated": loop_n < n,
+                "batch_ms": round(batch_s * 1000, 3),
+                "speedup": round(loop_s / batch_s, 1) if batch_s else None,
+            }
+        )
+    return results
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    rng = np.random.default_rng(args.seed)
+    names = args.models or list(MODELS)
+
+    def bench() -> list[dict]:
+        return [
+            row
+            for name in names
+            for row in bench_model(name, args.sizes, args.repeat, args.loop_cap, rng)
+        ]
+
+    if not args.train:
+        return bench()
+    with _temp_weights():
+        _train_all(rng)
+        return bench()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark predict() vs predict_batch().")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loop-cap", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--train", action="store_true", help="Train throwaway models in a temp dir first"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'model':16s} {'rows':>7s} {'loop ms':>11s} {'batch ms':>10s} {'×':>7s}  model_used")
+        for r in results:
+            loop = f"{r['loop_ms']:.2f}{'*' if r['loop_extrapolated'] else ''}"
+            print(
+                f"{r['model']:16s} {r['rows']:7d} {loop:>11s} {r['batch_ms']:10.2f}"
+                f" {r['speedup'] or 0:7.1f}  {r['model_used']}"
+            )
+        print("* extrapolated from --loop-cap rows")
@@ -24,6 +24,10 @@ PROPOSAL TEXT SIGNALS (from proposal)
   - Same company submitting multiple bids via fronts
   - Proposal matches spec template exactly → leak indicator
 
+Co-bidders linked through shared directors (SupplierNetworkIndex, see
+services/supplier_network_service.py) are flagged as "front_company" pairs
+regardless of how their proposal texts compare.
+
 OUTPUT per bid pair
 -------------------
   similarity_score: float  0.0–1.0
@@ -32,11 +36,20 @@ OUTPUT per bid pair
 """
 
 import os
-import pickle
 from typing import Optional
 
 import numpy as np
 
+from app.ml.artifacts import (
+    artifact_version,
+    bundle_version,
+    load_bundle,
+    load_pickle,
+    publish_bundle,
+)
+
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "weights", "collusion_tfidf")
+# Legacy pickle — read only when no bundle has been published yet
 VECTORIZER_PATH = os.path.join(
     os.path.dirname(__file__), "weights", "collusion_tfidf.pkl"
 )
@@ -66,17 +79,20 @@ def fit_vectorizer(all_texts: list[str]) -> None:
     )
     vectorizer.fit(all_texts)
 
-    os.makedirs(os.path.dirname(VECTORIZER_PATH), exist_ok=True)
-    with open(VECTORIZER_PATH, "wb") as f:
-        pickle.dump(vectorizer, f)
+    publish_bundle(BUNDLE_DIR, {"vectorizer": vectorizer})
     print(f"TF-IDF vectorizer fitted on {len(all_texts)} texts")
 
 
 def _load_vectorizer():
-    if not os.path.exists(VECTORIZER_PATH):
-        return None
-    with open(VECTORIZER_PATH, "rb") as f:
-        return pickle.load(f)
+    bundle = load_bundle(BUNDLE_DIR)
+    if bundle is not None:
+        return bundle["vectorizer"]
+    return load_pickle(VECTORIZER_PATH)
+
+
+def model_version() -> str:
+    """Version tag for persisted predictions ("untrained" without a vectorizer)."""
+    return bundle_version(BUNDLE_DIR) or artifact_version(VECTORIZER_PATH) or "untrained"
 
 
 # ── Collusion Detection ────────────────────────────────────────────────────────
@@ -85,6 +101,7 @@ def _load_vectorizer():
 def detect_bid_collusion(
     bids: list[dict],  # [{supplier_id, bid_amount, proposal_text}]
     tender_spec_text: Optional[str] = None,
+    network=None,  # SupplierNetworkIndex — flags co-bidders sharing directors
 ) -> dict:
     """
     Analyse bids on a single tender for collusion signals.
@@ -104,20 +121,54 @@ def detect_bid_collusion(
         flagged: bool
     }
     """
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-
     texts = [b.get("proposal_text", "") or "" for b in bids]
     supplier_ids = [str(b.get("supplier_id", i)) for i, b in enumerate(bids)]
 
-    # Need at least 2 bids to compare
-    if len(bids) < 2 or all(len(t.strip()) < 50 for t in texts):
-        return {
-            "collusion_pairs": [],
-            "max_similarity": 0.0,
-            "collusion_risk_score": 0.0,
-            "flagged": False,
-        }
+    collusion_pairs = []
+    if network is not None and len(bids) >= 2:
+        for a, b, shared in network.linked_pairs(supplier_ids):
+            collusion_pairs.append(
+                {
+                    "supplier_a": a,
+                    "supplier_b": b,
+                    "similarity": 0.0,
+                    "collusion_type": "front_company",
+                    "shared_directors": shared,
+                }
+            )
+
+    # Need at least 2 bids with real text to compare
+    if len(bids) >= 2 and not all(len(t.strip()) < 50 for t in texts):
+        collusion_pairs.extend(_text_collusion_pairs(texts, supplier_ids, tender_spec_text))
+
+    max_sim = max((p["similarity"] for p in collusion_pairs), default=0.0)
+
+    # Risk score: 0-100 based on number and severity of collusion pairs
+    if not collusion_pairs:
+        risk_score = 0.0
+    else:
+        # Scale: one critical pair = 80, each additional = +10
+        risk_score = min(80 + (len(collusion_pairs) - 1) * 10, 100.0)
+        # Boost for template leak / director-linked bidders (more serious)
+        if any(
+            p["collusion_type"] in ("template_leak", "front_company")
+            for p in collusion_pairs
+        ):
+            risk_score = min(risk_score + 15, 100.0)
+
+    return {
+        "collusion_pairs": collusion_pairs,
+        "max_similarity": max_sim,
+        "collusion_risk_score": round(risk_score, 2),
+        "flagged": len(collusion_pairs) > 0,
+    }
+
+
+def _text_collusion_pairs(
+    texts: list[str], supplier_ids: list[str], tender_spec_text: Optional[str]
+) -> list[dict]:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
 
     # Use fitted vectorizer if available, otherwise fit on the fly
     vectorizer = _load_vectorizer()
@@ -129,7 +180,7 @@ def detect_bid_collusion(
     sim_matrix = cosine_similarity(bid_vectors)
 
     collusion_pairs = []
-    n = len(bids)
+    n = len(texts)
 
     for i in range(n):
         for j in range(i + 1, n):
@@ -159,25 +210,7 @@ def detect_bid_collusion(
                         "collusion_type": "template_leak",
                     }
                 )
-
-    max_sim = max((p["similarity"] for p in collusion_pairs), default=0.0)
-
-    # Risk score: 0-100 based on number and severity of collusion pairs
-    if not collusion_pairs:
-        risk_score = 0.0
-    else:
-        # Scale: one critical pair = 80, each additional = +10
-        risk_score = min(80 + (len(collusion_pairs) - 1) * 10, 100.0)
-        # Boost for template leak (more serious)
-        if any(p["collusion_type"] == "template_leak" for p in collusion_pairs):
-            risk_score = min(risk_score + 15, 100.0)
-
-    return {
-        "collusion_pairs": collusion_pairs,
-        "max_similarity": max_sim,
-        "collusion_risk_score": round(risk_score, 2),
-        "flagged": len(collusion_pairs) > 0,
-    }
+    return collusion_pairs
 
 
 def analyse_cross_tender_collusion(
@@ -0,0 +1,98 @@
+"""
+Columnar input helpers for the predict_batch() functions.
+
+Batch inputs are "dict of columns": a plain dict of lists / numpy arrays,
+or a pandas DataFrame (anything supporting `name in data` and `data[name]`).
+Missing columns and None/NaN cells fall back to the same defaults the
+single-row predict() functions always used.
+"""
+
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+Columns = Mapping[str, Any]
+
+
+def records_to_columns(records: list[dict], names: list[str]) -> dict[str, list]:
+    """[{a: 1, b: 2}, …] → {a: [1, …], b: [2, …]} restricted to `names`."""
+    return {name: [r.get(name) for r in records] for name in names}
+
+
+def n_rows(data: Columns) -> int:
+    for name in data.keys():
+        return len(data[name])
+    return 0
+
+
+def _missing(arr: np.ndarray) -> np.ndarray:
+    if arr.dtype == object:
+        return np.fromiter(
+            (v is None or (isinstance(v, float) and v != v) for v in arr),
+            dtype=bool,
+            count=arr.size,
+        )
+    if arr.dtype.kind == "f":
+        return np.isnan(arr)
+    return np.zeros(arr.shape, dtype=bool)
+
+
+def numeric(data: Columns, name: str, n: int, default: float = 0.0) -> np.ndarray:
+    """Float column; absent column or None/NaN cells → `default`."""
+    if name not in data:
+        return np.full(n, default, dtype=float)
+    arr = np.asarray(data[name])
+    if arr.dtype.kind in "biu":
+        return arr.astype(float)
+    if arr.dtype.kind == "f" and not np.isnan(arr).any():
+        return arr
+    arr = arr.astype(object) if arr.dtype.kind != "f" else arr.copy()
+    arr[_missing(arr)] = default
+    return arr.astype(float)
+
+
+def flag(data: Columns, name: str, n: int) -> np.ndarray:
+    """0/1 column from truthy values; absent/None → 0."""
+    if name not in data:
+        return np.zeros(n, dtype=float)
+    arr = np.asarray(data[name])
+    if arr.dtype == bool or arr.dtype.kind in "biuf":
+        return (np.nan_to_num(arr.astype(float)) != 0).astype(float)
+    return np.fromiter((bool(v) for v in arr), dtype=bool, count=len(arr)).astype(float)
+
+
+def is_false(data: Columns, name: str, n: int) -> np.ndarray:
+    """
+    True only where the value is explicitly False (bool or np.bool_); None,
+    absent and numeric 0 → False, matching the per-row `is False` checks.
+    """
+    if name not in data:
+        return np.zeros(n, dtype=bool)
+    arr = np.asarray(data[name], dtype=object)
+    return np.fromiter((v is False or v is np.False_ for v in arr), dtype=bool, count=len(arr))
+
+
+def encoded(
+    data: Columns,
+    name: str,
+    n: int,
+    mapping: Mapping[Optional[str], int],
+    default: int,
+    lower: bool = False,
+) -> np.ndarray:
+    """
+    Map a string column through `mapping` (unknown → `default`). Each
+    distinct value is looked up once, then broadcast with the inverse index.
+    """
+    if name not in data:
+        return np.full(n, mapping.get(None, default), dtype=float)
+    arr = np.asarray(data[name], dtype=object)
+    missing = _missing(arr)
+    arr = np.where(missing, "", arr).astype(str)
+    if lower:
+        arr = np.char.lower(arr)
+    uniques, inverse = np.unique(arr, return_inverse=True)
+    codes = np.array(
+        [mapping.get(u if u else None, default) for u in uniques], dtype=float
+    )
+    return codes[inverse]
@@ -28,11 +28,21 @@ OUTPUT
 """
 
 import os
-import pickle
 from typing import Optional
 
 import numpy as np
 
+from app.ml.artifacts import (
+    artifact_version,
+    bundle_version,
+    load_bundle,
+    load_pickle,
+    publish_bundle,
+)
+from app.ml.columnar import Columns, encoded, n_rows, numeric, records_to_columns
+
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "weights", "price_anomaly")
+# Legacy pickles — read only when no bundle has been published yet
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "weights", "price_anomaly_if.pkl")
 ENCODER_PATH = os.path.join(
     os.path.dirname(__file__), "weights", "price_anomaly_encoders.pkl"
@@ -75,6 +85,26 @@ COUNTY_MAP = {
 }
 
 
+INPUT_COLUMNS = ["price", "benchmark_avg", "estimated_value", "category", "county"]
+
+
+def _feature_matrix(data: Columns) -> np.ndarray:
+    """Columnar inputs → (n, 6) feature matrix in the FEATURES order above."""
+    n = n_rows(data)
+    price = numeric(data, "price", n)
+    benchmark = numeric(data, "benchmark_avg", n)
+    return np.column_stack(
+        [
+            price,
+            benchmark,
+            (price - benchmark) / np.maximum(benchmark, 1.0),
+            np.log1p(np.maximum(numeric(data, "estimated_value", n), 0)),
+            encoded(data, "category", n, CATEGORY_MAP, CATEGORY_MAP["other"], lower=True),
+            encoded(data, "county", n, COUNTY_MAP, COUNTY_MAP["other"], lower=True),
+        ]
+    )
+
+
 def build_feature_vector(
     price: float,
     benchmark_avg: float,
@@ -82,22 +112,14 @@ def build_feature_vector(
     category: Optional[str],
     county: Optional[str],
 ) -> np.ndarray:
-    deviation_ratio = (price - benchmark_avg) / max(benchmark_avg, 1.0)
-    log_value = np.log1p(max(estimated_value, 0))
-    cat_code = CATEGORY_MAP.get((category or "").lower(), CATEGORY_MAP["other"])
-    county_code = COUNTY_MAP.get((county or "").lower(), COUNTY_MAP["other"])
-
-    return np.array(
-        [
-            [
-                price,
-                benchmark_avg,
-                deviation_ratio,
-                log_value,
-                cat_code,
-                county_code,
-            ]
-        ]
+    return _feature_matrix(
+        {
+            "price": [price],
+            "benchmark_avg": [benchmark_avg],
+            "estimated_value": [estimated_value],
+            "category": [category],
+            "county": [county],
+        }
     )
 
 
@@ -121,18 +143,7 @@ def train(training_records: list[dict]) -> None:
     from sklearn.ensemble import IsolationForest
     from sklearn.preprocessing import StandardScaler
 
-    X = np.vstack(
-        [
-            build_feature_vector(
-                r["price"],
-                r["benchmark_avg"],
-                r["estimated_value"],
-                r.get("category"),
-                r.get("county"),
-            )
-            for r in training_records
-        ]
-    )
+    X = _feature_matrix(records_to_columns(training_records, INPUT_COLUMNS))
 
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
@@ -145,14 +156,10 @@ def train(training_records: list[dict]) -> None:
     )
     model.fit(X_scaled)
 
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(model, f)
-    with open(ENCODER_PATH, "wb") as f:
-        pickle.dump({"scaler": scaler}, f)
+    publish_bundle(BUNDLE_DIR, {"model": model, "scaler": scaler})
 
     print(
-        f"Price anomaly model trained on {len(training_records)} records → {MODEL_PATH}"
+        f"Price anomaly model trained on {len(training_records)} records → {BUNDLE_DIR}"
     )
 
 
@@ -160,13 +167,22 @@ def train(training_records: list[dict]) -> None:
 
 
 def _load_model():
-    if not os.path.exists(MODEL_PATH):
+    bundle = load_bundle(BUNDLE_DIR)
+    if bundle is not None and "model" in bundle:
+        return bundle["model"], {"scaler": bundle["scaler"]}
+    model = load_pickle(MODEL_PATH)
+    if model is None:
         return None, None
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
-    with open(ENCODER_PATH, "rb") as f:
-        encoders = pickle.load(f)
-    return model, encoders
+    return model, load_pickle(ENCODER_PATH)
+
+
+def model_version() -> str:
+    """Version tag for persisted predictions ("fallback_deviation" when untrained)."""
+    return (
+        bundle_version(BUNDLE_DIR)
+        or artifact_version(MODEL_PATH, ENCODER_PATH)
+        or "fallback_deviation"
+    )
 
 
 def predict(
@@ -185,33 +201,72 @@ def predict(
         model_used: str
       }
     """
+    batch = predict_batch(
+        {
+            "price": [price],
+            "benchmark_avg": [benchmark_avg],
+            "estimated_value": [estimated_value],
+            "category": [category],
+            "county": [county],
+        }
+    )
+    return {
+        key: (value if key == "model_used" else value[0])
+        for key, value in batch.items()
+    }
+
+
+def predict_batch(data: Columns) -> dict:
+    """
+    Score many line items at once from columnar inputs (dict of lists/arrays
+    or a DataFrame; see INPUT_COLUMNS). One decision_function call covers
+    every row.
+
+    Returns columns of the predict() fields:
+    {
+        is_anomaly:    list[bool],
+        anomaly_score: list[float],
+        confidence:    list[float],
+        model_used:    str,
+    }
+    """
+    n = n_rows(data)
     model, encoders = _load_model()
 
     if model is None:
         # Model not trained yet — fall back to simple deviation
-        deviation = (price - benchmark_avg) / max(benchmark_avg, 1.0)
+        benchmark = numeric(data, "benchmark_avg", n)
+        deviation = (numeric(data, "price", n) - benchmark) / np.maximum(benchmark, 1.0)
         is_anomaly = deviation > 0.5
         return {
-            "is_anomaly": is_anomaly,
-            "anomaly_score": -deviation if is_anomaly else deviation,
-            "confidence": min(abs(deviation), 1.0),
+            "is_anomaly": is_anomaly.tolist(),
+            "anomaly_score": np.where(is_anomaly, -deviation, deviation).tolist(),
+            "confidence": np.minimum(np.abs(deviation), 1.0).tolist(),
             "model_used": "fallback_deviation",
         }
 
-    X = build_feature_vector(price, benchmark_avg, estimated_value, category, county)
-    X_scaled = encoders["scaler"].transform(X)
+    if not n:
+        return {
+            "is_anomaly": [],
+            "anomaly_score": [],
+            "confidence": [],
+            "model_used": "isolation_forest",
+        }
+
+    X_scaled = encoders["scaler"].transform(_feature_matrix(data))
 
-    # decision_function: negative = anomaly, positive = normal
-    raw_score = float(model.decision_function(X_scaled)[0])
-    is_anomaly = model.predict(X_scaled)[0] == -1
+    # decision_function: negative = anomaly, positive = normal.
+    # IsolationForest.predict() is just decision_function < 0, so reuse it.
+    raw_score = model.decision_function(X_scaled)
+    is_anomaly = raw_score < 0
 
     # Normalise to 0-1 confidence (how anomalous)
     # Raw scores typically range from -0.5 to +0.5
-    confidence = max(0.0, min(1.0, (-raw_score + 0.5)))
+    confidence = np.clip(-raw_score + 0.5, 0.0, 1.0)
 
     return {
-        "is_anomaly": is_anomaly,
-        "anomaly_score": round(raw_score, 4),
-        "confidence": round(confidence, 4),
+        "is_anomaly": is_anomaly.tolist(),
+        "anomaly_score": np.round(raw_score, 4).tolist(),
+        "confidence": np.round(confidence, 4).tolist(),
         "model_used": "isolation_forest",
     }
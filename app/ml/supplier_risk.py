@@ -33,11 +33,28 @@ OUTPUTS
 """
 
 import os
-import pickle
 from typing import Optional
 
 import numpy as np
 
+from app.ml.artifacts import (
+    artifact_version,
+    bundle_version,
+    load_bundle,
+    load_pickle,
+    publish_bundle,
+)
+from app.ml.columnar import (
+    Columns,
+    flag,
+    is_false,
+    n_rows,
+    numeric,
+    records_to_columns,
+)
+
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "weights", "supplier_risk")
+# Legacy pickles — read only when no bundle has been published yet
 RF_MODEL_PATH = os.path.join(os.path.dirname(__file__), "weights", "supplier_rf.pkl")
 IF_MODEL_PATH = os.path.join(os.path.dirname(__file__), "weights", "supplier_if.pkl")
 SCALER_PATH = os.path.join(os.path.dirname(__file__), "weights", "supplier_scaler.pkl")
@@ -54,33 +71,50 @@ FEATURE_NAMES = [
 ]
 
 
-def _build_features(
-    company_age_days: Optional[int],
-    tax_filings_count: int,
-    directors: list,
-    has_physical_address: Optional[bool],
-    has_online_presence: Optional[bool],
-    past_contracts_count: int,
-    past_contracts_value: float,
-    employee_count: Optional[int],
-) -> np.ndarray:
+# Columns accepted by predict_batch(); director_company_count may be given
+# directly or derived from a "directors" column (list of director dicts).
+INPUT_COLUMNS = [
+    "company_age_days",
+    "tax_filings_count",
+    "directors",
+    "director_company_count",
+    "has_physical_address",
+    "has_online_presence",
+    "past_contracts_count",
+    "past_contracts_value",
+    "employee_count",
+]
+
+
+def _director_company_counts(data: Columns, n: int) -> np.ndarray:
+    if "director_company_count" in data:
+        return numeric(data, "director_company_count", n)
+    if "directors" not in data:
+        return np.zeros(n)
     # Max companies any single director is linked to
-    max_dir_companies = max(
-        (len(d.get("other_companies", [])) for d in (directors or [])), default=0
+    return np.fromiter(
+        (
+            max((len(d.get("other_companies", [])) for d in (ds or [])), default=0)
+            for ds in data["directors"]
+        ),
+        dtype=float,
+        count=n,
     )
 
-    return np.array(
+
+def _feature_matrix(data: Columns) -> np.ndarray:
+    """Columnar inputs → (n, 8) feature matrix in FEATURE_NAMES order."""
+    n = n_rows(data)
+    return np.column_stack(
         [
-            [
-                company_age_days if company_age_days is not None else 365,
-                tax_filings_count,
-                max_dir_companies,
-                1 if has_physical_address else 0,
-                1 if has_online_presence else 0,
-                past_contracts_count,
-                float(np.log1p(max(past_contracts_value, 0))),
-                employee_count if employee_count is not None else 0,
-            ]
+            numeric(data, "company_age_days", n, 365),
+            numeric(data, "tax_filings_count", n),
+            _director_company_counts(data, n),
+            flag(data, "has_physical_address", n),
+            flag(data, "has_online_presence", n),
+            numeric(data, "past_contracts_count", n),
+            np.log1p(np.maximum(numeric(data, "past_contracts_value", n), 0)),
+            numeric(data, "employee_count", n),
         ]
     )
 
@@ -103,21 +137,7 @@ def train(labeled_records: list[dict]) -> None:
     from sklearn.ensemble import IsolationForest, RandomForestClassifier
     from sklearn.preprocessing import StandardScaler
 
-    X = np.vstack(
-        [
-            _build_features(
-                r.get("company_age_days"),
-                r.get("tax_filings_count", 0),
-                r.get("directors", []),
-                r.get("has_physical_address"),
-                r.get("has_online_presence"),
-                r.get("past_contracts_count", 0),
-                r.get("past_contracts_value", 0.0),
-                r.get("employee_count"),
-            )
-            for r in labeled_records
-        ]
-    )
+    X = _feature_matrix(records_to_columns(labeled_records, INPUT_COLUMNS))
     y = np.array([1 if r.get("is_ghost") else 0 for r in labeled_records])
 
     scaler = StandardScaler()
@@ -142,13 +162,7 @@ def train(labeled_records: list[dict]) -> None:
     )
     isolation_f.fit(X_scaled)
 
-    os.makedirs(os.path.dirname(RF_MODEL_PATH), exist_ok=True)
-    with open(RF_MODEL_PATH, "wb") as f:
-        pickle.dump(rf, f)
-    with open(IF_MODEL_PATH, "wb") as f:
-        pickle.dump(isolation_f, f)
-    with open(SCALER_PATH, "wb") as f:
-        pickle.dump(scaler, f)
+    publish_bundle(BUNDLE_DIR, {"scaler": scaler, "rf": rf, "if": isolation_f})
 
     # Print feature importances
     importances = sorted(
@@ -166,21 +180,7 @@ def train_unsupervised_only(records: list[dict]) -> None:
     from sklearn.ensemble import IsolationForest
     from sklearn.preprocessing import StandardScaler
 
-    X = np.vstack(
-        [
-            _build_features(
-                r.get("company_age_days"),
-                r.get("tax_filings_count", 0),
-                r.get("directors", []),
-                r.get("has_physical_address"),
-                r.get("has_online_presence"),
-                r.get("past_contracts_count", 0),
-                r.get("past_contracts_value", 0.0),
-                r.get("employee_count"),
-            )
-            for r in records
-        ]
-    )
+    X = _feature_matrix(records_to_columns(records, INPUT_COLUMNS))
 
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
@@ -188,28 +188,17 @@ def train_unsupervised_only(records: list[dict]) -> None:
     isolation_f = IsolationForest(n_estimators=200, contamination=0.20, random_state=42)
     isolation_f.fit(X_scaled)
 
-    os.makedirs(os.path.dirname(IF_MODEL_PATH), exist_ok=True)
-    with open(IF_MODEL_PATH, "wb") as f:
-        pickle.dump(isolation_f, f)
-    with open(SCALER_PATH, "wb") as f:
-        pickle.dump(scaler, f)
+    publish_bundle(BUNDLE_DIR, {"scaler": scaler, "if": isolation_f})
 
 
 # ── Inference ──────────────────────────────────────────────────────────────────
 
 
 def _load_models():
-    scaler = rf = if_model = None
-    if os.path.exists(SCALER_PATH):
-        with open(SCALER_PATH, "rb") as f:
-            scaler = pickle.load(f)
-    if os.path.exists(RF_MODEL_PATH):
-        with open(RF_MODEL_PATH, "rb") as f:
-            rf = pickle.load(f)
-    if os.path.exists(IF_MODEL_PATH):
-        with open(IF_MODEL_PATH, "rb") as f:
-            if_model = pickle.load(f)
-    return scaler, rf, if_model
+    bundle = load_bundle(BUNDLE_DIR)
+    if bundle is not None:
+        return bundle.get("scaler"), bundle.get("rf"), bundle.get("if")
+    return load_pickle(SCALER_PATH), load_pickle(RF_MODEL_PATH), load_pickle(IF_MODEL_PATH)
 
 
 def predict(
@@ -231,69 +220,89 @@ def predict(
         model_used: str
     }
     """
-    scaler, rf, if_model = _load_models()
+    batch = predict_batch(
+        {
+            "company_age_days": [company_age_days],
+            "tax_filings_count": [tax_filings_count],
+            "directors": [directors],
+            "has_physical_address": [has_physical_address],
+            "has_online_presence": [has_online_presence],
+            "past_contracts_count": [past_contracts_count],
+            "past_contracts_value": [past_contracts_value],
+            "employee_count": [employee_count],
+        }
+    )
+    return {
+        key: (value if key == "model_used" or value is None else value[0])
+        for key, value in batch.items()
+    }
 
-    X = _build_features(
-        company_age_days,
-        tax_filings_count,
-        directors,
-        has_physical_address,
-        has_online_presence,
-        past_contracts_count,
-        past_contracts_value,
-        employee_count,
+
+def model_version() -> str:
+    """Version tag for persisted predictions ("rule_based" when untrained)."""
+    return (
+        bundle_version(BUNDLE_DIR)
+        or artifact_version(SCALER_PATH, RF_MODEL_PATH, IF_MODEL_PATH)
+        or "rule_based"
     )
 
-    ghost_prob = None
-    anomaly_conf = None
-    models_used = []
 
-    if scaler is not None:
-        X_scaled = scaler.transform(X)
+def predict_batch(data: Columns) -> dict:
+    """
+    Score many suppliers at once from columnar inputs (dict of lists/arrays
+    or a DataFrame; see INPUT_COLUMNS). The feature matrix is built with
+    vectorised numpy and each model runs one call over every row.
+
+    Returns columns of the predict() fields:
+    {
+        ghost_probability:  list[float] | None,
+        anomaly_confidence: list[float] | None,
+        combined_score:     list[float],
+        model_used:         str,
+    }
+    """
+    n = n_rows(data)
+    scaler, rf, if_model = _load_models()
+    X = _feature_matrix(data) if n else np.empty((0, len(FEATURE_NAMES)))
 
+    ghost = anomaly = None
+    models_used = []
+    if scaler is not None and n:
+        X_scaled = scaler.transform(X)
         if rf is not None:
-            ghost_prob = float(rf.predict_proba(X_scaled)[0][1])  # P(ghost=1)
+            ghost = rf.predict_proba(X_scaled)[:, 1]  # P(ghost=1)
             models_used.append("random_forest")
-
         if if_model is not None:
-            raw = float(if_model.decision_function(X_scaled)[0])
-            anomaly_conf = max(0.0, min(1.0, -raw + 0.5))
+            anomaly = np.clip(-if_model.decision_function(X_scaled) + 0.5, 0.0, 1.0)
             models_used.append("isolation_forest")
 
     # Combined score: take max of available predictions, scaled to 0-100
-    scores = [s for s in [ghost_prob, anomaly_conf] if s is not None]
-    if scores:
-        combined = max(scores) * 100
+    available = [a for a in (ghost, anomaly) if a is not None]
+    if available:
+        combined = np.max(np.vstack(available), axis=0) * 100
     else:
         # Pure rule-based fallback
-        combined = _rule_based_score(
-            company_age_days,
-            tax_filings_count,
-            directors,
-            has_physical_address,
-            has_online_presence,
-        )
+        combined = _rule_based_scores(data, X, n)
         models_used.append("rule_based_fallback")
 
     return {
-        "ghost_probability": round(ghost_prob, 4) if ghost_prob is not None else None,
+        "ghost_probability": np.round(ghost, 4).tolist() if ghost is not None else None,
         "anomaly_confidence": (
-            round(anomaly_conf, 4) if anomaly_conf is not None else None
+            np.round(anomaly, 4).tolist() if anomaly is not None else None
         ),
-        "combined_score": round(combined, 2),
+        "combined_score": np.round(combined, 2).tolist(),
         "model_used": "+".join(models_used) if models_used else "none",
     }
 
 
-def _rule_based_score(age, tax_filings, directors, has_address, has_online) -> float:
+def _rule_based_scores(data: Columns, X: np.ndarray, n: int) -> np.ndarray:
     """Fallback when no model is trained — mirrors supplier_checker.py logic."""
-    score = 0.0
-    if age is not None and age < 180:
-        score += 40
-    if tax_filings == 0:
-        score += 30
-    if has_address is False:
-        score += 20
-    if has_online is False:
-        score += 10
-    return min(score, 100.0)
+    age_known = ~np.isnan(numeric(data, "company_age_days", n, np.nan))
+    filings_known = ~np.isnan(numeric(data, "tax_filings_count", n, np.nan))
+    score = (
+        40.0 * (age_known & (X[:, 0] < 180))
+        + 30.0 * (filings_known & (X[:, 1] == 0))
+        + 20.0 * is_false(data, "has_physical_address", n)
+        + 10.0 * is_false(data, "has_online_presence", n)
+    )
+    return np.minimum(score, 100.0)
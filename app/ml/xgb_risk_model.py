@@ -41,11 +41,28 @@ TRAINING DATA SOURCES (from proposal)
 """
 
 import os
-import pickle
 from typing import Optional
 
 import numpy as np
 
+from app.ml.artifacts import (
+    artifact_version,
+    bundle_version,
+    load_bundle,
+    load_pickle,
+    publish_bundle,
+)
+from app.ml.columnar import (
+    Columns,
+    encoded,
+    flag,
+    n_rows,
+    numeric,
+    records_to_columns,
+)
+
+BUNDLE_DIR = os.path.join(os.path.dirname(__file__), "weights", "xgb_risk")
+# Legacy pickles — read only when no bundle has been published yet
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "weights", "xgb_risk_model.pkl")
 SCALER_PATH = os.path.join(os.path.dirname(__file__), "weights", "xgb_scaler.pkl")
 
@@ -78,36 +95,35 @@ RISK_THRESHOLDS = {
 }
 
 
-def _build_features(
-    price_deviation_pct: float,
-    supplier_ghost_prob: float,
-    spec_restrictiveness: float,
-    estimated_value: float,
-    procurement_method: Optional[str],
-    entity_history_score: float,
-    deadline_days: Optional[int],
-    bid_count: int,
-    single_bidder: bool,
-    political_proximity_days: Optional[int],
-) -> np.ndarray:
-    return np.array(
+INPUT_COLUMNS = [
+    "price_deviation_pct",
+    "supplier_ghost_prob",
+    "spec_restrictiveness",
+    "estimated_value",
+    "procurement_method",
+    "entity_history_score",
+    "deadline_days",
+    "bid_count",
+    "single_bidder",
+    "political_proximity_days",
+]
+
+
+def _feature_matrix(data: Columns) -> np.ndarray:
+    """Columnar inputs → (n, 10) feature matrix in FEATURE_NAMES order."""
+    n = n_rows(data)
+    return np.column_stack(
         [
-            [
-                price_deviation_pct,
-                supplier_ghost_prob,
-                spec_restrictiveness / 100.0,  # normalise to 0-1
-                float(np.log1p(max(estimated_value, 0))),
-                PROCUREMENT_METHOD_ENC.get(procurement_method, 0),
-                entity_history_score / 100.0,  # normalise to 0-1
-                deadline_days if deadline_days is not None else 30,
-                bid_count,
-                1 if single_bidder else 0,
-                (
-                    political_proximity_days
-                    if political_proximity_days is not None
-                    else 365
-                ),
-            ]
+            numeric(data, "price_deviation_pct", n),
+            numeric(data, "supplier_ghost_prob", n),
+            numeric(data, "spec_restrictiveness", n) / 100.0,  # normalise to 0-1
+            np.log1p(np.maximum(numeric(data, "estimated_value", n), 0)),
+            encoded(data, "procurement_method", n, PROCUREMENT_METHOD_ENC, 0),
+            numeric(data, "entity_history_score", n) / 100.0,  # normalise to 0-1
+            numeric(data, "deadline_days", n, 30),
+            numeric(data, "bid_count", n, 1),
+            flag(data, "single_bidder", n),
+            numeric(data, "political_proximity_days", n, 365),
         ]
     )
 
@@ -138,23 +154,7 @@ def train(labeled_records: list[dict]) -> None:
     from sklearn.preprocessing import StandardScaler
     from xgboost import XGBClassifier
 
-    X = np.vstack(
-        [
-            _build_features(
-                r.get("price_deviation_pct", 0),
-                r.get("supplier_ghost_prob", 0),
-                r.get("spec_restrictiveness", 0),
-                r.get("estimated_value", 0),
-                r.get("procurement_method"),
-                r.get("entity_history_score", 0),
-                r.get("deadline_days"),
-                r.get("bid_count", 1),
-                r.get("single_bidder", False),
-                r.get("political_proximity_days"),
-            )
-            for r in labeled_records
-        ]
-    )
+    X = _feature_matrix(records_to_columns(labeled_records, INPUT_COLUMNS))
 
     y = np.array([1 if r.get("is_corrupt") else 0 for r in labeled_records])
 
@@ -193,13 +193,9 @@ def train(labeled_records: list[dict]) -> None:
     for name, imp in importances:
         print(f"  {name:30s} {imp:.4f}")
 
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(model, f)
-    with open(SCALER_PATH, "wb") as f:
-        pickle.dump(scaler, f)
+    publish_bundle(BUNDLE_DIR, {"model": model, "scaler": scaler})
 
-    print(f"XGBoost model saved → {MODEL_PATH}")
+    print(f"XGBoost model saved → {BUNDLE_DIR}")
 
 
 def train_with_synthetic_data() -> None:
@@ -260,13 +256,22 @@ def train_with_synthetic_data() -> None:
 
 
 def _load_model():
-    if not os.path.exists(MODEL_PATH):
+    bundle = load_bundle(BUNDLE_DIR)
+    if bundle is not None and "model" in bundle:
+        return bundle["model"], bundle["scaler"]
+    model = load_pickle(MODEL_PATH)
+    if model is None:
         return None, None
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
-    with open(SCALER_PATH, "rb") as f:
-        scaler = pickle.load(f)
-    return model, scaler
+    return model, load_pickle(SCALER_PATH)
+
+
+def model_version() -> str:
+    """Version tag for persisted predictions ("rule_based" when untrained)."""
+    return (
+        bundle_version(BUNDLE_DIR)
+        or artifact_version(MODEL_PATH, SCALER_PATH)
+        or "rule_based"
+    )
 
 
 def predict(
@@ -292,61 +297,83 @@ def predict(
         model_used:             str
     }
     """
-    model, scaler = _load_model()
-
-    X = _build_features(
-        price_deviation_pct,
-        supplier_ghost_prob,
-        spec_restrictiveness,
-        estimated_value,
-        procurement_method,
-        entity_history_score,
-        deadline_days,
-        bid_count,
-        single_bidder,
-        political_proximity_days,
+    batch = predict_batch(
+        {
+            "price_deviation_pct": [price_deviation_pct],
+            "supplier_ghost_prob": [supplier_ghost_prob],
+            "spec_restrictiveness": [spec_restrictiveness],
+            "estimated_value": [estimated_value],
+            "procurement_method": [procurement_method],
+            "entity_history_score": [entity_history_score],
+            "deadline_days": [deadline_days],
+            "bid_count": [bid_count],
+            "single_bidder": [single_bidder],
+            "political_proximity_days": [political_proximity_days],
+        }
     )
+    return {
+        key: (value if key == "model_used" else value[0])
+        for key, value in batch.items()
+    }
+
+
+def predict_batch(data: Columns) -> dict:
+    """
+    Predict corruption probability for many tenders from columnar inputs
+    (dict of lists/arrays or a DataFrame; see INPUT_COLUMNS) with a single
+    predict_proba call.
+
+    Returns columns of the predict() fields:
+    {
+        corruption_probability: list[float],
+        risk_score:             list[float],
+        risk_level:             list[str],
+        model_used:             str,
+    }
+    """
+    n = n_rows(data)
+    model, scaler = _load_model()
 
     if model is None:
         # Fallback to weighted composite (mirrors risk_engine.py rules)
-        prob = _rule_based_probability(
-            price_deviation_pct,
-            supplier_ghost_prob,
-            spec_restrictiveness,
-            procurement_method,
-        )
+        prob = _rule_based_probabilities(data, n)
         model_name = "rule_based_fallback"
+    elif n:
+        X_scaled = scaler.transform(_feature_matrix(data))
+        prob = model.predict_proba(X_scaled)[:, 1].astype(float)
+        model_name = "xgboost"
     else:
-        X_scaled = scaler.transform(X)
-        prob = float(model.predict_proba(X_scaled)[0][1])
+        prob = np.empty(0)
         model_name = "xgboost"
 
-    risk_score = round(prob * 100, 2)
-
-    if prob >= RISK_THRESHOLDS["critical"]:
-        risk_level = "critical"
-    elif prob >= RISK_THRESHOLDS["high"]:
-        risk_level = "high"
-    elif prob >= RISK_THRESHOLDS["medium"]:
-        risk_level = "medium"
-    else:
-        risk_level = "low"
+    risk_level = np.select(
+        [
+            prob >= RISK_THRESHOLDS["critical"],
+            prob >= RISK_THRESHOLDS["high"],
+            prob >= RISK_THRESHOLDS["medium"],
+        ],
+        ["critical", "high", "medium"],
+        default="low",
+    )
 
     return {
-        "corruption_probability": round(prob, 4),
-        "risk_score": risk_score,
-        "risk_level": risk_level,
+        "corruption_probability": np.round(prob, 4).tolist(),
+        "risk_score": np.round(prob * 100, 2).tolist(),
+        "risk_level": risk_level.tolist(),
         "model_used": model_name,
     }
 
 
-def _rule_based_probability(
-    price_dev: float, ghost_prob: float, spec_score: float, method: Optional[str]
-) -> float:
+def _rule_based_probabilities(data: Columns, n: int) -> np.ndarray:
     score = (
-        min(price_dev / 500, 1.0) * 0.40
-        + ghost_prob * 0.30
-        + (spec_score / 100) * 0.20
-        + (0.8 if method == "direct_procurement" else 0.1) * 0.10
+        np.minimum(numeric(data, "price_deviation_pct", n) / 500, 1.0) * 0.40
+        + numeric(data, "supplier_ghost_prob", n) * 0.30
+        + (numeric(data, "spec_restrictiveness", n) / 100) * 0.20
+        + np.where(
+            encoded(data, "procurement_method", n, {"direct_procurement": 1}, 0) == 1,
+            0.8,
+            0.1,
+        )
+        * 0.10
     )
-    return min(score, 1.0)
+    return np.minimum(score, 1.0)
@@ -64,8 +64,10 @@ from app.models.price_benchmark_model import PriceBenchmark  # noqa: F401
 from app.models.procuring_entity_model import ProcuringEntity  # noqa: F401
 from app.models.red_flag_model import RedFlag  # noqa: F401
 from app.models.refresh_token_model import RefreshToken
+from app.models.risk_daily_rollup_model import RiskDailyRollup  # noqa: F401
 from app.models.risk_score_model import RiskScore  # noqa: F401
 from app.models.role_model import Role
+from app.models.scraper_checkpoint_model import ScraperCheckpoint  # noqa: F401
 from app.models.supplier_model import Supplier  # noqa: F401
 from app.models.tender_document_model import TenderDocument  # noqa: F401
 from app.models.tender_model import Tender  # noqa: F401
@@ -90,10 +92,12 @@ __all__ = [
     "Bid",
     "Contract",
     "RiskScore",
+    "RiskDailyRollup",
     "RedFlag",
     "TenderDocument",
     "PriceBenchmark",
     "WhistleblowerReport",
+    "ScraperCheckpoint",
     # Association tables
     "user_roles",
     "role_permissions",
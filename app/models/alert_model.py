@@ -68,7 +68,7 @@ class Alert(Base):
     )
 
     # Relationships
-    tender = relationship("Tender", back_populates="alerts")
+    tender = relationship("Tender", back_populates="alerts", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"<Alert(id={self.id}, flag_type={self.flag_type}, severity={self.severity})>"
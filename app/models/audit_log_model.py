@@ -20,13 +20,22 @@ class AuditLog(Base):
     Immutable audit trail — one record per system action.
     Written by AuditService after every state-changing operation.
     Never delete records from this table.
+
+    On PostgreSQL the table is range-partitioned by month on performed_at
+    (audit_logs_y2026m10, …, plus audit_logs_default), which is why
+    performed_at is part of the primary key. Partitions are created ahead
+    of time and, past AUDIT_RETENTION_MONTHS, exported to an archive file
+    and detached — see services/audit_partition_service.py. Filter on
+    performed_at wherever possible so the planner can prune partitions.
     """
 
     __tablename__ = "audit_logs"
     __table_args__ = (
         Index("idx_audit_entity", "entity_type", "entity_id"),
         Index("idx_audit_performed_at", "performed_at"),
-        Index("idx_audit_user", "user_id"),
+        Index("brin_audit_performed_at", "performed_at", postgresql_using="brin"),
+        Index("idx_audit_user", "user_id", "performed_at"),
+        {"postgresql_partition_by": "RANGE (performed_at)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -36,7 +45,6 @@ class AuditLog(Base):
     user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
-        index=True,
         comment="NULL for system-initiated actions",
     )
     # What
@@ -59,11 +67,16 @@ class AuditLog(Base):
     ip_address: Mapped[Optional[str]] = mapped_column(String(45))
     user_agent: Mapped[Optional[str]] = mapped_column(String(500))
     performed_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        comment="Partition key",
     )
 
     # Relationship
-    user: Mapped[Optional["User"]] = relationship("User", back_populates="audit_logs")
+    user: Mapped[Optional["User"]] = relationship(
+        "User", back_populates="audit_logs", lazy="raise_on_sql"
+    )
 
     def __repr__(self) -> str:
         return f"<AuditLog [{self.action}] entity={self.entity_type}:{self.entity_id}>"
@@ -116,10 +116,12 @@ class Bid(Base):
     tender: Mapped["Tender"] = relationship(
         "Tender",
         back_populates="bids",
+        lazy="raise_on_sql",
     )
     supplier: Mapped["Supplier"] = relationship(
         "Supplier",
         back_populates="bids",
+        lazy="raise_on_sql",
     )
 
     # ── Constraints & indexes ─────────────────────────────────────────────────
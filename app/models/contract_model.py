@@ -115,16 +115,19 @@ class Contract(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
+        index=True,  # max() is the data-version token (data_version_service)
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
     tender: Mapped["Tender"] = relationship(
         "Tender",
         back_populates="contract",
+        lazy="raise_on_sql",
     )
     supplier: Mapped["Supplier"] = relationship(
         "Supplier",
         back_populates="contracts",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
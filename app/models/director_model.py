@@ -89,6 +89,7 @@ class Director(Base):
     supplier: Mapped["Supplier"] = relationship(
         "Supplier",
         back_populates="directors",
+        lazy="raise_on_sql",
     )
 
     # ── Composite indexes ──────────────────────────────────────────────────────
@@ -98,10 +99,6 @@ class Director(Base):
             "supplier_id",
             "national_id",
         ),
-        Index(
-            "ix_directors_national_id",
-            "national_id",
-        ),
     )
 
     def __repr__(self) -> str:
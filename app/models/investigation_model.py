@@ -92,8 +92,8 @@ class Investigation(Base):
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
-    tender: Mapped["Tender"] = relationship("Tender", lazy="select")
-    investigator: Mapped[Optional["User"]] = relationship("User", lazy="select")
+    tender: Mapped["Tender"] = relationship("Tender", lazy="raise_on_sql")
+    investigator: Mapped[Optional["User"]] = relationship("User", lazy="raise_on_sql")
 
     # ── Indexes ────────────────────────────────────────────────────────────────
     __table_args__ = (
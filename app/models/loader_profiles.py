@@ -0,0 +1,77 @@
+"""
+Named relationship-loading profiles.
+
+Relationships are declared lazy="raise_on_sql" (Tender.alerts: "noload"):
+touching one the query didn't load raises instead of issuing a hidden
+SELECT per row — which under asyncio would be a MissingGreenlet anyway.
+Each query states what it reads by naming a profile:
+
+    select(Tender).options(*load_profile(Tender, "detail"))
+
+Tender
+    list      entity + risk_score, red_flags, bids, documents — the list
+              endpoints serialise all of them
+    detail    to-ones (risk_score, contract, entity) joined, red_flags
+              selectin; bids are read separately with supplier names
+    scoring   bids, contract, entity, risk_score — compute_and_save_risk,
+              the fingerprint and the investigation package
+    export    entity only — one flat row per tender; callers that filter or
+              sort on RiskScore join it explicitly (dashboard tops)
+
+Supplier
+    list / detail   directors + contracts
+    scoring         directors (supplier rules, fingerprint)
+
+User
+    auth      roles + their permissions (require_role / require_permission)
+
+Statement counts per endpoint are pinned by `python -m app.core.sql_budget`.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.role_model import Role
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+from app.models.user_model import User
+
+PROFILES: dict[type, dict[str, tuple]] = {
+    Tender: {
+        "list": (
+            joinedload(Tender.entity),
+            selectinload(Tender.risk_score),
+            selectinload(Tender.red_flags),
+            selectinload(Tender.bids),
+            selectinload(Tender.documents),
+        ),
+        "detail": (
+            joinedload(Tender.risk_score),
+            joinedload(Tender.contract),
+            joinedload(Tender.entity),
+            selectinload(Tender.red_flags),
+        ),
+        "scoring": (
+            selectinload(Tender.bids),
+            joinedload(Tender.contract),
+            joinedload(Tender.entity),
+            joinedload(Tender.risk_score),
+        ),
+        "export": (joinedload(Tender.entity),),
+    },
+    Supplier: {
+        "list": (selectinload(Supplier.directors), selectinload(Supplier.contracts)),
+        "detail": (selectinload(Supplier.directors), selectinload(Supplier.contracts)),
+        "scoring": (selectinload(Supplier.directors),),
+    },
+    User: {
+        "auth": (selectinload(User.roles).selectinload(Role.permissions),),
+    },
+}
+
+
+def load_profile(model: type, name: str) -> tuple:
+    """Loader options for `model` under profile `name`."""
+    try:
+        return PROFILES[model][name]
+    except KeyError:
+        raise ValueError(f"No loader profile {name!r} for {model.__name__}") from None
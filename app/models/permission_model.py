@@ -38,7 +38,11 @@ class Permission(Base):
 
     # Relationship
     roles: Mapped[List["Role"]] = relationship(
-        "Role", secondary=role_permissions, back_populates="permissions"
+        "Role",
+        secondary=role_permissions,
+        back_populates="permissions",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
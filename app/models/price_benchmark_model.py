@@ -105,7 +105,6 @@ class PriceBenchmark(Base):
     # ── Composite indexes ──────────────────────────────────────────────────────
     __table_args__ = (
         Index("ix_price_benchmarks_item_category", "item_name", "category"),
-        Index("ix_price_benchmarks_category", "category"),
     )
 
     def __repr__(self) -> str:
@@ -96,7 +96,8 @@ class ProcuringEntity(Base):
     tenders: Mapped[List["Tender"]] = relationship(
         "Tender",
         back_populates="entity",
-        lazy="select",
+        passive_deletes=True,  # tenders.entity_id is ON DELETE SET NULL
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -90,13 +90,16 @@ class RedFlag(Base):
         comment="ML model that generated this flag e.g. 'isolation_forest', 'spacy_ner', 'xgboost'",
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        index=True,  # max() is the data-version token (data_version_service)
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
     tender: Mapped["Tender"] = relationship(
         "Tender",
         back_populates="red_flags",
+        lazy="raise_on_sql",
     )
 
     # ── Composite indexes ──────────────────────────────────────────────────────
@@ -54,7 +54,9 @@ class RefreshToken(Base):
     user_agent: Mapped[Optional[str]] = mapped_column(String(500))
 
     # Relationship
-    user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="refresh_tokens", lazy="raise_on_sql"
+    )
 
     def __repr__(self) -> str:
         return f"<RefreshToken user={self.user_id} revoked={self.is_revoked}>"
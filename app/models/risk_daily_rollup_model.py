@@ -0,0 +1,70 @@
+"""
+app/models/risk_daily_rollup.py
+───────────────────────────────
+RiskDailyRollup model — pre-aggregated daily facts for the trend endpoints.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RiskDailyRollup(Base):
+    """
+    One row per (day, county, category, risk_level, flag_type), written only
+    by services/risk_rollup_service.py — a day's rows are always recomputed
+    together from tenders, risk_scores, red_flags and contracts.
+
+    Missing dimensions are stored as "" so they can be part of the key:
+    risk_level "" is an unscored tender, county/category "" an unset one.
+
+    Two grains share the table, told apart by flag_type:
+
+      flag_type = ""      tender rows — the tenders created that day:
+                          tender_count, estimated_value_sum, total_score_sum,
+                          flagged_tender_count / flagged_value_sum (tenders
+                          with ≥1 red flag), flag_count (all their flags);
+                          plus contract_count / contract_value_sum for the
+                          contracts created that day, under their tender's
+                          county / category / risk_level
+      flag_type = <type>  flag rows — for tenders created that day with that
+                          flag type: flag_count, flagged_tender_count,
+                          flagged_value_sum
+
+    Summing tender_count across flag rows would count a tender once per flag
+    type; tender totals always read the "" rows.
+    """
+
+    __tablename__ = "risk_daily_rollup"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    county: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    category: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    risk_level: Mapped[str] = mapped_column(String(10), primary_key=True, default="")
+    flag_type: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+
+    tender_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    estimated_value_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    total_score_sum: Mapped[float] = mapped_column(
+        Float, default=0.0, nullable=False, comment="Over scored tenders; avg = sum / tender_count"
+    )
+    flagged_tender_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    flagged_value_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    flag_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    contract_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    contract_value_sum: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RiskDailyRollup day={self.day} county={self.county!r} "
+            f"category={self.category!r} level={self.risk_level!r} flag={self.flag_type!r}>"
+        )
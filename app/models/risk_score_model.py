@@ -115,12 +115,24 @@ class RiskScore(Base):
         Text,
         comment="Claude-generated recommended next step for investigators.",
     )
+    investigation_package: Mapped[Optional[str]] = mapped_column(
+        Text,
+        comment="Last generated EACC investigation package (Markdown).",
+    )
+    investigation_package_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="When investigation_package was generated; stale once updated_at is newer.",
+    )
     # ── Audit trail ────────────────────────────────────────────────────────────
     models_used: Mapped[Optional[dict]] = mapped_column(
         JSONB,
         default=dict,
         comment='Which ML models ran e.g. {"price_anomaly": true, "xgboost": false}',
     )
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        comment="SHA-256 of the scoring inputs (risk_fingerprint_service); unchanged → rescore skipped.",
+    )
     computed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
@@ -130,12 +142,14 @@ class RiskScore(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
+        index=True,  # max() is the data-version token (data_version_service)
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
     tender: Mapped["Tender"] = relationship(
         "Tender",
         back_populates="risk_score",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
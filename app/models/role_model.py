@@ -44,10 +44,18 @@ class Role(Base):
 
     # Relationships
     users: Mapped[List["User"]] = relationship(
-        "User", secondary=user_roles, back_populates="roles"
+        "User",
+        secondary=user_roles,
+        back_populates="roles",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     permissions: Mapped[List["Permission"]] = relationship(
-        "Permission", secondary=role_permissions, back_populates="roles"
+        "Permission",
+        secondary=role_permissions,
+        back_populates="roles",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
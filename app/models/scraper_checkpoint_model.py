@@ -0,0 +1,43 @@
+"""
+app/models/scraper_checkpoint.py
+─────────────────────────────────
+ScraperCheckpoint model — crawl state persisted between scraper runs.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ScraperCheckpoint(Base):
+    """
+    One row per scraper source ('ppip', 'gazette', …).
+
+    state is a JSONB document owned by the scraper:
+        {
+          "watermark":  "2026-03-01T08:00:00+00:00",   # newest notice seen
+          "validators": {"<url>": {"etag": "...", "last_modified": "..."}}
+        }
+
+    The watermark lets a rerun stop paging once it reaches notices it has
+    already ingested; the validators turn unchanged pages into 304s.
+    """
+
+    __tablename__ = "scraper_checkpoints"
+
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+    state: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ScraperCheckpoint source={self.source!r}>"
@@ -105,6 +105,18 @@ class Supplier(Base):
         index=True,
         comment="Composite ghost-supplier risk score (0–100); written by risk engine.",
     )
+    ghost_probability: Mapped[Optional[float]] = mapped_column(
+        Float,
+        index=True,
+        comment="Ghost-supplier probability (0–1) from ml/supplier_risk.py; "
+        "written by the supplier ghost backfill.",
+    )
+    model_version: Mapped[Optional[str]] = mapped_column(
+        String(40),
+        index=True,
+        comment="supplier_risk model version behind ghost_probability; "
+        "NULL means features changed and it must be recomputed.",
+    )
     # ── Verification / status ─────────────────────────────────────────────────
     verification_status: Mapped[str] = mapped_column(
         String(20),
@@ -131,24 +143,30 @@ class Supplier(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
+        index=True,  # max() is the data-version token (data_version_service)
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
+    # Loaded only via app/models/loader_profiles.py; deletes rely on the FKs
+    # (directors/bids CASCADE, contracts RESTRICT).
     directors: Mapped[List["Director"]] = relationship(
         "Director",
         back_populates="supplier",
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     bids: Mapped[List["Bid"]] = relationship(
         "Bid",
         back_populates="supplier",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     contracts: Mapped[List["Contract"]] = relationship(
         "Contract",
         back_populates="supplier",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
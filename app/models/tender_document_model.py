@@ -87,6 +87,7 @@ class TenderDocument(Base):
     tender: Mapped["Tender"] = relationship(
         "Tender",
         back_populates="documents",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -130,6 +130,7 @@ class Tender(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
+        index=True,  # max() is the data-version token (data_version_service)
     )
     # ── Foreign keys ───────────────────────────────────────────────────────────
     entity_id: Mapped[Optional[uuid.UUID]] = mapped_column(
@@ -142,54 +143,64 @@ class Tender(Base):
     )
 
     # ── Relationships ──────────────────────────────────────────────────────────
+    # Nothing loads implicitly: queries pick a profile from
+    # app/models/loader_profiles.py. passive_deletes leaves child rows to the
+    # ON DELETE CASCADE / SET NULL foreign keys instead of loading them first.
     entity: Mapped[Optional["ProcuringEntity"]] = relationship(
         "ProcuringEntity",
         back_populates="tenders",
-        lazy="select",
+        lazy="raise_on_sql",
     )
     bids: Mapped[List["Bid"]] = relationship(
         "Bid",
         back_populates="tender",
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     contract: Mapped[Optional["Contract"]] = relationship(
         "Contract",
         back_populates="tender",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     risk_score: Mapped[Optional["RiskScore"]] = relationship(
         "RiskScore",
         back_populates="tender",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     red_flags: Mapped[List["RedFlag"]] = relationship(
         "RedFlag",
         back_populates="tender",
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     documents: Mapped[List["TenderDocument"]] = relationship(
         "TenderDocument",
         back_populates="tender",
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     whistleblower_reports: Mapped[List["WhistleblowerReport"]] = relationship(
         "WhistleblowerReport",
         back_populates="tender",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
-    alerts = relationship("Alert", back_populates="tender", lazy="selectin")
+    alerts = relationship("Alert", back_populates="tender", lazy="noload")
     investigations: Mapped[List["Investigation"]] = relationship(
         "Investigation",
         back_populates="tender",  # or lazy="select" without back_populates if you prefer
         cascade="all, delete-orphan",
-        lazy="select",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
     # ── Composite indexes ──────────────────────────────────────────────────────
@@ -197,7 +208,6 @@ class Tender(Base):
         Index("ix_tenders_county_status", "county", "status"),
         Index("ix_tenders_county_category", "county", "category"),
         Index("ix_tenders_created_at", "created_at"),
-        Index("ix_tenders_estimated_value", "estimated_value"),
     )
 
     def __repr__(self) -> str:
@@ -74,13 +74,21 @@ class User(Base):
 
     # Relationships
     roles: Mapped[List["Role"]] = relationship(
-        "Role", secondary=user_roles, back_populates="users"
+        "Role",
+        secondary=user_roles,
+        back_populates="users",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     refresh_tokens: Mapped[List["RefreshToken"]] = relationship(
-        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+        "RefreshToken",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     audit_logs: Mapped[List["AuditLog"]] = relationship(
-        "AuditLog", back_populates="user"
+        "AuditLog", back_populates="user", passive_deletes=True, lazy="raise_on_sql"
     )
 
     def has_permission(self, permission_name: str) -> bool:
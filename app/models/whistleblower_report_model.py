@@ -11,7 +11,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,16 +30,19 @@ class WhistleblowerReport(Base):
         - No IP addresses, device fingerprints, or session tokens are stored
         - No contact information is recorded unless the reporter chooses to provide
           a secure email (which is never stored in this table)
-        - The reporter receives a UUID reference number stored only in their
-          browser's sessionStorage — not in the database
+        - The reporter receives a random tracking code (tracking_code) that
+          reveals nothing about them; it only lets them check triage status
 
-    AI triage pipeline (runs immediately on submission):
-        1. POST /api/whistleblower/submit received
-        2. ai_service.triage_whistleblower_report() calls Claude claude-opus-4-6
+    AI triage pipeline (deferred — intake never waits on the LLM):
+        1. POST /api/whistleblower/submit stores the report with
+           triage_status="pending" and returns the tracking code
+        2. services/whistleblower_triage_service claims pending reports in
+           batches and calls ai_service.triage_whistleblower_report()
         3. Returns: credibility_score, urgency, allegation_type, identity_risk,
                    corroborating_evidence_needed
-        4. All fields stored on this record
-        5. If credibility_score >= 60: notifies investigators via dashboard
+        4. Fields stored on this record, triage_status="done"
+        5. If urgency is high/critical and credibility_score >= 60:
+           escalated_at is set and the report surfaces first to investigators
 
     Review workflow:
         - Investigators see reports sorted by credibility_score descending
@@ -104,6 +107,34 @@ class WhistleblowerReport(Base):
         Boolean,
         comment="Investigator's final credibility judgement (may differ from AI score).",
     )
+    # ── Intake / triage queue ──────────────────────────────────────────────────
+    tracking_code: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        unique=True,
+        index=True,
+        comment="Random code returned to the reporter for status checks.",
+    )
+    triage_status: Mapped[str] = mapped_column(
+        String(20),
+        default="pending",
+        server_default="pending",
+        nullable=False,
+        index=True,
+        comment="pending | processing | done | failed | skipped",
+    )
+    triage_attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    triage_claimed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        comment="When a triage worker claimed the report; stale claims are retried.",
+    )
+    triaged_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    escalated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        index=True,
+        comment="Set when triage found the report urgent and credible.",
+    )
     # ── Review workflow ────────────────────────────────────────────────────────
     is_reviewed: Mapped[bool] = mapped_column(
         Boolean,
@@ -126,8 +157,9 @@ class WhistleblowerReport(Base):
     tender: Mapped[Optional["Tender"]] = relationship(
         "Tender",
         back_populates="whistleblower_reports",
+        lazy="raise_on_sql",
     )
-    reviewed_by: Mapped[Optional["User"]] = relationship("User")
+    reviewed_by: Mapped[Optional["User"]] = relationship("User", lazy="raise_on_sql")
 
     # ── Composite indexes ──────────────────────────────────────────────────────
     __table_args__ = (
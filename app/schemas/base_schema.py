@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar("T")
 
@@ -38,6 +38,9 @@ class PaginatedResponse(BaseSchema, Generic[T]):
 
     Example:
         PaginatedResponse[ClaimResponse]
+
+    Endpoints that bound their count query return at most the bound as
+    `total` and set `total_is_capped`; `pages` then covers only those rows.
     """
 
     items: List[T]
@@ -45,6 +48,13 @@ class PaginatedResponse(BaseSchema, Generic[T]):
     page: int
     page_size: int
     pages: int
+    total_is_capped: bool = Field(
+        default=False,
+        description=(
+            "True when counting stopped at the endpoint's limit: at least `total` "
+            "items match and `pages` is a lower bound."
+        ),
+    )
 
 
 class MessageResponse(BaseSchema):
@@ -35,6 +35,11 @@ class TenderUpdate(BaseModel):
     submission_deadline: Optional[datetime] = None
 
 
+class TenderRescoreRequest(BaseModel):
+    tender_ids: Optional[List[UUID]] = None  # None → every tender, in the background
+    force: bool = False  # ignore input fingerprints
+
+
 class RiskScoreOut(BaseModel):
     id: UUID
     price_score: float
@@ -0,0 +1,241 @@
+"""
+Shared crawling primitives for the PPIP / Gazette scrapers.
+
+  CrawlerClient     one pooled httpx.AsyncClient per run, bounded
+                    concurrency, polite per-host rate limit, retries on
+                    429/5xx, conditional GETs (ETag / Last-Modified)
+  CheckpointStore   where crawl state lives between runs:
+                      DbCheckpointStore   → scraper_checkpoints table
+                      FileCheckpointStore → local JSON file (CLI / fixtures)
+
+Nothing here knows about a particular site, so a scraper can be pointed at
+a local fixture server by passing a different base URL and a file store.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    body: Optional[bytes]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @property
+    def validators(self) -> dict:
+        return {
+            k: v
+            for k, v in (("etag", self.etag), ("last_modified", self.last_modified))
+            if v
+        }
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart."""
+
+    def __init__(self, rate_per_host: float):
+        self.interval = 1.0 / rate_per_host if rate_per_host > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class CrawlerClient:
+    """
+    Async context manager around a pooled httpx.AsyncClient.
+
+        async with CrawlerClient() as client:
+            result = await client.get(url, validators={"etag": '"abc"'})
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: Optional[int] = None,
+        rate_per_host: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = concurrency or settings.SCRAPER_CONCURRENCY
+        self.max_retries = (
+            settings.SCRAPER_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self._timeout = timeout or settings.SCRAPER_TIMEOUT
+        self._transport = transport
+        self._rate = HostRateLimiter(
+            settings.SCRAPER_RATE_PER_HOST if rate_per_host is None else rate_per_host
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.not_modified = 0
+
+    async def __aenter__(self) -> "CrawlerClient":
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            headers={"User-Agent": settings.SCRAPER_USER_AGENT},
+            follow_redirects=True,
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    async def get(self, url: str, validators: Optional[dict] = None) -> FetchResult:
+        """GET with conditional headers; retries transient failures with backoff."""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self._rate.wait(host)
+                self.requests += 1
+                try:
+                    response = await self._client.get(url, headers=headers)
+                except httpx.TransportError as exc:
+                    response, error = None, exc
+                else:
+                    error = None
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                break
+            attempt += 1
+            if attempt > self.max_retries:
+                if error is not None:
+                    raise error
+                break
+            delay = 2 ** (attempt - 1)
+            if response is not None and response.headers.get("Retry-After", "").isdigit():
+                delay = int(response.headers["Retry-After"])
+            logger.warning(
+                "Scraper request retry",
+                extra={
+                    "url": url,
+                    "attempt": attempt,
+                    "status_code": getattr(response, "status_code", None),
+                    "error": str(error) if error else None,
+                },
+            )
+            await asyncio.sleep(delay)
+
+        if response.status_code == 304:
+            self.not_modified += 1
+        return FetchResult(
+            url=url,
+            status_code=response.status_code,
+            body=response.content if response.status_code == 200 else None,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+# ── Checkpoints ───────────────────────────────────────────────────────────────
+
+
+class CheckpointStore(Protocol):
+    async def load(self, source: str) -> dict: ...
+
+    async def save(self, source: str, state: dict) -> None: ...
+
+
+class DbCheckpointStore:
+    """Checkpoints in the scraper_checkpoints table (one row per source)."""
+
+    async def load(self, source: str) -> dict:
+        from app.core.database import AsyncSessionLocal
+        from app.models.scraper_checkpoint_model import ScraperCheckpoint
+
+        async with AsyncSessionLocal() as db:
+            row = await db.get(ScraperCheckpoint, source)
+            return dict(row.state) if row else {}
+
+    async def save(self, source: str, state: dict) -> None:
+        from datetime import datetime, timezone
+
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from app.core.database import AsyncSessionLocal
+        from app.models.scraper_checkpoint_model import ScraperCheckpoint
+
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(ScraperCheckpoint).values(
+            source=source, state=state, updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source"], set_={"state": state, "updated_at": now}
+        )
+        async with AsyncSessionLocal() as db:
+            await db.execute(stmt)
+            await db.commit()
+
+
+class FileCheckpointStore:
+    """Checkpoints in a local JSON file keyed by source, replaced atomically."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    async def load(self, source: str) -> dict:
+        return self._read().get(source, {})
+
+    async def save(self, source: str, state: dict) -> None:
+        data = self._read()
+        data[source] = state
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
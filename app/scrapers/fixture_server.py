@@ -0,0 +1,234 @@
+"""
+Local PPIP fixture server — a synthetic OCDS release feed for exercising
+PPIPScraper without touching tenders.go.ke.
+
+Serves {PPIP_RELEASES_PATH}?page=N newest-first with per-page ETags (and
+304s on If-None-Match), 404 past the last page, and a 500 for any page put
+in `failing`.
+
+Run:
+    python -m app.scrapers.fixture_server --port 8765     # serve until Ctrl-C
+    python -m app.scrapers.fixture_server --check         # checkpoint regression
+
+--check drives PPIPScraper with a FileCheckpointStore through:
+  1. a full first crawl;
+  2. new releases published, then a crawl where a middle page fails — the
+     checkpoint must not move;
+  3. the next crawl must fetch the releases behind the failed page;
+  4. a crawl capped by --max-pages before the watermark — again no move;
+  5. a clean crawl afterwards ends on a 304 for page 1 with nothing new.
+Exits 1 on the first broken expectation.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from app.core.config import settings
+from app.scrapers.base import CrawlerClient, FileCheckpointStore
+from app.scrapers.ppip_scraper import SOURCE, PPIPScraper
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FixtureFeed:
+    """In-memory release feed, newest first, shared with the HTTP handler."""
+
+    def __init__(self, page_size: int = 5):
+        self.page_size = page_size
+        self.releases: list[dict] = []
+        self.failing: set[int] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, count: int) -> list[str]:
+        """Add `count` releases newer than everything already in the feed."""
+        with self._lock:
+            start = len(self.releases)
+            fresh = [self._release(start + i) for i in range(count)]
+            self.releases[:0] = reversed(fresh)
+        return [r["tender"]["id"] for r in fresh]
+
+    @staticmethod
+    def _release(seq: int) -> dict:
+        ref = f"FIX-{seq:05d}"
+        return {
+            "ocid": f"ocds-fixture-{ref}",
+            "date": (EPOCH + timedelta(hours=seq)).isoformat(),
+            "buyer": {"name": "Fixture County Government", "address": {"region": "Nairobi"}},
+            "tender": {
+                "id": ref,
+                "title": f"Fixture tender {seq}",
+                "mainProcurementCategory": "goods",
+                "value": {"amount": 100_000 + seq, "currency": "KES"},
+                "procurementMethod": "open",
+                "status": "active",
+            },
+        }
+
+    def page(self, number: int) -> Optional[bytes]:
+        with self._lock:
+            start = (number - 1) * self.page_size
+            if number < 1 or start >= len(self.releases):
+                return None
+            chunk = self.releases[start : start + self.page_size]
+        return json.dumps({"releases": chunk}).encode()
+
+
+def _handler(feed: FixtureFeed) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path != settings.PPIP_RELEASES_PATH:
+                return self._send(404)
+            try:
+                number = int(parse_qs(url.query).get("page", ["1"])[0])
+            except ValueError:
+                return self._send(400)
+            if number in feed.failing:
+                return self._send(500)
+            body = feed.page(number)
+            if body is None:
+                return self._send(404)
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, etag=etag)
+            self._send(200, body, etag)
+
+        def _send(self, status: int, body: bytes = b"", etag: Optional[str] = None):
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(feed: FixtureFeed, port: int = 0) -> ThreadingHTTPServer:
+    """Start the fixture server on a background thread; returns the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(feed))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ── Checkpoint regression ─────────────────────────────────────────────────────
+
+
+async def _crawl(
+    base_url: str, store: FileCheckpointStore, max_pages: Optional[int] = None
+) -> tuple[list[str], dict]:
+    async with CrawlerClient(concurrency=2, rate_per_host=0, max_retries=0) as client:
+        scraper = PPIPScraper(client, store, base_url=base_url, max_pages=max_pages)
+        refs = [record["reference_number"] async for record in scraper.records()]
+        await scraper.commit_checkpoint()
+    return refs, scraper.stats()
+
+
+def _expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise AssertionError(message)
+
+
+async def check() -> None:
+    feed = FixtureFeed(page_size=5)
+    server = serve(feed)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.unlink(path)
+    store = FileCheckpointStore(path)
+    try:
+        first = feed.publish(30)
+        refs, stats = await _crawl(base_url, store)
+        _expect(sorted(refs) == sorted(first), "first crawl did not read the whole feed")
+        _expect(stats["complete"], "first crawl should reach the end of the feed")
+        baseline = await store.load(SOURCE)
+        _expect(baseline.get("watermark") is not None, "first crawl saved no watermark")
+
+        # 12 new releases fill pages 1-2 and the top of page 3; page 2 fails.
+        fresh = feed.publish(12)
+        feed.failing = {2}
+        partial, stats = await _crawl(base_url, store)
+        _expect(not stats["complete"], "crawl with a failed page reported complete")
+        _expect(
+            await store.load(SOURCE) == baseline,
+            "checkpoint advanced past a failed page",
+        )
+
+        feed.failing = set()
+        retry, stats = await _crawl(base_url, store)
+        missed = set(fresh) - set(partial)
+        _expect(bool(missed), "fixture did not hide any releases behind page 2")
+        _expect(
+            missed <= set(retry),
+            f"next crawl skipped releases behind the failed page: {sorted(missed - set(retry))}",
+        )
+        _expect(stats["complete"], "recovery crawl should reach the watermark")
+
+        # 15 more releases: a one-page crawl cannot reach the watermark.
+        newest = feed.publish(15)
+        before = await store.load(SOURCE)
+        capped, stats = await _crawl(base_url, store, max_pages=1)
+        _expect(not stats["complete"], "max_pages-capped crawl reported complete")
+        _expect(await store.load(SOURCE) == before, "checkpoint advanced past max_pages")
+
+        rest, stats = await _crawl(base_url, store)
+        _expect(set(newest) <= set(capped) | set(rest), "capped crawl lost releases")
+
+        idle, stats = await _crawl(base_url, store)
+        _expect(not idle and stats["pages_unchanged"] == 1, "idle crawl should end on a 304")
+    finally:
+        server.shutdown()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local PPIP OCDS fixture server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--releases", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument(
+        "--fail-page", type=int, action="append", default=[], help="answer 500 for this page"
+    )
+    parser.add_argument("--check", action="store_true", help="run the checkpoint regression")
+    return parser.parse_args(argv)
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.check:
+        try:
+            asyncio.run(check())
+        except AssertionError as exc:
+            print(f"FAIL: {exc}", file=sys.stderr)
+            return 1
+        print("OK: PPIP checkpoint regression passed", file=sys.stderr)
+        return 0
+    feed = FixtureFeed(page_size=args.page_size)
+    feed.publish(args.releases)
+    feed.failing = set(args.fail_page)
+    server = serve(feed, args.port)
+    print(f"Serving {args.releases} releases on http://127.0.0.1:{args.port}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,59 @@
+"""
+Bulk tender ingestion CLI — same loader as POST /api/tenders/bulk.
+
+Run:
+    python -m app.scrapers.ingest notices.ndjson
+    python -m app.scrapers.ingest releases.ndjson --format ocds --score
+    cat notices.ndjson | python -m app.scrapers.ingest -
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import AsyncIterator
+
+from app.core.database import AsyncSessionLocal
+from app.services.tender_ingest_service import (
+    INGEST_FORMATS,
+    BulkTenderIngestor,
+    iter_lines,
+    score_ingested_tenders,
+)
+
+READ_CHUNK = 1 << 20
+
+
+async def _read_chunks(path: str) -> AsyncIterator[bytes]:
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(stream.read, READ_CHUNK):
+            yield chunk
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    async with AsyncSessionLocal() as db:
+        ingestor = BulkTenderIngestor(db, source=args.source, batch_size=args.batch_size)
+        summary = await ingestor.ingest(iter_lines(_read_chunks(args.path)), fmt=args.format)
+    if args.score and ingestor.inserted_ids:
+        await score_ingested_tenders(ingestor.inserted_ids)
+    return summary
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-load tenders from NDJSON / OCDS.")
+    parser.add_argument("path", help="NDJSON file, or '-' for stdin")
+    parser.add_argument("--format", choices=INGEST_FORMATS, default="ndjson")
+    parser.add_argument("--source", default="ppip")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument(
+        "--score", action="store_true", help="Score inserted tenders after loading"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(parse_args())), indent=2))
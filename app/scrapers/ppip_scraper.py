@@ -0,0 +1,262 @@
+"""
+PPIP scraper — incremental crawl of the Public Procurement Information
+Portal's OCDS release feed.
+
+The feed is paged newest-first: {PPIP_BASE_URL}{PPIP_RELEASES_PATH}?page=N,
+each page an OCDS release package ({"releases": [...]}) or a bare list.
+
+Incremental behaviour
+─────────────────────
+  - Pages are fetched in windows of SCRAPER_CONCURRENCY concurrent
+    requests and processed in page order.
+  - Every page GET carries the ETag / Last-Modified stored for that URL on
+    the previous run; a 304 on a page means nothing after it is new either.
+  - Releases dated at or before the stored watermark are skipped, and
+    paging stops at the first page that reaches the watermark.
+  - The checkpoint (watermark + validators) is saved only after the
+    records have been ingested, and only when the crawl was complete: it
+    reached the old watermark, got a 304, or hit the end of the feed. A
+    crawl cut short by a failed page or by SCRAPER_MAX_PAGES keeps the
+    previous checkpoint, so the next run fetches the missed pages again
+    (re-yielded notices are dropped by ingest's reference dedup).
+
+Run:
+    python -m app.scrapers.ppip_scraper                       # crawl + ingest
+    python -m app.scrapers.ppip_scraper --score               # + risk scoring
+    python -m app.scrapers.ppip_scraper --base-url http://127.0.0.1:8765 \\
+        --checkpoint-file /tmp/ppip.json --output -           # fixture server, no DB
+    python -m app.scrapers.fixture_server --check             # checkpoint regression
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.scrapers.base import (
+    CheckpointStore,
+    CrawlerClient,
+    DbCheckpointStore,
+    FetchResult,
+    FileCheckpointStore,
+)
+from app.services.tender_ingest_service import ocds_release_to_record
+
+logger = get_logger(__name__)
+
+SOURCE = "ppip"
+
+
+def _parse_date(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _page_releases(result: FetchResult) -> list[dict]:
+    payload = result.json()
+    if isinstance(payload, dict):
+        return payload.get("releases") or []
+    return payload or []
+
+
+class PPIPScraper:
+    """
+    One crawl of the PPIP feed. records() yields NDJSON-shape tender records
+    for BulkTenderIngestor; commit_checkpoint() persists progress afterwards.
+    """
+
+    source = SOURCE
+
+    def __init__(
+        self,
+        client: CrawlerClient,
+        store: CheckpointStore,
+        *,
+        base_url: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ):
+        self.client = client
+        self.store = store
+        self.base_url = (base_url or settings.PPIP_BASE_URL).rstrip("/")
+        self.max_pages = max_pages or settings.SCRAPER_MAX_PAGES
+        self._state: dict = {}
+        self._validators: dict[str, dict] = {}
+        self._newest: Optional[datetime] = None
+        self._complete = False
+        self.pages_fetched = 0
+        self.pages_unchanged = 0
+        self.releases_seen = 0
+        self.releases_new = 0
+
+    def page_url(self, page: int) -> str:
+        return f"{self.base_url}{settings.PPIP_RELEASES_PATH}?page={page}"
+
+    async def _fetch(self, page: int) -> FetchResult:
+        url = self.page_url(page)
+        return await self.client.get(
+            url, validators=self._state.get("validators", {}).get(url)
+        )
+
+    async def records(self) -> AsyncIterator[dict]:
+        self._state = await self.store.load(self.source)
+        watermark = _parse_date(self._state.get("watermark"))
+        window = self.client.concurrency
+        page = 1
+        done = False
+        while not done and page <= self.max_pages:
+            pages = range(page, min(page + window, self.max_pages + 1))
+            results = await asyncio.gather(*(self._fetch(p) for p in pages))
+            for result in results:
+                if result.not_modified:
+                    self.pages_unchanged += 1
+                    self._validators[result.url] = self._state["validators"][result.url]
+                    self._complete = done = True
+                    break
+                if result.status_code != 200:
+                    if result.status_code == 404:
+                        self._complete = True
+                    else:
+                        logger.warning(
+                            "PPIP page fetch failed",
+                            extra={"url": result.url, "status_code": result.status_code},
+                        )
+                    done = True
+                    break
+                self.pages_fetched += 1
+                if result.validators:
+                    self._validators[result.url] = result.validators
+                releases = _page_releases(result)
+                if not releases:
+                    self._complete = done = True
+                    break
+                for release in releases:
+                    self.releases_seen += 1
+                    released_at = _parse_date(release.get("date"))
+                    if watermark and released_at and released_at <= watermark:
+                        self._complete = done = True
+                        continue
+                    if released_at and (self._newest is None or released_at > self._newest):
+                        self._newest = released_at
+                    self.releases_new += 1
+                    yield {**ocds_release_to_record(release), "source": self.source}
+                if done:
+                    break
+            page += window
+        if not done:
+            logger.warning(
+                "PPIP crawl hit max_pages before the watermark",
+                extra={"max_pages": self.max_pages},
+            )
+
+    async def commit_checkpoint(self) -> None:
+        """
+        Persist watermark + page validators. Call after ingest succeeds.
+
+        An incomplete crawl leaves the stored checkpoint untouched: advancing
+        the watermark (or storing a fresh validator for page 1) past pages
+        that were never read would make the next run skip them for good.
+        """
+        if not self._complete:
+            logger.warning(
+                "PPIP crawl incomplete, checkpoint not advanced",
+                extra={"pages_fetched": self.pages_fetched},
+            )
+            return
+        previous = _parse_date(self._state.get("watermark"))
+        newest = max(filter(None, (previous, self._newest)), default=None)
+        await self.store.save(
+            self.source,
+            {
+                "watermark": newest.isoformat() if newest else None,
+                "validators": self._validators,
+            },
+        )
+
+    def stats(self) -> dict:
+        return {
+            "pages_fetched": self.pages_fetched,
+            "pages_unchanged": self.pages_unchanged,
+            "releases_seen": self.releases_seen,
+            "releases_new": self.releases_new,
+            "requests": self.client.requests,
+            "complete": self._complete,
+        }
+
+
+async def run_ppip_scrape(
+    *,
+    score: bool = False,
+    base_url: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    store: Optional[CheckpointStore] = None,
+) -> dict:
+    """Crawl PPIP and feed new notices straight into bulk tender ingestion."""
+    from app.core.database import AsyncSessionLocal
+    from app.services.tender_ingest_service import (
+        BulkTenderIngestor,
+        score_ingested_tenders,
+    )
+
+    store = store or DbCheckpointStore()
+    async with CrawlerClient() as client:
+        scraper = PPIPScraper(client, store, base_url=base_url, max_pages=max_pages)
+        async with AsyncSessionLocal() as db:
+            ingestor = BulkTenderIngestor(db, source=SOURCE)
+            summary = await ingestor.ingest_records(scraper.records(), fmt="ocds")
+        await scraper.commit_checkpoint()
+    if score and ingestor.inserted_ids:
+        await score_ingested_tenders(ingestor.inserted_ids)
+    return {**scraper.stats(), **summary}
+
+
+async def _dump_records(args: argparse.Namespace) -> dict:
+    """--output: write records as NDJSON instead of ingesting (no DB needed)."""
+    store = FileCheckpointStore(args.checkpoint_file)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        async with CrawlerClient() as client:
+            scraper = PPIPScraper(
+                client, store, base_url=args.base_url, max_pages=args.max_pages
+            )
+            async for record in scraper.records():
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            await scraper.commit_checkpoint()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return scraper.stats()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.output:
+        return await _dump_records(args)
+    store = FileCheckpointStore(args.checkpoint_file) if args.checkpoint_file else None
+    return await run_ppip_scrape(
+        score=args.score, base_url=args.base_url, max_pages=args.max_pages, store=store
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Incremental PPIP OCDS scraper.")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--checkpoint-file", default=None, help="JSON file instead of the DB")
+    parser.add_argument("--output", default=None, help="write NDJSON here instead of ingesting")
+    parser.add_argument("--score", action="store_true")
+    args = parser.parse_args(argv)
+    if args.output and not args.checkpoint_file:
+        parser.error("--output requires --checkpoint-file")
+    return args
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(parse_args())), indent=2), file=sys.stderr)
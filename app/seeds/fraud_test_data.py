@@ -21,6 +21,9 @@ Fraud patterns seeded:
 Run with:
     python -m app.seeds.fraud_test_data
     python -m app.seeds.fraud_test_data teardown
+
+For benchmarks, load tests and ML training at scale, use synthetic_data.py —
+the same patterns at controlled rates, up to millions of tenders.
 """
 
 import asyncio
@@ -0,0 +1,662 @@
+"""
+app/seeds/synthetic_data.py
+───────────────────────────
+Scalable synthetic procurement dataset for benchmarks, load tests and ML
+training — the same fraud patterns as fraud_test_data.py, at controlled
+rates and any size.
+
+Tenders are generated in fixed chunks of vectorised numpy draws and
+written as they're made: COPY on PostgreSQL (asyncpg), batched multi-row
+INSERTs anywhere else (SQLite / aiosqlite). Memory stays flat from
+thousands to millions of tenders.
+
+Fraud patterns (tender-level, independent draws at --rate):
+    [P1] Price inflation      — estimated value 2–5× its benchmark     8%
+    [P2] Ghost supplier       — awarded to a supplier < 180 days old,
+                                no tax filings, no address              5%
+    [P3] Spec restriction     — brand names, 15+ years, sole dealer    6%
+    [P4] Bid collusion        — co-bids within ±0.5%, same proposal     4%
+    [P5] Contract variation   — contract 30–100% above the estimate     5%
+    [P6] PEP director         — awarded to a supplier with a
+                                politically exposed director            3%
+    [P7] Direct procurement   — direct procurement above KES 50M       4%
+    [P8] Deadline mani.       — submission window under 72 hours        5%
+    [P9] Cross-supplier dirs  — two co-bidders share a director         3%
+
+A tender can carry several patterns. With --labels the per-tender and
+per-supplier pattern bitmasks (bit k-1 = Pk) are saved to an .npz file for
+supervised training; 25% of ghost suppliers are blacklisted, which is the
+proxy label the supplier models already train on.
+
+The same --seed, sizes, rates and --as-of give the same rows. Synthetic
+rows carry "SYN/<seed>/" references (tenders.source = 'synthetic') and are
+removed by --teardown.
+
+Run with:
+    python -m app.seeds.synthetic_data --tenders 100000
+    python -m app.seeds.synthetic_data --tenders 2000000 --seed 7 --labels labels.npz
+    python -m app.seeds.synthetic_data --tenders 50000 --rate P1=0.2 --rate P4=0.1
+    python -m app.seeds.synthetic_data --database-url sqlite+aiosqlite:///bench.db \\
+        --create-tables --tenders 200000
+    python -m app.seeds.synthetic_data --dry-run --tenders 1000000
+    python -m app.seeds.synthetic_data --teardown --seed 7
+
+Rows are loaded unscored — run the rescoring job (or POST /risk/compute)
+and `python -m app.services.risk_rollup_service --rebuild` afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.enums import (
+    BidStatus,
+    ContractStatus,
+    EntityType,
+    ProcurementMethod,
+    SupplierVerificationStatus,
+    TenderStatus,
+)
+from app.models.bid_model import Bid
+from app.models.contract_model import Contract
+from app.models.director_model import Director
+from app.models.price_benchmark_model import PriceBenchmark
+from app.models.procuring_entity_model import ProcuringEntity
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+from app.seeds.fraud_test_data import BENCHMARKS
+
+PATTERNS: dict[str, tuple[float, str]] = {
+    "P1": (0.08, "price inflation"),
+    "P2": (0.05, "ghost supplier"),
+    "P3": (0.06, "spec restriction"),
+    "P4": (0.04, "bid collusion"),
+    "P5": (0.05, "contract variation"),
+    "P6": (0.03, "PEP director"),
+    "P7": (0.04, "direct procurement"),
+    "P8": (0.05, "deadline manipulation"),
+    "P9": (0.03, "shared directors"),
+}
+CHUNK_TENDERS = 50_000  # part of the seed contract — changing it changes the data
+_DAY = 86_400.0
+
+COUNTIES = (
+    "Nairobi", "Mombasa", "Kisumu", "Nakuru", "Uasin Gishu", "Kiambu", "Machakos",
+    "Kakamega", "Meru", "Nyeri", "Kilifi", "Kwale", "Garissa", "Wajir", "Mandera",
+    "Marsabit", "Isiolo", "Turkana", "West Pokot", "Samburu", "Trans Nzoia",
+    "Elgeyo Marakwet", "Nandi", "Baringo", "Laikipia", "Narok", "Kajiado", "Kericho",
+    "Bomet", "Vihiga", "Bungoma", "Busia", "Siaya", "Homa Bay", "Migori", "Kisii",
+    "Nyamira", "Nyandarua", "Murang'a", "Kirinyaga", "Embu", "Tharaka Nithi",
+    "Kitui", "Makueni", "Taita Taveta", "Tana River", "Lamu",
+)
+FIRST_NAMES = (
+    "James", "Mary", "John", "Grace", "Peter", "Faith", "David", "Ann", "Joseph",
+    "Esther", "Samuel", "Lucy", "Daniel", "Mercy", "Paul", "Jane", "Brian", "Ruth",
+)
+LAST_NAMES = (
+    "Kamau", "Otieno", "Wanjiku", "Mwangi", "Ochieng", "Njoroge", "Kiprop", "Mutua",
+    "Achieng", "Kariuki", "Wafula", "Chebet", "Odhiambo", "Nyambura", "Korir", "Omondi",
+)
+COMPANY_WORDS = (
+    "Apex", "Savanna", "Rift", "Coastline", "Highland", "Unity", "Summit", "Equator",
+    "Lakeside", "Prime", "Acacia", "Baobab", "Crescent", "Horizon", "Pioneer", "Zenith",
+)
+COMPANY_KINDS = (
+    "Supplies Ltd", "Contractors Ltd", "Enterprises", "Holdings Ltd", "Solutions Ltd",
+    "General Merchants", "Technologies Ltd", "Builders Ltd",
+)
+RESTRICTIVE_CLAUSES = (
+    "Equipment must be HP brand products only.",
+    "Bidders must demonstrate a minimum of 15 years experience in similar works.",
+    "Only the sole authorized dealer of the specified brand may bid.",
+    "Bidders must be registered in Nairobi only.",
+    "Delivery within 24 hours of the purchase order.",
+)
+PROPOSALS = (
+    "We propose to deliver the items per the technical specification within the "
+    "stated period, backed by our quality assurance plan and after-sales support.",
+    "Our firm will mobilise a qualified team and supply certified goods, with a "
+    "detailed work plan, warranty and local service centre coverage.",
+    "The bid covers supply, delivery and installation. Attached are our audited "
+    "accounts, tax compliance certificate and references from past clients.",
+    "We offer competitive pricing with phased delivery, training for end users and "
+    "a twelve month maintenance period at no additional cost.",
+)
+COLLUSIVE_PROPOSAL = (
+    "We are pleased to submit our bid for the above tender. We confirm that we "
+    "shall supply the goods as per specifications at the quoted price."
+)
+
+
+@dataclass
+class _Universe:
+    """Everything a tender chunk draws from: entities, supplier pools, benchmarks."""
+
+    seed: int
+    now: datetime
+    days: int
+    rates: dict[str, float]
+    bids_mean: float
+    entity_ids: list
+    entity_county: np.ndarray
+    supplier_ids: list
+    clean: np.ndarray  # supplier indexes per pool
+    ghost: np.ndarray
+    pep: np.ndarray
+    shared: np.ndarray  # (groups, 3) — suppliers sharing one director
+
+
+# ── Vector helpers ────────────────────────────────────────────────────────────
+
+
+def _uuids(rng: np.random.Generator, n: int) -> list[uuid.UUID]:
+    raw = rng.bytes(16 * n)
+    return [uuid.UUID(bytes=raw[i : i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+def _stamps(now: datetime, seconds_ago: np.ndarray) -> list[datetime]:
+    """now − seconds_ago, as aware UTC datetimes."""
+    base = np.datetime64(now.replace(tzinfo=None), "us")
+    stamps = base - (np.asarray(seconds_ago) * 1e6).astype("int64").astype("timedelta64[us]")
+    return [d.replace(tzinfo=timezone.utc) for d in stamps.tolist()]
+
+
+def _pick(rng: np.random.Generator, options: tuple, n: int, p=None) -> np.ndarray:
+    return np.asarray(options, dtype=object)[rng.choice(len(options), n, p=p)]
+
+
+def _names(rng: np.random.Generator, n: int) -> list[str]:
+    first = _pick(rng, FIRST_NAMES, n)
+    last = _pick(rng, LAST_NAMES, n)
+    return [f"{a} {b}" for a, b in zip(first, last)]
+
+
+# ── Entities, suppliers, directors ────────────────────────────────────────────
+
+
+def _entities(rng: np.random.Generator, n: int, seed: int, now: datetime) -> dict:
+    county = _pick(rng, COUNTIES, n)
+    kind = _pick(rng, tuple(e.value for e in EntityType), n)
+    created = _stamps(now, rng.uniform(365, 3650, n) * _DAY)
+    return {
+        "id": _uuids(rng, n),
+        "name": [f"{c} {k.replace('_', ' ').title()} {i}" for i, (c, k) in enumerate(zip(county, kind))],
+        "entity_type": kind.tolist(),
+        "county": county.tolist(),
+        "code": [f"SYN/{seed}/E{i:06d}" for i in range(n)],
+        "corruption_history_score": np.round(rng.uniform(0, 60, n), 1).tolist(),
+        "investigation_count": rng.poisson(0.4, n).tolist(),
+        "is_active": [True] * n,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def _supplier_pools(rng: np.random.Generator, n: int, rates: dict) -> tuple:
+    """Disjoint clean / ghost / PEP / shared-director supplier index pools."""
+    order = rng.permutation(n)
+    n_ghost = max(int(n * max(rates["P2"], 0.01)), 1)
+    n_pep = max(int(n * max(rates["P6"], 0.01)), 1)
+    n_groups = max(int(n * max(rates["P9"], 0.01) / 3), 1)
+    ghost = order[:n_ghost]
+    pep = order[n_ghost : n_ghost + n_pep]
+    shared = order[n_ghost + n_pep : n_ghost + n_pep + 3 * n_groups].reshape(-1, 3)
+    clean = order[n_ghost + n_pep + 3 * n_groups :]
+    if len(clean) < 12:
+        raise ValueError("too few suppliers for the pattern rates — raise --suppliers")
+    return clean, ghost, pep, shared
+
+
+def _suppliers(rng, n: int, seed: int, now: datetime, ghost: np.ndarray) -> dict:
+    is_ghost = np.zeros(n, dtype=bool)
+    is_ghost[ghost] = True
+    age = rng.integers(365, 9000, n)
+    age[is_ghost] = rng.integers(10, 180, is_ghost.sum())
+    filings = np.where(is_ghost, 0, rng.integers(2, 40, n))
+    address = np.where(is_ghost, False, rng.random(n) < 0.95)
+    online = np.where(is_ghost, False, rng.random(n) < 0.7)
+    past = np.where(is_ghost, 0, rng.poisson(8, n))
+    blacklisted = np.where(is_ghost, rng.random(n) < 0.25, rng.random(n) < 0.005)
+    verified = ~is_ghost & ~blacklisted & (rng.random(n) < 0.6)
+    status = np.where(
+        blacklisted,
+        SupplierVerificationStatus.BLACKLISTED.value,
+        np.where(verified, SupplierVerificationStatus.VERIFIED.value, SupplierVerificationStatus.UNVERIFIED.value),
+    )
+    created = _stamps(now, np.minimum(age, 730) * _DAY * rng.uniform(0, 1, n))
+    county = _pick(rng, COUNTIES, n)
+    word = _pick(rng, COMPANY_WORDS, n)
+    kind = _pick(rng, COMPANY_KINDS, n)
+    return {
+        "id": _uuids(rng, n),
+        "name": [f"{w} {k} {i}" for i, (w, k) in enumerate(zip(word, kind))],
+        "registration_number": [f"SYN/{seed}/S{i:09d}" for i in range(n)],
+        "kra_pin": [f"P{i:09d}S" for i in range(n)],
+        "incorporation_date": _stamps(now, age * _DAY),
+        "company_age_days": age.tolist(),
+        "address": [f"Plot {i % 997}, {c}" if a else None for i, (c, a) in enumerate(zip(county, address))],
+        "county": county.tolist(),
+        "tax_filings_count": filings.tolist(),
+        "employee_count": np.where(is_ghost, rng.integers(0, 4, n), rng.integers(5, 800, n)).tolist(),
+        "has_physical_address": address.tolist(),
+        "has_online_presence": online.tolist(),
+        "past_contracts_count": past.tolist(),
+        "past_contracts_value": np.round(past * rng.uniform(2e5, 5e6, n), 2).tolist(),
+        "risk_score": [0.0] * n,
+        "verification_status": status.tolist(),
+        "is_verified": verified.tolist(),
+        "is_blacklisted": blacklisted.tolist(),
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def _directors(rng, supplier_ids: list, pep: np.ndarray, shared: np.ndarray, now) -> dict:
+    n_sup = len(supplier_ids)
+    per_supplier = rng.integers(1, 4, n_sup)
+    owner = np.repeat(np.arange(n_sup), per_supplier)
+    first_of_supplier = np.r_[True, owner[1:] != owner[:-1]]
+    is_pep = np.isin(owner, pep) & first_of_supplier
+    national = 20_000_000 + rng.permutation(len(owner))
+    # [P9] one extra director per shared-group member, same person across the group
+    group_owner = shared.ravel()
+    group_national = 10_000_000 + np.repeat(np.arange(len(shared)), shared.shape[1])
+    group_names = np.repeat(np.asarray(_names(rng, len(shared)), dtype=object), shared.shape[1])
+
+    owner = np.r_[owner, group_owner]
+    n = len(owner)
+    names = np.r_[np.asarray(_names(rng, n - len(group_owner)), dtype=object), group_names]
+    is_pep = np.r_[is_pep, np.zeros(len(group_owner), dtype=bool)]
+    return {
+        "id": _uuids(rng, n),
+        "supplier_id": [supplier_ids[i] for i in owner],
+        "full_name": names.tolist(),
+        "national_id": [str(v) for v in np.r_[national, group_national]],
+        "role_title": _pick(rng, ("Director", "Managing Director", "Secretary"), n, p=(0.6, 0.25, 0.15)).tolist(),
+        "is_politically_exposed": is_pep.tolist(),
+        "pep_details": ["Serving county official (synthetic)" if p else None for p in is_pep],
+        "created_at": [now] * n,
+    }
+
+
+# ── Tenders, bids, contracts ──────────────────────────────────────────────────
+
+
+def _tender_chunk(rng: np.random.Generator, offset: int, m: int, u: _Universe) -> tuple[dict, np.ndarray]:
+    """One chunk of tenders with their bids and contracts; returns (tables, pattern bits)."""
+    p = {code: rng.random(m) < rate for code, rate in u.rates.items()}
+    bits = sum(p[f"P{k}"].astype(np.uint16) << (k - 1) for k in range(1, 10))
+    needs_award = p["P2"] | p["P5"] | p["P6"]
+
+    # When and where
+    age_days = rng.uniform(0, u.days, m)
+    age_days[needs_award] = rng.uniform(min(60, u.days), max(u.days, 61), needs_award.sum())
+    window_days = rng.uniform(14, 45, m)
+    window_days[p["P8"]] = rng.uniform(1, 2.9, p["P8"].sum())  # < 72 hours
+    deadline_ago = age_days - window_days  # negative = still open
+    entity = rng.integers(0, len(u.entity_ids), m)
+
+    # What and how much
+    bench = rng.integers(0, len(BENCHMARKS), m)
+    multiplier = rng.lognormal(0, 0.12, m)
+    multiplier[p["P1"]] = rng.uniform(2, 5, p["P1"].sum())
+    value = np.array([BENCHMARKS[b]["avg_price"] for b in bench]) * multiplier
+    method = _pick(
+        rng,
+        (ProcurementMethod.OPEN_TENDER.value, ProcurementMethod.REQUEST_FOR_QUOTATION.value,
+         ProcurementMethod.REQUEST_FOR_PROPOSAL.value),
+        m,
+        p=(0.75, 0.15, 0.10),
+    )
+    method[p["P7"]] = ProcurementMethod.DIRECT_PROCUREMENT.value
+    value[p["P7"]] = np.maximum(value[p["P7"]], rng.uniform(55e6, 4e8, p["P7"].sum()))
+    value = np.round(value, 2)
+
+    awarded = (deadline_ago > 0) & ((rng.random(m) < 0.7) | needs_award)
+    status = np.where(
+        deadline_ago <= 0,
+        TenderStatus.OPEN.value,
+        np.where(awarded, TenderStatus.AWARDED.value, _pick(
+            rng, (TenderStatus.EVALUATED.value, TenderStatus.CLOSED.value, TenderStatus.CANCELLED.value), m
+        )),
+    )
+    clause = _pick(rng, RESTRICTIVE_CLAUSES, m)
+    created = _stamps(u.now, age_days * _DAY)
+    deadline = _stamps(u.now, deadline_ago * _DAY)
+    opening = _stamps(u.now, (deadline_ago - 1) * _DAY)
+    tender_ids = _uuids(rng, m)
+    titles, descriptions = [], []
+    for j in range(m):
+        item = BENCHMARKS[bench[j]]
+        titles.append(f"Supply of {item['item_name']} — Lot {offset + j}")
+        text = (
+            f"Supply, delivery and commissioning of {item['item_name'].lower()} "
+            f"({item['unit']}) for {u.entity_county[entity[j]]} county."
+        )
+        descriptions.append(f"{text} {clause[j]}" if p["P3"][j] else text)
+    tenders = {
+        "id": tender_ids,
+        "reference_number": [f"SYN/{u.seed}/T{offset + j:09d}" for j in range(m)],
+        "title": titles,
+        "description": descriptions,
+        "category": [BENCHMARKS[b]["category"] for b in bench],
+        "estimated_value": value.tolist(),
+        "currency": ["KES"] * m,
+        "county": u.entity_county[entity].tolist(),
+        "procurement_method": method.tolist(),
+        "status": status.tolist(),
+        "submission_deadline": deadline,
+        "opening_date": opening,
+        "source": ["synthetic"] * m,
+        "is_scraped": [False] * m,
+        "created_at": created,
+        "updated_at": created,
+        "entity_id": [u.entity_ids[e] for e in entity],
+    }
+
+    # Bids — the winner is the lowest bid on an awarded tender
+    n_bids = np.clip(rng.poisson(u.bids_mean, m), 2, 12)
+    n_bids[p["P4"] | p["P9"]] = np.maximum(n_bids[p["P4"] | p["P9"]], 3)
+    n_bids[p["P7"]] = 1
+    tender_of = np.repeat(np.arange(m), n_bids)
+    starts = np.r_[0, np.cumsum(n_bids)[:-1]]
+    position = np.arange(len(tender_of)) - starts[tender_of]
+    # distinct bidders per tender: a random start and stride through the clean pool
+    first = rng.integers(0, len(u.clean), m)
+    stride = rng.integers(1, max(len(u.clean) // 12, 1) + 1, m)
+    supplier = u.clean[(first[tender_of] + position * stride[tender_of]) % len(u.clean)]
+    amount = value[tender_of] * rng.uniform(0.85, 1.15, len(tender_of))
+    colluding = p["P4"][tender_of]
+    amount[colluding] = (
+        value[tender_of[colluding]]
+        * rng.uniform(0.97, 1.03, m)[tender_of[colluding]]
+        * rng.uniform(0.995, 1.005, colluding.sum())
+    )
+    amount = np.round(amount, 2)
+    lowest = np.lexsort((amount, tender_of))[starts]  # one per tender, ties included
+    is_winner = np.zeros(len(tender_of), dtype=bool)
+    is_winner[lowest[awarded]] = True
+    # [P9] the first two bidders come from one shared-director group
+    group = u.shared[rng.integers(0, len(u.shared), m)]
+    linked = p["P9"][tender_of] & (position < 2)
+    supplier[linked] = group[tender_of[linked], position[linked]]
+    for code, pool in (("P2", u.ghost), ("P6", u.pep)):
+        target = is_winner & p[code][tender_of]
+        supplier[target] = pool[rng.integers(0, len(pool), target.sum())]
+
+    proposal = _pick(rng, PROPOSALS, len(tender_of)).astype(object)
+    proposal[colluding] = COLLUSIVE_PROPOSAL
+    window = window_days[tender_of]
+    submitted = _stamps(u.now, (age_days[tender_of] - window * rng.uniform(0.3, 0.95, len(tender_of))) * _DAY)
+    bid_status = np.where(
+        is_winner,
+        BidStatus.AWARDED.value,
+        np.where(awarded[tender_of], BidStatus.REJECTED.value, BidStatus.SUBMITTED.value),
+    )
+    bids = {
+        "id": _uuids(rng, len(tender_of)),
+        "tender_id": [tender_ids[t] for t in tender_of],
+        "supplier_id": [u.supplier_ids[s] for s in supplier],
+        "bid_amount": amount.tolist(),
+        "currency": ["KES"] * len(tender_of),
+        "submitted_at": submitted,
+        "proposal_text": proposal.tolist(),
+        "status": bid_status.tolist(),
+        "is_winner": is_winner.tolist(),
+        "created_at": submitted,
+    }
+
+    # Contracts — one per awarded tender, with the winning bidder
+    won = np.flatnonzero(is_winner)
+    t = tender_of[won]
+    contract_value = amount[won].copy()
+    varied = p["P5"][t]
+    contract_value[varied] = value[t[varied]] * rng.uniform(1.3, 2.0, varied.sum())
+    contract_value = np.round(contract_value, 2)
+    variations = np.where(varied, rng.integers(1, 5, len(t)), 0)
+    awarded_ago = np.maximum(deadline_ago[t] - rng.uniform(7, 30, len(t)), 0)
+    completed = rng.random(len(t)) < np.clip(awarded_ago / 365, 0, 0.9)
+    awarded_at = _stamps(u.now, awarded_ago * _DAY)
+    contracts = {
+        "id": _uuids(rng, len(t)),
+        "tender_id": [tender_ids[i] for i in t],
+        "supplier_id": [u.supplier_ids[s] for s in supplier[won]],
+        "contract_value": contract_value.tolist(),
+        "original_tender_value": value[t].tolist(),
+        "value_variation_pct": np.round((contract_value - value[t]) / value[t] * 100, 2).tolist(),
+        "currency": ["KES"] * len(t),
+        "awarded_at": awarded_at,
+        "start_date": awarded_at,
+        "end_date": _stamps(u.now, (awarded_ago - rng.uniform(180, 720, len(t))) * _DAY),
+        "status": np.where(completed, ContractStatus.COMPLETED.value, ContractStatus.ACTIVE.value).tolist(),
+        "variation_count": variations.tolist(),
+        "variation_notes": [f"{v} variation(s) approved after award" if v else None for v in variations],
+        "created_at": awarded_at,
+        "updated_at": awarded_at,
+    }
+    return {"tenders": tenders, "bids": bids, "contracts": contracts}, bits
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+_TABLES = {
+    "procuring_entities": ProcuringEntity.__table__,
+    "suppliers": Supplier.__table__,
+    "directors": Director.__table__,
+    "tenders": Tender.__table__,
+    "bids": Bid.__table__,
+    "contracts": Contract.__table__,
+    "price_benchmarks": PriceBenchmark.__table__,
+}
+
+
+class _Loader:
+    """COPY into PostgreSQL, batched INSERTs elsewhere."""
+
+    def __init__(self, engine: Optional[AsyncEngine], batch_rows: int):
+        self.engine = engine
+        self.batch_rows = batch_rows
+        self.rows: dict[str, int] = dict.fromkeys(_TABLES, 0)
+
+    async def load(self, name: str, columns: dict) -> None:
+        names = list(columns)
+        records = list(zip(*columns.values()))
+        self.rows[name] += len(records)
+        if self.engine is None or not records:
+            return
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    name, records=records, columns=names
+                )
+            else:
+                for i in range(0, len(records), self.batch_rows):
+                    await conn.execute(
+                        insert(_TABLES[name]),
+                        [dict(zip(names, r)) for r in records[i : i + self.batch_rows]],
+                    )
+            await conn.commit()
+
+
+async def generate(
+    n_tenders: int,
+    n_suppliers: Optional[int] = None,
+    n_entities: Optional[int] = None,
+    rates: Optional[dict[str, float]] = None,
+    seed: int = 42,
+    days: int = 730,
+    bids_mean: float = 4.0,
+    as_of: Optional[datetime] = None,
+    engine: Optional[AsyncEngine] = None,
+    batch_rows: int = 5000,
+    labels: Optional[str] = None,
+) -> dict:
+    """Generate (and, given an engine, load) a dataset; returns row counts and timing."""
+    started = time.perf_counter()
+    rates = {code: rate for code, (rate, _) in PATTERNS.items()} | (rates or {})
+    n_suppliers = n_suppliers or max(n_tenders // 5, 200)
+    n_entities = n_entities or max(min(n_tenders // 500, 2000), 20)
+    now = as_of or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    streams = np.random.SeedSequence(seed).spawn(2)
+    rng = np.random.default_rng(streams[0])
+    loader = _Loader(engine, batch_rows)
+
+    if engine is not None:
+        async with engine.connect() as conn:
+            if not await conn.scalar(select(func.count()).select_from(PriceBenchmark)):
+                await conn.execute(insert(PriceBenchmark), BENCHMARKS)
+                await conn.commit()
+                loader.rows["price_benchmarks"] = len(BENCHMARKS)
+
+    entities = _entities(rng, n_entities, seed, now)
+    clean, ghost, pep, shared = _supplier_pools(rng, n_suppliers, rates)
+    suppliers = _suppliers(rng, n_suppliers, seed, now, ghost)
+    directors = _directors(rng, suppliers["id"], pep, shared, now)
+    supplier_bits = np.zeros(n_suppliers, dtype=np.uint16)
+    supplier_bits[ghost] |= 1 << 1
+    supplier_bits[pep] |= 1 << 5
+    supplier_bits[shared.ravel()] |= 1 << 8
+    u = _Universe(
+        seed=seed,
+        now=now,
+        days=days,
+        rates=rates,
+        bids_mean=bids_mean,
+        entity_ids=entities["id"],
+        entity_county=np.asarray(entities["county"], dtype=object),
+        supplier_ids=suppliers["id"],
+        clean=clean,
+        ghost=ghost,
+        pep=pep,
+        shared=shared,
+    )
+    await loader.load("procuring_entities", entities)
+    await loader.load("suppliers", suppliers)
+    await loader.load("directors", directors)
+
+    tender_ids: list = []
+    tender_bits: list[np.ndarray] = []
+    chunk_seeds = streams[1].spawn(-(-n_tenders // CHUNK_TENDERS))
+    for i, chunk_seed in enumerate(chunk_seeds):
+        offset = i * CHUNK_TENDERS
+        tables, bits = _tender_chunk(
+            np.random.default_rng(chunk_seed), offset, min(CHUNK_TENDERS, n_tenders - offset), u
+        )
+        for name in ("tenders", "bids", "contracts"):
+            await loader.load(name, tables[name])
+        if labels:
+            tender_ids.extend(str(t) for t in tables["tenders"]["id"])
+            tender_bits.append(bits)
+        print(f"   … {offset + len(bits):,} / {n_tenders:,} tenders", flush=True)
+
+    if labels:
+        np.savez_compressed(
+            labels,
+            patterns=np.array(list(PATTERNS)),
+            tender_id=np.array(tender_ids),
+            tender_patterns=np.concatenate(tender_bits),
+            supplier_id=np.array([str(s) for s in suppliers["id"]]),
+            supplier_patterns=supplier_bits,
+        )
+    seconds = time.perf_counter() - started
+    return {
+        "seed": seed,
+        "as_of": now.isoformat(),
+        "rows": loader.rows,
+        "seconds": round(seconds, 2),
+        "tenders_per_second": round(n_tenders / seconds) if seconds else None,
+    }
+
+
+async def teardown(engine: AsyncEngine, seed: int) -> dict:
+    """Delete the rows generated with `seed` (children first)."""
+    prefix = f"SYN/{seed}/%"
+    tenders = select(Tender.id).filter(Tender.reference_number.like(prefix))
+    suppliers = select(Supplier.id).filter(Supplier.registration_number.like(prefix))
+    deleted = {}
+    async with engine.begin() as conn:
+        for name, stmt in (
+            ("bids", delete(Bid).where(Bid.tender_id.in_(tenders))),
+            ("contracts", delete(Contract).where(Contract.tender_id.in_(tenders))),
+            ("tenders", delete(Tender).where(Tender.reference_number.like(prefix))),
+            ("directors", delete(Director).where(Director.supplier_id.in_(suppliers))),
+            ("suppliers", delete(Supplier).where(Supplier.registration_number.like(prefix))),
+            ("procuring_entities", delete(ProcuringEntity).where(ProcuringEntity.code.like(prefix))),
+        ):
+            deleted[name] = (await conn.execute(stmt)).rowcount
+    return deleted
+
+
+def _rate(value: str) -> tuple[str, float]:
+    code, _, rate = value.partition("=")
+    if code not in PATTERNS or not rate:
+        raise argparse.ArgumentTypeError(f"expected P1..P9=<rate>, got {value!r}")
+    return code, float(rate)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic procurement dataset.")
+    parser.add_argument("--tenders", type=int, default=10_000)
+    parser.add_argument("--suppliers", type=int, help="Default: tenders / 5")
+    parser.add_argument("--entities", type=int, help="Default: tenders / 500 (20–2000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=730, help="Spread tenders over the last N days")
+    parser.add_argument("--bids-mean", type=float, default=4.0)
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="Reference 'now' (ISO date)")
+    parser.add_argument("--rate", type=_rate, action="append", default=[], help="e.g. P1=0.2")
+    parser.add_argument("--labels", help="Write pattern labels to this .npz file")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--batch-rows", type=int, default=5000, help="INSERT batch size (non-PostgreSQL)")
+    parser.add_argument("--create-tables", action="store_true", help="Create the loaded tables if missing")
+    parser.add_argument("--dry-run", action="store_true", help="Generate only; nothing is written")
+    parser.add_argument("--teardown", action="store_true", help="Delete the rows of --seed")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    engine = None if args.dry_run else create_async_engine(args.database_url)
+    try:
+        if args.teardown:
+            print(f"🗑️  Removed: {await teardown(engine, args.seed)}")
+            return
+        if args.create_tables:
+            from app.core.database import Base
+
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all, tables=list(_TABLES.values()))
+        as_of = args.as_of.replace(tzinfo=args.as_of.tzinfo or timezone.utc) if args.as_of else None
+        print(f"\n🌱 Generating {args.tenders:,} synthetic tenders (seed {args.seed})...")
+        summary = await generate(
+            args.tenders,
+            n_suppliers=args.suppliers,
+            n_entities=args.entities,
+            rates=dict(args.rate),
+            seed=args.seed,
+            days=args.days,
+            bids_mean=args.bids_mean,
+            as_of=as_of,
+            engine=engine,
+            batch_rows=args.batch_rows,
+            labels=args.labels,
+        )
+        print(f"\n✅ {'Generated' if args.dry_run else 'Loaded'} in {summary['seconds']}s "
+              f"({summary['tenders_per_second']:,} tenders/s)")
+        for name, count in summary["rows"].items():
+            print(f"   {count:>12,}  {name}")
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(parse_args()))
@@ -9,7 +9,7 @@ AI Service — integrates Anthropic Claude for:
 
 import json
 import re
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import anthropic
 
@@ -22,6 +22,34 @@ def _get_client() -> anthropic.Anthropic:
     return anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
 
 
+def _get_async_client() -> anthropic.AsyncAnthropic:
+    if not settings.ANTHROPIC_API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY not set in environment")
+    return anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+
+async def stream_text(
+    prompt: str,
+    max_tokens: int,
+    system: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield Claude's text deltas as they arrive. Closing the generator (e.g. the
+    SSE client disconnected and the response task was cancelled) exits the
+    stream context, which closes the upstream HTTP request.
+    """
+    client = _get_async_client()
+    kwargs = {"system": system} if system else {}
+    async with client.messages.stream(
+        model="claude-opus-4-6",
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+        **kwargs,
+    ) as stream:
+        async for text in stream.text_stream:
+            yield text
+
+
 # ─────────────────────────────────────────────
 # 1. Tender Risk Narrative Analysis
 # ─────────────────────────────────────────────
@@ -126,8 +154,11 @@ async def triage_whistleblower_report(
     """
     AI triage of an anonymous whistleblower report.
     Returns: { triage_summary, credibility_score, allegation_type, is_credible }
+
+    Uses the async client so the triage worker can run several reports
+    concurrently without blocking the event loop.
     """
-    client = _get_client()
+    client = _get_async_client()
 
     tender_context = (
         f"\nRelated Tender: {related_tender_title}" if related_tender_title else ""
@@ -152,7 +183,7 @@ Analyze this report and respond ONLY with valid JSON (no markdown, no explanatio
 
 Score credibility based on: specificity of allegations, verifiable claims, consistency with known patterns, seriousness of allegation."""
 
-    message = client.messages.create(
+    message = await client.messages.create(
         model="claude-opus-4-6",
         max_tokens=500,
         messages=[{"role": "user", "content": prompt}],
@@ -275,20 +306,18 @@ Provide a clear, concise answer in plain English. Use specific figures from the
 # ─────────────────────────────────────────────
 
 
-async def generate_investigation_package(
+INVESTIGATION_PACKAGE_MAX_TOKENS = 1500
+
+
+def investigation_package_prompt(
     tender: dict,
     risk_score: dict,
     supplier: Optional[dict],
     bids: Optional[list],
     similar_cases: Optional[list] = None,
 ) -> str:
-    """
-    Generates a structured investigation briefing document for EACC investigators.
-    Returns formatted Markdown text.
-    """
-    client = _get_client()
-
-    prompt = f"""You are preparing an investigation briefing package for EACC investigators.
+    """Prompt shared by the blocking and streaming investigation package."""
+    return f"""You are preparing an investigation briefing package for EACC investigators.
 Generate a professional, court-admissible quality investigation memo based on the following data.
 
 TENDER DATA:
@@ -317,9 +346,24 @@ Generate a structured investigation package in Markdown with these sections:
 
 Be specific, reference actual Kenyan legal statutes, and write for a legal/investigative audience."""
 
-    message = client.messages.create(
+
+async def generate_investigation_package(
+    tender: dict,
+    risk_score: dict,
+    supplier: Optional[dict],
+    bids: Optional[list],
+    similar_cases: Optional[list] = None,
+) -> str:
+    """
+    Generates a structured investigation briefing document for EACC investigators.
+    Returns formatted Markdown text.
+    """
+    client = _get_async_client()
+    prompt = investigation_package_prompt(tender, risk_score, supplier, bids, similar_cases)
+
+    message = await client.messages.create(
         model="claude-opus-4-6",
-        max_tokens=1500,
+        max_tokens=INVESTIGATION_PACKAGE_MAX_TOKENS,
         messages=[{"role": "user", "content": prompt}],
     )
 
@@ -1,11 +1,10 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import extract, func, select
+from sqlalchemy import and_, case, extract, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.red_flag_model import RedFlag
+from app.models.risk_daily_rollup_model import RiskDailyRollup
 from app.models.risk_score_model import RiskScore
-from app.models.tender_model import Tender
 
 MONTH_ABBR = [
     "Jan",
@@ -25,81 +24,42 @@ MONTH_ABBR = [
 
 async def get_spending_trend(db: AsyncSession, months: int = 6) -> list[dict]:
     """
-    Monthly budgeted vs actual spend vs flagged spend.
+    Monthly budgeted vs actual spend vs flagged spend, from risk_daily_rollup.
     budgeted  = sum of estimated_value on all tenders
     actual    = sum of contract values (awarded)
     flagged   = sum of estimated_value on tenders that have red flags
     All values in millions KES.
     """
-    since = datetime.now(timezone.utc) - timedelta(days=30 * months)
+    since = (datetime.now(timezone.utc) - timedelta(days=30 * months)).date()
+    year = extract("year", RiskDailyRollup.day).label("year")
+    month = extract("month", RiskDailyRollup.day).label("month")
 
-    # Budgeted per month
-    budgeted_rows = (
-        await db.execute(
-            select(
-                extract("year", Tender.created_at).label("year"),
-                extract("month", Tender.created_at).label("month"),
-                func.coalesce(func.sum(Tender.estimated_value), 0).label("total"),
-            )
-            .filter(Tender.created_at >= since)
-            .group_by("year", "month")
-            .order_by("year", "month")
-        )
-    ).all()
-
-    # Actual (awarded contract values) per month
-    # Import Contract inside to avoid circular at module level
-    from app.models.contract_model import Contract
-
-    actual_rows = (
-        await db.execute(
-            select(
-                extract("year", Contract.created_at).label("year"),
-                extract("month", Contract.created_at).label("month"),
-                func.coalesce(func.sum(Contract.contract_value), 0).label("total"),
-            )
-            .filter(Contract.created_at >= since)
-            .group_by("year", "month")
-            .order_by("year", "month")
-        )
-    ).all()
-
-    # Flagged spend per month (tenders that have ≥1 red flag)
-    flagged_rows = (
+    rows = (
         await db.execute(
             select(
-                extract("year", Tender.created_at).label("year"),
-                extract("month", Tender.created_at).label("month"),
-                func.coalesce(func.sum(Tender.estimated_value), 0).label("total"),
+                year,
+                month,
+                func.sum(RiskDailyRollup.estimated_value_sum).label("budgeted"),
+                func.sum(RiskDailyRollup.contract_value_sum).label("actual"),
+                func.sum(RiskDailyRollup.flagged_value_sum).label("flagged"),
             )
-            .join(RedFlag, RedFlag.tender_id == Tender.id)
-            .filter(Tender.created_at >= since)
-            .group_by("year", "month")
-            .order_by("year", "month")
-            .distinct()
+            .filter(RiskDailyRollup.flag_type == "", RiskDailyRollup.day >= since)
+            .group_by(year, month)
+            .order_by(year, month)
         )
     ).all()
 
-    # Build maps keyed by "YYYY-MM"
-    def to_map(rows) -> dict[str, float]:
-        return {
-            f"{int(r.year)}-{int(r.month):02d}": round((r.total or 0) / 1_000_000, 1)
-            for r in rows
-        }
-
-    budgeted_map = to_map(budgeted_rows)
-    actual_map = to_map(actual_rows)
-    flagged_map = to_map(flagged_rows)
+    def millions(value) -> float:
+        return round((value or 0) / 1_000_000, 1)
 
-    all_keys = sorted(set(budgeted_map) | set(actual_map) | set(flagged_map))
     return [
         {
-            "month": MONTH_ABBR[int(k.split("-")[1]) - 1],
-            "budgeted": budgeted_map.get(k, 0),
-            "actual": actual_map.get(k, 0),
-            "flagged": flagged_map.get(k, 0),
+            "month": MONTH_ABBR[int(r.month) - 1],
+            "budgeted": millions(r.budgeted),
+            "actual": millions(r.actual),
+            "flagged": millions(r.flagged),
         }
-        for k in all_keys
+        for r in rows
     ]
 
 
@@ -136,42 +96,39 @@ async def get_analytics_kpis(db: AsyncSession) -> dict:
     start_curr = now - timedelta(days=30)
     start_prev = now - timedelta(days=60)
 
-    # Total procurement value (all time)
-    total_value = (
-        await db.scalar(select(func.coalesce(func.sum(Tender.estimated_value), 0)))
-    ) or 0
+    tender_rows = RiskDailyRollup.flag_type == ""
+    in_curr = RiskDailyRollup.day >= start_curr.date()
+    in_prev = and_(
+        RiskDailyRollup.day >= start_prev.date(), RiskDailyRollup.day < start_curr.date()
+    )
+    scored = RiskDailyRollup.risk_level != ""
 
-    # Flagged tenders (have ≥1 red flag)
-    flagged_curr = (
-        await db.scalar(
-            select(func.count(func.distinct(RedFlag.tender_id))).filter(
-                RedFlag.created_at >= start_curr
-            )
-        )
-    ) or 0
-    flagged_prev = (
-        await db.scalar(
-            select(func.count(func.distinct(RedFlag.tender_id))).filter(
-                RedFlag.created_at >= start_prev, RedFlag.created_at < start_curr
-            )
-        )
-    ) or 0
-
-    # Average risk score
-    avg_curr = (
-        await db.scalar(
-            select(func.avg(RiskScore.total_score))
-            .join(Tender, Tender.id == RiskScore.tender_id)
-            .filter(Tender.created_at >= start_curr)
-        )
-    ) or 0
-    avg_prev = (
-        await db.scalar(
-            select(func.avg(RiskScore.total_score))
-            .join(Tender, Tender.id == RiskScore.tender_id)
-            .filter(Tender.created_at >= start_prev, Tender.created_at < start_curr)
+    def total(column, *conditions):
+        return func.coalesce(func.sum(case((and_(*conditions), column), else_=0)), 0)
+
+    row = (
+        await db.execute(
+            select(
+                # Total procurement value (all time)
+                func.coalesce(func.sum(RiskDailyRollup.estimated_value_sum), 0).label(
+                    "total_value"
+                ),
+                # Flagged tenders (have ≥1 red flag), by the tender's created day
+                total(RiskDailyRollup.flagged_tender_count, in_curr).label("flagged_curr"),
+                total(RiskDailyRollup.flagged_tender_count, in_prev).label("flagged_prev"),
+                # Average risk score = score sum / scored tenders
+                total(RiskDailyRollup.total_score_sum, in_curr, scored).label("score_curr"),
+                total(RiskDailyRollup.tender_count, in_curr, scored).label("scored_curr"),
+                total(RiskDailyRollup.total_score_sum, in_prev, scored).label("score_prev"),
+                total(RiskDailyRollup.tender_count, in_prev, scored).label("scored_prev"),
+            ).filter(tender_rows)
         )
-    ) or 0
+    ).one()
+    total_value = row.total_value or 0
+    flagged_curr = int(row.flagged_curr or 0)
+    flagged_prev = int(row.flagged_prev or 0)
+    avg_curr = row.score_curr / row.scored_curr if row.scored_curr else 0
+    avg_prev = row.score_prev / row.scored_prev if row.scored_prev else 0
 
     def delta_pct(curr, prev) -> str:
         if not prev:
@@ -198,33 +155,32 @@ async def get_daily_trend(db: AsyncSession, days: int = 7) -> list[dict]:
     """
     Daily counts of tenders by risk level for TrendChart (area chart).
     """
-    since = datetime.now(timezone.utc) - timedelta(days=days)
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
 
     rows = (
         await db.execute(
             select(
-                func.date(Tender.created_at).label("date"),
-                RiskScore.risk_level,
-                func.count(Tender.id).label("count"),
+                RiskDailyRollup.day,
+                RiskDailyRollup.risk_level,
+                func.sum(RiskDailyRollup.tender_count).label("count"),
+            )
+            .filter(
+                RiskDailyRollup.flag_type == "",
+                RiskDailyRollup.risk_level != "",
+                RiskDailyRollup.day >= since,
             )
-            .join(RiskScore, RiskScore.tender_id == Tender.id)
-            .filter(Tender.created_at >= since)
-            .group_by(func.date(Tender.created_at), RiskScore.risk_level)
-            .order_by(func.date(Tender.created_at))
+            .group_by(RiskDailyRollup.day, RiskDailyRollup.risk_level)
+            .having(func.sum(RiskDailyRollup.tender_count) > 0)
+            .order_by(RiskDailyRollup.day)
         )
     ).all()
 
     day_map: dict[str, dict[str, int]] = {}
     for row in rows:
-        key = str(row.date)  # "2026-03-19"
+        key = str(row.day)  # "2026-03-19"
         day_map.setdefault(key, {"critical": 0, "high": 0, "medium": 0})
-        level = (
-            row.risk_level.value
-            if hasattr(row.risk_level, "value")
-            else str(row.risk_level)
-        )
-        if level in day_map[key]:
-            day_map[key][level] = row.count
+        if row.risk_level in day_map[key]:
+            day_map[key][row.risk_level] = int(row.count)
 
     return [
         {
@@ -0,0 +1,321 @@
+"""
+Audit Log Partitions — monthly partitions of audit_logs and their archival.
+
+On PostgreSQL audit_logs is range-partitioned by performed_at, one
+partition per calendar month (migration 9e2b5f7c3d18):
+
+    audit_logs_y2026m09   [2026-09-01, 2026-10-01)
+    audit_logs_y2026m10   [2026-10-01, 2026-11-01)
+    audit_logs_default    anything no monthly partition covers
+
+The daily job (run_maintenance, app/core/scheduler.py):
+  1. creates the partitions for this month and the next
+     AUDIT_PARTITION_MONTHS_AHEAD, so writes never land in the default
+     partition;
+  2. archives every partition that ended more than AUDIT_RETENTION_MONTHS
+     ago — its rows are streamed to AUDIT_ARCHIVE_DIR as gzip NDJSON (or
+     Parquet), the row count is checked against the partition, and only
+     then is the partition detached (and dropped if AUDIT_ARCHIVE_DROP).
+
+Archived records leave the live table but are never deleted unrecoverably:
+a detached partition can be re-attached, and the archive file reloaded.
+
+    python -m app.services.audit_partition_service              # the daily job
+    python -m app.services.audit_partition_service --ensure
+    python -m app.services.audit_partition_service --archive audit_logs_y2024m01
+
+On other databases (SQLite in development) every step is a no-op.
+"""
+
+import argparse
+import asyncio
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import fast_json
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARENT = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+_BATCH_ROWS = 5000
+# Column order of the archive files
+COLUMNS = (
+    "id",
+    "user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "audit_log_metadata",
+    "ip_address",
+    "user_agent",
+    "performed_at",
+)
+
+
+def add_months(month: date, n: int) -> date:
+    years, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """First day of the month a partition covers; None for other tables."""
+    match = _NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL for one monthly partition (the name and bounds come from a date)."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+    )
+
+
+def _this_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = await db.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": PARENT},
+    )
+    return relkind == "p"
+
+
+async def list_partitions(db: AsyncSession) -> list[str]:
+    """Names of the partitions currently attached to audit_logs, oldest first."""
+    rows = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+        ),
+        {"name": PARENT},
+    )
+    return list(rows.scalars())
+
+
+# ── Creation ──────────────────────────────────────────────────────────────────
+
+
+async def ensure_partitions(db: AsyncSession, months_ahead: Optional[int] = None) -> list[str]:
+    """Create this month's partition and the next `months_ahead`; returns those created."""
+    if not await is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_PARTITION_MONTHS_AHEAD
+    existing = set(await list_partitions(db))
+    created = []
+    for n in range(months_ahead + 1):
+        month = add_months(_this_month(), n)
+        if partition_name(month) in existing:
+            continue
+        try:
+            await db.execute(text(create_partition_sql(month)))
+            await db.commit()
+            created.append(partition_name(month))
+        except DBAPIError as exc:
+            # e.g. rows for that month already sit in the default partition
+            await db.rollback()
+            logger.error(
+                "Audit partition not created",
+                extra={"partition": partition_name(month), "error": str(exc.orig)},
+            )
+    if created:
+        logger.info("Audit partitions created", extra={"partitions": created})
+    return created
+
+
+# ── Archival ──────────────────────────────────────────────────────────────────
+
+
+def _archive_path(name: str, fmt: str, out_dir: Path) -> Path:
+    suffix = {"ndjson": ".ndjson.gz", "parquet": ".parquet"}[fmt]
+    return out_dir / f"{name}{suffix}"
+
+
+class _NdjsonWriter:
+    def __init__(self, path: Path):
+        self._file = gzip.open(path, "wb", compresslevel=6)
+
+    def write(self, rows: list[dict]) -> None:
+        self._file.write(b"".join(fast_json.dumps(row) + b"\n" for row in rows))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # optional — pip install pyarrow
+            raise RuntimeError("AUDIT_ARCHIVE_FORMAT=parquet needs pyarrow installed") from exc
+        self._pa = pa
+        self._schema = pa.schema(
+            [(column, pa.string()) for column in COLUMNS if column != "performed_at"]
+            + [("performed_at", pa.timestamp("us", tz="UTC"))]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows: list[dict]) -> None:
+        for row in rows:
+            for column in COLUMNS[:-1]:
+                value = row[column]
+                if isinstance(value, dict):
+                    row[column] = fast_json.dumps_str(value)
+                elif value is not None and not isinstance(value, str):
+                    row[column] = str(value)
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+async def archive_partition(
+    name: str,
+    fmt: Optional[str] = None,
+    out_dir: Optional[str] = None,
+    drop: Optional[bool] = None,
+) -> dict:
+    """
+    Stream one monthly partition to an archive file, then detach it.
+
+    The partition stays attached (and nothing is lost) if writing the file
+    fails or its row count doesn't match the partition's.
+    """
+    from app.core.database import AsyncSessionLocal
+
+    if partition_month(name) is None:
+        raise ValueError(f"not a monthly audit partition: {name}")
+    fmt = fmt or settings.AUDIT_ARCHIVE_FORMAT
+    if fmt not in ("ndjson", "parquet"):
+        raise ValueError("format must be ndjson or parquet")
+    drop = settings.AUDIT_ARCHIVE_DROP if drop is None else drop
+    directory = Path(out_dir or settings.AUDIT_ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = _archive_path(name, fmt, directory)
+    partial = path.with_name(path.name + ".partial")
+
+    async with AsyncSessionLocal() as db:
+        if name not in await list_partitions(db):
+            raise ValueError(f"{name} is not attached to {PARENT}")
+        writer = _ParquetWriter(partial) if fmt == "parquet" else _NdjsonWriter(partial)
+        written = 0
+        try:
+            result = await db.stream(
+                text(f"SELECT {', '.join(COLUMNS)} FROM {name} ORDER BY performed_at")
+                .execution_options(yield_per=_BATCH_ROWS)
+            )
+            async for batch in result.mappings().partitions():
+                rows = [dict(row) for row in batch]
+                writer.write(rows)
+                written += len(rows)
+        finally:
+            writer.close()
+        expected = await db.scalar(text(f"SELECT count(*) FROM {name}"))
+        if expected != written:
+            partial.unlink(missing_ok=True)
+            raise RuntimeError(f"{name}: archived {written} rows but the partition holds {expected}")
+        with open(partial, "rb") as f:
+            os.fsync(f.fileno())
+        partial.replace(path)
+
+        await db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            await db.execute(text(f"DROP TABLE {name}"))
+        await db.commit()
+
+    summary = {
+        "partition": name,
+        "rows": written,
+        "path": str(path),
+        "bytes": path.stat().st_size,
+        "dropped": drop,
+    }
+    logger.info("Audit partition archived", extra=summary)
+    return summary
+
+
+async def archive_expired(
+    retention_months: Optional[int] = None,
+    fmt: Optional[str] = None,
+    out_dir: Optional[str] = None,
+) -> list[dict]:
+    """Archive every monthly partition that ended more than `retention_months` ago."""
+    from app.core.database import AsyncSessionLocal
+
+    if retention_months is None:
+        retention_months = settings.AUDIT_RETENTION_MONTHS
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(_this_month(), -retention_months)
+    async with AsyncSessionLocal() as db:
+        if not await is_partitioned(db):
+            return []
+        expired = [
+            name
+            for name in await list_partitions(db)
+            if (month := partition_month(name)) is not None and add_months(month, 1) <= cutoff
+        ]
+    return [await archive_partition(name, fmt, out_dir) for name in expired]
+
+
+async def run_maintenance() -> None:
+    """Scheduler entry point (app/core/scheduler.py)."""
+    from app.core.database import AsyncSessionLocal
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await ensure_partitions(db)
+        await archive_expired()
+    except Exception as exc:
+        logger.error("Audit partition maintenance failed", extra={"error": str(exc)})
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain audit_logs partitions.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--ensure", action="store_true", help="Only create upcoming partitions")
+    group.add_argument("--archive", metavar="PARTITION", help="Archive and detach one partition")
+    parser.add_argument("--format", choices=("ndjson", "parquet"), help="Archive file format")
+    parser.add_argument("--out-dir", help=f"Default: {settings.AUDIT_ARCHIVE_DIR}")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.core.database import AsyncSessionLocal
+
+    if args.archive:
+        print(await archive_partition(args.archive, args.format, args.out_dir))
+        return
+    async with AsyncSessionLocal() as db:
+        print("created:", await ensure_partitions(db) or "none")
+    if not args.ensure:
+        for summary in await archive_expired(fmt=args.format, out_dir=args.out_dir):
+            print(summary)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(parse_args()))
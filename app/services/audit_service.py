@@ -47,13 +47,12 @@ class AuditService:
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
-            metadata=metadata or {},
+            audit_log_metadata=metadata or {},
             ip_address=ip_address,
             user_agent=user_agent,
         )
         db.add(entry)
-        await db.commit()
-        await db.refresh(entry)
+        await db.commit()  # sessions don't expire on commit — no refresh round trip
         return entry
 
     @staticmethod
@@ -1,5 +1,3 @@
-import cloudinary
-import cloudinary.uploader
 from fastapi import UploadFile
 
 from app.core.config import settings
@@ -7,18 +5,30 @@ from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET,
-)
+_configured = False
+
+
+def _uploader():
+    """Import and configure the Cloudinary SDK on first use (or at warm-up)."""
+    global _configured
+    import cloudinary
+    import cloudinary.uploader
+
+    if not _configured:
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET,
+        )
+        _configured = True
+    return cloudinary.uploader
 
 
 async def upload_tender_attachment(file: UploadFile, tender_number: str) -> dict:
     """Upload a single file to Cloudinary and return its metadata."""
     try:
         contents = await file.read()
-        result = cloudinary.uploader.upload(
+        result = _uploader().upload(
             contents,
             folder=f"tenders/{tender_number}",
             resource_type="auto",  # handles PDFs, images, docs
@@ -43,7 +53,7 @@ async def upload_tender_attachment(file: UploadFile, tender_number: str) -> dict
 async def delete_tender_attachment(public_id: str) -> None:
     """Delete a file from Cloudinary by public_id."""
     try:
-        cloudinary.uploader.destroy(public_id, resource_type="raw")
+        _uploader().destroy(public_id, resource_type="raw")
     except Exception as exc:
         logger.error(
             "Cloudinary delete failed",
@@ -60,7 +70,7 @@ async def upload_bid_document(
     """Upload a bid document to Cloudinary under bids/{reference}/{folder}/"""
     try:
         contents = await file.read()
-        result = cloudinary.uploader.upload(
+        result = _uploader().upload(
             contents,
             folder=f"bids/{bid_reference}/{folder}",
             resource_type="auto",
@@ -4,6 +4,7 @@ from sqlalchemy import extract, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.red_flag_model import RedFlag
+from app.models.risk_daily_rollup_model import RiskDailyRollup
 from app.models.risk_score_model import RiskScore
 from app.models.tender_model import Tender
 
@@ -119,20 +120,26 @@ async def get_county_risk(db: AsyncSession) -> list[dict]:
 
 
 async def get_risk_trend(db: AsyncSession, months: int = 6) -> list[dict]:
-    since = datetime.now(timezone.utc) - timedelta(days=30 * months)
+    since = (datetime.now(timezone.utc) - timedelta(days=30 * months)).date()
+    year = extract("year", RiskDailyRollup.day).label("year")
+    month = extract("month", RiskDailyRollup.day).label("month")
 
     rows = (
         await db.execute(
             select(
-                extract("year", Tender.created_at).label("year"),
-                extract("month", Tender.created_at).label("month"),
-                RiskScore.risk_level,
-                func.count(Tender.id).label("count"),
+                year,
+                month,
+                RiskDailyRollup.risk_level,
+                func.sum(RiskDailyRollup.tender_count).label("count"),
             )
-            .join(RiskScore, RiskScore.tender_id == Tender.id)
-            .filter(Tender.created_at >= since)
-            .group_by("year", "month", RiskScore.risk_level)
-            .order_by("year", "month")
+            .filter(
+                RiskDailyRollup.flag_type == "",
+                RiskDailyRollup.risk_level != "",
+                RiskDailyRollup.day >= since,
+            )
+            .group_by(year, month, RiskDailyRollup.risk_level)
+            .having(func.sum(RiskDailyRollup.tender_count) > 0)
+            .order_by(year, month)
         )
     ).all()
 
@@ -140,13 +147,8 @@ async def get_risk_trend(db: AsyncSession, months: int = 6) -> list[dict]:
     for row in rows:
         key = f"{int(row.year)}-{int(row.month):02d}"
         month_map.setdefault(key, {"critical": 0, "high": 0, "medium": 0, "low": 0})
-        level = (
-            row.risk_level.value
-            if hasattr(row.risk_level, "value")
-            else str(row.risk_level)
-        )
-        if level in month_map[key]:
-            month_map[key][level] = row.count
+        if row.risk_level in month_map[key]:
+            month_map[key][row.risk_level] = int(row.count)
 
     return [
         {
@@ -162,21 +164,21 @@ async def get_risk_trend(db: AsyncSession, months: int = 6) -> list[dict]:
 
 
 async def get_risk_type_distribution(db: AsyncSession) -> list[dict]:
+    flags = func.sum(RiskDailyRollup.flag_count)
     rows = (
         await db.execute(
-            select(
-                RedFlag.flag_type,
-                func.count(RedFlag.id).label("count"),
-            )
-            .group_by(RedFlag.flag_type)
-            .order_by(func.count(RedFlag.id).desc())
+            select(RiskDailyRollup.flag_type, flags.label("count"))
+            .filter(RiskDailyRollup.flag_type != "")
+            .group_by(RiskDailyRollup.flag_type)
+            .having(flags > 0)
+            .order_by(flags.desc())
         )
     ).all()
 
     return [
         {
             "name": LABEL_MAP.get(row.flag_type, row.flag_type),
-            "value": row.count,
+            "value": int(row.count),
             "color": COLOR_MAP.get(row.flag_type, "#94a3b8"),
         }
         for row in rows
@@ -1,14 +1,25 @@
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
 
+from fastapi import HTTPException
 from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.sse import sse_event
+
+from app.models.loader_profiles import load_profile
 from app.models.red_flag_model import RedFlag
 from app.models.risk_score_model import RiskScore
 from app.models.supplier_model import Supplier
 from app.models.tender_model import Tender
 from app.models.investigation_model import Investigation
 
+logger = get_logger(__name__)
+
 
 async def get_dashboard_stats(db: AsyncSession) -> dict:
     now = datetime.now(timezone.utc)
@@ -150,7 +161,11 @@ async def get_top_risk_suppliers(db: AsyncSession, limit: int = 5) -> list[dict]
             "supplier_id": str(s.id),
             "name": s.name,
             "risk_score": s.risk_score,
-            "ghost_probability": round(min((s.risk_score or 0) / 100, 1.0), 4),
+            "ghost_probability": (
+                s.ghost_probability
+                if s.ghost_probability is not None
+                else round(min((s.risk_score or 0) / 100, 1.0), 4)
+            ),
             "rank": idx + 1,
             "county": s.county,
             "is_verified": s.is_verified,
@@ -165,37 +180,20 @@ async def get_high_risk_tenders(db: AsyncSession, limit: int = 10) -> list[dict]
         await db.execute(
             select(Tender, RiskScore)
             .join(RiskScore, RiskScore.tender_id == Tender.id)
+            .options(*load_profile(Tender, "export"))
             .filter(RiskScore.risk_level.in_(["critical", "high"]))
             .order_by(desc(RiskScore.total_score))
             .limit(limit)
         )
     ).all()
 
-    from app.models.procuring_entity_model import ProcuringEntity
-
     results = []
     for tender, rs in rows:
-        # Load entity name if available
-        entity_name = None
-        if tender.entity_id:
-            entity = (
-                (
-                    await db.execute(
-                        select(ProcuringEntity).filter(
-                            ProcuringEntity.id == tender.entity_id
-                        )
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            entity_name = entity.name if entity else None
-
         results.append(
             {
                 "id": str(tender.id),
                 "title": tender.title,
-                "entity": entity_name,
+                "entity": tender.entity.name if tender.entity else None,
                 "county": tender.county,
                 "estimated_value": tender.estimated_value,
                 "risk_score": rs.total_score,
@@ -210,23 +208,99 @@ async def get_high_risk_tenders(db: AsyncSession, limit: int = 10) -> list[dict]
     return results
 
 
+# ── AI query ───────────────────────────────────────────────────────────────────
+
+_AI_QUERY_SYSTEM = (
+    "You are a procurement fraud analyst for the Kenyan government. "
+    "Answer questions about procurement risks, corruption patterns, "
+    "and tender irregularities concisely and factually. "
+    "If you cannot answer from available context, say so clearly."
+)
+_AI_QUERY_MAX_TOKENS = 1024
+
+# normalised question → (stored at monotonic seconds, answer); LRU order
+_answer_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+
+def _cache_key(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def _cached_answer(question: str) -> Optional[str]:
+    key = _cache_key(question)
+    entry = _answer_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, answer = entry
+    if time.monotonic() - stored_at > settings.AI_QUERY_CACHE_TTL_SECONDS:
+        del _answer_cache[key]
+        return None
+    _answer_cache.move_to_end(key)
+    return answer
+
+
+def _remember_answer(question: str, answer: str) -> None:
+    key = _cache_key(question)
+    _answer_cache[key] = (time.monotonic(), answer)
+    _answer_cache.move_to_end(key)
+    while len(_answer_cache) > settings.AI_QUERY_CACHE_SIZE:
+        _answer_cache.popitem(last=False)
+
+
 async def ask_ai_query(question: str) -> dict:
     """
     Send a natural language question to Claude and return the answer.
     """
-    import anthropic
+    cached = _cached_answer(question)
+    if cached is not None:
+        return {"answer": cached, "cached": True}
 
-    client = anthropic.Anthropic()
-    message = client.messages.create(
+    from app.services.ai_service import _get_async_client
+
+    try:
+        client = _get_async_client()
+    except ValueError as exc:  # ANTHROPIC_API_KEY not configured
+        raise HTTPException(status_code=503, detail=f"AI query unavailable: {exc}")
+    message = await client.messages.create(
         model="claude-opus-4-6",
-        max_tokens=1024,
-        system=(
-            "You are a procurement fraud analyst for the Kenyan government. "
-            "Answer questions about procurement risks, corruption patterns, "
-            "and tender irregularities concisely and factually. "
-            "If you cannot answer from available context, say so clearly."
-        ),
+        max_tokens=_AI_QUERY_MAX_TOKENS,
+        system=_AI_QUERY_SYSTEM,
         messages=[{"role": "user", "content": question}],
     )
     answer = message.content[0].text if message.content else "No response generated."
-    return {"answer": answer}
+    if message.content:
+        _remember_answer(question, answer)
+    return {"answer": answer, "cached": False}
+
+
+async def stream_ai_query(question: str) -> AsyncIterator[str]:
+    """
+    SSE events (start → delta… → done | error) for one question. The full
+    answer is cached once the stream completes; a disconnect cancels the
+    generator and the upstream call with it.
+    """
+    cached = _cached_answer(question)
+    yield sse_event("start", {"cached": cached is not None})
+    if cached is not None:
+        yield sse_event("delta", {"text": cached})
+        yield sse_event("done", {"cached": True})
+        return
+
+    from app.services.ai_service import stream_text
+
+    chunks: list[str] = []
+    try:
+        async for text in stream_text(question, _AI_QUERY_MAX_TOKENS, system=_AI_QUERY_SYSTEM):
+            chunks.append(text)
+            yield sse_event("delta", {"text": text})
+    except ValueError as exc:  # ANTHROPIC_API_KEY not configured
+        yield sse_event("error", {"detail": str(exc)})
+        return
+    except Exception as exc:
+        logger.error("AI query stream failed", extra={"error": str(exc)})
+        yield sse_event("error", {"detail": "AI generation failed"})
+        return
+
+    if chunks:
+        _remember_answer(question, "".join(chunks))
+    yield sse_event("done", {"cached": False})
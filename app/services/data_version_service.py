@@ -0,0 +1,104 @@
+"""
+Data Version — a cheap token that changes whenever dashboard data may have.
+
+The analytics, dashboard and list endpoints are polled by the frontend and
+their answers only change when tenders, scores, flags, suppliers or
+contracts are written. The token is the newest write timestamp of each of
+those tables — one statement of five max() lookups, each a single probe of
+an index on the column (see the index=True on those timestamps):
+
+    tenders.updated_at      risk_scores.updated_at   red_flags.created_at
+    suppliers.updated_at    contracts.updated_at
+
+plus:
+  - a local generation, bumped after any commit in this process that
+    touched those models (deletes included) and by writers that bypass the
+    session or write derived tables (bump_data_version — e.g. the risk
+    rollup refresh), so this worker's own writes show up immediately;
+  - the ETAG_MAX_AGE_SECONDS window the request falls in, which bounds
+    staleness for what the maxima can't see — deletes made by other
+    workers and time-relative answers ("last 30 days").
+
+The token is memoised for DATA_VERSION_TTL_SECONDS per process so a burst
+of dashboard widgets costs one lookup. conditional_get
+(app/core/dependencies.py) turns it into an ETag per URL.
+"""
+
+import time
+from typing import Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contract_model import Contract
+from app.models.red_flag_model import RedFlag
+from app.models.risk_score_model import RiskScore
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+
+_VERSION_COLUMNS = (
+    Tender.updated_at,
+    RiskScore.updated_at,
+    RedFlag.created_at,
+    Supplier.updated_at,
+    Contract.updated_at,
+)
+_TRACKED = (Tender, RiskScore, RedFlag, Supplier, Contract)
+
+_generation = 0
+# (fetched at monotonic seconds, token)
+_memo: Optional[tuple[float, str]] = None
+
+
+async def data_version(db: AsyncSession) -> str:
+    """Opaque token; equal tokens mean the tracked tables have not changed."""
+    global _memo
+    now = time.monotonic()
+    if _memo is not None and now - _memo[0] < settings.DATA_VERSION_TTL_SECONDS:
+        stamps = _memo[1]
+    else:
+        # one scalar subquery per table — bare max()es would share a FROM
+        # list and scan the cross join of all five tables
+        row = (
+            await db.execute(
+                select(
+                    *(select(func.max(column)).scalar_subquery() for column in _VERSION_COLUMNS)
+                )
+            )
+        ).one()
+        stamps = ",".join(stamp.isoformat() if stamp else "-" for stamp in row)
+        _memo = (now, stamps)
+    window = int(time.time() // max(settings.ETAG_MAX_AGE_SECONDS, 1))
+    return f"{stamps}|{_generation}|{window}"
+
+
+def bump_data_version() -> None:
+    """Invalidate the local token — for writers that bypass the ORM session."""
+    global _generation, _memo
+    _generation += 1
+    _memo = None
+
+
+# ── Session events ────────────────────────────────────────────────────────────
+
+
+@event.listens_for(Session, "after_flush")
+def _note_tracked_writes(session: Session, flush_context) -> None:
+    if any(
+        isinstance(obj, _TRACKED)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["data_version_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    if session.info.pop("data_version_dirty", False):
+        bump_data_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("data_version_dirty", None)
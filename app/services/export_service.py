@@ -0,0 +1,295 @@
+"""
+Export Service — streaming bulk extracts for investigators and auditors.
+
+Datasets
+────────
+  tenders      one row per tender (+ entity name, total score, risk level)
+  risk-scores  one row per RiskScore (+ tender reference / title / county)
+  red-flags    one row per RedFlag  (+ tender reference / county)
+
+Formats
+───────
+  ndjson   one JSON object per line
+  csv      header row + one line per record
+  parquet  one row group per fetched batch (requires pyarrow)
+
+Every export selects plain columns (no ORM objects, no relationship loads)
+through a server-side cursor with yield_per, and encodes each fetched
+partition straight into a response chunk. Memory stays proportional to
+EXPORT_BATCH_SIZE regardless of how many rows match.
+
+The generator opens its own session: the request-scoped session from
+get_db() may already be closed while the response body is still streaming.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.procuring_entity_model import ProcuringEntity
+from app.models.red_flag_model import RedFlag
+from app.models.risk_score_model import RiskScore
+from app.models.tender_model import Tender
+from app.services.tender_service import apply_tender_filters
+
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# ── Dataset definitions ────────────────────────────────────────────────────────
+# (column name, SQL expression, parquet type). Column order is the file order.
+
+_TENDER_COLUMNS = [
+    ("id", Tender.id, "string"),
+    ("reference_number", Tender.reference_number, "string"),
+    ("title", Tender.title, "string"),
+    ("category", Tender.category, "string"),
+    ("county", Tender.county, "string"),
+    ("estimated_value", Tender.estimated_value, "float64"),
+    ("currency", Tender.currency, "string"),
+    ("procurement_method", Tender.procurement_method, "string"),
+    ("status", Tender.status, "string"),
+    ("submission_deadline", Tender.submission_deadline, "string"),
+    ("source", Tender.source, "string"),
+    ("created_at", Tender.created_at, "string"),
+    ("entity_name", ProcuringEntity.name, "string"),
+    ("total_score", RiskScore.total_score, "float64"),
+    ("risk_level", RiskScore.risk_level, "string"),
+]
+
+_RISK_SCORE_COLUMNS = [
+    ("id", RiskScore.id, "string"),
+    ("tender_id", RiskScore.tender_id, "string"),
+    ("reference_number", Tender.reference_number, "string"),
+    ("tender_title", Tender.title, "string"),
+    ("county", Tender.county, "string"),
+    ("category", Tender.category, "string"),
+    ("price_score", RiskScore.price_score, "float64"),
+    ("supplier_score", RiskScore.supplier_score, "float64"),
+    ("spec_score", RiskScore.spec_score, "float64"),
+    ("contract_value_score", RiskScore.contract_value_score, "float64"),
+    ("entity_history_score", RiskScore.entity_history_score, "float64"),
+    ("collusion_score", RiskScore.collusion_score, "float64"),
+    ("xgb_score", RiskScore.xgb_score, "float64"),
+    ("total_score", RiskScore.total_score, "float64"),
+    ("risk_level", RiskScore.risk_level, "string"),
+    ("computed_at", RiskScore.computed_at, "string"),
+]
+
+_RED_FLAG_COLUMNS = [
+    ("id", RedFlag.id, "string"),
+    ("tender_id", RedFlag.tender_id, "string"),
+    ("reference_number", Tender.reference_number, "string"),
+    ("county", Tender.county, "string"),
+    ("flag_type", RedFlag.flag_type, "string"),
+    ("severity", RedFlag.severity, "string"),
+    ("description", RedFlag.description, "string"),
+    ("source_model", RedFlag.source_model, "string"),
+    ("created_at", RedFlag.created_at, "string"),
+]
+
+
+def _columns_query(columns: list, from_):
+    return select(*(expr.label(name) for name, expr, _ in columns)).select_from(from_)
+
+
+def _tenders_query(filters: dict):
+    query = _columns_query(_TENDER_COLUMNS, Tender).outerjoin(
+        ProcuringEntity, ProcuringEntity.id == Tender.entity_id
+    )
+    if not filters.get("risk_level"):
+        # with a risk_level filter, apply_tender_filters inner-joins RiskScore
+        query = query.outerjoin(RiskScore, RiskScore.tender_id == Tender.id)
+    return apply_tender_filters(query, **filters).order_by(Tender.created_at)
+
+
+def _risk_scores_query(filters: dict):
+    query = _columns_query(_RISK_SCORE_COLUMNS, RiskScore).join(
+        Tender, Tender.id == RiskScore.tender_id
+    )
+    level = filters.pop("risk_level", None)
+    if level:
+        query = query.filter(RiskScore.risk_level == level)
+    return apply_tender_filters(query, **filters).order_by(RiskScore.computed_at)
+
+
+def _red_flags_query(filters: dict):
+    query = _columns_query(_RED_FLAG_COLUMNS, RedFlag).join(
+        Tender, Tender.id == RedFlag.tender_id
+    )
+    return apply_tender_filters(query, **filters).order_by(RedFlag.created_at)
+
+
+EXPORT_DATASETS: dict[str, tuple[list, Callable]] = {
+    "tenders": (_TENDER_COLUMNS, _tenders_query),
+    "risk-scores": (_RISK_SCORE_COLUMNS, _risk_scores_query),
+    "red-flags": (_RED_FLAG_COLUMNS, _red_flags_query),
+}
+
+
+# ── Row normalisation ─────────────────────────────────────────────────────────
+
+
+def _plain(value):
+    """Make a DB value JSON/CSV/Arrow friendly without a jsonable_encoder pass."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # str enums
+        return value.value
+    return str(value)  # UUID and anything else
+
+
+async def _partitions(query) -> AsyncIterator[list[tuple]]:
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions(EXPORT_BATCH_SIZE):
+            yield [tuple(_plain(v) for v in row) for row in partition]
+
+
+# ── Encoders ──────────────────────────────────────────────────────────────────
+
+
+async def _encode_ndjson(names: list[str], partitions) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield "".join(
+            json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+async def _encode_csv(names: list[str], partitions) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(names)
+    yield buf.getvalue().encode("utf-8")
+    async for rows in partitions:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after each row group."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _encode_parquet(columns: list, partitions) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, _, kind in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for rows in partitions:
+            table = pa.Table.from_pylist(
+                [dict(zip(schema.names, row)) for row in rows], schema=schema
+            )
+            writer.write_table(table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    dataset: str, fmt: str, filters: dict
+) -> tuple[AsyncIterator[bytes], str, str]:
+    """
+    Build the streaming body for an export.
+
+    Returns (body_iterator, media_type, filename). Validation — unknown
+    dataset/format, bad dates, missing pyarrow — happens here so errors are
+    returned as normal 4xx responses before streaming starts.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown export {dataset!r}")
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}",
+        )
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=501, detail="Parquet export requires pyarrow"
+            )
+
+    columns, build_query = EXPORT_DATASETS[dataset]
+    query = build_query(dict(filters))
+    partitions = _partitions(query)
+    names = [name for name, _, _ in columns]
+
+    if fmt == "ndjson":
+        body = _encode_ndjson(names, partitions)
+    elif fmt == "csv":
+        body = _encode_csv(names, partitions)
+    else:
+        body = _encode_parquet(columns, partitions)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    filename = f"{dataset}-{stamp}.{fmt}"
+    return body, EXPORT_MEDIA_TYPES[fmt], filename
+
+
+def export_filters(
+    county: Optional[str] = None,
+    category: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    status: Optional[str] = None,
+    procurement_method: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    search: Optional[str] = None,
+) -> dict:
+    """Depends() callable — same query-string filters as GET /tenders."""
+    return {
+        "county": county,
+        "category": category,
+        "risk_level": risk_level,
+        "status": status,
+        "procurement_method": procurement_method,
+        "min_value": min_value,
+        "max_value": max_value,
+        "date_from": date_from,
+        "date_to": date_to,
+        "search": search,
+    }
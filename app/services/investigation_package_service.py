@@ -0,0 +1,194 @@
+"""
+Investigation package — the Claude-written EACC briefing for a tender.
+
+Generation takes 10–20 s, so the text is persisted on the tender's RiskScore
+(investigation_package / investigation_package_at) and served from there
+until the score is recomputed: risk_engine_service bumps RiskScore.updated_at
+on every rescore, which makes the stored package stale. Writing the package
+keeps updated_at unchanged so it does not invalidate itself.
+
+GET /tenders/{id}/investigation-package         blocking, cached
+GET /tenders/{id}/investigation-package/stream  SSE (app/core/sse.py)
+"""
+
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.logger import get_logger
+from app.core.sse import sse_event
+from app.models.loader_profiles import load_profile
+from app.models.risk_score_model import RiskScore
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+
+logger = get_logger(__name__)
+
+
+async def load_package_inputs(db: AsyncSession, tender_id: UUID) -> tuple[Tender, dict]:
+    """Tender (with risk_score) and the generate_investigation_package() kwargs."""
+    result = await db.execute(
+        select(Tender)
+        .options(*load_profile(Tender, "scoring"))
+        .filter(Tender.id == tender_id)
+    )
+    tender = result.unique().scalar_one_or_none()
+
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+    if not tender.risk_score:
+        raise HTTPException(
+            status_code=400,
+            detail="Run risk analysis first before generating investigation package",
+        )
+
+    supplier = None
+    if tender.contract:
+        supplier_result = await db.execute(
+            select(Supplier)
+            .options(*load_profile(Supplier, "scoring"))
+            .filter(Supplier.id == tender.contract.supplier_id)
+        )
+        supplier = supplier_result.scalar_one_or_none()
+
+    rs = tender.risk_score
+    inputs = {
+        "tender": {
+            "title": tender.title,
+            "description": tender.description,
+            "estimated_value": tender.estimated_value,
+            "county": tender.county,
+            "procurement_method": tender.procurement_method,
+            "status": tender.status,
+            "reference_number": tender.reference_number,
+        },
+        "risk_score": {
+            "total_score": rs.total_score,
+            "risk_level": rs.risk_level.value if hasattr(rs.risk_level, "value") else rs.risk_level,
+            "price_score": rs.price_score,
+            "supplier_score": rs.supplier_score,
+            "spec_score": rs.spec_score,
+            "flags": rs.flags,
+            "ai_analysis": rs.ai_analysis,
+        },
+        "supplier": (
+            {
+                "name": supplier.name,
+                "registration_number": supplier.registration_number,
+                "company_age_days": supplier.company_age_days,
+                "tax_filings_count": supplier.tax_filings_count,
+                "directors": supplier.directors,
+                "risk_score": supplier.risk_score,
+            }
+            if supplier
+            else None
+        ),
+        "bids": [
+            {"bid_amount": b.bid_amount, "is_winner": b.is_winner}
+            for b in (tender.bids or [])
+        ],
+    }
+    return tender, inputs
+
+
+def cached_package(risk_score: RiskScore) -> Optional[str]:
+    """The stored package, unless the risk score changed after it was written."""
+    generated_at = risk_score.investigation_package_at
+    if not risk_score.investigation_package or generated_at is None:
+        return None
+    if risk_score.updated_at and risk_score.updated_at > generated_at:
+        return None
+    return risk_score.investigation_package
+
+
+async def save_package(risk_score_id: UUID, package_md: str) -> datetime:
+    """Persist a finished package in its own session (streams outlive the request's)."""
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(RiskScore)
+            .where(RiskScore.id == risk_score_id)
+            .values(
+                investigation_package=package_md,
+                investigation_package_at=now,
+                # explicit value overrides onupdate — the rescore timestamp is
+                # what marks this package stale, so it must not move here
+                updated_at=RiskScore.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    return now
+
+
+def package_response(tender: Tender, package_md: str, generated_at: datetime, cached: bool) -> dict:
+    return {
+        "tender_id": str(tender.id),
+        "tender_title": tender.title,
+        "reference_number": tender.reference_number,
+        "package_markdown": package_md,
+        "generated_at": generated_at.isoformat(),
+        "cached": cached,
+    }
+
+
+def stream_package(tender: Tender, inputs: dict, refresh: bool = False) -> AsyncIterator[str]:
+    """
+    SSE events for one package. A fresh stored package is replayed as a single
+    delta; otherwise Claude's deltas are forwarded as they arrive and the full
+    text is persisted once the stream completes. A client disconnect cancels
+    the generator mid-stream — nothing partial is saved.
+
+    Everything needed from the ORM objects is read here, before the response
+    starts: the request session is finished by the time the body streams.
+    """
+    rs = tender.risk_score
+    tender_id, risk_score_id = tender.id, rs.id
+    meta = {
+        "tender_id": str(tender.id),
+        "tender_title": tender.title,
+        "reference_number": tender.reference_number,
+    }
+    cached = None if refresh else cached_package(rs)
+    cached_at = rs.investigation_package_at
+
+    async def events() -> AsyncIterator[str]:
+        from app.services.ai_service import (
+            INVESTIGATION_PACKAGE_MAX_TOKENS,
+            investigation_package_prompt,
+            stream_text,
+        )
+
+        yield sse_event("start", {**meta, "cached": cached is not None})
+        if cached is not None:
+            yield sse_event("delta", {"text": cached})
+            yield sse_event("done", {"generated_at": cached_at, "cached": True})
+            return
+
+        chunks: list[str] = []
+        try:
+            async for text in stream_text(
+                investigation_package_prompt(**inputs), INVESTIGATION_PACKAGE_MAX_TOKENS
+            ):
+                chunks.append(text)
+                yield sse_event("delta", {"text": text})
+        except ValueError as exc:  # ANTHROPIC_API_KEY not configured
+            yield sse_event("error", {"detail": str(exc)})
+            return
+        except Exception as exc:
+            logger.error(
+                "Investigation package stream failed",
+                extra={"tender_id": str(tender_id), "error": str(exc)},
+            )
+            yield sse_event("error", {"detail": "AI generation failed"})
+            return
+
+        generated_at = await save_package(risk_score_id, "".join(chunks))
+        yield sse_event("done", {"generated_at": generated_at, "cached": False})
+
+    return events()
@@ -1,9 +1,26 @@
 """
 ML Service — wraps all ML model status, training, and forecast calls
 for the ML status page.
+
+Training data loaders stream rows through a server-side cursor
+(yield_per) and build plain dict records, so memory is bounded by the
+records themselves rather than by ORM identity maps. Each train_*_job()
+is a runner for training_job_service.submit_training_job(): it opens its
+own session, loads data, then hands the fit to the training process pool.
 """
 
 import os
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.ml.artifacts import has_component
+from app.services.rescore_tracker_service import track_model_change
+from app.services.supplier_ghost_service import schedule_ghost_backfill
+from app.services.training_job_service import run_in_training_process, update_job
 
 WEIGHTS_DIR = os.path.join(os.path.dirname(__file__), "..", "ml", "weights")
 
@@ -12,6 +29,11 @@ def _exists(filename: str) -> bool:
     return os.path.exists(os.path.join(WEIGHTS_DIR, filename))
 
 
+def _trained(bundle: str, component: str, legacy: str) -> bool:
+    """Published as a bundle component, or still as a legacy pickle."""
+    return has_component(os.path.join(WEIGHTS_DIR, bundle), component) or _exists(legacy)
+
+
 def _spacy_available() -> bool:
     try:
         import spacy
@@ -50,7 +72,7 @@ def get_model_status() -> list[dict]:
             "name": "XGBoost Risk Model",
             "library": "XGBoost",
             "layer": "Layer 5 — Corruption Risk Score",
-            "trained": _exists("xgb_risk_model.pkl"),
+            "trained": _trained("xgb_risk", "model", "xgb_risk_model.pkl"),
             "trainable": True,
             "train_endpoint": "/ml/train/xgboost-synthetic",
         },
@@ -59,7 +81,7 @@ def get_model_status() -> list[dict]:
             "name": "Price Anomaly Detector",
             "library": "Isolation Forest",
             "layer": "Layer 2 — Price Inflation",
-            "trained": _exists("price_anomaly_if.pkl"),
+            "trained": _trained("price_anomaly", "model", "price_anomaly_if.pkl"),
             "trainable": True,
             "train_endpoint": "/ml/train/price-anomaly",
         },
@@ -68,7 +90,7 @@ def get_model_status() -> list[dict]:
             "name": "Collusion Vectorizer",
             "library": "TF-IDF + Cosine Similarity",
             "layer": "Layer 4 — Bid Collusion",
-            "trained": _exists("collusion_tfidf.pkl"),
+            "trained": _trained("collusion_tfidf", "vectorizer", "collusion_tfidf.pkl"),
             "trainable": True,
             "train_endpoint": "/ml/train/collusion-vectorizer",
         },
@@ -86,7 +108,7 @@ def get_model_status() -> list[dict]:
             "name": "Ghost Company Detector (RF)",
             "library": "Random Forest",
             "layer": "Layer 3 — Ghost Supplier",
-            "trained": _exists("supplier_rf.pkl"),
+            "trained": _trained("supplier_risk", "rf", "supplier_rf.pkl"),
             "trainable": True,
             "train_endpoint": "/ml/train/supplier-rf",
         },
@@ -95,7 +117,7 @@ def get_model_status() -> list[dict]:
             "name": "Supplier Anomaly Detector",
             "library": "Isolation Forest",
             "layer": "Layer 3 — Ghost Supplier",
-            "trained": _exists("supplier_if.pkl"),
+            "trained": _trained("supplier_risk", "if", "supplier_if.pkl"),
             "trainable": True,
             "train_endpoint": "/ml/train/supplier-if",
         },
@@ -120,70 +142,213 @@ def get_model_status() -> list[dict]:
     ]
 
 
-async def train_supplier_rf(db) -> dict:
-    """Train Random Forest + IsolationForest on supplier records from DB."""
-    from sqlalchemy import select
+# ── Streamed training data ────────────────────────────────────────────────────
 
-    from app.models.supplier_model import Supplier
+# Share of job progress reserved for loading data; the rest covers the fit.
+_LOAD_PROGRESS_SHARE = 0.5
 
-    result = await db.execute(select(Supplier))
-    suppliers = result.scalars().all()
 
-    if len(suppliers) < 20:
-        raise ValueError(
-            f"Need at least 20 suppliers to train. Currently have {len(suppliers)}."
+async def _stream_rows(db: AsyncSession, stmt, job: Optional[dict] = None):
+    """
+    Yield rows from `stmt` through a server-side cursor, reporting progress
+    on `job` after every fetched partition.
+    """
+    batch = settings.ML_TRAINING_STREAM_BATCH
+    total = None
+    if job is not None:
+        total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    result = await db.stream(stmt.execution_options(yield_per=batch))
+    loaded = 0
+    async for partition in result.partitions(batch):
+        for row in partition:
+            yield row
+        loaded += len(partition)
+        if job is not None:
+            update_job(
+                job,
+                rows_loaded=loaded,
+                progress=round(_LOAD_PROGRESS_SHARE * loaded / max(total or 1, 1), 3),
+            )
+
+
+async def load_price_anomaly_records(
+    db: AsyncSession, job: Optional[dict] = None
+) -> tuple[list[dict], int]:
+    """
+    One query: every valued, categorised tender joined to the first matching
+    PriceBenchmark (same case-insensitive substring match the price analyzer
+    uses). Returns (records_with_benchmark, tenders_scanned).
+    """
+    from app.models.price_benchmark_model import PriceBenchmark
+    from app.models.tender_model import Tender
+
+    benchmark_avg = (
+        select(PriceBenchmark.avg_price)
+        .where(PriceBenchmark.category.icontains(Tender.category))
+        .limit(1)
+        .correlate(Tender)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Tender.estimated_value,
+        Tender.category,
+        Tender.county,
+        benchmark_avg.label("benchmark_avg"),
+    ).filter(
+        Tender.estimated_value.isnot(None),
+        Tender.category.isnot(None),
+    )
+
+    records = []
+    scanned = 0
+    async for row in _stream_rows(db, stmt, job):
+        scanned += 1
+        if row.benchmark_avg is None:
+            continue
+        records.append(
+            {
+                "price": row.estimated_value,
+                "benchmark_avg": row.benchmark_avg,
+                "estimated_value": row.estimated_value,
+                "category": row.category,
+                "county": row.county,
+            }
         )
+    return records, scanned
 
-    records = [
-        {
-            "company_age_days": s.company_age_days,
-            "tax_filings_count": s.tax_filings_count,
-            "directors": [],  # directors not eager-loaded here
-            "has_physical_address": s.has_physical_address,
-            "has_online_presence": s.has_online_presence,
-            "past_contracts_count": s.past_contracts_count,
-            "past_contracts_value": s.past_contracts_value,
-            "employee_count": s.employee_count,
-            "is_ghost": s.is_blacklisted,  # proxy label
+
+async def load_supplier_records(
+    db: AsyncSession, job: Optional[dict] = None, labeled: bool = True
+) -> list[dict]:
+    """Supplier feature rows; `is_blacklisted` is used as a proxy label."""
+    from app.models.supplier_model import Supplier
+
+    stmt = select(
+        Supplier.company_age_days,
+        Supplier.tax_filings_count,
+        Supplier.has_physical_address,
+        Supplier.has_online_presence,
+        Supplier.past_contracts_count,
+        Supplier.past_contracts_value,
+        Supplier.employee_count,
+        Supplier.is_blacklisted,
+    )
+    records = []
+    async for row in _stream_rows(db, stmt, job):
+        record = {
+            "company_age_days": row.company_age_days,
+            "tax_filings_count": row.tax_filings_count,
+            "directors": [],  # director links are not part of the training scan
+            "has_physical_address": row.has_physical_address,
+            "has_online_presence": row.has_online_presence,
+            "past_contracts_count": row.past_contracts_count,
+            "past_contracts_value": row.past_contracts_value,
+            "employee_count": row.employee_count,
         }
-        for s in suppliers
-    ]
+        if labeled:
+            record["is_ghost"] = row.is_blacklisted  # proxy label
+        records.append(record)
+    return records
 
-    from app.ml.supplier_risk import train
-    from fastapi.concurrency import run_in_threadpool
 
-    await run_in_threadpool(train, records)
+async def load_collusion_texts(
+    db: AsyncSession, job: Optional[dict] = None
+) -> list[str]:
+    """Bid proposal texts long enough to be useful for the TF-IDF vocabulary."""
+    from app.models.bid_model import Bid
+
+    stmt = select(Bid.proposal_text).filter(
+        Bid.proposal_text.isnot(None),
+        func.length(Bid.proposal_text) > 50,
+    )
+    return [row.proposal_text async for row in _stream_rows(db, stmt, job)]
+
+
+# ── Training job runners ──────────────────────────────────────────────────────
+
+
+async def _fit(job: dict, fn, *args) -> None:
+    update_job(job, stage="fitting", progress=_LOAD_PROGRESS_SHARE)
+    await run_in_training_process(fn, *args)
+    update_job(job, stage="publishing", progress=0.95)
+
+
+async def train_xgboost_synthetic_job(job: dict) -> dict:
+    from app.ml.xgb_risk_model import train_with_synthetic_data
+
+    await _fit(job, train_with_synthetic_data)
+    track_model_change("xgb_risk_model")
+    return {"status": "success", "records_used": 500}
+
+
+async def train_price_anomaly_job(job: dict) -> dict:
+    async with AsyncSessionLocal() as db:
+        records, scanned = await load_price_anomaly_records(db, job)
+
+    if scanned < 50:
+        raise ValueError(f"Need at least 50 tenders. Currently have {scanned}.")
+    if len(records) < 30:
+        raise ValueError(f"Only {len(records)} tenders matched benchmarks. Need 30+.")
+
+    from app.ml.price_anomaly import train
+
+    await _fit(job, train, records)
+    track_model_change("price_anomaly")
     return {"status": "success", "records_used": len(records)}
 
 
-async def train_supplier_if(db) -> dict:
-    """Train only the IsolationForest on supplier records (unsupervised)."""
-    from sqlalchemy import select
+async def train_collusion_vectorizer_job(job: dict) -> dict:
+    async with AsyncSessionLocal() as db:
+        texts = await load_collusion_texts(db, job)
 
-    from app.models.supplier_model import Supplier
+    if len(texts) < 20:
+        raise ValueError(f"Need 20+ bid texts. Have {len(texts)}.")
 
-    result = await db.execute(select(Supplier))
-    suppliers = result.scalars().all()
+    from app.ml.collusion import fit_vectorizer
 
-    if len(suppliers) < 20:
-        raise ValueError(f"Need at least 20 suppliers. Have {len(suppliers)}.")
+    await _fit(job, fit_vectorizer, texts)
+    track_model_change("collusion")
+    return {"status": "success", "texts_used": len(texts)}
 
-    records = [
-        {
-            "company_age_days": s.company_age_days,
-            "tax_filings_count": s.tax_filings_count,
-            "directors": [],
-            "has_physical_address": s.has_physical_address,
-            "has_online_presence": s.has_online_presence,
-            "past_contracts_count": s.past_contracts_count,
-            "past_contracts_value": s.past_contracts_value,
-            "employee_count": s.employee_count,
-        }
-        for s in suppliers
-    ]
+
+async def train_supplier_rf_job(job: dict) -> dict:
+    """Train Random Forest + IsolationForest on supplier records from DB."""
+    async with AsyncSessionLocal() as db:
+        records = await load_supplier_records(db, job, labeled=True)
+
+    if len(records) < 20:
+        raise ValueError(
+            f"Need at least 20 suppliers to train. Currently have {len(records)}."
+        )
+
+    from app.ml.supplier_risk import train
+
+    await _fit(job, train, records)
+    schedule_ghost_backfill(delay=0)  # new weights → every stored probability is stale
+    track_model_change("supplier_risk")
+    return {"status": "success", "records_used": len(records)}
+
+
+async def train_supplier_if_job(job: dict) -> dict:
+    """Train only the IsolationForest on supplier records (unsupervised)."""
+    async with AsyncSessionLocal() as db:
+        records = await load_supplier_records(db, job, labeled=False)
+
+    if len(records) < 20:
+        raise ValueError(f"Need at least 20 suppliers. Have {len(records)}.")
 
     from app.ml.supplier_risk import train_unsupervised_only
-    from fastapi.concurrency import run_in_threadpool
 
-    await run_in_threadpool(train_unsupervised_only, records)
+    await _fit(job, train_unsupervised_only, records)
+    schedule_ghost_backfill(delay=0)
+    track_model_change("supplier_risk")
     return {"status": "success", "records_used": len(records)}
+
+
+TRAINING_RUNNERS = {
+    "xgboost_risk_model": train_xgboost_synthetic_job,
+    "price_anomaly_isolation_forest": train_price_anomaly_job,
+    "collusion_tfidf_vectorizer": train_collusion_vectorizer_job,
+    "supplier_random_forest": train_supplier_rf_job,
+    "supplier_isolation_forest": train_supplier_if_job,
+}
@@ -0,0 +1,319 @@
+"""
+Rescore Tracker — keeps RiskScore rows fresh when their dependencies change.
+
+A tender's score depends on more than the tender row (see
+risk_fingerprint_service). This module maps each kind of change to the
+scored tenders that read it:
+
+  supplier features              → tenders the supplier bid on or holds
+                                   the contract for
+  directors                      → the same, for every supplier in the
+                                   director's network component before
+                                   and after the change (a director on a
+                                   non-bidder can link two bidders)
+  bid added/changed/removed      → that bid's tender
+  price benchmark                → tenders find_benchmark() would match to
+                                   it, for the old and new values:
+                                   category is a substring of the
+                                   benchmark's, uncategorised tenders
+                                   (which match any), and valued tenders
+                                   whose title has a word of 4+ letters
+                                   inside the item name (keyword fallback)
+  model retrained                → tenders that model contributed to
+                                   (price_anomaly: valued tenders,
+                                   supplier_risk: tenders with a bidder,
+                                   collusion: 2+ bids, xgb: all scored)
+
+Only tenders that already have a RiskScore are queued — unscored tenders
+are the ingest path's job. ORM writes are picked up by session events and
+queued after commit; retraining calls track_model_change() explicitly.
+
+Queued keys are deduplicated in sets and a debounced pass
+(RESCORE_DEBOUNCE_SECONDS) resolves them to tender ids and runs
+rescoring_service.rescore_tenders() — whose fingerprint check still skips
+tenders the change did not actually affect. A burst of edits becomes one
+job; changes arriving mid-run are picked up by one follow-up run.
+
+Tracking is per process. Changes made by other workers or scripts are
+caught by the nightly fingerprint rescore.
+"""
+
+import asyncio
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.bid_model import Bid
+from app.models.contract_model import Contract
+from app.models.director_model import Director
+from app.models.price_benchmark_model import PriceBenchmark
+from app.models.risk_score_model import RiskScore
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+from app.services.risk_fingerprint_service import SUPPLIER_FEATURES
+
+logger = get_logger(__name__)
+
+TRACKED_MODELS = ("price_anomaly", "supplier_risk", "collusion", "xgb_risk_model")
+
+_pending_keys: dict[str, set] = {
+    "suppliers": set(),
+    "networks": set(),
+    "tenders": set(),
+    "categories": set(),
+    "items": set(),
+    "models": set(),
+}
+
+
+# ── Dependency resolution ─────────────────────────────────────────────────────
+
+
+def _scored(tender_ids):
+    return select(RiskScore.tender_id).filter(RiskScore.tender_id.in_(tender_ids))
+
+
+def _category_match(category: Optional[str]):
+    """Tenders find_benchmark() would match to a benchmark in `category`."""
+    uncategorised = or_(Tender.category.is_(None), Tender.category == "")
+    if not category:
+        return uncategorised
+    return or_(
+        uncategorised,
+        literal(category).ilike(func.concat("%", Tender.category, "%")),
+    )
+
+
+def _keyword_match(title: Optional[str], item_names: list[str]) -> bool:
+    """find_benchmark()'s fallback: a title word of 4+ letters inside an item name."""
+    words = [w for w in (title or "").lower().split() if len(w) > 3]
+    return any(w in name for name in item_names for w in words)
+
+
+async def _network_suppliers(db, supplier_ids) -> set:
+    """Every supplier sharing a director component with `supplier_ids` now."""
+    from app.services.supplier_network_service import get_supplier_network
+
+    index = await get_supplier_network(db)
+    members: set = set()
+    for supplier_id in supplier_ids:
+        members |= index.component(supplier_id)
+    return {uuid.UUID(str(m)) for m in members}
+
+
+def _model_dependents(model: str):
+    if model == "price_anomaly":
+        return select(Tender.id).filter(Tender.estimated_value > 0)
+    if model == "supplier_risk":
+        return select(Bid.tender_id).union(select(Contract.tender_id))
+    if model == "collusion":
+        return select(Bid.tender_id).group_by(Bid.tender_id).having(func.count(Bid.id) >= 2)
+    return select(RiskScore.tender_id)  # xgb_risk_model feeds every total_score
+
+
+async def resolve_tender_ids(keys: dict[str, set]) -> set:
+    """Scored tender ids that depend on the queued keys."""
+    from app.core.database import AsyncSessionLocal
+
+    tender_ids: set = set()
+    async with AsyncSessionLocal() as db:
+        suppliers = set(keys["suppliers"])
+        if keys["networks"]:
+            suppliers |= await _network_suppliers(db, keys["networks"])
+        for query in _dependency_queries(keys, suppliers):
+            tender_ids.update((await db.execute(query)).scalars())
+        if keys["items"]:
+            item_names = [name.lower() for name in keys["items"]]
+            result = await db.stream(
+                select(RiskScore.tender_id, Tender.title)
+                .join(Tender, Tender.id == RiskScore.tender_id)
+                .filter(Tender.estimated_value > 0)
+                .execution_options(yield_per=5000)
+            )
+            async for tender_id, title in result:
+                if _keyword_match(title, item_names):
+                    tender_ids.add(tender_id)
+    return tender_ids
+
+
+def _dependency_queries(keys: dict[str, set], suppliers: set) -> list:
+    queries = []
+    if keys["tenders"]:
+        queries.append(_scored(list(keys["tenders"])))
+    if suppliers:
+        supplier_ids = list(suppliers)
+        queries.append(
+            _scored(
+                select(Bid.tender_id)
+                .filter(Bid.supplier_id.in_(supplier_ids))
+                .union(select(Contract.tender_id).filter(Contract.supplier_id.in_(supplier_ids)))
+            )
+        )
+    for category in keys["categories"]:
+        queries.append(
+            select(RiskScore.tender_id)
+            .join(Tender, Tender.id == RiskScore.tender_id)
+            .filter(_category_match(category))
+        )
+    for model in keys["models"]:
+        queries.append(_scored(_model_dependents(model)))
+    return queries
+
+
+async def rescore_dependents(keys: dict[str, set]) -> dict:
+    from app.services.rescoring_service import rescore_tenders
+
+    tender_ids = await resolve_tender_ids(keys)
+    summary = {name: len(values) for name, values in keys.items()}
+    if not tender_ids:
+        logger.info("No scored tenders depend on the changes", extra=summary)
+        return {"tenders": 0}
+    counts = await rescore_tenders(sorted(tender_ids, key=str))
+    logger.info(
+        "Dependency rescore finished",
+        extra={**summary, "tenders": len(tender_ids), **counts},
+    )
+    return {"tenders": len(tender_ids), **counts}
+
+
+# ── Debounced scheduling ──────────────────────────────────────────────────────
+
+_pending: Optional[asyncio.TimerHandle] = None
+_running: Optional[asyncio.Task] = None
+
+
+def _take_pending() -> dict[str, set]:
+    taken = {name: set(values) for name, values in _pending_keys.items()}
+    for values in _pending_keys.values():
+        values.clear()
+    return taken
+
+
+def _start_rescore() -> None:
+    global _pending, _running
+    _pending = None
+    if _running is not None and not _running.done():
+        return  # _rescore_task re-schedules itself for what arrived meanwhile
+    _running = asyncio.get_running_loop().create_task(_rescore_task())
+
+
+async def _rescore_task() -> None:
+    try:
+        await rescore_dependents(_take_pending())
+    except Exception as exc:
+        logger.error("Dependency rescore failed", extra={"error": str(exc)})
+    if any(_pending_keys.values()):
+        _schedule()
+
+
+def _schedule(delay: Optional[float] = None) -> None:
+    global _pending
+    if _pending is not None:
+        return
+    delay = settings.RESCORE_DEBOUNCE_SECONDS if delay is None else delay
+    _pending = asyncio.get_running_loop().call_later(delay, _start_rescore)
+
+
+def enqueue(
+    suppliers: Iterable = (),
+    networks: Iterable = (),
+    tenders: Iterable = (),
+    categories: Iterable = (),
+    items: Iterable[str] = (),
+    models: Iterable[str] = (),
+    delay: Optional[float] = None,
+) -> None:
+    """
+    Queue dependency keys for the next debounced rescore. Outside a running
+    event loop (scripts, seeds) it's a no-op — the nightly pass catches up.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _pending_keys["suppliers"].update(s for s in suppliers if s)
+    _pending_keys["networks"].update(s for s in networks if s)
+    _pending_keys["tenders"].update(t for t in tenders if t)
+    _pending_keys["categories"].update(c or "" for c in categories)
+    _pending_keys["items"].update(i for i in items if i)
+    _pending_keys["models"].update(m for m in models if m in TRACKED_MODELS)
+    if any(_pending_keys.values()):
+        _schedule(delay)
+
+
+def track_supplier_change(*supplier_ids) -> None:
+    enqueue(suppliers=supplier_ids)
+
+
+def track_model_change(model: str) -> None:
+    """Call after new weights are published."""
+    enqueue(models=[model])
+
+
+# ── Invalidation from ORM writes ──────────────────────────────────────────────
+
+
+def _changed(obj, columns) -> bool:
+    from sqlalchemy import inspect
+
+    state = inspect(obj)
+    return any(state.attrs[c].history.has_changes() for c in columns)
+
+
+def _values(obj, column) -> set:
+    """Old and new values of a column across the current flush."""
+    from sqlalchemy import inspect
+
+    history = inspect(obj).attrs[column].history
+    return {*(history.added or ()), *(history.deleted or ()), *(history.unchanged or ())}
+
+
+def _current_component(supplier_id) -> set:
+    """The supplier's director component before this change lands (if indexed)."""
+    from app.services.supplier_network_service import cached_component
+
+    return {uuid.UUID(m) for m in cached_component(supplier_id)}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dependencies(session: Session, flush_context) -> None:
+    keys = session.info.setdefault(
+        "rescore_deps",
+        {name: set() for name in ("suppliers", "networks", "tenders", "categories", "items")},
+    )
+    for obj in session.dirty:
+        if isinstance(obj, Supplier) and _changed(obj, SUPPLIER_FEATURES):
+            keys["suppliers"].add(obj.id)
+        elif isinstance(obj, PriceBenchmark) and _changed(
+            obj, ("category", "item_name", "avg_price")
+        ):
+            keys["categories"].update(_values(obj, "category"))
+            keys["items"].update(_values(obj, "item_name"))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Director):
+            for supplier_id in filter(None, _values(obj, "supplier_id")):
+                keys["suppliers"].update(_current_component(supplier_id) or {supplier_id})
+                keys["networks"].add(supplier_id)
+        elif isinstance(obj, Bid) and obj.tender_id:
+            keys["tenders"].add(obj.tender_id)
+        elif isinstance(obj, PriceBenchmark) and obj not in session.dirty:
+            keys["categories"].add(obj.category)
+            keys["items"].add(obj.item_name)
+    if not any(keys.values()):
+        session.info.pop("rescore_deps", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    keys = session.info.pop("rescore_deps", None)
+    if keys:
+        enqueue(**keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("rescore_deps", None)
@@ -0,0 +1,117 @@
+"""
+Bulk rescoring — rerun the risk pipeline over many tenders, skipping the
+ones whose input fingerprint is unchanged (risk_fingerprint_service).
+
+Used by POST /tenders/rescore and the nightly scheduler job. Work is
+proportional to what changed since the last run: an unchanged tender costs
+its fingerprint queries, not spaCy + three models + a RedFlag rewrite.
+Model versions are read once per run.
+"""
+
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logger import get_logger
+from app.models.loader_profiles import load_profile
+from app.models.tender_model import Tender
+
+logger = get_logger(__name__)
+
+
+async def _tender_id_batches(
+    tender_ids: Optional[Iterable[uuid.UUID]], batch_size: int
+):
+    if tender_ids is not None:
+        ids = list(dict.fromkeys(tender_ids))
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
+        return
+
+    last_id = None  # keyset pagination over the whole table
+    while True:
+        query = select(Tender.id).order_by(Tender.id).limit(batch_size)
+        if last_id is not None:
+            query = query.filter(Tender.id > last_id)
+        async with AsyncSessionLocal() as db:
+            ids = list((await db.execute(query)).scalars())
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+async def _load_tenders(db: AsyncSession, tender_ids: list) -> dict:
+    if not tender_ids:
+        return {}
+    result = await db.execute(
+        select(Tender)
+        .options(*load_profile(Tender, "scoring"))
+        .filter(Tender.id.in_(tender_ids))
+        .execution_options(populate_existing=True)
+    )
+    return {t.id: t for t in result.unique().scalars()}
+
+
+async def rescore_tenders(
+    tender_ids: Optional[Iterable[uuid.UUID]] = None,
+    force: bool = False,
+    use_ai: bool = False,
+    batch_size: Optional[int] = None,
+) -> dict:
+    """
+    Rescore `tender_ids` (every tender when None). Returns counts of
+    rescored / skipped (fingerprint unchanged) / failed / missing tenders.
+    """
+    from app.services.risk_engine_service import rescore_if_changed
+    from app.services.risk_fingerprint_service import load_scoring_inputs, scoring_versions
+
+    versions = scoring_versions()
+    counts = {"rescored": 0, "skipped": 0, "failed": 0, "missing": 0}
+
+    async for batch in _tender_id_batches(tender_ids, batch_size or settings.RESCORE_BATCH_SIZE):
+        async with AsyncSessionLocal() as db:
+            tenders = await _load_tenders(db, batch)
+            counts["missing"] += len(batch) - len(tenders)
+
+            for i, tender_id in enumerate(batch):
+                tender = tenders.get(tender_id)
+                if tender is None:
+                    continue
+                try:
+                    supplier, bids = await load_scoring_inputs(db, tender)
+                    _, rescored = await rescore_if_changed(
+                        db,
+                        tender,
+                        supplier,
+                        bids,
+                        use_ai=use_ai,
+                        force=force,
+                        versions=versions,
+                    )
+                    await db.commit()
+                    counts["rescored" if rescored else "skipped"] += 1
+                except Exception as exc:
+                    await db.rollback()
+                    counts["failed"] += 1
+                    logger.error(
+                        "Rescoring tender failed",
+                        extra={"tender_id": str(tender_id), "error": str(exc)},
+                    )
+                    # rollback expired the batch's objects — reload the rest
+                    tenders = await _load_tenders(db, batch[i + 1 :])
+
+    logger.info("Rescoring finished", extra={**counts, "force": force})
+    return counts
+
+
+async def run_nightly_rescore() -> None:
+    """Scheduler entry point (app/core/scheduler.py)."""
+    try:
+        await rescore_tenders()
+    except Exception as exc:
+        logger.error("Nightly rescoring crashed", extra={"error": str(exc)})
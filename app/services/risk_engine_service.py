@@ -10,6 +10,9 @@ PIPELINE (per tender)
   Step 5  xgb_risk_model.py      XGBoost           → composite corruption probability
   Step 6  ai_service.py          Claude            → narrative + recommended action
   Step 7  DB save                                  → RiskScore + RedFlag rows
+
+rescore_if_changed() wraps the pipeline with the input fingerprint from
+risk_fingerprint_service: unchanged tenders keep their stored score.
 """
 
 from datetime import datetime, timezone
@@ -28,6 +31,8 @@ from app.models.investigation_model import Investigation
 from app.models.tender_model import Tender
 from app.services.audit_service import AuditService
 from app.services.price_analyzer_service import compute_price_score
+from app.services.risk_fingerprint_service import risk_input_fingerprint
+from app.services import risk_rollup_service  # noqa: F401 — registers its session listeners
 
 
 def _risk_level_from_score(score: float) -> RiskLevel:
@@ -59,8 +64,11 @@ async def compute_and_save_risk(
     bids: Optional[list] = None,
     use_ai: bool = True,
     user_id: Optional[uuid.UUID] = None,
+    fingerprint: Optional[str] = None,
 ) -> RiskScore:
     """Full ML + AI risk pipeline. Saves and returns RiskScore."""
+    if fingerprint is None:
+        fingerprint = await risk_input_fingerprint(db, tender, supplier, bids)
     all_flags = []
 
     # ── Step 1: Price — rule-based + IsolationForest ─────────────────────────
@@ -162,6 +170,7 @@ async def compute_and_save_risk(
     if bids and len(bids) >= 2:
         try:
             from app.ml.collusion import detect_bid_collusion
+            from app.services.supplier_network_service import get_supplier_network
             from fastapi.concurrency import run_in_threadpool
 
             bids_data = [
@@ -172,9 +181,19 @@ async def compute_and_save_risk(
                 }
                 for b in bids
             ]
-            col_r = await run_in_threadpool(detect_bid_collusion, bids_data, tender.description)
+            network = await get_supplier_network(db)
+            col_r = await run_in_threadpool(
+                detect_bid_collusion, bids_data, tender.description, network
+            )
             collusion_score = col_r["collusion_risk_score"]
             for pair in col_r.get("collusion_pairs", []):
+                if pair["collusion_type"] == "front_company":
+                    all_flags.append(
+                        f"HIGH: Linked co-bidders — suppliers "
+                        f"{pair['supplier_a'][:8]}... / {pair['supplier_b'][:8]}... "
+                        f"share directors ({pair['shared_directors']} direct)"
+                    )
+                    continue
                 all_flags.append(
                     f"HIGH: Bid collusion detected — suppliers "
                     f"{pair['supplier_a'][:8]}... / {pair['supplier_b'][:8]}... "
@@ -282,8 +301,10 @@ async def compute_and_save_risk(
         existing.total_score = total_score
         existing.risk_level = risk_level
         existing.flags = unique_flags
-        existing.ai_analysis = ai_analysis
-        existing.recommended_action = recommended_action
+        if use_ai:  # a rules-only rescore keeps the stored Claude narrative
+            existing.ai_analysis = ai_analysis
+            existing.recommended_action = recommended_action
+        existing.input_fingerprint = fingerprint
         existing.updated_at = datetime.now(timezone.utc)
         rso = existing
     else:
@@ -299,6 +320,7 @@ async def compute_and_save_risk(
             flags=unique_flags,
             ai_analysis=ai_analysis,
             recommended_action=recommended_action,
+            input_fingerprint=fingerprint,
         )
         db.add(rso)
 
@@ -352,7 +374,7 @@ async def compute_and_save_risk(
         
         if not existing_inv:
             inv_title = f"Automatic Investigation: {tender.title}"
-            findings_text = ai_analysis if ai_analysis else "\n".join(unique_flags)
+            findings_text = rso.ai_analysis or "\n".join(unique_flags)
             if not findings_text:
                 findings_text = "System flagged this tender for high/critical risk."
                 
@@ -394,3 +416,36 @@ async def compute_and_save_risk(
         except Exception:
             pass
     return rso
+
+
+async def rescore_if_changed(
+    db: AsyncSession,
+    tender: Tender,
+    supplier: Optional[Supplier] = None,
+    bids: Optional[list] = None,
+    use_ai: bool = False,
+    force: bool = False,
+    user_id: Optional[uuid.UUID] = None,
+    versions: Optional[dict] = None,
+) -> tuple[Optional[RiskScore], bool]:
+    """
+    Run compute_and_save_risk() only if the tender's input fingerprint differs
+    from the stored one. Returns (risk score, rescored). An AI rescore still
+    runs when the stored score qualified for a narrative but has none.
+    """
+    fingerprint = await risk_input_fingerprint(db, tender, supplier, bids, versions)
+    existing = (
+        await db.execute(select(RiskScore).filter(RiskScore.tender_id == tender.id))
+    ).scalars().first()
+    if (
+        not force
+        and existing is not None
+        and existing.input_fingerprint == fingerprint
+        and not (use_ai and existing.total_score >= 30 and existing.ai_analysis is None)
+    ):
+        return existing, False
+
+    rso = await compute_and_save_risk(
+        db, tender, supplier, bids, use_ai=use_ai, user_id=user_id, fingerprint=fingerprint
+    )
+    return rso, True
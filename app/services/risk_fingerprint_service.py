@@ -0,0 +1,210 @@
+"""
+Risk input fingerprint — skip rescoring tenders whose inputs did not change.
+
+compute_and_save_risk() is expensive (spaCy, three models, DB rewrites of
+RiskScore + every RedFlag) and deterministic in its inputs. The fingerprint
+is a SHA-256 over a canonical JSON document of everything the pipeline
+reads:
+
+  tender      title, description, category, value, county, method,
+              deadline window, procuring entity history score
+  bids        supplier, amount, winner flag, proposal text hash — as a set
+  supplier    the scored supplier's rule/ML features and its directors
+  bidders     directors per bidding supplier (collusion / front companies)
+  links       bidder pairs in one director-sharing component of the supplier
+              network, with their direct shared-director counts — a director
+              on a supplier that never bid can link or unlink two bidders
+  benchmark   the PriceBenchmark row matched for the tender: the fields the
+              price flags and evidence quote, plus last_updated
+  models      model_version() of every ML artifact + the spaCy model,
+              and SCORING_VERSION for changes to the pipeline code itself
+
+Each director is hashed as (director key, full name, PEP flag) — the key
+drives network links, the name and PEP flag the supplier rules' PEP flag.
+Anything compute_and_save_risk() reads must be in this document, or
+changing it will not trigger a rescore.
+
+It is stored on RiskScore.input_fingerprint; a rescore whose fingerprint
+matches is skipped (see risk_engine_service.rescore_if_changed).
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.director_model import Director
+from app.models.loader_profiles import load_profile
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+from app.services.price_analyzer_service import find_benchmark
+from app.services.supplier_network_service import director_key, get_supplier_network
+
+# Bump when compute_and_save_risk changes in a way that alters its output
+SCORING_VERSION = "2"
+
+SUPPLIER_FEATURES = (
+    "company_age_days",
+    "tax_filings_count",
+    "has_physical_address",
+    "has_online_presence",
+    "past_contracts_count",
+    "past_contracts_value",
+    "employee_count",
+)
+
+
+def scoring_versions() -> dict:
+    """Model versions that feed the pipeline. Compute once per bulk run."""
+    import importlib
+    import importlib.metadata
+
+    versions = {"scoring": SCORING_VERSION}
+    for name in ("price_anomaly", "supplier_risk", "collusion", "xgb_risk_model"):
+        try:
+            versions[name] = importlib.import_module(f"app.ml.{name}").model_version()
+        except ImportError:
+            versions[name] = "unavailable"
+    try:
+        versions["spacy"] = importlib.metadata.version("en_core_web_sm")
+    except importlib.metadata.PackageNotFoundError:
+        versions["spacy"] = "unavailable"
+    return versions
+
+
+async def load_scoring_inputs(
+    db: AsyncSession, tender: Tender
+) -> tuple[Optional[Supplier], list]:
+    """
+    The supplier and bids the pipeline scores a tender with: the contracted
+    supplier, else the winning (or first) bidder. `tender.bids` and
+    `tender.contract` must already be loaded. Directors are eager-loaded for
+    the supplier rules.
+    """
+    bids = list(tender.bids or [])
+    supplier_id = None
+    if tender.contract:
+        supplier_id = tender.contract.supplier_id
+    elif bids:
+        supplier_id = next((b for b in bids if b.is_winner), bids[0]).supplier_id
+    supplier = None
+    if supplier_id:
+        result = await db.execute(
+            select(Supplier)
+            .options(*load_profile(Supplier, "scoring"))
+            .filter(Supplier.id == supplier_id)
+        )
+        supplier = result.scalar_one_or_none()
+    return supplier, bids
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _text_hash(text: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(text.encode()).hexdigest()[:16] if text else None
+
+
+async def _directors(db: AsyncSession, supplier_ids: set) -> dict:
+    """
+    supplier id → sorted [director key, full name, PEP flag] per director
+    (queried, so unloaded relationships are fine).
+    """
+    if not supplier_ids:
+        return {}
+    rows = await db.execute(
+        select(
+            Director.supplier_id,
+            Director.national_id,
+            Director.full_name,
+            Director.is_politically_exposed,
+        ).filter(Director.supplier_id.in_(supplier_ids))
+    )
+    directors: dict[str, list] = {}
+    for supplier_id, national_id, full_name, is_pep in rows.all():
+        directors.setdefault(str(supplier_id), []).append(
+            [director_key(national_id, full_name) or "", full_name or "", bool(is_pep)]
+        )
+    return {sid: sorted(d) for sid, d in directors.items()}
+
+
+async def risk_input_fingerprint(
+    db: AsyncSession,
+    tender: Tender,
+    supplier: Optional[Supplier] = None,
+    bids: Optional[list] = None,
+    versions: Optional[dict] = None,
+) -> str:
+    """SHA-256 hex digest of the canonical scoring inputs for `tender`."""
+    bids = bids or []
+    method = tender.procurement_method
+    benchmark = None
+    if tender.estimated_value and tender.estimated_value > 0:
+        benchmark = await find_benchmark(db, tender.category or "", tender.title)
+    bidder_ids = {b.supplier_id for b in bids}
+    directors = await _directors(
+        db, bidder_ids | ({supplier.id} if supplier else set())
+    )
+    links = []
+    if len(bids) >= 2:
+        network = await get_supplier_network(db)
+        links = sorted(
+            list(pair) for pair in network.linked_pairs(sorted(map(str, bidder_ids)))
+        )
+
+    doc = {
+        "tender": {
+            "title": tender.title,
+            "description": _text_hash(tender.description),
+            "category": tender.category,
+            "estimated_value": tender.estimated_value,
+            "county": tender.county,
+            "procurement_method": method.value if hasattr(method, "value") else method,
+            "submission_deadline": _iso(tender.submission_deadline),
+            "created_at": _iso(tender.created_at),
+            "entity_history_score": (
+                tender.entity.corruption_history_score if tender.entity else None
+            ),
+        },
+        "bids": sorted(
+            (
+                [str(b.supplier_id), b.bid_amount, bool(b.is_winner), _text_hash(b.proposal_text)]
+                for b in bids
+            ),
+            key=lambda b: (b[0], b[1] or 0, b[3] or ""),
+        ),
+        "supplier": (
+            {
+                "id": str(supplier.id),
+                **{name: getattr(supplier, name) for name in SUPPLIER_FEATURES},
+                "directors": directors.get(str(supplier.id), []),
+            }
+            if supplier
+            else None
+        ),
+        "bidders": (
+            {sid: directors.get(sid, []) for sid in sorted(map(str, bidder_ids))}
+            if len(bids) >= 2
+            else {}
+        ),
+        "links": links,
+        "benchmark": (
+            {
+                "id": str(benchmark.id),
+                "item_name": benchmark.item_name,
+                "category": benchmark.category,
+                "unit": benchmark.unit,
+                "avg_price": benchmark.avg_price,
+                "last_updated": _iso(benchmark.last_updated),
+            }
+            if benchmark
+            else None
+        ),
+        "models": versions or scoring_versions(),
+    }
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
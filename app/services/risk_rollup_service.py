@@ -0,0 +1,405 @@
+"""
+Risk Daily Rollup — keeps risk_daily_rollup in step with the source tables.
+
+The trend endpoints (analytics_service, county_risk_service) read the
+rollup instead of grouping tenders, risk_scores, red_flags and contracts on
+every call. Its rows are never incremented in place: a day is recomputed
+whole from the source tables (refresh_range), so a refresh is idempotent
+and cannot drift.
+
+What marks a day for recomputation:
+
+  ORM write to a Tender, Contract       → that row's created day
+  ORM write to a RiskScore, RedFlag     → its tender's created day
+                                          (resolved when the job runs)
+
+Marked days are collected per session, queued after commit and refreshed by
+a debounced job (RISK_ROLLUP_DEBOUNCE_SECONDS) — a rescoring run that
+touches a thousand tenders from the same week becomes one refresh of that
+week. Like rescore_tracker_service the tracking is per process; writes it
+cannot see (other scripts, raw SQL, a contract changing tier because its
+tender was rescored) are caught by the nightly compaction, which recomputes
+the last RISK_ROLLUP_COMPACT_DAYS days, or by a full rebuild:
+
+    python -m app.services.risk_rollup_service --rebuild
+    python -m app.services.risk_rollup_service --days 90
+
+An empty rollup (fresh deploy) is rebuilt in the background at startup.
+
+Every committed refresh bumps data_version, so an ETag cached between a
+score write and the debounced refresh that follows it stops matching.
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.contract_model import Contract
+from app.models.red_flag_model import RedFlag
+from app.models.risk_daily_rollup_model import RiskDailyRollup
+from app.models.risk_score_model import RiskScore
+from app.models.tender_model import Tender
+from app.services.data_version_service import bump_data_version
+
+logger = get_logger(__name__)
+
+KEY = ("day", "county", "category", "risk_level", "flag_type")
+FACTS = (
+    "tender_count",
+    "estimated_value_sum",
+    "total_score_sum",
+    "flagged_tender_count",
+    "flagged_value_sum",
+    "flag_count",
+    "contract_count",
+    "contract_value_sum",
+)
+_CHUNK_DAYS = 31  # per transaction when refreshing long ranges
+_LOCK_KEY = 0x52495348  # pg_advisory_xact_lock — one refresh at a time
+
+
+def _as_day(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])  # SQLite returns date() as text
+
+
+def _level(value) -> str:
+    if value is None:
+        return ""
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _key(day, county, category, risk_level, flag_type: str = "") -> tuple:
+    return (_as_day(day), county or "", category or "", _level(risk_level), flag_type or "")
+
+
+def _bounds(start: date, end: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(start, time.min, tzinfo=timezone.utc),
+        datetime.combine(end, time.min, tzinfo=timezone.utc),
+    )
+
+
+# ── Recompute ─────────────────────────────────────────────────────────────────
+
+
+async def aggregate(db: AsyncSession, start: date, end: date) -> dict[tuple, dict]:
+    """Rollup rows for days in [start, end), computed from the source tables."""
+    lo, hi = _bounds(start, end)
+    created_in_range = (Tender.created_at >= lo, Tender.created_at < hi)
+    dims = (Tender.county, Tender.category, RiskScore.risk_level)
+    facts: dict[tuple, dict] = defaultdict(lambda: dict.fromkeys(FACTS, 0))
+
+    # Tender rows — one pass over the range's tenders, flags pre-counted per tender
+    day = func.date(Tender.created_at).label("day")
+    flags_per_tender = (
+        select(RedFlag.tender_id, func.count(RedFlag.id).label("n"))
+        .join(Tender, Tender.id == RedFlag.tender_id)
+        .filter(*created_in_range)
+        .group_by(RedFlag.tender_id)
+        .subquery()
+    )
+    flagged = flags_per_tender.c.tender_id.is_not(None)
+    rows = await db.execute(
+        select(
+            day,
+            *dims,
+            func.count(Tender.id).label("tenders"),
+            func.coalesce(func.sum(Tender.estimated_value), 0).label("value"),
+            func.coalesce(func.sum(RiskScore.total_score), 0).label("score"),
+            func.count(flags_per_tender.c.tender_id).label("flagged"),
+            func.coalesce(
+                func.sum(case((flagged, Tender.estimated_value), else_=0)), 0
+            ).label("flagged_value"),
+            func.coalesce(func.sum(flags_per_tender.c.n), 0).label("flags"),
+        )
+        .outerjoin(RiskScore, RiskScore.tender_id == Tender.id)
+        .outerjoin(flags_per_tender, flags_per_tender.c.tender_id == Tender.id)
+        .filter(*created_in_range)
+        .group_by(day, *dims)
+    )
+    for r in rows:
+        facts[_key(r.day, r.county, r.category, r.risk_level)].update(
+            tender_count=r.tenders,
+            estimated_value_sum=float(r.value),
+            total_score_sum=float(r.score),
+            flagged_tender_count=r.flagged,
+            flagged_value_sum=float(r.flagged_value),
+            flag_count=r.flags,
+        )
+
+    # Flag rows — per (tender, flag_type) first so a tender's value counts once per type
+    per_type = (
+        select(RedFlag.tender_id, RedFlag.flag_type, func.count(RedFlag.id).label("n"))
+        .join(Tender, Tender.id == RedFlag.tender_id)
+        .filter(*created_in_range)
+        .group_by(RedFlag.tender_id, RedFlag.flag_type)
+        .subquery()
+    )
+    rows = await db.execute(
+        select(
+            day,
+            *dims,
+            per_type.c.flag_type,
+            func.sum(per_type.c.n).label("flags"),
+            func.count().label("flagged"),
+            func.coalesce(func.sum(Tender.estimated_value), 0).label("flagged_value"),
+        )
+        .select_from(per_type)
+        .join(Tender, Tender.id == per_type.c.tender_id)
+        .outerjoin(RiskScore, RiskScore.tender_id == Tender.id)
+        .group_by(day, *dims, per_type.c.flag_type)
+    )
+    for r in rows:
+        facts[_key(r.day, r.county, r.category, r.risk_level, r.flag_type)].update(
+            flag_count=r.flags,
+            flagged_tender_count=r.flagged,
+            flagged_value_sum=float(r.flagged_value),
+        )
+
+    # Contracts — by the contract's own created day, under their tender's dimensions
+    contract_day = func.date(Contract.created_at).label("day")
+    rows = await db.execute(
+        select(
+            contract_day,
+            *dims,
+            func.count(Contract.id).label("contracts"),
+            func.coalesce(func.sum(Contract.contract_value), 0).label("value"),
+        )
+        .join(Tender, Tender.id == Contract.tender_id)
+        .outerjoin(RiskScore, RiskScore.tender_id == Tender.id)
+        .filter(Contract.created_at >= lo, Contract.created_at < hi)
+        .group_by(contract_day, *dims)
+    )
+    for r in rows:
+        facts[_key(r.day, r.county, r.category, r.risk_level)].update(
+            contract_count=r.contracts, contract_value_sum=float(r.value)
+        )
+    return facts
+
+
+async def refresh_range(db: AsyncSession, start: date, end: date) -> int:
+    """Replace the rollup rows for days in [start, end); returns rows written."""
+    written = 0
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + timedelta(days=_CHUNK_DAYS), end)
+        if db.get_bind().dialect.name == "postgresql":
+            await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        facts = await aggregate(db, chunk_start, chunk_end)
+        await db.execute(
+            delete(RiskDailyRollup).where(
+                RiskDailyRollup.day >= chunk_start, RiskDailyRollup.day < chunk_end
+            )
+        )
+        if facts:
+            now = datetime.now(timezone.utc)
+            await db.execute(
+                insert(RiskDailyRollup),
+                [
+                    {**dict(zip(KEY, key)), **values, "refreshed_at": now}
+                    for key, values in facts.items()
+                ],
+            )
+        await db.commit()
+        bump_data_version()  # the rollup is not one of the token's tables
+        written += len(facts)
+        chunk_start = chunk_end
+    return written
+
+
+def _runs(days: Iterable[date]) -> list[tuple[date, date]]:
+    """Contiguous [start, end) ranges covering `days`."""
+    runs: list[tuple[date, date]] = []
+    for day in sorted(set(days)):
+        if runs and runs[-1][1] == day:
+            runs[-1] = (runs[-1][0], day + timedelta(days=1))
+        else:
+            runs.append((day, day + timedelta(days=1)))
+    return runs
+
+
+async def refresh_days(days: Iterable[date] = (), tender_ids: Iterable = ()) -> int:
+    """Recompute the given days plus the created days of `tender_ids`."""
+    from app.core.database import AsyncSessionLocal
+
+    days = set(days)
+    tender_ids = list(tender_ids)
+    written = 0
+    async with AsyncSessionLocal() as db:
+        for i in range(0, len(tender_ids), 1000):
+            created = await db.execute(
+                select(func.date(Tender.created_at))
+                .filter(Tender.id.in_(tender_ids[i : i + 1000]))
+                .distinct()
+            )
+            days.update(_as_day(d) for d in created.scalars() if d is not None)
+        for start, end in _runs(days):
+            written += await refresh_range(db, start, end)
+    return written
+
+
+async def rebuild(days: Optional[int] = None) -> int:
+    """Recompute the last `days` days, or everything when None."""
+    from app.core.database import AsyncSessionLocal
+
+    end = datetime.now(timezone.utc).date() + timedelta(days=1)
+    async with AsyncSessionLocal() as db:
+        if days is None:
+            firsts = (
+                await db.execute(
+                    select(func.min(Tender.created_at), func.min(Contract.created_at))
+                    .select_from(Tender)
+                    .outerjoin(Contract, Contract.tender_id == Tender.id)
+                )
+            ).one()
+            firsts = [_as_day(first) for first in firsts if first is not None]
+            if not firsts:
+                return 0
+            start = min(firsts)
+        else:
+            start = end - timedelta(days=days + 1)
+        written = await refresh_range(db, start, end)
+    logger.info(
+        "Risk rollup rebuilt",
+        extra={"from": start.isoformat(), "to": end.isoformat(), "rows": written},
+    )
+    return written
+
+
+async def run_nightly_compaction() -> None:
+    """Scheduler entry point (app/core/scheduler.py)."""
+    try:
+        await rebuild(days=settings.RISK_ROLLUP_COMPACT_DAYS)
+    except Exception as exc:
+        logger.error("Risk rollup compaction failed", extra={"error": str(exc)})
+
+
+async def rebuild_if_empty() -> None:
+    """Warm-up step: a fresh rollup table is filled in the background."""
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        populated = await db.scalar(select(RiskDailyRollup.day).limit(1))
+    if populated is None:
+        asyncio.get_running_loop().create_task(_rebuild_logged())
+
+
+async def _rebuild_logged() -> None:
+    try:
+        await rebuild()
+    except Exception as exc:
+        logger.error("Risk rollup rebuild failed", extra={"error": str(exc)})
+
+
+# ── Debounced refresh ─────────────────────────────────────────────────────────
+
+_pending_days: set[date] = set()
+_pending_tenders: set = set()
+_pending: Optional[asyncio.TimerHandle] = None
+_running: Optional[asyncio.Task] = None
+
+
+def _start_refresh() -> None:
+    global _pending, _running
+    _pending = None
+    if _running is not None and not _running.done():
+        return  # _refresh_task re-schedules itself for what arrived meanwhile
+    _running = asyncio.get_running_loop().create_task(_refresh_task())
+
+
+async def _refresh_task() -> None:
+    days, tender_ids = set(_pending_days), set(_pending_tenders)
+    _pending_days.clear()
+    _pending_tenders.clear()
+    try:
+        written = await refresh_days(days, tender_ids)
+        logger.debug("Risk rollup refreshed", extra={"days": len(days), "rows": written})
+    except Exception as exc:
+        logger.error("Risk rollup refresh failed", extra={"error": str(exc)})
+    if _pending_days or _pending_tenders:
+        _schedule()
+
+
+def _schedule() -> None:
+    global _pending
+    if _pending is not None:
+        return
+    _pending = asyncio.get_running_loop().call_later(
+        settings.RISK_ROLLUP_DEBOUNCE_SECONDS, _start_refresh
+    )
+
+
+def enqueue(days: Iterable[date] = (), tender_ids: Iterable = ()) -> None:
+    """
+    Queue days (or tenders whose day to refresh) for the next debounced
+    refresh. Outside a running event loop it's a no-op — the nightly
+    compaction catches up.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _pending_days.update(days)
+    _pending_tenders.update(t for t in tender_ids if t)
+    if _pending_days or _pending_tenders:
+        _schedule()
+
+
+# ── Invalidation from ORM writes ──────────────────────────────────────────────
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_days(session: Session, flush_context) -> None:
+    marked = session.info.setdefault("risk_rollup", {"days": set(), "tenders": set()})
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Tender, Contract)):
+            # loaded state only — never trigger a load from inside a flush
+            created_at = inspect(obj).dict.get("created_at")
+            if created_at is not None:
+                marked["days"].add(_as_day(created_at))
+            elif isinstance(obj, Tender) and obj not in session.deleted:
+                marked["tenders"].add(obj.id)
+        elif isinstance(obj, (RiskScore, RedFlag)):
+            tender_id = inspect(obj).dict.get("tender_id")
+            if tender_id is not None:
+                marked["tenders"].add(tender_id)
+    if not any(marked.values()):
+        session.info.pop("risk_rollup", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    marked = session.info.pop("risk_rollup", None)
+    if marked:
+        enqueue(marked["days"], marked["tenders"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("risk_rollup", None)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompute risk_daily_rollup.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--rebuild", action="store_true", help="Every day with data")
+    group.add_argument("--days", type=int, help="Only the last N days")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    rows = asyncio.run(rebuild(None if args.rebuild else args.days))
+    print(f"risk_daily_rollup: {rows} rows written")
@@ -0,0 +1,82 @@
+"""
+Scraper Service — runs the PPIP crawl off the request path.
+
+POST /scraper/run and the optional scheduled job both go through
+start_scrape(); only one crawl per source runs at a time. The last run's
+summary is kept in-process for GET /scraper/status.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.logger import get_logger
+from app.scrapers.ppip_scraper import SOURCE as PPIP_SOURCE
+from app.scrapers.ppip_scraper import run_ppip_scrape
+
+logger = get_logger(__name__)
+
+SCRAPERS = {PPIP_SOURCE: run_ppip_scrape}
+
+_runs: dict[str, dict] = {}
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def _run(source: str, run: dict, **kwargs) -> None:
+    try:
+        run["result"] = await SCRAPERS[source](**kwargs)
+        run["status"] = "succeeded"
+        logger.info("Scrape finished", extra={"source": source, **run["result"]})
+    except Exception as exc:
+        run["status"] = "failed"
+        run["error"] = str(exc)
+        logger.error("Scrape failed", extra={"source": source, "error": str(exc)})
+    finally:
+        run["finished_at"] = _now()
+        _tasks.pop(source, None)
+
+
+def start_scrape(
+    source: str = PPIP_SOURCE, *, score: bool = False, max_pages: Optional[int] = None
+) -> dict:
+    """
+    Start a crawl in the background and return its run record.
+
+    Raises KeyError for an unknown source and ValueError if that source is
+    already being crawled.
+    """
+    if source not in SCRAPERS:
+        raise KeyError(source)
+    if source in _tasks:
+        raise ValueError(f"A '{source}' scrape is already running.")
+    run = {
+        "source": source,
+        "status": "running",
+        "started_at": _now(),
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+    _runs[source] = run
+    _tasks[source] = asyncio.create_task(
+        _run(source, run, score=score, max_pages=max_pages)
+    )
+    return run
+
+
+def get_scrape_status(source: Optional[str] = None) -> dict:
+    if source:
+        return _runs.get(source) or {"source": source, "status": "never_run"}
+    return {name: _runs.get(name, {"status": "never_run"}) for name in SCRAPERS}
+
+
+async def run_scheduled_scrape() -> None:
+    """APScheduler job — skip quietly if a manual run is still going."""
+    try:
+        start_scrape(PPIP_SOURCE, score=True)
+    except ValueError:
+        logger.info("Scheduled scrape skipped; previous run still active")
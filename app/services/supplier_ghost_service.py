@@ -0,0 +1,244 @@
+"""
+Supplier Ghost Service — keeps Supplier.ghost_probability up to date.
+
+Supplier listings used to re-run the RF/IF ghost-supplier models for every
+row on every request. The probability is now a column, written by a batched
+backfill and read like any other field.
+
+A supplier needs (re)scoring when its model_version is NULL or differs from
+the version of the published supplier_risk weights:
+
+  - new supplier                         → model_version starts NULL
+  - a feature column changes             → before_flush sets it NULL
+  - a director is added/changed/removed  → after_flush NULLs the supplier
+                                           and every supplier sharing that
+                                           director (their director counts
+                                           moved too)
+  - supplier model retrained             → weights version changes, so every
+                                           row mismatches at once
+
+Committed changes schedule a debounced backfill on the running event loop;
+a burst of edits produces one pass. The backfill walks stale suppliers in
+id order, scores each batch with supplier_risk.predict_batch() in the
+threadpool and writes results with one executemany UPDATE per batch.
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.director_model import Director
+from app.models.supplier_model import Supplier
+from app.services.data_version_service import bump_data_version
+
+logger = get_logger(__name__)
+
+# Supplier columns that feed ml/supplier_risk._feature_matrix()
+FEATURE_COLUMNS = (
+    "incorporation_date",
+    "company_age_days",
+    "tax_filings_count",
+    "has_physical_address",
+    "has_online_presence",
+    "past_contracts_count",
+    "past_contracts_value",
+    "employee_count",
+)
+
+_suppliers = Supplier.__table__
+
+
+def _row(predictions: dict, i: int) -> dict:
+    return {
+        k: v[i] if isinstance(v, list) else v for k, v in predictions.items()
+    }
+
+
+def ghost_value(prediction: dict, risk_score: Optional[float]) -> float:
+    """Same precedence the listing endpoint always used."""
+    if prediction.get("ghost_probability") is not None:
+        return prediction["ghost_probability"]
+    if prediction.get("combined_score") is not None:
+        return round(prediction["combined_score"] / 100, 4)
+    return round(min((risk_score or 0) / 100, 1.0), 4)
+
+
+async def backfill_ghost_probabilities(
+    batch_size: Optional[int] = None, supplier_ids: Optional[Iterable] = None
+) -> dict:
+    """
+    Score every stale supplier (or just `supplier_ids`) and persist
+    ghost_probability + model_version. Safe to run repeatedly.
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.ml.supplier_risk import model_version, predict_batch
+    from app.services.supplier_network_service import get_supplier_network
+
+    batch_size = batch_size or settings.GHOST_BACKFILL_BATCH_SIZE
+    version = model_version()
+    write = (
+        update(_suppliers)
+        .where(_suppliers.c.id == bindparam("b_id"))
+        .values(
+            ghost_probability=bindparam("b_ghost"),
+            model_version=bindparam("b_version"),
+            updated_at=_suppliers.c.updated_at,  # derived column — not a user edit
+        )
+    )
+
+    scored = 0
+    last_id = None
+    async with AsyncSessionLocal() as db:
+        network = await get_supplier_network(db)
+        while True:
+            query = select(
+                Supplier.id, Supplier.risk_score, *(getattr(Supplier, c) for c in FEATURE_COLUMNS)
+            )
+            if supplier_ids is not None:
+                query = query.filter(Supplier.id.in_(list(supplier_ids)))
+            else:
+                query = query.filter(
+                    or_(Supplier.model_version.is_(None), Supplier.model_version != version)
+                )
+            if last_id is not None:
+                query = query.filter(Supplier.id > last_id)
+            rows = (await db.execute(query.order_by(Supplier.id).limit(batch_size))).all()
+            if not rows:
+                break
+
+            columns = {
+                c: [getattr(r, c) for r in rows]
+                for c in FEATURE_COLUMNS
+                if c != "incorporation_date"
+            }
+            columns["director_company_count"] = [
+                max(map(len, network.director_other_companies(r.id)), default=0)
+                for r in rows
+            ]
+            predictions = await run_in_threadpool(predict_batch, columns)
+            await db.execute(
+                write,
+                [
+                    {
+                        "b_id": r.id,
+                        "b_ghost": ghost_value(_row(predictions, i), r.risk_score),
+                        "b_version": version,
+                    }
+                    for i, r in enumerate(rows)
+                ],
+            )
+            await db.commit()
+            scored += len(rows)
+            last_id = rows[-1].id
+
+    if scored:
+        bump_data_version()  # updated_at is left alone, so the token can't see it
+    logger.info(
+        "Ghost probability backfill finished",
+        extra={"scored": scored, "model_version": version},
+    )
+    return {"scored": scored, "model_version": version}
+
+
+# ── Debounced scheduling ──────────────────────────────────────────────────────
+
+_pending: Optional[asyncio.TimerHandle] = None
+_running: Optional[asyncio.Task] = None
+_rerun = False
+
+
+def _start_backfill() -> None:
+    global _pending, _running, _rerun
+    _pending = None
+    if _running is not None and not _running.done():
+        _rerun = True
+        return
+    _running = asyncio.get_running_loop().create_task(_backfill_task())
+
+
+async def _backfill_task() -> None:
+    global _rerun
+    try:
+        await backfill_ghost_probabilities()
+    except Exception as exc:
+        logger.error("Ghost probability backfill failed", extra={"error": str(exc)})
+    if _rerun:
+        _rerun = False
+        schedule_ghost_backfill()
+
+
+def schedule_ghost_backfill(delay: Optional[float] = None) -> None:
+    """
+    Queue a backfill pass on the running event loop. Calls within the
+    debounce window collapse into one; outside a loop (scripts) it's a no-op.
+    """
+    global _pending
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if _pending is not None:
+        return
+    delay = settings.GHOST_BACKFILL_DEBOUNCE_SECONDS if delay is None else delay
+    _pending = loop.call_later(delay, _start_backfill)
+
+
+# ── Invalidation from ORM writes ──────────────────────────────────────────────
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_changed_suppliers(session: Session, flush_context, instances) -> None:
+    from sqlalchemy import inspect
+
+    for obj in session.dirty:
+        if not isinstance(obj, Supplier):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[c].history.has_changes() for c in FEATURE_COLUMNS):
+            obj.model_version = None
+            session.info["ghost_backfill"] = True
+    if any(isinstance(obj, Supplier) for obj in session.new):
+        session.info["ghost_backfill"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_director_suppliers(session: Session, flush_context) -> None:
+    changed = [
+        obj
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Director)
+    ]
+    if not changed:
+        return
+    supplier_ids = {d.supplier_id for d in changed if d.supplier_id}
+    national_ids = {d.national_id for d in changed if d.national_id}
+    sharing = _suppliers.c.id.in_(supplier_ids)
+    if national_ids:
+        sharing = or_(
+            sharing,
+            _suppliers.c.id.in_(
+                select(Director.supplier_id).filter(Director.national_id.in_(national_ids))
+            ),
+        )
+    session.connection().execute(
+        update(_suppliers)
+        .where(sharing)
+        .values(model_version=None, updated_at=_suppliers.c.updated_at)
+    )
+    session.info["ghost_backfill"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_after_commit(session: Session) -> None:
+    if session.info.pop("ghost_backfill", False):
+        schedule_ghost_backfill()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("ghost_backfill", None)
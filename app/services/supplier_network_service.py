@@ -0,0 +1,262 @@
+"""
+Supplier Network Service — suppliers linked through shared directors.
+
+Fraud pattern P9 (one person sitting on the boards of several "competing"
+suppliers) shows up as connected components of a graph whose nodes are
+suppliers and whose edges are shared directors. Answering that with SQL
+means repeated self-joins on `directors`; instead this module keeps an
+in-memory index:
+
+  - director key → suppliers        national ID when known, otherwise the
+                                    normalised full name
+  - supplier → direct neighbours    degree / "who shares a director with X"
+  - union-find over suppliers       connected component / "are A and B
+                                    linked" in near-constant time
+
+Maintenance
+───────────
+  - Built from one SELECT on first use (get_supplier_network()).
+  - Directors added through the ORM are applied incrementally after the
+    transaction commits (session events below) — union-find only grows.
+  - Director updates/deletes, supplier deletes, and changes made by other
+    processes can't be undone in a union-find; they mark the index stale
+    or age it out (SUPPLIER_NETWORK_TTL_SECONDS) and the next call rebuilds.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.models.director_model import Director
+from app.models.supplier_model import Supplier
+
+logger = get_logger(__name__)
+
+
+def director_key(national_id: Optional[str], full_name: Optional[str]) -> Optional[str]:
+    """National ID when present, else the normalised name; None if neither."""
+    if national_id and national_id.strip():
+        return "id:" + re.sub(r"\s+", "", national_id).upper()
+    if full_name and full_name.strip():
+        name = re.sub(r"[^a-z0-9 ]", "", full_name.lower())
+        name = " ".join(name.split())
+        return "name:" + name if name else None
+    return None
+
+
+class SupplierNetworkIndex:
+    """Union-find + adjacency index of suppliers sharing directors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # detect_bid_collusion reads from a worker thread
+        self._parent: dict[str, str] = {}
+        self._members: dict[str, set[str]] = {}  # root → component members
+        self._director_suppliers: dict[str, set[str]] = {}
+        self._supplier_directors: dict[str, set[str]] = {}
+        self._neighbours: dict[str, set[str]] = {}
+        self.built_at = time.monotonic()
+        self.stale = False
+
+    # ── union-find ────────────────────────────────────────────────────────────
+
+    def _find(self, node: str) -> str:
+        parent = self._parent
+        if node not in parent:
+            parent[node] = node
+            self._members[node] = {node}
+            return node
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]  # path halving
+            node = parent[node]
+        return node
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._members[root_a] |= self._members.pop(root_b)
+
+    # ── writes ────────────────────────────────────────────────────────────────
+
+    def add_director(
+        self, supplier_id, national_id: Optional[str], full_name: Optional[str]
+    ) -> None:
+        key = director_key(national_id, full_name)
+        if key is None:
+            return
+        supplier = str(supplier_id)
+        with self._lock:
+            self._find(supplier)
+            self._supplier_directors.setdefault(supplier, set()).add(key)
+            sharing = self._director_suppliers.setdefault(key, set())
+            if supplier in sharing:
+                return
+            for other in sharing:
+                self._neighbours.setdefault(other, set()).add(supplier)
+                self._neighbours.setdefault(supplier, set()).add(other)
+                self._union(supplier, other)
+            sharing.add(supplier)
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    def linked(self, a, b) -> bool:
+        """True if two suppliers are in the same director-sharing component."""
+        a, b = str(a), str(b)
+        with self._lock:
+            if a == b or a not in self._parent or b not in self._parent:
+                return False
+            return self._find(a) == self._find(b)
+
+    def component(self, supplier_id) -> set[str]:
+        """All suppliers reachable through shared directors (including itself)."""
+        supplier = str(supplier_id)
+        with self._lock:
+            if supplier not in self._parent:
+                return {supplier}
+            return set(self._members[self._find(supplier)])
+
+    def degree(self, supplier_id) -> int:
+        """Number of suppliers sharing at least one director with this one."""
+        return len(self._neighbours.get(str(supplier_id), ()))
+
+    def neighbours(self, supplier_id) -> set[str]:
+        with self._lock:
+            return set(self._neighbours.get(str(supplier_id), ()))
+
+    def director_other_companies(self, supplier_id) -> list[list[str]]:
+        """For each of a supplier's directors, the other suppliers they sit on."""
+        supplier = str(supplier_id)
+        with self._lock:
+            return [
+                sorted(self._director_suppliers[key] - {supplier})
+                for key in self._supplier_directors.get(supplier, ())
+            ]
+
+    def shared_directors(self, a, b) -> int:
+        """Directors held in common by two suppliers (0 if linked only indirectly)."""
+        with self._lock:
+            return len(
+                self._supplier_directors.get(str(a), set())
+                & self._supplier_directors.get(str(b), set())
+            )
+
+    def linked_pairs(self, supplier_ids: Iterable) -> list[tuple[str, str, int]]:
+        """
+        Every pair among `supplier_ids` that sits in one component, as
+        (a, b, shared_director_count). Used to flag linked co-bidders.
+        """
+        ids = list(dict.fromkeys(str(s) for s in supplier_ids))
+        with self._lock:
+            roots = {s: self._find(s) for s in ids if s in self._parent}
+            pairs = []
+            for i, a in enumerate(ids):
+                for b in ids[i + 1 :]:
+                    if a in roots and roots.get(b) == roots[a]:
+                        shared = len(
+                            self._supplier_directors.get(a, set())
+                            & self._supplier_directors.get(b, set())
+                        )
+                        pairs.append((a, b, shared))
+            return pairs
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [len(m) for m in self._members.values()]
+        return {
+            "suppliers": len(self._parent),
+            "director_keys": len(self._director_suppliers),
+            "linked_components": sum(1 for s in sizes if s > 1),
+            "largest_component": max(sizes, default=0),
+        }
+
+
+# ── Module-level index ────────────────────────────────────────────────────────
+
+_network: Optional[SupplierNetworkIndex] = None
+_build_lock = asyncio.Lock()
+
+
+async def build_supplier_network(db: AsyncSession) -> SupplierNetworkIndex:
+    index = SupplierNetworkIndex()
+    result = await db.stream(
+        select(Director.supplier_id, Director.national_id, Director.full_name)
+        .execution_options(yield_per=5000)
+    )
+    async for supplier_id, national_id, full_name in result:
+        index.add_director(supplier_id, national_id, full_name)
+    logger.info("Supplier network index built", extra=index.stats())
+    return index
+
+
+def _expired(index: SupplierNetworkIndex) -> bool:
+    ttl = settings.SUPPLIER_NETWORK_TTL_SECONDS
+    return index.stale or (ttl > 0 and time.monotonic() - index.built_at > ttl)
+
+
+async def get_supplier_network(db: AsyncSession) -> SupplierNetworkIndex:
+    """Return the shared index, (re)building it first if missing or stale."""
+    global _network
+    if _network is None or _expired(_network):
+        async with _build_lock:
+            if _network is None or _expired(_network):
+                _network = await build_supplier_network(db)
+    return _network
+
+
+def cached_component(supplier_id) -> set[str]:
+    """Component from the index as currently built (no rebuild); empty if none."""
+    if _network is None:
+        return set()
+    return _network.component(supplier_id)
+
+
+def mark_supplier_network_stale() -> None:
+    """Force a rebuild on next use (e.g. after bulk director loads via Core)."""
+    if _network is not None:
+        _network.stale = True
+
+
+# ── Incremental maintenance from ORM writes ───────────────────────────────────
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_director_changes(session: Session, flush_context) -> None:
+    added = session.info.setdefault("supplier_network_added", [])
+    for obj in session.new:
+        if isinstance(obj, Director):
+            added.append((obj.supplier_id, obj.national_id, obj.full_name))
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Director) or (
+            isinstance(obj, Supplier) and obj in session.deleted
+        ):
+            session.info["supplier_network_stale"] = True
+            break
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_director_changes(session: Session) -> None:
+    added = session.info.pop("supplier_network_added", None)
+    stale = session.info.pop("supplier_network_stale", False)
+    if _network is None:
+        return
+    if stale:
+        _network.stale = True
+    for supplier_id, national_id, full_name in added or ():
+        _network.add_director(supplier_id, national_id, full_name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_director_changes(session: Session) -> None:
+    session.info.pop("supplier_network_added", None)
+    session.info.pop("supplier_network_stale", None)
@@ -5,12 +5,12 @@ from fastapi import HTTPException, status
 from sqlalchemy import desc, or_, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.functions import count
 
 from app.core.logger import get_logger
 from app.models.bid_model import Bid
 from app.models.contract_model import Contract
+from app.models.loader_profiles import load_profile
 from app.models.red_flag_model import RedFlag
 from app.models.supplier_model import Supplier
 from app.models.tender_model import Tender
@@ -58,6 +58,7 @@ async def list_suppliers(
     is_blacklisted: Optional[bool] = None,
     min_risk_score: Optional[float] = None,
     risk_level: Optional[str] = None,  # derived from risk_score ranges, not a column
+    sort: str = "risk_score",  # risk_score | ghost_probability (both indexed)
     page: int = 1,
     limit: int = 20,
 ) -> tuple[list[Supplier], int]:
@@ -96,11 +97,12 @@ async def list_suppliers(
     total = await db.scalar(select(count()).select_from(base_query.subquery())) or 0
 
     data_query = (
-        base_query.options(
-            selectinload(Supplier.directors),
-            selectinload(Supplier.contracts),
+        base_query.options(*load_profile(Supplier, "list"))
+        .order_by(
+            desc(Supplier.ghost_probability).nulls_last()
+            if sort == "ghost_probability"
+            else desc(Supplier.risk_score)
         )
-        .order_by(desc(Supplier.risk_score))
         .offset((page - 1) * limit)
         .limit(limit)
     )
@@ -114,10 +116,7 @@ async def get_supplier_by_id(
 ) -> Supplier:
     result = await db.execute(
         select(Supplier)
-        .options(
-            selectinload(Supplier.directors),
-            selectinload(Supplier.contracts),
-        )
+        .options(*load_profile(Supplier, "detail"))
         .filter(Supplier.id == supplier_id)
     )
     supplier = result.scalars().first()
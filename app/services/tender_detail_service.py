@@ -0,0 +1,203 @@
+"""
+Tender Detail Service — GET /tenders/{id} without a cartesian product.
+
+The detail page used to joinedload risk_score, red_flags, bids, contract and
+entity in one statement: a tender with 200 bids and 30 flags came back as
+6,000 rows for SQLAlchemy to de-duplicate, followed by a second query for
+supplier names. Now:
+
+  1. tender + its to-one rows (risk_score, contract, entity) — one row
+  2. red_flags via selectinload — one row per flag
+  3. bids LEFT JOIN suppliers for the name — one row per bid
+
+so the work grows linearly with bids + flags instead of their product.
+
+Responses are cached per tender (TENDER_DETAIL_CACHE_TTL_SECONDS /
+TENDER_DETAIL_CACHE_SIZE). ORM writes to the tender, its risk score, red
+flags, bids or contract evict its entry after commit. The TTL bounds
+staleness for what that can't see: other workers' writes, bulk UPDATEs,
+and supplier or entity renames.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.bid_model import Bid
+from app.models.contract_model import Contract
+from app.models.loader_profiles import load_profile
+from app.models.red_flag_model import RedFlag
+from app.models.risk_score_model import RiskScore
+from app.models.supplier_model import Supplier
+from app.models.tender_model import Tender
+
+# tender id → (stored at monotonic seconds, response); LRU order
+_cache: "OrderedDict[uuid.UUID, tuple[float, dict]]" = OrderedDict()
+
+
+def _cached(tender_id: uuid.UUID) -> Optional[dict]:
+    entry = _cache.get(tender_id)
+    if entry is None:
+        return None
+    stored_at, response = entry
+    if time.monotonic() - stored_at > settings.TENDER_DETAIL_CACHE_TTL_SECONDS:
+        _cache.pop(tender_id, None)
+        return None
+    _cache.move_to_end(tender_id)
+    return response
+
+
+def _remember(tender_id: uuid.UUID, response: dict) -> None:
+    _cache[tender_id] = (time.monotonic(), response)
+    _cache.move_to_end(tender_id)
+    while len(_cache) > settings.TENDER_DETAIL_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def invalidate_tender_detail(*tender_ids: uuid.UUID) -> None:
+    for tender_id in tender_ids:
+        _cache.pop(tender_id, None)
+
+
+async def get_tender_detail(db: AsyncSession, tender_id: uuid.UUID) -> dict:
+    """Full tender detail with risk score, red flags, bids, and entity."""
+    if settings.TENDER_DETAIL_CACHE_TTL_SECONDS > 0:
+        cached = _cached(tender_id)
+        if cached is not None:
+            return cached
+
+    result = await db.execute(
+        select(Tender)
+        .options(*load_profile(Tender, "detail"))
+        .filter(Tender.id == tender_id)
+    )
+    tender = result.unique().scalar_one_or_none()
+
+    if not tender:
+        raise HTTPException(status_code=404, detail="Tender not found")
+
+    bid_rows = await db.execute(
+        select(Bid, Supplier.name)
+        .outerjoin(Supplier, Supplier.id == Bid.supplier_id)
+        .filter(Bid.tender_id == tender_id)
+    )
+    bids_out = [
+        {
+            "id": str(b.id),
+            "supplier_id": str(b.supplier_id),
+            "supplier_name": supplier_name,
+            "bid_amount": b.bid_amount,
+            "is_winner": b.is_winner,
+            "similarity_score": b.similarity_score,
+            "proposal_text": b.proposal_text,
+        }
+        for b, supplier_name in bid_rows.all()
+    ]
+
+    response = {
+        "id": str(tender.id),
+        "reference_number": tender.reference_number,
+        "title": tender.title,
+        "description": tender.description,
+        "category": tender.category,
+        "estimated_value": tender.estimated_value,
+        "currency": tender.currency or "KES",
+        "county": tender.county,
+        "procurement_method": tender.procurement_method,
+        "status": tender.status,
+        "submission_deadline": (
+            tender.submission_deadline.isoformat()
+            if tender.submission_deadline
+            else None
+        ),
+        "source_url": tender.source_url,
+        "created_at": tender.created_at.isoformat(),
+        "entity": (
+            {
+                "id": str(tender.entity.id),
+                "name": tender.entity.name,
+                "county": tender.entity.county,
+                "corruption_history_score": tender.entity.corruption_history_score,
+            }
+            if tender.entity
+            else None
+        ),
+        "risk_score": (
+            {
+                "total_score": tender.risk_score.total_score,
+                "risk_level": tender.risk_score.risk_level.value if hasattr(tender.risk_score.risk_level, "value") else tender.risk_score.risk_level,
+                "price_score": tender.risk_score.price_score,
+                "supplier_score": tender.risk_score.supplier_score,
+                "spec_score": tender.risk_score.spec_score,
+                "contract_value_score": tender.risk_score.contract_value_score,
+                "entity_history_score": tender.risk_score.entity_history_score,
+                "flags": tender.risk_score.flags,
+                "ai_analysis": tender.risk_score.ai_analysis,
+                "recommended_action": tender.risk_score.recommended_action,
+                "computed_at": tender.risk_score.computed_at.isoformat(),
+            }
+            if tender.risk_score
+            else None
+        ),
+        "red_flags": [
+            {
+                "type": f.flag_type,
+                "severity": f.severity,
+                "description": f.description,
+                "evidence": f.evidence,
+            }
+            for f in (tender.red_flags or [])
+        ],
+        "bids": bids_out,
+        "bid_count": len(bids_out),
+        "contract": (
+            {
+                "contract_value": tender.contract.contract_value,
+                "awarded_at": (
+                    tender.contract.awarded_at.isoformat()
+                    if tender.contract.awarded_at
+                    else None
+                ),
+                "value_variation_pct": tender.contract.value_variation_pct,
+            }
+            if tender.contract
+            else None
+        ),
+    }
+    if settings.TENDER_DETAIL_CACHE_TTL_SECONDS > 0:
+        _remember(tender_id, response)
+    return response
+
+
+# ── Invalidation from ORM writes ──────────────────────────────────────────────
+
+_TENDER_CHILDREN = (RiskScore, RedFlag, Bid, Contract)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_tenders(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("tender_detail_stale", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Tender):
+            changed.add(obj.id)
+        elif isinstance(obj, _TENDER_CHILDREN) and obj.tender_id:
+            changed.add(obj.tender_id)
+    if not changed:
+        session.info.pop("tender_detail_stale", None)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session: Session) -> None:
+    invalidate_tender_detail(*session.info.pop("tender_detail_stale", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("tender_detail_stale", None)
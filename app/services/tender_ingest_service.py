@@ -0,0 +1,434 @@
+"""
+Tender Ingest Service — bulk loading of PPIP / OCDS notices.
+
+create_tender() is built for one form submission: SELECT on reference_number,
+get_or_create_entity() by name, INSERT, commit, refresh, audit row, commit.
+Loading a year of notices that way is ~6 round trips per tender. The bulk
+path instead:
+
+  1. Reads an NDJSON stream line by line (never the whole body).
+  2. Resolves procuring entities through an in-memory name → id map,
+     preloaded once; unseen names are inserted in one multi-row INSERT
+     per batch.
+  3. Writes tenders with one multi-row
+     INSERT ... ON CONFLICT (reference_number) DO NOTHING RETURNING id
+     per batch, so duplicates (in the DB or earlier in the stream) are
+     skipped without a lookup.
+  4. Commits once per batch and writes one summary audit entry at the end.
+
+Input formats
+─────────────
+  ndjson  one tender per line, TenderCreate field names plus optional
+          entity_name / entity_type / opening_date / source_url
+  ocds    one OCDS release per line, or one release package per line
+          (its "releases" array is expanded)
+
+Invalid lines are counted and the first few errors returned; they never
+abort the load. Fields are checked before insert (entity_id must be a UUID,
+over-long keys and URLs are rejected, free text is cut to its column), and
+a batch the database still rejects — e.g. an unknown entity_id — is retried
+row by row so only the offending lines are lost.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import StatementError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.enums import AuditAction, ProcurementMethod, TenderStatus
+from app.models.loader_profiles import load_profile
+from app.models.procuring_entity_model import ProcuringEntity
+from app.models.tender_model import Tender
+from app.services import risk_rollup_service
+from app.services.audit_service import AuditService
+
+logger = get_logger(__name__)
+
+INGEST_FORMATS = ("ndjson", "ocds")
+MAX_REPORTED_ERRORS = 20
+
+_STATUSES = {s.value for s in TenderStatus}
+_METHODS = {m.value for m in ProcurementMethod}
+
+# OCDS codelists → our enums
+_OCDS_METHODS = {
+    "open": ProcurementMethod.OPEN_TENDER.value,
+    "selective": ProcurementMethod.RESTRICTED_TENDER.value,
+    "limited": ProcurementMethod.DIRECT_PROCUREMENT.value,
+    "direct": ProcurementMethod.DIRECT_PROCUREMENT.value,
+}
+_OCDS_STATUSES = {
+    "planning": TenderStatus.DRAFT.value,
+    "planned": TenderStatus.DRAFT.value,
+    "active": TenderStatus.OPEN.value,
+    "complete": TenderStatus.CLOSED.value,
+    "cancelled": TenderStatus.CANCELLED.value,
+    "unsuccessful": TenderStatus.CANCELLED.value,
+    "withdrawn": TenderStatus.CANCELLED.value,
+}
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream (e.g. request.stream()) into non-empty text lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.decode("utf-8")
+    if pending.strip():
+        yield pending.decode("utf-8")
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _parse_uuid(value) -> Optional[uuid.UUID]:
+    if not value:
+        return None
+    if isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))  # ValueError on a malformed id
+
+
+def _text(value, limit: int, field: str, truncate: bool = False) -> Optional[str]:
+    """Strip a string column; over-long values are cut or rejected (keys, URLs)."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if len(text) > limit:
+        if not truncate:
+            raise ValueError(f"{field} is longer than {limit} characters")
+        text = text[:limit]
+    return text or None
+
+
+def _parse_float(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def ocds_release_to_record(release: dict) -> dict:
+    """Map one OCDS release onto the NDJSON record shape."""
+    tender = release.get("tender") or {}
+    buyer = release.get("buyer") or {}
+    value = tender.get("value") or {}
+    period = tender.get("tenderPeriod") or {}
+    region = (buyer.get("address") or {}).get("region")
+    documents = tender.get("documents") or []
+    return {
+        "reference_number": tender.get("id") or release.get("ocid"),
+        "title": tender.get("title"),
+        "description": tender.get("description"),
+        "category": tender.get("mainProcurementCategory"),
+        "estimated_value": value.get("amount"),
+        "currency": value.get("currency") or "KES",
+        "county": region,
+        "procurement_method": _OCDS_METHODS.get(tender.get("procurementMethod")),
+        "status": _OCDS_STATUSES.get(tender.get("status")),
+        "submission_deadline": period.get("endDate"),
+        "opening_date": (tender.get("awardPeriod") or {}).get("startDate"),
+        "source_url": documents[0].get("url") if documents else None,
+        "entity_name": buyer.get("name"),
+    }
+
+
+def _records_from_line(line: str, fmt: str) -> list[dict]:
+    obj = json.loads(line)
+    if not isinstance(obj, dict):
+        raise ValueError("expected a JSON object")
+    if fmt == "ndjson":
+        return [obj]
+    releases = obj.get("releases") if "releases" in obj else [obj]
+    return [ocds_release_to_record(r) for r in releases]
+
+
+def _tender_row(record: dict, source: str, now: datetime) -> dict:
+    """
+    Normalise one record into a full `tenders` row. Every row carries the
+    same keys so a batch can go out as a single multi-row INSERT.
+    """
+    title = _text(record.get("title"), 1000, "title", truncate=True)
+    if not title:
+        raise ValueError("title is required")
+    reference = _text(record.get("reference_number"), 200, "reference_number")
+    category = _text(record.get("category"), 200, "category", truncate=True)
+    status = record.get("status") or TenderStatus.OPEN.value
+    method = record.get("procurement_method")
+    return {
+        "id": uuid.uuid4(),
+        "reference_number": reference,
+        "title": title,
+        "description": record.get("description"),
+        "category": category.lower()[:50] if category else None,
+        "category_raw": category,
+        "estimated_value": _parse_float(record.get("estimated_value")),
+        "currency": _text(record.get("currency"), 10, "currency") or "KES",
+        "county": _text(record.get("county"), 100, "county", truncate=True),
+        "procurement_method": method if method in _METHODS else None,
+        "status": status if status in _STATUSES else TenderStatus.OPEN.value,
+        "submission_deadline": _parse_datetime(record.get("submission_deadline")),
+        "opening_date": _parse_datetime(record.get("opening_date")),
+        "source_url": _text(record.get("source_url"), 2000, "source_url"),
+        "source": _text(record.get("source"), 100, "source", truncate=True) or source,
+        "is_scraped": source != "manual",
+        "scraped_at": now if source != "manual" else None,
+        "created_at": now,
+        "updated_at": now,
+        "entity_id": _parse_uuid(record.get("entity_id")),
+    }
+
+
+# ── Ingestor ──────────────────────────────────────────────────────────────────
+
+
+class BulkTenderIngestor:
+    """
+    Holds the entity map and counters for one load. Use once per stream:
+
+        ingestor = BulkTenderIngestor(db, source="ppip")
+        summary = await ingestor.ingest(iter_lines(chunks), fmt="ocds")
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        source: str = "ppip",
+        batch_size: Optional[int] = None,
+        user_id: Optional[uuid.UUID] = None,
+    ):
+        self.db = db
+        self.source = source
+        self.batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        self.user_id = user_id
+        self._entity_ids: Optional[dict[str, uuid.UUID]] = None
+        self._seen_refs: set[str] = set()
+        self._batch: list[tuple[int, dict, dict]] = []  # (line, record, row)
+        self.inserted_ids: list[uuid.UUID] = []
+        self.lines = 0
+        self.received = 0
+        self.duplicates = 0
+        self.entities_created = 0
+        self.errors: list[dict] = []
+        self.error_count = 0
+
+    def _error(self, line_no: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    async def _load_entity_map(self) -> dict[str, uuid.UUID]:
+        if self._entity_ids is None:
+            result = await self.db.execute(
+                select(ProcuringEntity.name, ProcuringEntity.id)
+            )
+            self._entity_ids = {name.strip().lower(): eid for name, eid in result}
+        return self._entity_ids
+
+    async def _resolve_entities(self, batch: list[tuple[int, dict, dict]]) -> int:
+        """
+        Fill entity_id on each row, inserting unseen entities in one
+        statement; returns how many were inserted.
+        """
+        entity_ids = await self._load_entity_map()
+        new_entities: dict[str, dict] = {}
+        for _, record, row in batch:
+            name = (record.get("entity_name") or "").strip()
+            if row["entity_id"] or not name:
+                continue
+            key = name.lower()
+            if key not in entity_ids and key not in new_entities:
+                new_entities[key] = {
+                    "id": uuid.uuid4(),
+                    "name": name[:500],
+                    "entity_type": (record.get("entity_type") or "OTHER")[:50],
+                    "county": record.get("county"),
+                    "corruption_history_score": 0.0,
+                    "investigation_count": 0,
+                    "is_active": True,
+                    "created_at": row["created_at"],
+                    "updated_at": row["created_at"],
+                }
+        if new_entities:
+            await self.db.execute(
+                pg_insert(ProcuringEntity.__table__), list(new_entities.values())
+            )
+            entity_ids.update({k: v["id"] for k, v in new_entities.items()})
+        for _, record, row in batch:
+            name = (record.get("entity_name") or "").strip()
+            if not row["entity_id"] and name:
+                row["entity_id"] = entity_ids[name.lower()]
+        return len(new_entities)
+
+    async def _insert(self, batch: list[tuple[int, dict, dict]]) -> list[uuid.UUID]:
+        """Resolve entities, insert the batch and commit; returns the new tender ids."""
+        created = await self._resolve_entities(batch)
+        stmt = (
+            pg_insert(Tender.__table__)
+            .on_conflict_do_nothing(index_elements=["reference_number"])
+            .returning(Tender.__table__.c.id)
+        )
+        result = await self.db.execute(stmt, [row for _, _, row in batch])
+        ids = list(result.scalars().all())
+        await self.db.commit()
+        self.entities_created += created
+        self.duplicates += len(batch) - len(ids)
+        return ids
+
+    async def _rollback(self, batch: list[tuple[int, dict, dict]]) -> None:
+        """Undo a failed insert: entities it created are gone, so re-resolve names."""
+        await self.db.rollback()
+        self._entity_ids = None
+        for _, record, row in batch:
+            row["entity_id"] = _parse_uuid(record.get("entity_id"))
+
+    async def _flush(self, batch: list[tuple[int, dict, dict]]) -> None:
+        if not batch:
+            return
+        try:
+            ids = await self._insert(batch)
+        except StatementError as exc:
+            # e.g. an unknown entity_id — retry row by row so only that line is lost
+            await self._rollback(batch)
+            logger.warning(
+                "Bulk tender batch failed, retrying row by row",
+                extra={"rows": len(batch), "error": str(exc.orig or exc)},
+            )
+            ids = []
+            for item in batch:
+                try:
+                    ids.extend(await self._insert([item]))
+                except StatementError as row_exc:
+                    await self._rollback([item])
+                    self._error(item[0], str(row_exc.orig or row_exc).splitlines()[0])
+        risk_rollup_service.enqueue(tender_ids=ids)  # Core insert — no ORM events
+        self.inserted_ids.extend(ids)
+
+    async def _add(self, record: dict, now: datetime) -> None:
+        self.received += 1
+        try:
+            row = _tender_row(record, self.source, now)
+        except (ValueError, TypeError) as exc:
+            self._error(self.lines, str(exc))
+            return
+        ref = row["reference_number"]
+        if ref is not None:
+            if ref in self._seen_refs:
+                self.duplicates += 1
+                return
+            self._seen_refs.add(ref)
+        self._batch.append((self.lines, record, row))
+        if len(self._batch) >= self.batch_size:
+            await self._flush(self._batch)
+            self._batch = []
+
+    async def _finish(self, fmt: str) -> dict:
+        await self._flush(self._batch)
+        self._batch = []
+        summary = self.summary()
+        await AuditService.log(
+            self.db,
+            AuditAction.TENDER_CREATED,
+            user_id=self.user_id,
+            entity_type="Tender",
+            metadata={"bulk_ingest": True, "format": fmt, **summary},
+        )
+        logger.info("Bulk tender ingest finished", extra=summary)
+        return summary
+
+    async def ingest(self, lines: AsyncIterable[str], fmt: str = "ndjson") -> dict:
+        """Load an NDJSON / OCDS line stream."""
+        if fmt not in INGEST_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(INGEST_FORMATS)}")
+        now = datetime.now(timezone.utc)
+        async for line in lines:
+            self.lines += 1
+            try:
+                records = _records_from_line(line, fmt)
+            except ValueError as exc:  # JSONDecodeError is a ValueError
+                self._error(self.lines, str(exc))
+                continue
+            for record in records:
+                await self._add(record, now)
+        return await self._finish(fmt)
+
+    async def ingest_records(
+        self, records: AsyncIterable[dict], fmt: str = "records"
+    ) -> dict:
+        """Load already-parsed records (NDJSON record shape), e.g. from a scraper."""
+        now = datetime.now(timezone.utc)
+        async for record in records:
+            self.lines += 1
+            await self._add(record, now)
+        return await self._finish(fmt)
+
+    def summary(self) -> dict:
+        return {
+            "source": self.source,
+            "lines": self.lines,
+            "received": self.received,
+            "inserted": len(self.inserted_ids),
+            "duplicates": self.duplicates,
+            "entities_created": self.entities_created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+# ── Scoring ───────────────────────────────────────────────────────────────────
+
+
+async def score_ingested_tenders(tender_ids: Iterable[uuid.UUID]) -> None:
+    """
+    Background task — run the risk pipeline over freshly ingested tenders
+    with its own session (the request session is closed by then). AI
+    narrative is skipped, as for single creates.
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.services.risk_engine_service import compute_and_save_risk
+    from app.services.risk_fingerprint_service import load_scoring_inputs
+
+    scored = failed = 0
+    async with AsyncSessionLocal() as db:
+        for tender_id in tender_ids:
+            try:
+                result = await db.execute(
+                    select(Tender)
+                    .options(*load_profile(Tender, "scoring"))
+                    .filter(Tender.id == tender_id)
+                )
+                tender = result.unique().scalar_one_or_none()
+                if tender:
+                    supplier, bids = await load_scoring_inputs(db, tender)
+                    await compute_and_save_risk(db, tender, supplier, bids, use_ai=False)
+                    await db.commit()
+                    scored += 1
+            except Exception as e:
+                await db.rollback()
+                failed += 1
+                logger.error(
+                    "Scoring ingested tender failed",
+                    extra={"tender_id": str(tender_id), "error": str(e)},
+                )
+    logger.info(
+        "Scoring of ingested tenders finished",
+        extra={"scored": scored, "failed": failed},
+    )
@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException, status
@@ -6,10 +7,10 @@ from sqlalchemy import or_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload, selectinload
 
 from app.core.logger import get_logger
 from app.enums import AuditAction, RiskLevel, TenderStatus
+from app.models.loader_profiles import load_profile
 from app.models.risk_score_model import RiskScore
 from app.models.tender_model import Tender
 from app.schemas.tender_schema import TenderCreate, TenderUpdate
@@ -73,6 +74,66 @@ async def create_tender(
         ) from e
 
 
+def apply_tender_filters(
+    query,
+    *,
+    county: Optional[str] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    procurement_method: Optional[str] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    search: Optional[str] = None,
+    risk_level: Optional[str] = None,
+):
+    """
+    Apply the GET /tenders query-string filters to a select() that includes
+    Tender. Shared by the tender list and the bulk export endpoints so both
+    return the same rows for the same filters.
+
+    A risk_level filter inner-joins RiskScore onto the query.
+    """
+    if county:
+        query = query.filter(Tender.county.ilike(f"%{county}%"))
+    if category:
+        query = query.filter(Tender.category.ilike(f"%{category}%"))
+    if status:
+        query = query.filter(Tender.status == status)
+    if procurement_method:
+        query = query.filter(Tender.procurement_method == procurement_method)
+    if min_value is not None:
+        query = query.filter(Tender.estimated_value >= min_value)
+    if max_value is not None:
+        query = query.filter(Tender.estimated_value <= max_value)
+    if date_from:
+        try:
+            query = query.filter(Tender.created_at >= datetime.fromisoformat(date_from))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid date_from format: {date_from!r}"
+            )
+    if date_to:
+        try:
+            query = query.filter(Tender.created_at <= datetime.fromisoformat(date_to))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid date_to format: {date_to!r}"
+            )
+    if search:
+        query = query.filter(
+            Tender.title.ilike(f"%{search}%")
+            | Tender.description.ilike(f"%{search}%")
+            | Tender.reference_number.ilike(f"%{search}%")
+        )
+    if risk_level:
+        query = query.join(RiskScore, RiskScore.tender_id == Tender.id).filter(
+            RiskScore.risk_level == risk_level
+        )
+    return query
+
+
 async def list_tenders(
     db: AsyncSession,
     search: Optional[str] = None,
@@ -84,13 +145,7 @@ async def list_tenders(
     skip: int = 0,
     limit: int = 50,
 ) -> list[Tender]:
-    query = select(Tender).options(
-        joinedload(Tender.entity),  # single row JOIN — efficient
-        selectinload(Tender.risk_score),  # one-to-one via separate query
-        selectinload(Tender.red_flags),  # one-to-many
-        selectinload(Tender.bids),  # one-to-many
-        selectinload(Tender.documents),  # one-to-many
-    )
+    query = select(Tender).options(*load_profile(Tender, "list"))
     if search:
         term = f"%{search.strip()}%"
         query = query.filter(
@@ -0,0 +1,258 @@
+"""
+Training Job Service — runs ML training off the request path.
+
+POST /ml/train/* used to call train() inside the request coroutine, which
+blocked the event loop for the whole sklearn/XGBoost fit. Now each request
+registers a job and returns immediately:
+
+  queued → loading_data → fitting → publishing → succeeded | failed
+
+  - Data loading runs on the event loop using a fresh session and a
+    server-side cursor (see ml_service.py).
+  - The fit runs in a separate process (ProcessPoolExecutor, spawn context)
+    so CPU-bound work never competes with request handling for the GIL.
+  - Weights are published atomically by app/ml/artifacts.py at the end of
+    the fit.
+
+Job state is written to one JSON file per job under the weights directory
+(weights/jobs/<id>.json), the same place every API worker reads published
+weights from. Any worker can answer GET /ml/jobs/{id}, the one-job-per-model
+check holds across workers, and state survives a restart. A queued/running
+job whose owning process is gone (restart, crash) is reported as failed.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.ml.artifacts import WEIGHTS_DIR
+
+logger = get_logger(__name__)
+
+MAX_FINISHED_JOBS = 50  # finished jobs kept for GET /ml/jobs
+JOBS_DIR = os.path.join(WEIGHTS_DIR, "jobs")
+
+_jobs: dict[str, dict] = {}  # jobs owned by this process
+_tasks: set[asyncio.Task] = set()
+_executor: Optional[ProcessPoolExecutor] = None
+
+JobRunner = Callable[[dict], Awaitable[dict]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: never fork a process that holds an event loop and DB sockets
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.ML_TRAINING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def run_in_training_process(fn: Callable, *args, **kwargs):
+    """Run a picklable, module-level training function in the fit process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(fn, *args, **kwargs))
+
+
+# ── Job store ─────────────────────────────────────────────────────────────────
+
+
+def _job_path(job_id: str) -> str:
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+
+def _save(job: dict) -> None:
+    """Write the job file atomically, so a reader never sees half of it."""
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=JOBS_DIR, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(job, f, default=str)
+        os.replace(tmp_path, _job_path(job["id"]))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _owner_gone(job: dict) -> bool:
+    """True if the process that ran this unfinished job no longer exists."""
+    if job["id"] in _jobs or job.get("host") != socket.gethostname():
+        return False
+    try:
+        os.kill(job["pid"], 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, KeyError, TypeError):
+        return False
+    return job["pid"] == os.getpid()  # this process restarted and lost it
+
+
+def _load(job_id: str) -> Optional[dict]:
+    if job_id in _jobs:
+        return _jobs[job_id]
+    try:
+        with open(_job_path(job_id), encoding="utf-8") as f:
+            job = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if job["status"] in ("queued", "running") and _owner_gone(job):
+        job.update(
+            status="failed",
+            stage="failed",
+            error="Interrupted: the worker running this job stopped",
+            finished_at=job.get("finished_at") or _now(),
+        )
+        _save(job)
+    return job
+
+
+def _all_jobs() -> list[dict]:
+    try:
+        names = os.listdir(JOBS_DIR)
+    except FileNotFoundError:
+        names = []
+    jobs = (_load(name[:-5]) for name in names if name.endswith(".json"))
+    return [j for j in jobs if j is not None]
+
+
+def update_job(job: dict, **fields) -> None:
+    """Record stage / progress changes reported by a running job."""
+    job.update(fields)
+    job["updated_at"] = _now()
+    _save(job)
+
+
+def _prune_finished() -> None:
+    finished = [j for j in _all_jobs() if j["status"] in ("succeeded", "failed")]
+    for job in sorted(finished, key=lambda j: j["created_at"])[:-MAX_FINISHED_JOBS]:
+        _jobs.pop(job["id"], None)
+        try:
+            os.unlink(_job_path(job["id"]))
+        except FileNotFoundError:
+            pass
+
+
+async def _run(job: dict, runner: JobRunner) -> None:
+    update_job(job, status="running", stage="loading_data", started_at=_now())
+    try:
+        result = await runner(job)
+    except asyncio.CancelledError:
+        update_job(
+            job,
+            status="failed",
+            stage="failed",
+            error="Cancelled: the API worker shut down",
+            finished_at=_now(),
+        )
+        raise
+    except Exception as exc:
+        update_job(
+            job,
+            status="failed",
+            stage="failed",
+            error=str(exc),
+            finished_at=_now(),
+        )
+        logger.warning(
+            "Training job failed",
+            extra={"job_id": job["id"], "model_id": job["model_id"], "error": str(exc)},
+        )
+    else:
+        update_job(
+            job,
+            status="succeeded",
+            stage="done",
+            progress=1.0,
+            result=result,
+            finished_at=_now(),
+        )
+        logger.info(
+            "Training job finished",
+            extra={"job_id": job["id"], "model_id": job["model_id"]},
+        )
+    finally:
+        _jobs.pop(job["id"], None)
+        _prune_finished()
+
+
+def submit_training_job(model_id: str, runner: JobRunner) -> dict:
+    """
+    Register and start a training job for `model_id`.
+
+    Raises ValueError if a job for the same model is already queued/running
+    in any worker — two concurrent fits would just race to publish the same
+    weights.
+    """
+    for existing in _all_jobs():
+        if existing["model_id"] == model_id and existing["status"] in (
+            "queued",
+            "running",
+        ):
+            raise ValueError(
+                f"Training for '{model_id}' is already in progress (job {existing['id']})."
+            )
+
+    job = {
+        "id": str(uuid.uuid4()),
+        "model_id": model_id,
+        "status": "queued",
+        "stage": "queued",
+        "progress": 0.0,
+        "rows_loaded": 0,
+        "result": None,
+        "error": None,
+        "created_at": _now(),
+        "updated_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+    }
+    _jobs[job["id"]] = job
+    _save(job)
+    task = asyncio.create_task(_run(job, runner))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    try:
+        uuid.UUID(job_id)  # also keeps the id from naming a path outside JOBS_DIR
+    except ValueError:
+        return None
+    return _load(job_id)
+
+
+def list_jobs(model_id: Optional[str] = None) -> list[dict]:
+    jobs = [j for j in _all_jobs() if model_id is None or j["model_id"] == model_id]
+    return sorted(jobs, key=lambda j: j["created_at"], reverse=True)
+
+
+def shutdown_training_executor() -> None:
+    """Stop the fit process pool. Call from app lifespan on shutdown."""
+    global _executor
+    for task in list(_tasks):
+        task.cancel()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,253 @@
+"""
+Whistleblower Triage Service — AI triage off the intake path.
+
+POST /whistleblower/submit only inserts the report (triage_status="pending")
+and returns a tracking code; its latency no longer depends on Claude. This
+module drains the pending queue:
+
+  - claim      one UPDATE … WHERE id IN (SELECT … FOR UPDATE SKIP LOCKED)
+               marks up to WB_TRIAGE_BATCH_SIZE reports "processing", so
+               several API workers can run the loop without double-triaging
+  - triage     the batch goes to Claude concurrently (WB_TRIAGE_CONCURRENCY)
+  - apply      results written back; urgent + credible reports get
+               escalated_at and a warning log for investigators. The AI's
+               is_credible seeds the column as intake used to, but never
+               replaces a judgement an investigator already recorded
+  - retry      failures return to "pending" until WB_TRIAGE_MAX_ATTEMPTS;
+               claims older than WB_TRIAGE_STALE_MINUTES (crashed worker)
+               are picked up again
+
+Intake in this process wakes the loop immediately (notify_new_report());
+reports taken by other processes are found by the WB_TRIAGE_POLL_SECONDS poll.
+"""
+
+import asyncio
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logger import get_logger
+from app.enums import AllegationType, WhistleblowerUrgency
+from app.models.tender_model import Tender
+from app.models.whistleblower_report_model import WhistleblowerReport
+
+logger = get_logger(__name__)
+
+_TRACKING_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # no 0/O, 1/I
+
+# Claude answers IMMEDIATE | URGENT | ROUTINE; the column holds WhistleblowerUrgency
+_URGENCY = {
+    "immediate": WhistleblowerUrgency.CRITICAL.value,
+    "urgent": WhistleblowerUrgency.HIGH.value,
+    "routine": WhistleblowerUrgency.LOW.value,
+    **{u.value: u.value for u in WhistleblowerUrgency},
+}
+_ESCALATE_URGENCY = {WhistleblowerUrgency.CRITICAL.value, WhistleblowerUrgency.HIGH.value}
+_ALLEGATION_TYPES = {a.value for a in AllegationType}
+
+
+def new_tracking_code() -> str:
+    """e.g. WB-7KQM-X3PD — random, so it can't be linked back to the reporter."""
+    chars = [secrets.choice(_TRACKING_ALPHABET) for _ in range(8)]
+    return f"WB-{''.join(chars[:4])}-{''.join(chars[4:])}"
+
+
+def triage_fields(result: dict, current_allegation: Optional[str]) -> dict:
+    """Map a triage_whistleblower_report() result onto report columns."""
+    urgency = _URGENCY.get(str(result.get("urgency") or "").lower())
+    allegation = result.get("allegation_type")
+    if allegation == "specification_manipulation":
+        allegation = AllegationType.SPEC_MANIPULATION.value
+    credibility = result.get("credibility_score")
+    is_credible = result.get("is_credible")
+    return {
+        "credibility_score": float(credibility) if credibility is not None else None,
+        "is_credible": bool(is_credible) if is_credible is not None else None,
+        "ai_triage_summary": result.get("triage_summary"),
+        "urgency": urgency or WhistleblowerUrgency.MEDIUM.value,
+        "allegation_type": (
+            allegation if allegation in _ALLEGATION_TYPES else current_allegation or "other"
+        ),
+    }
+
+
+def _should_escalate(fields: dict) -> bool:
+    return (
+        fields["urgency"] in _ESCALATE_URGENCY
+        and (fields["credibility_score"] or 0) >= settings.WB_ESCALATE_MIN_CREDIBILITY
+    )
+
+
+# ── Queue processing ──────────────────────────────────────────────────────────
+
+
+async def _claim_batch(batch_size: int) -> list:
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(minutes=settings.WB_TRIAGE_STALE_MINUTES)
+    retry_after = now - timedelta(seconds=settings.WB_TRIAGE_POLL_SECONDS)
+    claimable = (
+        select(WhistleblowerReport.id)
+        .filter(
+            or_(
+                and_(
+                    WhistleblowerReport.triage_status == "pending",
+                    # a failed attempt waits one poll interval before retrying
+                    or_(
+                        WhistleblowerReport.triage_claimed_at.is_(None),
+                        WhistleblowerReport.triage_claimed_at < retry_after,
+                    ),
+                ),
+                and_(
+                    WhistleblowerReport.triage_status == "processing",
+                    WhistleblowerReport.triage_claimed_at < stale,
+                ),
+            )
+        )
+        .order_by(WhistleblowerReport.submitted_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    async with AsyncSessionLocal() as db:
+        rows = (
+            await db.execute(
+                update(WhistleblowerReport)
+                .where(WhistleblowerReport.id.in_(claimable.scalar_subquery()))
+                .values(
+                    triage_status="processing",
+                    triage_claimed_at=now,
+                    triage_attempts=WhistleblowerReport.triage_attempts + 1,
+                )
+                .returning(
+                    WhistleblowerReport.id,
+                    WhistleblowerReport.report_text,
+                    WhistleblowerReport.tender_id,
+                    WhistleblowerReport.allegation_type,
+                    WhistleblowerReport.triage_attempts,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        await db.commit()
+    return rows
+
+
+async def _triage_one(row, tender_title: Optional[str], limiter: asyncio.Semaphore) -> dict:
+    from app.services.ai_service import triage_whistleblower_report
+
+    async with limiter:
+        try:
+            result = await triage_whistleblower_report(row.report_text, tender_title)
+        except ValueError as exc:  # ANTHROPIC_API_KEY not configured
+            return {"triage_status": "skipped", "error": str(exc)}
+        except Exception as exc:
+            retry = row.triage_attempts < settings.WB_TRIAGE_MAX_ATTEMPTS
+            return {"triage_status": "pending" if retry else "failed", "error": str(exc)}
+
+    fields = triage_fields(result, row.allegation_type)
+    now = datetime.now(timezone.utc)
+    fields.update(triage_status="done", triaged_at=now)
+    if _should_escalate(fields):
+        fields["escalated_at"] = now
+    return fields
+
+
+async def process_pending_reports(batch_size: Optional[int] = None) -> int:
+    """Triage one claimed batch; returns how many reports were claimed."""
+    rows = await _claim_batch(batch_size or settings.WB_TRIAGE_BATCH_SIZE)
+    if not rows:
+        return 0
+
+    tender_ids = {r.tender_id for r in rows if r.tender_id}
+    titles = {}
+    if tender_ids:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Tender.id, Tender.title).filter(Tender.id.in_(tender_ids))
+            )
+            titles = dict(result.all())
+
+    # No session is held open while Claude is thinking
+    limiter = asyncio.Semaphore(settings.WB_TRIAGE_CONCURRENCY)
+    outcomes = await asyncio.gather(
+        *(_triage_one(r, titles.get(r.tender_id), limiter) for r in rows)
+    )
+
+    async with AsyncSessionLocal() as db:
+        for row, fields in zip(rows, outcomes):
+            error = fields.pop("error", None)
+            if error:
+                logger.warning(
+                    "Whistleblower triage failed",
+                    extra={
+                        "report_id": str(row.id),
+                        "status": fields["triage_status"],
+                        "error": error,
+                    },
+                )
+            if fields.get("escalated_at"):
+                logger.warning(
+                    "Whistleblower report escalated",
+                    extra={
+                        "report_id": str(row.id),
+                        "urgency": fields["urgency"],
+                        "credibility_score": fields["credibility_score"],
+                    },
+                )
+            if "is_credible" in fields:
+                fields["is_credible"] = func.coalesce(
+                    WhistleblowerReport.is_credible, fields["is_credible"]
+                )
+            await db.execute(
+                update(WhistleblowerReport)
+                .where(WhistleblowerReport.id == row.id)
+                .values(**fields)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+
+    logger.info("Whistleblower triage batch done", extra={"reports": len(rows)})
+    return len(rows)
+
+
+# ── Background worker ─────────────────────────────────────────────────────────
+
+_wake: Optional[asyncio.Event] = None
+_task: Optional[asyncio.Task] = None
+
+
+def notify_new_report() -> None:
+    """Wake the worker after intake commits (no-op if it isn't running)."""
+    if _wake is not None:
+        _wake.set()
+
+
+async def _worker() -> None:
+    while True:
+        try:
+            if await process_pending_reports():
+                continue  # keep draining while there is backlog
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Whistleblower triage pass crashed", extra={"error": str(exc)})
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=settings.WB_TRIAGE_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+def start_triage_worker() -> None:
+    """Start the triage loop on the running event loop. Call from lifespan."""
+    global _wake, _task
+    _wake = asyncio.Event()
+    _task = asyncio.create_task(_worker())
+
+
+def stop_triage_worker() -> None:
+    if _task is not None and not _task.done():
+        _task.cancel()